@@ -13,29 +13,56 @@ Este módulo proporciona:
 - Lanzador de consolas con soporte para múltiples terminales
 - Sistema de plugins extensible
 - Extracción mejorada del contenido de consolas
+
+Al arrancar NVDA solo se importa lo imprescindible (configuración, gestor
+de plugins y mensajes). Los lectores, el lanzador, los diálogos y los
+servicios en segundo plano se importan y crean en su primer uso.
 """
 
-import globalPluginHandler
-import addonHandler
-import api
-import globalVars
-from scriptHandler import script
-from logHandler import log
-import wx
+import os
+import time
+import winsound
+from typing import TYPE_CHECKING, Optional
+
+# `utilidades` importa sus nombres en el primer acceso: esto no carga nada más
+from .utilidades.perfil_arranque import PerfilArranque
+_perfil_arranque = PerfilArranque(__name__)
+_perfil_arranque.iniciar()
+
+try:
+	import globalPluginHandler
+	import addonHandler
+	import api
+	import globalVars
+	from scriptHandler import script
+	from logHandler import log
+	import wx
+	
+	# Inicializar traducción
+	import addonHandler
+	_ = addonHandler.initTranslation()
+	if not callable(_):
+		_ = lambda x: x
+	
+	from .nucleo.configuracion import Configuracion
+	from .nucleo.gestor_plugins import GestorPlugins
+	from .utilidades.mensajes import Mensajes
+	from .utilidades.anunciador import AnunciadorAgrupado
+except BaseException:
+	# Si el complemento no se puede importar, el buscador no debe quedarse instalado
+	_perfil_arranque.detener()
+	raise
 
-# Inicializar traducción
-import addonHandler
-_ = addonHandler.initTranslation()
-if not callable(_):
-	_ = lambda x: x
+if TYPE_CHECKING:
+	from .nucleo.indice_historial import IndiceHistorial
+	from .nucleo.vigilante_comandos import AvisoFinComando, ConsolaVigilada, VigilanteComandos
+	from .nucleo.servicio_monitor import ConsolaMonitorizada, ServicioMonitor
+	from .nucleo.motor_alertas import ResultadoAlertas
+	from .nucleo.planificador import PlanificadorCompartido
+	from .lectores.gestor_lectores import GestorLectores
+	from .lanzador.gestor_lanzador import GestorLanzador
 
-from .nucleo.configuracion import Configuracion
-from .nucleo.gestor_plugins import GestorPlugins
-from .lectores.gestor_lectores import GestorLectores
-from .lanzador.gestor_lanzador import GestorLanzador
-from .interfaz.visor_consola import VisorConsola
-from .interfaz.lanzador_dialogo import LanzadorDialogo
-from .utilidades.mensajes import Mensajes
+_perfil_arranque.registrar_paso(_("Importación del complemento"))
 
 
 def deshabilitarEnModoSeguro(claseDecorada):
@@ -48,6 +75,8 @@ def deshabilitarEnModoSeguro(claseDecorada):
 		La clase original o GlobalPlugin base dependiendo del modo seguro.
 	"""
 	if globalVars.appArgs.secure:
+		# El plugin no se crea: no hay arranque que medir
+		_perfil_arranque.detener()
 		return globalPluginHandler.GlobalPlugin
 	return claseDecorada
 
@@ -65,31 +94,76 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 	# TRANSLATORS: Nombre de la categoría en gestos de entrada
 	scriptCategory = _("Visor de consola")
 	
+	# Milisegundos tras el arranque antes de detectar las consolas del lanzador
+	RETRASO_DETECCION_MS = 5000
+	
+	# Milisegundos tras el arranque antes de precargar los plugins (si está activado)
+	RETRASO_PRECARGA_PLUGINS_MS = 8000
+	
 	def __init__(self, *args, **kwargs):
-		"""Inicializa el plugin global y todos sus componentes."""
-		super().__init__(*args, **kwargs)
-		
-		# Estado del plugin
-		self._proceso_en_marcha = False
-		self._dialogo_visor_abierto = False
-		self._dialogo_lanzador_abierto = False
-		
-		# Inicializar componentes
-		self._configuracion = Configuracion()
-		self._gestor_plugins = GestorPlugins(self._configuracion)
-		self._gestor_lectores = GestorLectores()
-		self._gestor_lanzador = GestorLanzador()
-		self._mensajes = Mensajes()
-		
-		# Cargar plugins
-		self._gestor_plugins.cargar_plugins()
-		
+		"""Inicializa el plugin global; el resto de componentes se crean en su primer uso."""
+		inicio = time.perf_counter()
+		try:
+			super().__init__(*args, **kwargs)
+			
+			# Estado del plugin
+			self._proceso_en_marcha = False
+			self._dialogo_visor_abierto = False
+			self._dialogo_lanzador_abierto = False
+			self._indice_historial = None
+			self._planificador = None
+			self._vigilante = None
+			self._monitor = None
+			self._gestor_lectores = None
+			self._gestor_lanzador = None
+			
+			# Inicializar componentes
+			self._configuracion = Configuracion()
+			self._gestor_plugins = GestorPlugins(self._configuracion)
+			self._mensajes = Mensajes()
+			config_anuncios = self._configuracion.anuncios
+			self._anunciador = AnunciadorAgrupado(
+				self._mensajes, config_anuncios.ventana_agrupacion, config_anuncios.intervalo_minimo
+			)
+			
+			# Cargar plugins
+			self._gestor_plugins.cargar_plugins()
+			
+			# Las consolas del lanzador se detectan en segundo plano, pasado el arranque
+			self._precarga_lanzador = wx.CallLater(self.RETRASO_DETECCION_MS, self._precargar_lanzador)
+			# Los plugins se inicializan en paralelo en segundo plano, también pasado el arranque
+			self._precarga_plugins = None
+			if self._configuracion.plugins.auto_cargar_plugins:
+				self._precarga_plugins = wx.CallLater(self.RETRASO_PRECARGA_PLUGINS_MS, self._gestor_plugins.precargar_plugins)
+		except BaseException:
+			# Sin plugin no termina el arranque: el buscador no debe quedarse instalado
+			_perfil_arranque.detener()
+			raise
+		
+		_perfil_arranque.registrar_paso(_("Inicialización del plugin"), inicio)
+		_perfil_arranque.terminar()
 		log.debug("consoleLog: Plugin inicializado correctamente")
 	
 	def terminate(self):
 		"""Libera recursos al terminar el plugin."""
 		try:
+			if self._precarga_lanzador.IsRunning():
+				self._precarga_lanzador.Stop()
+			if self._precarga_plugins is not None and self._precarga_plugins.IsRunning():
+				self._precarga_plugins.Stop()
+			self._anunciador.descartar()
 			self._gestor_plugins.descargar_plugins()
+			if self._indice_historial:
+				self._indice_historial.cerrar()
+			if self._vigilante:
+				self._vigilante.detener()
+			if self._monitor:
+				self._monitor.detener()
+			if self._planificador:
+				self._planificador.detener()
+			if self._gestor_lanzador:
+				self._gestor_lanzador.detener_pool()
+				self._gestor_lanzador.liberar()
 			log.debug("consoleLog: Plugin terminado correctamente")
 		except Exception as e:
 			log.error(f"consoleLog: Error al terminar el plugin: {e}")
@@ -114,6 +188,134 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		"""Establece el estado del diálogo del visor."""
 		self._dialogo_visor_abierto = valor
 	
+	@property
+	def gestor_lectores(self) -> "GestorLectores":
+		"""Lectores de consolas, creados en el primer uso."""
+		if self._gestor_lectores is None:
+			with _perfil_arranque.medir(_("Lectores de consola")):
+				from .lectores.gestor_lectores import GestorLectores
+				self._gestor_lectores = GestorLectores()
+		return self._gestor_lectores
+	
+	@property
+	def gestor_lanzador(self) -> "GestorLanzador":
+		"""Gestor del lanzador, creado (y detectadas las consolas) en el primer uso."""
+		if self._gestor_lanzador is None:
+			with _perfil_arranque.medir(_("Lanzador de consolas")):
+				from .lanzador.gestor_lanzador import GestorLanzador
+				ruta_cache = os.path.join(self._configuracion.obtener_directorio_datos(), "consolas_detectadas.json")
+				self._gestor_lanzador = GestorLanzador(ruta_cache)
+				self._configurar_pool_consolas()
+		return self._gestor_lanzador
+	
+	def _configurar_pool_consolas(self):
+		"""Aplica al lanzador la configuración de las consolas precalentadas."""
+		config_lanzador = self._configuracion.lanzador
+		self._gestor_lanzador.configurar_pool(
+			config_lanzador.pool_habilitado,
+			config_lanzador.pool_tipos,
+			config_lanzador.pool_max_procesos,
+			config_lanzador.pool_max_memoria_mb,
+			os.path.join(self._configuracion.obtener_directorio_datos(), "consolas_precalentadas.json")
+		)
+	
+	def _precargar_lanzador(self):
+		"""Crea el gestor del lanzador, que empieza a detectar las consolas en segundo plano."""
+		try:
+			self.gestor_lanzador
+		except Exception as e:
+			log.error(f"consoleLog: No se pudo iniciar la detección de consolas: {e}")
+	
+	@property
+	def perfil_arranque(self) -> PerfilArranque:
+		"""Tiempos de importación e inicialización medidos al arrancar."""
+		return _perfil_arranque
+	
+	@property
+	def indice_historial(self) -> Optional["IndiceHistorial"]:
+		"""Índice de búsqueda del historial grabado, creado en el primer uso."""
+		if self._indice_historial is None and self._configuracion.grabacion.indexar_historial:
+			try:
+				from .nucleo.indice_historial import IndiceHistorial
+				ruta = os.path.join(self._configuracion.obtener_directorio_datos(), "historial.db")
+				self._indice_historial = IndiceHistorial(ruta)
+			except Exception as e:
+				log.error(f"consoleLog: No se pudo abrir el índice del historial: {e}")
+		return self._indice_historial
+	
+	@property
+	def anunciador(self) -> AnunciadorAgrupado:
+		"""Anunciador compartido para los mensajes que pueden llegar en ráfagas."""
+		return self._anunciador
+	
+	@property
+	def planificador(self) -> "PlanificadorCompartido":
+		"""Hilo compartido por los servicios que sondean consolas en segundo plano."""
+		if self._planificador is None:
+			from .nucleo.planificador import PlanificadorCompartido
+			self._planificador = PlanificadorCompartido()
+		return self._planificador
+	
+	@property
+	def vigilante(self) -> "VigilanteComandos":
+		"""Vigilante de comandos largos, creado en el primer uso."""
+		if self._vigilante is None:
+			from .nucleo.vigilante_comandos import VigilanteComandos
+			config_alertas = self._configuracion.alertas
+			self._vigilante = VigilanteComandos(
+				self.gestor_lectores,
+				self.planificador,
+				self._avisar_fin_comando,
+				self._avisar_fin_vigilancia,
+				intervalo=config_alertas.intervalo_vigilancia,
+				duracion_minima=config_alertas.duracion_minima_aviso,
+				patrones_alerta=config_alertas.patrones if config_alertas.habilitar_alertas else []
+			)
+		return self._vigilante
+	
+	@property
+	def monitor(self) -> "ServicioMonitor":
+		"""Monitor de alertas de varias consolas, creado en el primer uso."""
+		if self._monitor is None:
+			from .nucleo.servicio_monitor import ServicioMonitor
+			self._monitor = ServicioMonitor(
+				self.gestor_lectores,
+				self.planificador,
+				self._anunciar_alertas_monitor,
+				self._avisar_retirada_monitor
+			)
+			self._configurar_monitor()
+		return self._monitor
+	
+	def _configurar_monitor(self):
+		"""Aplica al monitor de consolas la configuración actual."""
+		config_alertas = self._configuracion.alertas
+		self._monitor.configurar(
+			config_alertas.intervalo_monitor_minimo,
+			config_alertas.intervalo_monitor_maximo,
+			self._configuracion.visor.factor_espera_seguimiento,
+			config_alertas.patrones if config_alertas.habilitar_alertas else [],
+			config_alertas.intervalo_minimo_alerta,
+			config_alertas.presupuesto_cpu_monitor
+		)
+	
+	def aplicar_configuracion_servicios(self):
+		"""Aplica la configuración actual a los servicios en segundo plano ya creados."""
+		config_anuncios = self._configuracion.anuncios
+		self._anunciador.configurar(config_anuncios.ventana_agrupacion, config_anuncios.intervalo_minimo)
+		config_alertas = self._configuracion.alertas
+		if self._vigilante is not None:
+			self._vigilante.configurar(
+				config_alertas.intervalo_vigilancia,
+				config_alertas.duracion_minima_aviso,
+				config_alertas.patrones if config_alertas.habilitar_alertas else []
+			)
+		if self._monitor is not None:
+			self._configurar_monitor()
+		if self._gestor_lanzador is not None:
+			self._configurar_pool_consolas()
+		self._gestor_plugins.configurar_perfilador()
+	
 	@property
 	def dialogo_lanzador_abierto(self) -> bool:
 		"""Indica si el diálogo del lanzador está abierto."""
@@ -214,7 +416,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		tipo_consola = self._obtener_tipo_consola(objeto)
 		
 		# Iniciar lectura asíncrona
-		self._gestor_lectores.leer_consola(
+		self.gestor_lectores.leer_consola(
 			tipo_consola=tipo_consola,
 			objeto_ventana=objeto,
 			callback_exito=lambda texto: self._mostrar_visor(texto, objeto, tipo_consola),
@@ -248,6 +450,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			tipo_consola: Tipo de consola.
 		"""
 		import gui
+		from .interfaz.visor_consola import VisorConsola
 		visor = VisorConsola(gui.mainFrame, self, texto, objeto, tipo_consola)
 		visor.Show()
 		visor.Maximize()
@@ -286,7 +489,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 					self._mensajes.anunciar(_("Contenido de consola copiado"))
 					winsound.Beep(1200, 100)
 		
-		self._gestor_lectores.leer_consola(
+		self.gestor_lectores.leer_consola(
 			tipo_consola=tipo_consola,
 			objeto_ventana=objeto,
 			callback_exito=_copiar,
@@ -335,6 +538,157 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			plugin = PluginClicDerecho()
 			plugin.ejecutar(tipo_consola=tipo_consola, objeto=objeto)
 	
+	@script(
+		gesture=None,
+		# TRANSLATORS: Descripción para el diálogo de gestos
+		description=_("Activa o desactiva el aviso de fin de comandos largos en la consola enfocada"),
+	)
+	def script_vigilarConsola(self, gesture):
+		"""Activa o desactiva la vigilancia de la consola enfocada.
+		
+		Args:
+			gesture: El gesto asociado con este script.
+		"""
+		if not self._es_ventana_consola():
+			self._mensajes.anunciar(_("Esta no es una ventana de consola."))
+			return
+		
+		objeto = api.getForegroundObject()
+		hwnd = objeto.windowHandle
+		if self._vigilante and self._vigilante.esta_vigilada(hwnd):
+			self._vigilante.dejar_de_vigilar(hwnd)
+			self._mensajes.anunciar(_("Aviso de fin de comandos desactivado"))
+			return
+		
+		descripcion = getattr(objeto, 'name', '') or self._obtener_tipo_consola(objeto)
+		self.vigilante.vigilar(objeto, self._obtener_tipo_consola(objeto), descripcion)
+		self._mensajes.anunciar(_("Aviso de fin de comandos activado"))
+	
+	def _avisar_fin_comando(self, aviso: "AvisoFinComando"):
+		"""Anuncia un comando vigilado que ha terminado.
+		
+		Args:
+			aviso: Comando terminado y alertas de su salida.
+		"""
+		from .nucleo.marcas_tiempo import formatear_duracion
+		comando = aviso.comando or _("el comando")
+		mensaje = _("{consola}: {comando} terminó tras {duracion}").format(
+			consola=aviso.consola.descripcion,
+			comando=comando,
+			duracion=formatear_duracion(aviso.duracion)
+		)
+		if aviso.alertas:
+			mensaje += ". " + _("{cantidad} alertas, la primera: {linea}").format(
+				cantidad=len(aviso.alertas),
+				linea=aviso.alertas[0].linea.strip()
+			)
+			if any(alerta.sonido for alerta in aviso.alertas):
+				winsound.Beep(200, 100)
+		self._anunciador.anunciar(mensaje, clave=("fin_comando", aviso.consola.hwnd))
+	
+	def _avisar_fin_vigilancia(self, consola: "ConsolaVigilada"):
+		"""Anuncia que una consola vigilada ya no se puede leer.
+		
+		Args:
+			consola: Consola que ha dejado de vigilarse.
+		"""
+		self._mensajes.anunciar(_("Se dejó de vigilar {}: la consola ya no responde").format(consola.descripcion))
+	
+	@script(
+		gesture=None,
+		# TRANSLATORS: Descripción para el diálogo de gestos
+		description=_("Añade o quita la consola enfocada del monitor de alertas en segundo plano"),
+	)
+	def script_monitorizarConsola(self, gesture):
+		"""Añade o quita la consola enfocada del monitor de consolas.
+		
+		Args:
+			gesture: El gesto asociado con este script.
+		"""
+		if not self._es_ventana_consola():
+			self._mensajes.anunciar(_("Esta no es una ventana de consola."))
+			return
+		
+		objeto = api.getForegroundObject()
+		hwnd = objeto.windowHandle
+		if self._monitor and self._monitor.esta_registrada(hwnd):
+			self._monitor.retirar(hwnd)
+			self._mensajes.anunciar(_("Consola quitada del monitor. Quedan {}").format(len(self._monitor.consolas)))
+			return
+		
+		if not self._configuracion.alertas.habilitar_alertas:
+			self._mensajes.anunciar(_("El sistema de alertas está desactivado en las opciones."))
+			return
+		descripcion = getattr(objeto, 'name', '') or self._obtener_tipo_consola(objeto)
+		self.monitor.registrar(objeto, self._obtener_tipo_consola(objeto), descripcion)
+		self._mensajes.anunciar(_("Consola añadida al monitor. Consolas monitorizadas: {}").format(len(self._monitor.consolas)))
+	
+	@script(
+		gesture=None,
+		# TRANSLATORS: Descripción para el diálogo de gestos
+		description=_("Anuncia las consolas monitorizadas y el uso de CPU del monitor"),
+	)
+	def script_estadoMonitor(self, gesture):
+		"""Anuncia el estado del monitor de consolas.
+		
+		Args:
+			gesture: El gesto asociado con este script.
+		"""
+		consolas = self._monitor.consolas if self._monitor else []
+		if not consolas:
+			self._mensajes.anunciar(_("No hay consolas en el monitor."))
+			return
+		detalles = [
+			_("{consola}, {alertas} alertas").format(consola=consola.descripcion, alertas=consola.alertas)
+			for consola in consolas
+		]
+		mensaje = _("{cantidad} consolas monitorizadas, {cpu:.1f} % de CPU, {aplazados} sondeos aplazados").format(
+			cantidad=len(consolas),
+			cpu=self._monitor.uso_cpu * 100,
+			aplazados=self._monitor.sondeos_aplazados
+		)
+		self._mensajes.anunciar(". ".join([mensaje] + detalles))
+	
+	def _anunciar_alertas_monitor(self, consola: "ConsolaMonitorizada", resultado: "ResultadoAlertas"):
+		"""Anuncia las alertas encontradas por el monitor en una consola.
+		
+		Args:
+			consola: Consola en la que aparecieron.
+			resultado: Alertas del sondeo.
+		"""
+		if any(c.sonido for c in resultado.anunciables):
+			winsound.PlaySound("SystemExclamation", winsound.SND_ALIAS | winsound.SND_ASYNC)
+		mensajes = [
+			_("Alerta en {}: {}").format(consola.descripcion, c.linea.strip())
+			for c in resultado.anunciables if c.voz
+		]
+		for patron, cantidad in resultado.silenciadas.items():
+			mensajes.append(_("{} alertas más de {}").format(cantidad, patron))
+		if mensajes:
+			self._anunciador.anunciar(". ".join(mensajes))
+	
+	def _avisar_retirada_monitor(self, consola: "ConsolaMonitorizada"):
+		"""Anuncia que una consola monitorizada ya no se puede leer.
+		
+		Args:
+			consola: Consola retirada del monitor.
+		"""
+		self._mensajes.anunciar(_("{} quitada del monitor: la consola ya no responde").format(consola.descripcion))
+	
+	@script(
+		gesture=None,
+		# TRANSLATORS: Descripción para el diálogo de gestos
+		description=_("Muestra cuánto tarda el complemento en cargarse al arrancar NVDA"),
+	)
+	def script_informeArranque(self, gesture):
+		"""Muestra el informe de tiempos de arranque del complemento.
+		
+		Args:
+			gesture: El gesto asociado con este script.
+		"""
+		import ui
+		ui.browseableMessage(_perfil_arranque.informe(), _("Arranque de consoleLog"))
+	
 	@script(
 		gesture=None,
 		# TRANSLATORS: Descripción para el diálogo de gestos
@@ -355,13 +709,14 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			return
 		
 		# Obtener directorio desde explorador
-		directorio = self._gestor_lanzador.obtener_directorio_actual()
+		directorio = self.gestor_lanzador.obtener_directorio_actual()
 		
 		if not directorio:
 			self._mensajes.anunciar(_("No se encontró una selección válida."))
 			return
 		
 		import gui
+		from .interfaz.lanzador_dialogo import LanzadorDialogo
 		self._dialogo_lanzador_abierto = True
 		
 		gui.mainFrame.prePopup()
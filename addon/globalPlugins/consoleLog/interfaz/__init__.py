@@ -9,12 +9,15 @@ Módulo de interfaces gráficas.
 Contiene:
 - VisorConsola: Ventana del visor de contenido
 - LanzadorDialogo: Diálogo para seleccionar consolas
+- BusquedaHistorialDialog: Búsqueda en el historial grabado
 """
 
 from .visor_consola import VisorConsola
 from .lanzador_dialogo import LanzadorDialogo
+from .busqueda_historial import BusquedaHistorialDialog
 
 __all__ = [
 	'VisorConsola',
-	'LanzadorDialogo'
+	'LanzadorDialogo',
+	'BusquedaHistorialDialog'
 ]
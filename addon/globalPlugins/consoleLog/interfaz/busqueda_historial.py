@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Diálogo de Búsqueda en el Historial
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Diálogo de búsqueda en el historial grabado.
+
+Busca un texto en todas las sesiones indexadas y permite abrir la
+sesión elegida en el visor, situado en la línea encontrada.
+"""
+
+import time
+import wx
+import ui
+from typing import List, Optional
+
+import addonHandler
+_ = addonHandler.initTranslation()
+if not callable(_):
+	_ = lambda x: x
+
+from ..nucleo.indice_historial import IndiceHistorial, ResultadoBusqueda
+
+
+class BusquedaHistorialDialog(wx.Dialog):
+	"""Diálogo para buscar texto en todas las sesiones grabadas."""
+	
+	def __init__(self, parent, indice: IndiceHistorial, texto_inicial: str = ""):
+		"""Inicializa el diálogo.
+		
+		Args:
+			parent: Ventana padre.
+			indice: Índice del historial en el que buscar.
+			texto_inicial: Texto con el que rellenar el campo de búsqueda.
+		"""
+		# TRANSLATORS: Título del diálogo de búsqueda en el historial
+		super().__init__(parent, title=_("Buscar en el historial grabado"), style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+		self._indice = indice
+		self._resultados: List[ResultadoBusqueda] = []
+		self.resultado_elegido: Optional[ResultadoBusqueda] = None
+		
+		sizer = wx.BoxSizer(wx.VERTICAL)
+		
+		sizer_busqueda = wx.BoxSizer(wx.HORIZONTAL)
+		sizer_busqueda.Add(wx.StaticText(self, label=_("&Texto a buscar:")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self._txt_consulta = wx.TextCtrl(self, value=texto_inicial, style=wx.TE_PROCESS_ENTER)
+		sizer_busqueda.Add(self._txt_consulta, 1, wx.ALL | wx.EXPAND, 5)
+		self._boton_buscar = wx.Button(self, label=_("&Buscar"))
+		sizer_busqueda.Add(self._boton_buscar, 0, wx.ALL, 5)
+		sizer.Add(sizer_busqueda, 0, wx.EXPAND | wx.ALL, 5)
+		
+		sizer.Add(wx.StaticText(self, label=_("&Resultados:")), 0, wx.LEFT | wx.TOP, 10)
+		self._lista = wx.ListBox(self, style=wx.LB_SINGLE)
+		sizer.Add(self._lista, 1, wx.EXPAND | wx.ALL, 10)
+		
+		self._lbl_estado = wx.StaticText(self, label="")
+		sizer.Add(self._lbl_estado, 0, wx.LEFT | wx.RIGHT, 10)
+		
+		sizer_botones = wx.BoxSizer(wx.HORIZONTAL)
+		# TRANSLATORS: Botón para abrir la línea encontrada en el visor
+		self._boton_abrir = wx.Button(self, wx.ID_OK, _("&Ir a la línea"))
+		sizer_botones.Add(self._boton_abrir, 0, wx.RIGHT, 5)
+		sizer_botones.Add(wx.Button(self, wx.ID_CANCEL, _("&Cerrar")))
+		sizer.Add(sizer_botones, 0, wx.ALIGN_CENTER | wx.ALL, 10)
+		
+		self.SetSizer(sizer)
+		self.SetSize(650, 450)
+		self.Centre()
+		
+		self._boton_buscar.Bind(wx.EVT_BUTTON, self._al_buscar)
+		self._txt_consulta.Bind(wx.EVT_TEXT_ENTER, self._al_buscar)
+		self._boton_abrir.Bind(wx.EVT_BUTTON, self._al_abrir)
+		self._lista.Bind(wx.EVT_LISTBOX_DCLICK, self._al_abrir)
+		self._txt_consulta.SetFocus()
+	
+	def _al_buscar(self, evento):
+		"""Ejecuta la búsqueda y rellena la lista de resultados."""
+		consulta = self._txt_consulta.GetValue()
+		if not consulta.strip():
+			return
+		inicio = time.perf_counter()
+		self._resultados = self._indice.buscar(consulta)
+		milisegundos = (time.perf_counter() - inicio) * 1000
+		
+		self._lista.Clear()
+		for resultado in self._resultados:
+			fecha = time.strftime("%d/%m/%Y %H:%M:%S", time.localtime(resultado.marca_tiempo))
+			self._lista.Append(_("{texto} — {consola}, línea {linea}, {fecha}").format(
+				texto=resultado.texto.strip(),
+				consola=resultado.descripcion or resultado.tipo_consola,
+				linea=resultado.numero_linea,
+				fecha=fecha
+			))
+		
+		estado = _("{} resultados en {:.0f} ms").format(len(self._resultados), milisegundos)
+		self._lbl_estado.SetLabel(estado)
+		ui.message(estado)
+		if self._resultados:
+			self._lista.SetSelection(0)
+			self._lista.SetFocus()
+	
+	def _al_abrir(self, evento):
+		"""Cierra el diálogo devolviendo el resultado seleccionado."""
+		indice = self._lista.GetSelection()
+		if indice == wx.NOT_FOUND:
+			return
+		self.resultado_elegido = self._resultados[indice]
+		self.EndModal(wx.ID_OK)
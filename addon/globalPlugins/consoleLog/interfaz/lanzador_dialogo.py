@@ -13,6 +13,10 @@ tipos de consolas en el directorio actual.
 import wx
 from typing import List, Optional
 from logHandler import log
+import ui
+
+from ..lanzador.gestor_lanzador import TIPOS_CON_CAPTURA
+from ..nucleo import ingesta
 
 import addonHandler
 _ = addonHandler.initTranslation()
@@ -34,7 +38,7 @@ class OpcionConsola:
 		
 		Args:
 			nombre: Nombre a mostrar al usuario.
-			tipo: Tipo de consola (cmd, powershell, wt, git-bash, vs-32, vs-64).
+			tipo: Tipo de consola (cmd, powershell, wt, git-bash, vs-<versión>-<edición>-<arquitectura>...).
 			como_admin: Si debe abrirse como administrador.
 			script_vs: Ruta al script de Visual Studio (si aplica).
 		"""
@@ -42,7 +46,12 @@ class OpcionConsola:
 		self.tipo = tipo
 		self.como_admin = como_admin
 		self.script_vs = script_vs
-
+	
+	@property
+	def clave(self) -> str:
+		"""Identifica la opción aunque cambie su posición en la lista."""
+		return f"{self.tipo}:admin" if self.como_admin else self.tipo
+	
 
 class LanzadorDialogo(wx.Dialog):
 	"""Diálogo del lanzador de consolas.
@@ -68,16 +77,29 @@ class LanzadorDialogo(wx.Dialog):
 		
 		self._plugin = plugin
 		self._directorio = directorio
-		self._gestor_lanzador = plugin._gestor_lanzador
+		self._gestor_lanzador = plugin.gestor_lanzador
 		self._opciones: List[OpcionConsola] = []
+		# Si hay que anunciar el fin de la detección aunque no aparezcan opciones nuevas
+		self._avisar_fin_deteccion = False
+		# Opción recordada que aún no ha aparecido en la lista
+		self._seleccion_pendiente: Optional[str] = None
 		
+		# Se registra antes de leer la lista: si la detección termina entre
+		# medias, el aviso llega igualmente y completa la lista
+		self._gestor_lanzador.agregar_oyente(self._al_detectar)
 		self._crear_opciones()
 		self._crear_interfaz()
 		self._configurar_eventos()
 	
-	def _crear_opciones(self):
-		"""Crea la lista de opciones disponibles."""
-		consolas = self._gestor_lanzador.obtener_consolas_disponibles()
+	def _crear_opciones(self, consolas=None):
+		"""Crea la lista de opciones disponibles.
+		
+		Args:
+			consolas: Consolas disponibles; por defecto, las detectadas hasta ahora.
+		"""
+		if consolas is None:
+			consolas = self._gestor_lanzador.obtener_consolas_disponibles()
+		self._opciones = []
 		
 		for consola in consolas:
 			if consola.identificador == 'cmd':
@@ -136,34 +158,19 @@ class LanzadorDialogo(wx.Dialog):
 					como_admin=True
 				))
 			
-			elif consola.identificador == 'vs-32':
-				# TRANSLATORS: Opción de Visual Studio 32-bit
-				self._opciones.append(OpcionConsola(
-					_("Abrir Visual Studio Developer (32-bit)"),
-					'vs-32',
-					como_admin=False,
-					script_vs=consola.ruta
-				))
-				# TRANSLATORS: Opción de Visual Studio 32-bit como admin
-				self._opciones.append(OpcionConsola(
-					_("Abrir Visual Studio Developer (32-bit) como Administrador"),
-					'vs-32',
-					como_admin=True,
-					script_vs=consola.ruta
-				))
-			
-			elif consola.identificador == 'vs-64':
-				# TRANSLATORS: Opción de Visual Studio 64-bit
+			elif consola.identificador.startswith('vs-'):
+				# Una entrada por instalación y arquitectura de Visual Studio
+				# TRANSLATORS: Opción de una consola de desarrollador de Visual Studio
 				self._opciones.append(OpcionConsola(
-					_("Abrir Visual Studio Developer (64-bit)"),
-					'vs-64',
+					_("Abrir {}").format(consola.nombre),
+					consola.identificador,
 					como_admin=False,
 					script_vs=consola.ruta
 				))
-				# TRANSLATORS: Opción de Visual Studio 64-bit como admin
+				# TRANSLATORS: Opción de una consola de desarrollador de Visual Studio como admin
 				self._opciones.append(OpcionConsola(
-					_("Abrir Visual Studio Developer (64-bit) como Administrador"),
-					'vs-64',
+					_("Abrir {} como Administrador").format(consola.nombre),
+					consola.identificador,
 					como_admin=True,
 					script_vs=consola.ruta
 				))
@@ -209,6 +216,13 @@ class LanzadorDialogo(wx.Dialog):
 		etiqueta_lista = wx.StaticText(self, label=_("Seleccione una consola:"))
 		sizer.Add(etiqueta_lista, flag=wx.LEFT | wx.RIGHT | wx.TOP, border=10)
 		
+		# TRANSLATORS: Estado mientras se detectan las consolas instaladas
+		self._estado = wx.StaticText(
+			self,
+			label="" if self._gestor_lanzador.deteccion_completa else _("Detectando más consolas...")
+		)
+		sizer.Add(self._estado, flag=wx.LEFT | wx.RIGHT, border=10)
+		
 		nombres_opciones = [opcion.nombre for opcion in self._opciones]
 		
 		self._lista = wx.ListBox(
@@ -221,14 +235,23 @@ class LanzadorDialogo(wx.Dialog):
 			# Aplicar selección guardada si está habilitado
 			config_lanzador = self._plugin._configuracion.lanzador
 			seleccion = 0
-			if config_lanzador.recordar_ultima_opcion:
-				seleccion = config_lanzador.ultima_opcion
-				if seleccion >= len(self._opciones):
-					seleccion = 0
+			if config_lanzador.recordar_ultima_opcion and config_lanzador.ultima_consola:
+				indice = self._indice_opcion(config_lanzador.ultima_consola)
+				if indice is None:
+					# Puede aparecer cuando termine la detección
+					self._seleccion_pendiente = config_lanzador.ultima_consola
+				else:
+					seleccion = indice
 			self._lista.SetSelection(seleccion)
 		
 		sizer.Add(self._lista, proportion=1, flag=wx.EXPAND | wx.ALL, border=10)
 		
+		# TRANSLATORS: Casilla para guardar la salida de la consola en un archivo que puede abrir el visor
+		self._chk_captura = wx.CheckBox(self, label=_("&Guardar la salida para el visor (PowerShell y WSL)"))
+		self._chk_captura.SetValue(self._plugin._configuracion.lanzador.capturar_salida)
+		sizer.Add(self._chk_captura, flag=wx.LEFT | wx.RIGHT | wx.BOTTOM, border=10)
+		self._actualizar_captura()
+		
 		# Panel de botones
 		sizer_botones = wx.BoxSizer(wx.HORIZONTAL)
 		
@@ -237,6 +260,10 @@ class LanzadorDialogo(wx.Dialog):
 		self._boton_abrir.SetDefault()
 		sizer_botones.Add(self._boton_abrir, flag=wx.RIGHT, border=5)
 		
+		# TRANSLATORS: Botón para repetir la detección de consolas instaladas
+		self._boton_detectar = wx.Button(self, label=_("&Volver a detectar"))
+		sizer_botones.Add(self._boton_detectar, flag=wx.RIGHT, border=5)
+		
 		# TRANSLATORS: Botón para cancelar
 		self._boton_cancelar = wx.Button(self, wx.ID_CANCEL, _("&Cancelar"))
 		sizer_botones.Add(self._boton_cancelar)
@@ -253,8 +280,99 @@ class LanzadorDialogo(wx.Dialog):
 		"""Configura los manejadores de eventos."""
 		self.Bind(wx.EVT_BUTTON, self._al_abrir, self._boton_abrir)
 		self.Bind(wx.EVT_BUTTON, self._al_cancelar, self._boton_cancelar)
+		self.Bind(wx.EVT_BUTTON, self._al_volver_a_detectar, self._boton_detectar)
 		self._lista.Bind(wx.EVT_LISTBOX_DCLICK, self._al_abrir)
+		self._lista.Bind(wx.EVT_LISTBOX, self._al_seleccionar)
 		self.Bind(wx.EVT_CHAR_HOOK, self._al_tecla)
+		self.Bind(wx.EVT_WINDOW_DESTROY, self._al_destruir)
+	
+	def _indice_opcion(self, clave: str) -> Optional[int]:
+		"""Posición en la lista de la opción con una clave, o None si no está."""
+		for i, opcion in enumerate(self._opciones):
+			if opcion.clave == clave:
+				return i
+		return None
+	
+	def _al_seleccionar(self, evento):
+		"""Actualiza la casilla de captura al cambiar de opción.
+		
+		Args:
+			evento: Evento de la lista.
+		"""
+		# El usuario ya ha elegido: no se salta a la opción recordada
+		self._seleccion_pendiente = None
+		self._actualizar_captura()
+	
+	def _actualizar_captura(self):
+		"""Habilita la casilla de captura solo para las consolas que la admiten."""
+		indice = self._lista.GetSelection()
+		admite = indice != wx.NOT_FOUND and self._opciones[indice].tipo in TIPOS_CON_CAPTURA
+		self._chk_captura.Enable(admite)
+	
+	def _al_volver_a_detectar(self, evento):
+		"""Repite la detección de consolas sin usar la caché.
+		
+		Args:
+			evento: Evento de botón.
+		"""
+		if not self._gestor_lanzador.deteccion_completa:
+			ui.message(_("Ya se están detectando las consolas"))
+			return
+		self._avisar_fin_deteccion = True
+		# Sin duplicarlo si sigue registrado desde que se abrió el diálogo
+		self._gestor_lanzador.quitar_oyente(self._al_detectar)
+		self._gestor_lanzador.agregar_oyente(self._al_detectar)
+		self._gestor_lanzador.volver_a_detectar()
+		self._estado.SetLabel(_("Detectando más consolas..."))
+		ui.message(_("Detectando consolas"))
+	
+	def _al_destruir(self, evento):
+		"""Deja de recibir resultados de la detección al cerrar el diálogo.
+		
+		Args:
+			evento: Evento de destrucción.
+		"""
+		if evento.GetEventObject() is self:
+			self._gestor_lanzador.quitar_oyente(self._al_detectar)
+		evento.Skip()
+	
+	def _al_detectar(self, consolas, completa: bool):
+		"""Actualiza la lista con los resultados de la detección en curso.
+		
+		Args:
+			consolas: Consolas disponibles detectadas hasta ahora.
+			completa: Si la detección ha terminado.
+		"""
+		if not self:
+			# El diálogo ya se ha destruido
+			return
+		anteriores = len(self._opciones)
+		indice = self._lista.GetSelection()
+		seleccionada = self._opciones[indice] if indice != wx.NOT_FOUND else None
+		
+		self._crear_opciones(consolas)
+		self._lista.Set([opcion.nombre for opcion in self._opciones])
+		
+		# Conservar la opción en la que estaba el usuario, o la recordada si acaba de aparecer
+		nueva = None
+		if self._seleccion_pendiente is not None:
+			nueva = self._indice_opcion(self._seleccion_pendiente)
+			if nueva is not None:
+				self._seleccion_pendiente = None
+		if nueva is None and seleccionada is not None:
+			nueva = self._indice_opcion(seleccionada.clave)
+		if nueva is None:
+			nueva = 0
+		if self._opciones:
+			self._lista.SetSelection(nueva)
+		self._actualizar_captura()
+		
+		if completa:
+			self._gestor_lanzador.quitar_oyente(self._al_detectar)
+			self._estado.SetLabel("")
+			if len(self._opciones) > anteriores or self._avisar_fin_deteccion:
+				self._avisar_fin_deteccion = False
+				ui.message(_("Detección terminada: {} opciones").format(len(self._opciones)))
 	
 	def _al_tecla(self, evento):
 		"""Maneja eventos de teclado.
@@ -298,16 +416,26 @@ class LanzadorDialogo(wx.Dialog):
 		
 		# Guardar selección si está habilitado
 		config_gestor = self._plugin._configuracion
-		if config_gestor.lanzador.recordar_ultima_opcion:
-			config_gestor.lanzador.ultima_opcion = indice
+		capturar = self._chk_captura.GetValue()
+		if config_gestor.lanzador.recordar_ultima_opcion or capturar != config_gestor.lanzador.capturar_salida:
+			if config_gestor.lanzador.recordar_ultima_opcion:
+				config_gestor.lanzador.ultima_consola = opcion.clave
+			config_gestor.lanzador.capturar_salida = capturar
 			config_gestor.guardar_configuracion()
 		
 		try:
+			ruta_captura = None
+			if capturar and opcion.tipo in TIPOS_CON_CAPTURA:
+				directorio_capturas = config_gestor.obtener_directorio_datos("capturas")
+				# Deja sitio para la nueva dentro del máximo
+				ingesta.limpiar_capturas(directorio_capturas, config_gestor.grabacion.max_capturas - 1)
+				ruta_captura = ingesta.nueva_ruta_captura(directorio_capturas, opcion.tipo)
 			self._gestor_lanzador.abrir_consola(
 				tipo=opcion.tipo,
 				directorio=self._directorio,
 				como_admin=opcion.como_admin,
-				ruta_script=opcion.script_vs
+				ruta_script=opcion.script_vs,
+				ruta_captura=ruta_captura
 			)
 			log.debug(f"consoleLog: Abriendo {opcion.tipo} en {self._directorio}")
 		except Exception as e:
@@ -6,6 +6,8 @@
 import wx
 import winsound
 import os
+import threading
+import time
 from typing import Optional, List, Dict, Any
 from logHandler import log
 import api
@@ -18,12 +20,26 @@ _ = addonHandler.initTranslation()
 if not callable(_):
 	_ = lambda x: x
 
+from ..nucleo.planificador import PlanificadorAdaptativo
+from ..nucleo.captura import Captura
+from ..nucleo.diferencias import SeguidorCapturas
+from ..nucleo.motor_alertas import MotorAlertas
+from ..nucleo.marcas_tiempo import MarcasTiempo, formatear_duracion
+from ..nucleo.segmentador import SegmentadorComandos
+from ..nucleo import grabador_sesion, ingesta
+from ..nucleo.grabador_sesion import GrabadorSesion
+from ..nucleo.archivo_registro import ArchivoRegistro
+from ..utilidades import exportador
+from .busqueda_historial import BusquedaHistorialDialog
+
 class AjustesDialog(wx.Dialog):
 	"""Diálogo avanzado para configurar todas las opciones del complemento."""
-	def __init__(self, parent, config, gestor_plugins):
+	def __init__(self, parent, config, gestor_plugins, consolas_precalentables=None):
 		super().__init__(parent, title=_("Opciones de Visor de consola"), size=(500, 450))
 		self.config = config
 		self.gestor_plugins = gestor_plugins
+		# Pares (identificador, nombre) de las consolas que admiten precalentarse
+		self.consolas_precalentables = list(consolas_precalentables or [])
 		
 		sizer_principal = wx.BoxSizer(wx.VERTICAL)
 		notebook = wx.Notebook(self)
@@ -54,10 +70,32 @@ class AjustesDialog(wx.Dialog):
 		self.chk_sonidos_act.SetValue(self.config.visor.sonidos_al_actualizar)
 		s_visual.Add(self.chk_sonidos_act, 0, wx.ALL, 10)
 		
+		self.chk_grabar = wx.CheckBox(p_visual, label=_("Grabar en disco el historial durante el seguimiento automático"))
+		self.chk_grabar.SetValue(self.config.grabacion.habilitar_grabacion)
+		s_visual.Add(self.chk_grabar, 0, wx.ALL, 10)
+		
+		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		i_sizer.Add(wx.StaticText(p_visual, label=_("Seguimiento: intervalo mínimo (segundos):")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_intervalo_min = wx.SpinCtrlDouble(p_visual, min=0.2, max=60, inc=0.1, initial=self.config.visor.intervalo_seguimiento_minimo)
+		i_sizer.Add(self.spn_intervalo_min, 1, wx.ALL | wx.EXPAND, 5)
+		s_visual.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
+		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		i_sizer.Add(wx.StaticText(p_visual, label=_("Seguimiento: intervalo máximo en reposo (segundos):")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_intervalo_max = wx.SpinCtrlDouble(p_visual, min=0.2, max=300, inc=0.5, initial=self.config.visor.intervalo_seguimiento_maximo)
+		i_sizer.Add(self.spn_intervalo_max, 1, wx.ALL | wx.EXPAND, 5)
+		s_visual.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
+		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		i_sizer.Add(wx.StaticText(p_visual, label=_("Seguimiento: factor de espera sin cambios:")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_factor = wx.SpinCtrlDouble(p_visual, min=1.0, max=4.0, inc=0.1, initial=self.config.visor.factor_espera_seguimiento)
+		i_sizer.Add(self.spn_factor, 1, wx.ALL | wx.EXPAND, 5)
+		s_visual.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
 		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
-		i_sizer.Add(wx.StaticText(p_visual, label=_("Seguimiento cada (segundos):")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
-		self.spn_intervalo = wx.SpinCtrl(p_visual, value=str(self.config.visor.intervalo_seguimiento), min=1, max=60)
-		i_sizer.Add(self.spn_intervalo, 1, wx.ALL | wx.EXPAND, 5)
+		i_sizer.Add(wx.StaticText(p_visual, label=_("Líneas que se muestran al abrir un archivo de registro:")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_lineas_archivo = wx.SpinCtrl(p_visual, min=1000, max=1000000, initial=self.config.visor.max_lineas_archivo)
+		i_sizer.Add(self.spn_lineas_archivo, 1, wx.ALL | wx.EXPAND, 5)
 		s_visual.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
 
 		self.chk_cat = wx.CheckBox(p_visual, label=_("Categorizar plugins en submenús"))
@@ -79,6 +117,34 @@ class AjustesDialog(wx.Dialog):
 		self.chk_lanz_todas.SetValue(self.config.lanzador.mostrar_consolas_no_disponibles)
 		s_lanzador.Add(self.chk_lanz_todas, 0, wx.ALL, 10)
 		
+		self.chk_pool = wx.CheckBox(p_lanzador, label=_("Mantener consolas precalentadas para abrirlas al instante"))
+		self.chk_pool.SetValue(self.config.lanzador.pool_habilitado)
+		s_lanzador.Add(self.chk_pool, 0, wx.ALL, 10)
+		
+		# Las elegidas que no se han detectado se conservan al final de la lista
+		identificadores = [i for i, unused_ in self.consolas_precalentables]
+		for tipo in self.config.lanzador.pool_tipos:
+			if tipo not in identificadores:
+				self.consolas_precalentables.append((tipo, tipo))
+		s_lanzador.Add(wx.StaticText(p_lanzador, label=_("Consolas precalentadas:")), 0, wx.LEFT | wx.TOP, 10)
+		self.lst_pool = CustomCheckListBox(p_lanzador, choices=[n for unused_, n in self.consolas_precalentables])
+		for i, (tipo, unused_) in enumerate(self.consolas_precalentables):
+			if tipo in self.config.lanzador.pool_tipos:
+				self.lst_pool.Check(i)
+		s_lanzador.Add(self.lst_pool, 1, wx.EXPAND | wx.ALL, 5)
+		
+		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		i_sizer.Add(wx.StaticText(p_lanzador, label=_("Número máximo de consolas precalentadas:")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_pool_procesos = wx.SpinCtrl(p_lanzador, min=1, max=8, initial=self.config.lanzador.pool_max_procesos)
+		i_sizer.Add(self.spn_pool_procesos, 1, wx.ALL | wx.EXPAND, 5)
+		s_lanzador.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
+		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		i_sizer.Add(wx.StaticText(p_lanzador, label=_("Memoria máxima de las consolas precalentadas (MB):")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_pool_memoria = wx.SpinCtrl(p_lanzador, min=32, max=4096, initial=self.config.lanzador.pool_max_memoria_mb)
+		i_sizer.Add(self.spn_pool_memoria, 1, wx.ALL | wx.EXPAND, 5)
+		s_lanzador.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
 		p_lanzador.SetSizer(s_lanzador)
 		notebook.AddPage(p_lanzador, _("Lanzador"))
 		
@@ -89,12 +155,22 @@ class AjustesDialog(wx.Dialog):
 		
 		# Usar el widget compatible con NVDA
 		self.lst_plugins = CustomCheckListBox(p_plugins, choices=self.gestor_plugins.listar_plugins_disponibles())
-		plugins_cargados = self.gestor_plugins.listar_plugins_cargados()
+		plugins_cargados = self.gestor_plugins.listar_plugins_habilitados()
 		for i, nombre in enumerate(self.gestor_plugins.listar_plugins_disponibles()):
 			if nombre in plugins_cargados:
 				self.lst_plugins.Check(i)
 		
 		s_plugins.Add(self.lst_plugins, 1, wx.EXPAND | wx.ALL, 5)
+		
+		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		i_sizer.Add(wx.StaticText(p_plugins, label=_("Avisar en el registro si un plugin bloquea la interfaz más de (ms):")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_presupuesto_plugins = wx.SpinCtrlDouble(p_plugins, min=10, max=10000, inc=10, initial=self.config.plugins.presupuesto_hilo_principal_ms)
+		i_sizer.Add(self.spn_presupuesto_plugins, 1, wx.ALL | wx.EXPAND, 5)
+		s_plugins.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
+		self.chk_memoria_plugins = wx.CheckBox(p_plugins, label=_("Medir la memoria que usa cada plugin (ralentiza NVDA)"))
+		self.chk_memoria_plugins.SetValue(self.config.plugins.medir_memoria_plugins)
+		s_plugins.Add(self.chk_memoria_plugins, 0, wx.ALL, 10)
 		p_plugins.SetSizer(s_plugins)
 		notebook.AddPage(p_plugins, _("Plugins"))
 
@@ -114,6 +190,30 @@ class AjustesDialog(wx.Dialog):
 		s_alertas.Add(self.txt_patrones, 1, wx.EXPAND | wx.ALL, 10)
 		s_alertas.Add(wx.StaticText(p_alertas, label=_("Nota: Se avisará por voz y sonido al detectar estas palabras.")), 0, wx.LEFT | wx.BOTTOM, 10)
 		
+		i_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		i_sizer.Add(wx.StaticText(p_alertas, label=_("Segundos mínimos entre avisos del mismo patrón:")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_intervalo_alerta = wx.SpinCtrlDouble(p_alertas, min=0, max=600, inc=1, initial=self.config.alertas.intervalo_minimo_alerta)
+		i_sizer.Add(self.spn_intervalo_alerta, 1, wx.ALL | wx.EXPAND, 5)
+		s_alertas.Add(i_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
+		d_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		d_sizer.Add(wx.StaticText(p_alertas, label=_("Avisar del fin de comandos que duren al menos (segundos):")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_duracion_aviso = wx.SpinCtrlDouble(p_alertas, min=0, max=86400, inc=5, initial=self.config.alertas.duracion_minima_aviso)
+		d_sizer.Add(self.spn_duracion_aviso, 1, wx.ALL | wx.EXPAND, 5)
+		s_alertas.Add(d_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
+		g_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		g_sizer.Add(wx.StaticText(p_alertas, label=_("Segundos para agrupar los anuncios que llegan seguidos:")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_ventana_anuncios = wx.SpinCtrlDouble(p_alertas, min=0, max=10, inc=0.1, initial=self.config.anuncios.ventana_agrupacion)
+		g_sizer.Add(self.spn_ventana_anuncios, 1, wx.ALL | wx.EXPAND, 5)
+		s_alertas.Add(g_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
+		m_sizer = wx.BoxSizer(wx.HORIZONTAL)
+		m_sizer.Add(wx.StaticText(p_alertas, label=_("Segundos mínimos entre dos anuncios:")), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 5)
+		self.spn_intervalo_anuncios = wx.SpinCtrlDouble(p_alertas, min=0, max=30, inc=0.5, initial=self.config.anuncios.intervalo_minimo)
+		m_sizer.Add(self.spn_intervalo_anuncios, 1, wx.ALL | wx.EXPAND, 5)
+		s_alertas.Add(m_sizer, 0, wx.EXPAND | wx.ALL, 5)
+		
 		p_alertas.SetSizer(s_alertas)
 		notebook.AddPage(p_alertas, _("Alertas"))
 		
@@ -141,16 +241,36 @@ class AjustesDialog(wx.Dialog):
 				"sonidos_seguimiento": self.chk_sonidos.GetValue(),
 				"sonidos_al_actualizar": self.chk_sonidos_act.GetValue(),
 				"categorizar_plugins": self.chk_cat.GetValue(),
-				"intervalo_seguimiento": self.spn_intervalo.GetValue()
+				"intervalo_seguimiento_minimo": self.spn_intervalo_min.GetValue(),
+				"intervalo_seguimiento_maximo": max(self.spn_intervalo_min.GetValue(), self.spn_intervalo_max.GetValue()),
+				"factor_espera_seguimiento": self.spn_factor.GetValue(),
+				"max_lineas_archivo": self.spn_lineas_archivo.GetValue()
 			},
 			"lanzador": {
 				"recordar_ultima_opcion": self.chk_lanz_rec.GetValue(),
-				"mostrar_consolas_no_disponibles": self.chk_lanz_todas.GetValue()
+				"mostrar_consolas_no_disponibles": self.chk_lanz_todas.GetValue(),
+				"pool_habilitado": self.chk_pool.GetValue(),
+				"pool_tipos": [self.consolas_precalentables[i][0] for i in self.lst_pool.GetCheckedItems()],
+				"pool_max_procesos": self.spn_pool_procesos.GetValue(),
+				"pool_max_memoria_mb": self.spn_pool_memoria.GetValue()
 			},
 			"plugins": plugins_seleccionados,
+			"perfilador": {
+				"presupuesto_hilo_principal_ms": self.spn_presupuesto_plugins.GetValue(),
+				"medir_memoria_plugins": self.chk_memoria_plugins.GetValue()
+			},
+			"grabacion": {
+				"habilitar_grabacion": self.chk_grabar.GetValue()
+			},
+			"anuncios": {
+				"ventana_agrupacion": self.spn_ventana_anuncios.GetValue(),
+				"intervalo_minimo": self.spn_intervalo_anuncios.GetValue()
+			},
 			"alertas": {
 				"habilitar_alertas": self.chk_alerta_en.GetValue(),
-				"patrones": [{"patron": p.strip(), "voz": True, "sonido": True} for p in self.txt_patrones.GetValue().splitlines() if p.strip()]
+				"patrones": [{"patron": p.strip(), "voz": True, "sonido": True} for p in self.txt_patrones.GetValue().splitlines() if p.strip()],
+				"intervalo_minimo_alerta": self.spn_intervalo_alerta.GetValue(),
+				"duracion_minima_aviso": self.spn_duracion_aviso.GetValue()
 			}
 		}
 
@@ -177,6 +297,77 @@ class AyudaAtajosDialog(wx.Dialog):
 		wx.CallAfter(self.txt.SetFocus)
 		self.txt.SetInsertionPoint(0)
 
+class InformePluginsDialog(wx.Dialog):
+	"""Diálogo con el tiempo y la memoria de las llamadas a los plugins."""
+	def __init__(self, parent, gestor_plugins):
+		super().__init__(parent, title=_("Rendimiento de los plugins"), size=(750, 450))
+		self._gestor_plugins = gestor_plugins
+		self._perfilador = gestor_plugins.perfilador
+		sizer = wx.BoxSizer(wx.VERTICAL)
+		
+		self.lbl_resumen = wx.StaticText(self)
+		sizer.Add(self.lbl_resumen, 0, wx.ALL, 10)
+		
+		self.lst = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+		columnas = [
+			(_("Plugin"), 180), (_("Fase"), 90), (_("Llamadas"), 70), (_("Media (ms)"), 80),
+			(_("p95 (ms)"), 80), (_("Máximo (ms)"), 80), (_("Memoria pico (KB)"), 110), (_("Bloqueos"), 70)
+		]
+		for indice, (titulo, ancho) in enumerate(columnas):
+			self.lst.InsertColumn(indice, titulo, width=ancho)
+		sizer.Add(self.lst, 1, wx.EXPAND | wx.ALL, 10)
+		
+		botones = wx.BoxSizer(wx.HORIZONTAL)
+		btn_copiar = wx.Button(self, label=_("&Copiar informe"))
+		btn_copiar.Bind(wx.EVT_BUTTON, self._al_copiar)
+		botones.Add(btn_copiar, 0, wx.ALL, 5)
+		btn_reiniciar = wx.Button(self, label=_("&Reiniciar estadísticas"))
+		btn_reiniciar.Bind(wx.EVT_BUTTON, self._al_reiniciar)
+		botones.Add(btn_reiniciar, 0, wx.ALL, 5)
+		botones.Add(wx.Button(self, wx.ID_CLOSE, label=_("Cerrar")), 0, wx.ALL, 5)
+		sizer.Add(botones, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+		self.Bind(wx.EVT_BUTTON, lambda evento: self.EndModal(wx.ID_CLOSE), id=wx.ID_CLOSE)
+		self.SetEscapeId(wx.ID_CLOSE)
+		
+		self.SetSizer(sizer)
+		self.Centre()
+		self._rellenar()
+		wx.CallAfter(self.lst.SetFocus)
+	
+	def _rellenar(self):
+		"""Muestra las estadísticas actuales, de los plugins más lentos a los más rápidos."""
+		self.lst.DeleteAllItems()
+		fases = {"inicializar": _("Inicio"), "ejecutar": _("Ejecución")}
+		for estadisticas in self._perfilador.estadisticas():
+			meta = self._gestor_plugins.obtener_metadatos(estadisticas.nombre)
+			fila = self.lst.InsertItem(self.lst.GetItemCount(), meta.nombre if meta else estadisticas.nombre)
+			memoria = f"{estadisticas.memoria_pico / 1024:.1f}" if estadisticas.memoria_pico is not None else "-"
+			valores = [
+				fases.get(estadisticas.fase, estadisticas.fase), str(estadisticas.ejecuciones),
+				f"{estadisticas.media_ms:.1f}", f"{estadisticas.p95_ms:.1f}", f"{estadisticas.maximo_ms:.1f}",
+				memoria, str(estadisticas.excesos)
+			]
+			for columna, valor in enumerate(valores, start=1):
+				self.lst.SetItem(fila, columna, valor)
+		if self.lst.GetItemCount():
+			self.lst.Select(0)
+			self.lst.Focus(0)
+		resumen = _("Presupuesto en el hilo de la interfaz: {:.0f} ms.").format(self._perfilador.presupuesto_ms)
+		if not self._perfilador.mide_memoria:
+			resumen += " " + _("La memoria no se mide; actívelo en las opciones del visor.")
+		if not self.lst.GetItemCount():
+			resumen += " " + _("Aún no se ha ejecutado ningún plugin.")
+		self.lbl_resumen.SetLabel(resumen)
+	
+	def _al_copiar(self, evento):
+		if api.copyToClip(self._perfilador.informe()):
+			ui.message(_("Informe copiado"))
+	
+	def _al_reiniciar(self, evento):
+		self._perfilador.reiniciar()
+		self._rellenar()
+		ui.message(_("Estadísticas reiniciadas"))
+
 class VisorConsola(wx.Frame):
 	"""Visor de consola avanzado con estética premium y soporte nativo para menús."""
 	
@@ -187,21 +378,56 @@ class VisorConsola(wx.Frame):
 		self._plugin = plugin
 		self._plugin.dialogo_visor_abierto = True
 		self._contenido = contenido
+		# Índice de líneas del contenido, compartido con el seguidor y los plugins
+		self._captura = Captura(contenido)
 		self._objeto_consola = objeto_consola
 		self._tipo_consola = tipo_consola
 		self._ultima_busqueda = ""
 		self._refrescando_automaticamente = False
-		self._ultima_linea_procesada = 0
+		# Líneas nuevas entre capturas y alertas sobre ellas
+		self._seguidor = SeguidorCapturas()
+		self._seguidor.reiniciar(self._captura)
+		# Hora a la que apareció cada línea (las iniciales se desconocen)
+		self._marcas = MarcasTiempo()
+		self._marcas.reiniciar(len(self._captura))
+		# Índice de comandos: se crea la primera vez que se navega por ellos
+		self._segmentador: Optional[SegmentadorComandos] = None
+		config_alertas = self._plugin._configuracion.alertas
+		self._motor_alertas = MotorAlertas(config_alertas.patrones, config_alertas.intervalo_minimo_alerta)
+		self._tarea_plugin = None
+		self._dialogo_progreso = None
+		self._titulo_plugin = ""
+		self._inicio_plugin = 0.0
+		self._tarea_guardado = None
+		# Grabación en disco y modo historial (el control muestra lo grabado
+		# y las capturas nuevas se añaden al final)
+		self._ultima_captura = contenido
+		self._grabador = None
+		self._modo_historial = False
+		self._cargando_historial = False
+		# Salida capturada por el lanzador: el seguimiento lee el final del archivo
+		self._seguidor_archivo = None
 		
 		# Estructura de la interfaz (sin paneles intermedios para no bloquear Alt)
 		self._crear_interfaz()
 		self._crear_menu()
 		self._configurar_eventos()
 		
-		# Temporizador para modo seguimiento
+		# Temporizador para modo seguimiento (de un solo disparo, se reprograma
+		# tras cada captura según la actividad de la consola)
 		self._timer_seguimiento = wx.Timer(self)
+		config_visor = self._plugin._configuracion.visor
+		self._planificador = PlanificadorAdaptativo(
+			config_visor.intervalo_seguimiento_minimo,
+			config_visor.intervalo_seguimiento_maximo,
+			config_visor.factor_espera_seguimiento
+		)
 		self.Bind(wx.EVT_TIMER, self._al_refrescar, self._timer_seguimiento)
 		
+		# Temporizador para el progreso de los plugins en segundo plano
+		self._timer_plugin = wx.Timer(self)
+		self.Bind(wx.EVT_TIMER, self._al_progreso_plugin, self._timer_plugin)
+		
 		# Cargar contenido y foco inicial
 		self._texto_ctrl.SetValue(self._contenido)
 		self._texto_ctrl.SetInsertionPoint(0)
@@ -242,8 +468,15 @@ class VisorConsola(wx.Frame):
 		
 		# Menú Archivo
 		menu_archivo = wx.Menu()
+		item_abrir_registro = menu_archivo.Append(wx.ID_ANY, _("&Abrir archivo de registro...\tCtrl+O"))
+		self.Bind(wx.EVT_MENU, self._al_abrir_archivo_registro, item_abrir_registro)
+		menu_archivo.AppendSeparator()
 		item_guardar = menu_archivo.Append(wx.ID_SAVEAS, _("&Guardar como...\tCtrl+S"))
 		self.Bind(wx.EVT_MENU, self._al_guardar, item_guardar)
+		item_guardar_sel = menu_archivo.Append(wx.ID_ANY, _("Guardar &líneas seleccionadas...\tCtrl+Shift+S"))
+		self.Bind(wx.EVT_MENU, self._al_guardar_seleccion, item_guardar_sel)
+		item_guardar_filtro = menu_archivo.Append(wx.ID_ANY, _("Guardar líneas &filtradas...\tCtrl+Alt+S"))
+		self.Bind(wx.EVT_MENU, self._al_guardar_filtradas, item_guardar_filtro)
 		menu_archivo.AppendSeparator()
 		item_opciones = menu_archivo.Append(wx.ID_ANY, _("&Opciones...\tCtrl+P"))
 		self.Bind(wx.EVT_MENU, self._al_abrir_opciones, item_opciones)
@@ -261,6 +494,8 @@ class VisorConsola(wx.Frame):
 		menu_edicion.AppendSeparator()
 		item_buscar = menu_edicion.Append(wx.ID_FIND, _("&Buscar...\tCtrl+F"))
 		self.Bind(wx.EVT_MENU, self._al_buscar, item_buscar)
+		item_buscar_historial = menu_edicion.Append(wx.ID_ANY, _("Buscar en el &historial grabado...\tCtrl+Alt+F"))
+		self.Bind(wx.EVT_MENU, self._al_buscar_historial, item_buscar_historial)
 		barra_menu.Append(menu_edicion, _("&Edición"))
 		
 		# Menú Ver
@@ -275,6 +510,29 @@ class VisorConsola(wx.Frame):
 		menu_ver.AppendSeparator()
 		self.item_seguimiento = menu_ver.AppendCheckItem(wx.ID_ANY, _("&Seguimiento automático\tCtrl+Shift+F"))
 		self.Bind(wx.EVT_MENU, self._al_conmutar_seguimiento, self.item_seguimiento)
+		self.item_leer_nuevas = menu_ver.AppendCheckItem(wx.ID_ANY, _("&Leer las líneas nuevas durante el seguimiento\tCtrl+Shift+L"))
+		self.item_leer_nuevas.Check(self._plugin._configuracion.anuncios.leer_lineas_nuevas)
+		self.Bind(wx.EVT_MENU, self._al_conmutar_leer_nuevas, self.item_leer_nuevas)
+		item_historial = menu_ver.Append(wx.ID_ANY, _("Cargar &historial grabado...\tCtrl+Shift+H"))
+		self.Bind(wx.EVT_MENU, self._al_cargar_historial, item_historial)
+		item_captura_lanzador = menu_ver.Append(wx.ID_ANY, _("Abrir salida captu&rada por el lanzador..."))
+		self.Bind(wx.EVT_MENU, self._al_abrir_captura_lanzador, item_captura_lanzador)
+		menu_ver.AppendSeparator()
+		item_hora = menu_ver.Append(wx.ID_ANY, _("H&ora de la línea actual\tCtrl+T"))
+		self.Bind(wx.EVT_MENU, self._al_anunciar_hora_linea, item_hora)
+		item_tiempo = menu_ver.Append(wx.ID_ANY, _("&Tiempo entre las líneas seleccionadas\tCtrl+Shift+T"))
+		self.Bind(wx.EVT_MENU, self._al_anunciar_tiempo_seleccion, item_tiempo)
+		item_pausas = menu_ver.Append(wx.ID_ANY, _("Pa&usas más largas...\tCtrl+Alt+T"))
+		self.Bind(wx.EVT_MENU, self._al_mostrar_pausas, item_pausas)
+		menu_ver.AppendSeparator()
+		item_cmd_siguiente = menu_ver.Append(wx.ID_ANY, _("Comando si&guiente\tF6"))
+		self.Bind(wx.EVT_MENU, self._al_comando_siguiente, item_cmd_siguiente)
+		item_cmd_anterior = menu_ver.Append(wx.ID_ANY, _("Comando a&nterior\tShift+F6"))
+		self.Bind(wx.EVT_MENU, self._al_comando_anterior, item_cmd_anterior)
+		item_sel_salida = menu_ver.Append(wx.ID_ANY, _("Seleccionar la sali&da del comando\tCtrl+F6"))
+		self.Bind(wx.EVT_MENU, self._al_seleccionar_salida, item_sel_salida)
+		item_copiar_salida = menu_ver.Append(wx.ID_ANY, _("&Copiar la salida del último comando\tCtrl+Shift+C"))
+		self.Bind(wx.EVT_MENU, self._al_copiar_ultima_salida, item_copiar_salida)
 		barra_menu.Append(menu_ver, _("&Ver"))
 		
 		# Menú Plugins (Dinámico)
@@ -294,7 +552,8 @@ class VisorConsola(wx.Frame):
 		"""Carga los plugins en el menú, opcionalmente categorizados."""
 		try:
 			gestor = self._plugin._gestor_plugins
-			plugins_cargados = gestor.listar_plugins_cargados()
+			# El menú sale del manifiesto: los plugins se importan al usarlos
+			plugins_cargados = gestor.listar_plugins_habilitados()
 			self._mapa_plugins = {}
 			
 			categorizar = self._plugin._configuracion.visor.categorizar_plugins
@@ -303,9 +562,7 @@ class VisorConsola(wx.Frame):
 				# Modo lista plana (actual)
 				for nombre in sorted(plugins_cargados):
 					if nombre == 'clic_derecho': continue
-					plugin_inst = gestor.obtener_plugin(nombre)
-					if not plugin_inst: continue
-					meta = plugin_inst.obtener_metadatos()
+					meta = gestor.obtener_metadatos(nombre)
 					if meta:
 						item = menu.Append(wx.ID_ANY, meta.nombre)
 						self._mapa_plugins[item.GetId()] = nombre
@@ -315,9 +572,7 @@ class VisorConsola(wx.Frame):
 				categorias = {}
 				for nombre in sorted(plugins_cargados):
 					if nombre == 'clic_derecho': continue
-					plugin_inst = gestor.obtener_plugin(nombre)
-					if not plugin_inst: continue
-					meta = plugin_inst.obtener_metadatos()
+					meta = gestor.obtener_metadatos(nombre)
 					if meta:
 						cat = meta.categoria.capitalize() if meta.categoria else _("General")
 						if cat not in categorias:
@@ -337,6 +592,11 @@ class VisorConsola(wx.Frame):
 				item_vacio.Enable(False)
 		except Exception as e:
 			log.error(f"consoleLog: Error en menú de plugins: {e}")
+		menu.AppendSeparator()
+		item_analizar_todo = menu.Append(wx.ID_ANY, _("Analizar &todo\tCtrl+Shift+A"))
+		self.Bind(wx.EVT_MENU, self._al_analizar_todo, item_analizar_todo)
+		item_rendimiento = menu.Append(wx.ID_ANY, _("&Rendimiento de los plugins..."))
+		self.Bind(wx.EVT_MENU, self._al_mostrar_rendimiento_plugins, item_rendimiento)
 
 	def _configurar_eventos(self):
 		"""Configura los eventos asegurando que el teclado sea fluido."""
@@ -392,20 +652,124 @@ class VisorConsola(wx.Frame):
 			evento.Skip()
 
 	def _al_ejecutar_plugin(self, evento):
-		"""Ejecuta un plugin y maneja sus resultados de forma dinámica."""
+		"""Lanza un plugin sin bloquear el visor y muestra el progreso si tarda."""
 		nombre = self._mapa_plugins.get(evento.GetId())
 		if not nombre: return
 		
-		plugin = self._plugin._gestor_plugins.obtener_plugin(nombre)
+		if self._tarea_plugin and not self._tarea_plugin.terminada:
+			ui.message(_("Espere a que termine el plugin en ejecución."))
+			return
+		
+		gestor = self._plugin._gestor_plugins
+		plugin = gestor.obtener_plugin(nombre)
+		if not plugin:
+			ui.message(_("No se pudo cargar el plugin. Consulte el registro de NVDA."))
+			return
 		meta = plugin.obtener_metadatos()
-		resultado = plugin.ejecutar(
-			texto=self._texto_ctrl.GetValue(),
+		
+		# Título genérico basado en el nombre del plugin si es posible
+		titulo = meta.nombre if meta else _("Resultado del Plugin")
+		
+		self._tarea_plugin = gestor.ejecutar_plugin(
+			nombre,
+			callback_exito=lambda resultado: self._al_terminar_plugin(nombre, titulo, resultado),
+			callback_error=lambda error: self._al_error_plugin(titulo, error),
+			texto=self._contenido,
+			captura=self.captura,
 			seleccionado=self._texto_ctrl.GetStringSelection(),
 			visor=self
 		)
 		
-		# Título genérico basado en el nombre del plugin si es posible
-		titulo = meta.nombre if meta else _("Resultado del Plugin")
+		if self._tarea_plugin and not self._tarea_plugin.terminada:
+			self._titulo_plugin = titulo
+			self._barra_estado.SetStatusText(_("Ejecutando {}...").format(titulo), 2)
+			self._inicio_plugin = time.monotonic()
+			self._timer_plugin.Start(100)
+	
+	def _al_analizar_todo(self, evento):
+		"""Analiza el contenido con todos los plugins de análisis a la vez."""
+		if self._tarea_plugin and not self._tarea_plugin.terminada:
+			ui.message(_("Espere a que termine el plugin en ejecución."))
+			return
+		titulo = _("Análisis completo")
+		self._tarea_plugin = self._plugin._gestor_plugins.ejecutar_analisis_todo(
+			self.captura,
+			callback_exito=self._al_terminar_analisis_todo,
+			callback_error=lambda error: self._al_error_plugin(titulo, error)
+		)
+		self._titulo_plugin = titulo
+		self._barra_estado.SetStatusText(_("Analizando el contenido..."), 2)
+		self._inicio_plugin = time.monotonic()
+		self._timer_plugin.Start(100)
+	
+	def _al_terminar_analisis_todo(self, resultados: Dict[str, Any]):
+		"""Muestra juntos los resultados de todos los plugins de análisis."""
+		if not self: return
+		self._cerrar_progreso_plugin()
+		self._barra_estado.SetStatusText("", 2)
+		if not resultados:
+			wx.MessageBox(_("No hay plugins de análisis habilitados."), _("Análisis completo"), wx.OK | wx.ICON_INFORMATION, self)
+			return
+		gestor = self._plugin._gestor_plugins
+		lineas = []
+		for nombre, resultado in resultados.items():
+			meta = gestor.obtener_metadatos(nombre)
+			if isinstance(resultado, dict):
+				elementos = [f"[{cat.upper()}] {item}" for cat, lista in resultado.items() for item in lista]
+			else:
+				elementos = [str(elemento) for elemento in resultado or []]
+			lineas.append(_("{nombre} ({total})").format(nombre=meta.nombre if meta else nombre, total=len(elementos)))
+			lineas += [f"  {elemento}" for elemento in elementos] or ["  " + _("Sin resultados")]
+			lineas.append("")
+		dlg = AyudaAtajosDialog(self, _("Análisis completo"), "\n".join(lineas))
+		dlg.ShowModal()
+		dlg.Destroy()
+	
+	def _al_progreso_plugin(self, evento):
+		"""Muestra un diálogo de progreso cancelable si el plugin tarda en responder."""
+		tarea = self._tarea_plugin
+		if tarea is None or tarea.terminada:
+			self._cerrar_progreso_plugin()
+			return
+		
+		if self._dialogo_progreso is None:
+			# No molestar con el diálogo si el plugin termina enseguida
+			if time.monotonic() - self._inicio_plugin < 0.3:
+				return
+			self._dialogo_progreso = wx.ProgressDialog(
+				self._titulo_plugin,
+				_("Procesando el contenido de la consola..."),
+				parent=self,
+				style=wx.PD_APP_MODAL | wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME
+			)
+		
+		continuar, _omitir = self._dialogo_progreso.Pulse()
+		if not continuar:
+			tarea.cancelar()
+			self._cerrar_progreso_plugin()
+			self._barra_estado.SetStatusText(_("Plugin cancelado"), 2)
+			ui.message(_("Plugin cancelado"))
+	
+	def _cerrar_progreso_plugin(self):
+		"""Detiene el indicador de progreso del plugin en curso."""
+		if self._timer_plugin.IsRunning():
+			self._timer_plugin.Stop()
+		if self._dialogo_progreso is not None:
+			self._dialogo_progreso.Destroy()
+			self._dialogo_progreso = None
+	
+	def _al_error_plugin(self, titulo: str, error: Exception):
+		"""Informa de un error producido durante la ejecución de un plugin."""
+		if not self: return
+		self._cerrar_progreso_plugin()
+		self._barra_estado.SetStatusText(_("Error en el plugin"), 2)
+		wx.MessageBox(_("Error al ejecutar el plugin: {}").format(error), titulo, wx.OK | wx.ICON_ERROR, self)
+	
+	def _al_terminar_plugin(self, nombre: str, titulo: str, resultado: Any):
+		"""Presenta el resultado de un plugin una vez terminado."""
+		if not self: return
+		self._cerrar_progreso_plugin()
+		self._barra_estado.SetStatusText("", 2)
 		
 		if nombre == 'extractor_datos':
 			self._mostrar_extractor(resultado)
@@ -459,15 +823,100 @@ class VisorConsola(wx.Frame):
 				self._barra_estado.SetStatusText(_("JSON copiado al portapapeles"), 2)
 			dlg.Destroy()
 
+	def _pedir_ruta_guardado(self):
+		"""Pide el archivo de destino y su compresión.
+		
+		Returns:
+			Tupla (ruta, compresión) o None si se cancela.
+		"""
+		if self._tarea_guardado and self._tarea_guardado.en_curso:
+			ui.message(_("Ya hay un guardado en curso"))
+			return None
+		compresiones = list(exportador.COMPRESIONES)
+		comodin = "|".join([
+			_("Texto (*.txt)|*.txt"),
+			_("Texto comprimido gzip (*.txt.gz)|*.txt.gz"),
+			_("Texto comprimido xz (*.txt.xz)|*.txt.xz")
+		])
+		while True:
+			with wx.FileDialog(self, _("Guardar contenido"), wildcard=comodin, style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as dlg:
+				if dlg.ShowModal() != wx.ID_OK:
+					return None
+				confirmada = dlg.GetPath()
+				compresion = exportador.compresion_por_ruta(confirmada) or compresiones[dlg.GetFilterIndex()]
+			ruta = confirmada
+			extension = exportador.COMPRESIONES[compresion]
+			if compresion and not ruta.lower().endswith(extension):
+				ruta = os.path.splitext(ruta)[0] + extension
+			# El diálogo solo ha confirmado sobrescribir el nombre que se escribió
+			if ruta == confirmada or not os.path.exists(ruta):
+				return ruta, compresion
+			respuesta = gui.messageBox(
+				_("El archivo {} ya existe. ¿Desea reemplazarlo?").format(os.path.basename(ruta)),
+				_("Confirmar guardado"),
+				wx.YES_NO | wx.ICON_WARNING,
+				self
+			)
+			if respuesta == wx.YES:
+				return ruta, compresion
+
+	def _iniciar_guardado(self, fragmentos, total, ruta, compresion):
+		"""Lanza el guardado en segundo plano e informa del progreso en la barra de estado."""
+		self._barra_estado.SetStatusText(_("Guardando..."), 2)
+		self._tarea_guardado = exportador.exportar(
+			ruta,
+			fragmentos,
+			total,
+			compresion=compresion,
+			callback_progreso=self._al_progreso_guardado,
+			callback_exito=self._al_terminar_guardado,
+			callback_error=self._al_error_guardado
+		)
+
+	def _al_progreso_guardado(self, porcentaje):
+		if not self: return
+		self._barra_estado.SetStatusText(_("Guardando... {}%").format(porcentaje), 2)
+
+	def _al_terminar_guardado(self, ruta):
+		if not self: return
+		self._barra_estado.SetStatusText(_("Archivo guardado"), 2)
+		ui.message(_("Archivo guardado: {}").format(os.path.basename(ruta)))
+
+	def _al_error_guardado(self, error):
+		if not self: return
+		self._barra_estado.SetStatusText(_("Error al guardar"), 2)
+		wx.MessageBox(str(error), _("Error"), wx.OK | wx.ICON_ERROR, self)
+
 	def _al_guardar(self, evento):
-		with wx.FileDialog(self, _("Guardar contenido"), wildcard="*.txt", style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as dlg:
-			if dlg.ShowModal() == wx.ID_OK:
-				try:
-					with open(dlg.GetPath(), 'w', encoding='utf-8') as f:
-						f.write(self._texto_ctrl.GetValue())
-					self._barra_estado.SetStatusText(_("Archivo guardado"), 2)
-				except Exception as e:
-					wx.MessageBox(str(e), _("Error"), wx.OK | wx.ICON_ERROR)
+		destino = self._pedir_ruta_guardado()
+		if not destino: return
+		texto = self._contenido
+		self._iniciar_guardado(exportador.iterar_bloques(texto), len(texto), *destino)
+
+	def _al_guardar_seleccion(self, evento):
+		"""Guarda las líneas completas que abarca la selección actual."""
+		desde, hasta = self._texto_ctrl.GetSelection()
+		if desde == hasta:
+			ui.message(_("No hay texto seleccionado"))
+			return
+		_ok, _x, primera = self._texto_ctrl.PositionToXY(desde)
+		_ok, _x, ultima = self._texto_ctrl.PositionToXY(max(desde, hasta - 1))
+		destino = self._pedir_ruta_guardado()
+		if not destino: return
+		texto = self._contenido
+		self._iniciar_guardado(exportador.iterar_lineas(texto, primera, ultima), len(texto), *destino)
+
+	def _al_guardar_filtradas(self, evento):
+		"""Guarda solo las líneas que contienen un texto."""
+		with wx.TextEntryDialog(self, _("Guardar solo las líneas que contengan:"), _("Guardar líneas filtradas"), self._ultima_busqueda) as dlg:
+			if dlg.ShowModal() != wx.ID_OK or not dlg.GetValue():
+				return
+			objetivo = dlg.GetValue().lower()
+		destino = self._pedir_ruta_guardado()
+		if not destino: return
+		texto = self._contenido
+		filtro = lambda linea: objetivo in linea.lower()
+		self._iniciar_guardado(exportador.iterar_lineas(texto, filtro=filtro), len(texto), *destino)
 
 	def _al_buscar(self, evento):
 		with wx.TextEntryDialog(self, _("Texto a buscar:"), _("Buscar"), self._ultima_busqueda) as dlg:
@@ -475,6 +924,27 @@ class VisorConsola(wx.Frame):
 				self._ultima_busqueda = dlg.GetValue()
 				self._buscar_logic(self._ultima_busqueda, "forward")
 
+	def _al_buscar_historial(self, evento):
+		"""Busca en el índice de todas las sesiones grabadas y abre la elegida."""
+		indice = self._plugin.indice_historial
+		if indice is None:
+			ui.message(_("La indexación del historial está desactivada"))
+			return
+		with BusquedaHistorialDialog(self, indice, self._ultima_busqueda) as dlg:
+			if dlg.ShowModal() != wx.ID_OK or dlg.resultado_elegido is None:
+				return
+			resultado = dlg.resultado_elegido
+		directorio = os.path.join(self._plugin._configuracion.obtener_directorio_datos("sesiones"), resultado.sesion)
+		sesion = next((s for s in grabador_sesion.listar_sesiones(os.path.dirname(directorio)) if s['directorio'] == directorio), None)
+		if sesion is None:
+			ui.message(_("La sesión de ese resultado ya no está grabada"))
+			return
+		linea = resultado.numero_linea - sesion.get('lineas_descartadas', 0)
+		if linea < 1:
+			ui.message(_("Esa línea ya se descartó de la grabación por su antigüedad"))
+			return
+		self._cargar_sesion(directorio, linea)
+
 	def _buscar_siguiente_anterior(self, direction):
 		if not self._ultima_busqueda:
 			self._al_buscar(None)
@@ -527,6 +997,110 @@ class VisorConsola(wx.Frame):
 		_ok, x, y = self._texto_ctrl.PositionToXY(pos)
 		ui.message(_("Línea {}, columna {}").format(y+1, x+1))
 
+	def _al_anunciar_hora_linea(self, evento):
+		"""Anuncia la hora a la que apareció la línea del cursor."""
+		_ok, _x, y = self._texto_ctrl.PositionToXY(self._texto_ctrl.GetInsertionPoint())
+		marca = self._marcas.marca(y)
+		if marca is None:
+			ui.message(_("Hora desconocida: la línea no llegó durante el seguimiento"))
+			return
+		ui.message(_("Línea {}: {}, hace {}").format(
+			y + 1, time.strftime("%H:%M:%S", time.localtime(marca)), formatear_duracion(time.time() - marca)
+		))
+
+	def _al_anunciar_tiempo_seleccion(self, evento):
+		"""Anuncia el tiempo transcurrido entre la primera y la última línea seleccionadas."""
+		desde, hasta = self._texto_ctrl.GetSelection()
+		if desde == hasta:
+			ui.message(_("Seleccione desde una línea hasta otra"))
+			return
+		_ok, _x, primera = self._texto_ctrl.PositionToXY(desde)
+		_ok, _x, ultima = self._texto_ctrl.PositionToXY(max(desde, hasta - 1))
+		inicio, fin = self._marcas.marca(primera), self._marcas.marca(ultima)
+		if inicio is None or fin is None:
+			ui.message(_("Hora desconocida: la línea no llegó durante el seguimiento"))
+			return
+		ui.message(_("{} entre la línea {} y la {}").format(formatear_duracion(fin - inicio), primera + 1, ultima + 1))
+
+	def _al_mostrar_pausas(self, evento):
+		"""Muestra las esperas más largas entre líneas, para localizar los pasos lentos."""
+		pausas = self._marcas.pausas_mayores()
+		if not pausas:
+			ui.message(_("No hay pausas registradas. Active el seguimiento automático mientras se ejecuta el proceso."))
+			return
+		captura = self.captura
+		lineas = []
+		for segundos, indice in pausas:
+			anterior = captura[indice - 1].strip() if indice - 1 < len(captura) else ""
+			lineas.append(_("{duracion} de espera tras la línea {numero}: {texto}").format(
+				duracion=formatear_duracion(segundos), numero=indice, texto=anterior
+			))
+		dlg = AyudaAtajosDialog(self, _("Pausas más largas"), "\n".join(lineas))
+		dlg.ShowModal()
+		dlg.Destroy()
+
+	@property
+	def segmentador(self) -> SegmentadorComandos:
+		"""Índice de comandos del contenido mostrado, creado al usarlo por primera vez."""
+		if self._segmentador is None:
+			self._segmentador = SegmentadorComandos()
+			desplazamiento = 0 if self._modo_historial or self._seguidor_archivo else self._seguidor.desplazamiento
+			self._segmentador.analizar(self.captura, desplazamiento)
+		return self._segmentador
+
+	def _linea_actual(self) -> int:
+		"""Índice (base 0) de la línea donde está el cursor."""
+		_ok, _x, y = self._texto_ctrl.PositionToXY(self._texto_ctrl.GetInsertionPoint())
+		return y
+
+	def _ir_a_comando(self, bloque):
+		"""Sitúa el cursor en la línea de prompt de un comando y la anuncia."""
+		if bloque is None:
+			winsound.Beep(200, 100)
+			ui.message(_("No hay más comandos"))
+			return
+		pos = self._texto_ctrl.XYToPosition(0, bloque.linea_prompt)
+		self._texto_ctrl.SetInsertionPoint(pos)
+		self._texto_ctrl.ShowPosition(pos)
+		ui.message(_("{}, {} líneas de salida").format(
+			self._texto_ctrl.GetLineText(bloque.linea_prompt), bloque.lineas_salida
+		))
+
+	def _al_comando_siguiente(self, evento):
+		self._ir_a_comando(self.segmentador.siguiente(self._linea_actual()))
+
+	def _al_comando_anterior(self, evento):
+		self._ir_a_comando(self.segmentador.anterior(self._linea_actual()))
+
+	def _al_seleccionar_salida(self, evento):
+		"""Selecciona las líneas de salida del comando en el que está el cursor."""
+		bloque = self.segmentador.bloque_de_linea(self._linea_actual())
+		if bloque is None or not bloque.comando:
+			ui.message(_("El cursor no está en la salida de ningún comando"))
+			return
+		if not bloque.lineas_salida:
+			ui.message(_("El comando {} no tiene salida").format(bloque.comando))
+			return
+		desde = self._texto_ctrl.XYToPosition(0, bloque.inicio_salida)
+		ultima = bloque.fin_salida - 1
+		hasta = self._texto_ctrl.XYToPosition(0, ultima) + self._texto_ctrl.GetLineLength(ultima)
+		self._texto_ctrl.SetSelection(desde, hasta)
+		ui.message(_("Salida de {} seleccionada: {} líneas").format(bloque.comando, bloque.lineas_salida))
+
+	def _al_copiar_ultima_salida(self, evento):
+		"""Copia al portapapeles la salida del último comando ejecutado."""
+		bloque = self.segmentador.ultimo()
+		if bloque is None:
+			ui.message(_("No se ha encontrado ningún comando"))
+			return
+		salida = "\n".join(self.captura.lineas(bloque.inicio_salida, bloque.fin_salida))
+		if not salida.strip():
+			ui.message(_("El comando {} no tiene salida").format(bloque.comando))
+			return
+		api.copyToClip(salida)
+		self._barra_estado.SetStatusText(_("Salida copiada"), 2)
+		ui.message(_("Copiada la salida de {}: {} líneas").format(bloque.comando, bloque.lineas_salida))
+
 	def _al_mostrar_atajos(self, evento):
 		msg = _(
 			"Atajos de teclado de VisorConsolasXD:\n\n"
@@ -535,17 +1109,29 @@ class VisorConsola(wx.Frame):
 			"• F3: Buscar siguiente coincidencia\n"
 			"• Shift+F3: Buscar coincidencia anterior\n"
 			"• Control+Shift+F: Activar/Desactivar Seguimiento Automático (Auto-Tail)\n"
+			"• Control+Shift+L: Leer o no las líneas nuevas durante el seguimiento\n"
+			"• Control+Alt+F: Buscar en el historial grabado de todas las sesiones\n"
+			"• Control+Shift+H: Cargar el historial grabado en disco\n"
 			"• Control+G: Ir a una línea específica\n"
+			"• Control+T: Anunciar la hora a la que apareció la línea actual\n"
+			"• Control+Shift+T: Anunciar el tiempo entre la primera y la última línea seleccionadas\n"
+			"• Control+Alt+T: Mostrar las pausas más largas entre líneas\n"
+			"• F6 / Shift+F6: Ir al comando siguiente / anterior\n"
+			"• Control+F6: Seleccionar la salida del comando en el que está el cursor\n"
+			"• Control+Shift+C: Copiar la salida del último comando\n"
 			"• Control+P: Abrir opciones y ajustes del complemento\n"
-			"• Control+S: Guardar el contenido actual como archivo .txt\n"
+			"• Control+S: Guardar el contenido actual como archivo .txt (o comprimido .txt.gz / .txt.xz)\n"
+			"• Control+Shift+S: Guardar solo las líneas seleccionadas\n"
+			"• Control+Alt+S: Guardar solo las líneas que contengan un texto\n"
 			"• Control+C: Copiar el texto seleccionado\n"
 			"• Control+A: Seleccionar todo el texto\n"
 			"• F1: Anunciar posición actual del cursor (línea y columna)\n"
 			"• F2: Mostrar esta ayuda de atajos\n"
 			"• F5: Actualizar contenido capturando la consola de nuevo\n"
 			"• Escape: Cerrar el visor de consola\n\n"
-			"Nota: El modo seguimiento automático refresca el contenido cada 2 segundos y se desplaza al final "
-			"automáticamente si hay texto nuevo. Puede configurar los sonidos en el menú Archivo > Opciones."
+			"Nota: El modo seguimiento automático captura la consola con más frecuencia mientras aparece texto nuevo "
+			"y se va espaciando cuando no hay cambios. Se desplaza al final automáticamente si hay texto nuevo. "
+			"Puede configurar los intervalos y los sonidos en el menú Archivo > Opciones."
 		)
 		dlg = AyudaAtajosDialog(self, _("Ayuda de Atajos"), msg)
 		dlg.ShowModal()
@@ -554,7 +1140,10 @@ class VisorConsola(wx.Frame):
 	def _al_abrir_opciones(self, evento):
 		config_gestor = self._plugin._configuracion
 		gestor_plugins = self._plugin._gestor_plugins
-		dlg = AjustesDialog(self, config_gestor, gestor_plugins)
+		precalentables = [
+			(c.identificador, c.nombre) for c in self._plugin.gestor_lanzador.obtener_consolas_precalentables()
+		]
+		dlg = AjustesDialog(self, config_gestor, gestor_plugins, precalentables)
 		if dlg.ShowModal() == wx.ID_OK:
 			valores = dlg.obtener_valores()
 			
@@ -569,9 +1158,21 @@ class VisorConsola(wx.Frame):
 			# Aplicar Alertas
 			for clave, valor in valores["alertas"].items():
 				config_gestor.establecer_valor("alertas", clave, valor)
+			
+			# Aplicar Grabación
+			for clave, valor in valores["grabacion"].items():
+				config_gestor.establecer_valor("grabacion", clave, valor)
+			
+			# Aplicar Anuncios
+			for clave, valor in valores["anuncios"].items():
+				config_gestor.establecer_valor("anuncios", clave, valor)
 				
+			# Aplicar Perfilador de plugins
+			for clave, valor in valores["perfilador"].items():
+				config_gestor.establecer_valor("plugins", clave, valor)
+			
 			# Aplicar Plugins (y recargar si es necesario)
-			actuales = gestor_plugins.listar_plugins_cargados()
+			actuales = gestor_plugins.listar_plugins_habilitados()
 			nuevos = valores["plugins"]
 			
 			for p in gestor_plugins.listar_plugins_disponibles():
@@ -582,12 +1183,18 @@ class VisorConsola(wx.Frame):
 			
 			config_gestor.guardar_configuracion()
 			self._aplicar_configuracion()
+			self._plugin.aplicar_configuracion_servicios()
 			# Re-crear menú de plugins para reflejar cambios
 			# Para simplificar, avisamos que requiere reinicio si son cambios de plugins
 			# Pero intentamos reconstruir el menú
 			self._actualizar_menu_plugins()
 		dlg.Destroy()
 
+	def _al_mostrar_rendimiento_plugins(self, evento):
+		"""Muestra cuánto tardan y cuánta memoria usan los plugins."""
+		with InformePluginsDialog(self, self._plugin._gestor_plugins) as dlg:
+			dlg.ShowModal()
+
 	def _actualizar_menu_plugins(self):
 		"""Reconstruye el menú de plugins dinámicamente."""
 		# Primero localizamos el menú de plugins en el MenuBar
@@ -610,15 +1217,30 @@ class VisorConsola(wx.Frame):
 		fuente = wx.Font(config.tamanio_fuente, family, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL, faceName=face)
 		self._texto_ctrl.SetFont(fuente)
 		self._texto_ctrl.Refresh()
+		self._planificador.configurar(
+			config.intervalo_seguimiento_minimo,
+			config.intervalo_seguimiento_maximo,
+			config.factor_espera_seguimiento
+		)
+		config_alertas = self._plugin._configuracion.alertas
+		self._motor_alertas.configurar(config_alertas.patrones, config_alertas.intervalo_minimo_alerta)
 
 	def _al_refrescar(self, evento):
 		"""Captura de nuevo el contenido de la consola original."""
 		es_automatico = isinstance(evento, wx.TimerEvent)
 		self._refrescando_automaticamente = es_automatico
+		if self._cargando_historial:
+			# Se reprograma al terminar la carga para no perder líneas
+			return
+		
+		if self._seguidor_archivo is not None:
+			self._leer_archivo_captura()
+			return
 		
 		if self._tipo_consola == 'terminal':
 			# Si es el timer, no anunciamos repetidamente
 			if es_automatico:
+				self._programar_siguiente_sondeo(False)
 				return
 			# TRANSLATORS: Mensaje cuando el refresco no está disponible para Windows Terminal
 			self._plugin._mensajes.anunciar(_("El refresco de contenido para Windows Terminal estará disponible próximamente."))
@@ -634,7 +1256,7 @@ class VisorConsola(wx.Frame):
 			
 		self._barra_estado.SetStatusText(_("Actualizando contenido..."), 2)
 		
-		self._plugin._gestor_lectores.leer_consola(
+		self._plugin.gestor_lectores.leer_consola(
 			tipo_consola=self._tipo_consola,
 			objeto_ventana=self._objeto_consola,
 			callback_exito=self._finalizar_refresco,
@@ -643,10 +1265,34 @@ class VisorConsola(wx.Frame):
 
 	def _finalizar_refresco(self, nuevo_texto):
 		"""Actualiza el control de texto con el nuevo contenido."""
+		if not self: return
 		if not nuevo_texto:
 			self._barra_estado.SetStatusText(_("No se recibió contenido nuevo"), 2)
+			self._programar_siguiente_sondeo(False)
 			return
-			
+		
+		if nuevo_texto == self._ultima_captura:
+			# Sin cambios: no tocar el control ni la posición del usuario
+			self._programar_siguiente_sondeo(False)
+			if self._refrescando_automaticamente:
+				self._barra_estado.SetStatusText(
+					_("Sin cambios. Próxima captura en {:.1f} s ({} sondeos omitidos)").format(
+						self._planificador.intervalo, self._planificador.sondeos_omitidos
+					), 2
+				)
+			else:
+				self._barra_estado.SetStatusText(_("Contenido actualizado"), 2)
+			return
+		
+		# Las marcas siguen a la captura salvo si se mostraba otra sesión
+		mostraba_captura = self._contenido is self._ultima_captura
+		self._ultima_captura = nuevo_texto
+		captura = Captura(nuevo_texto)
+		delta = self._seguidor.actualizar(captura)
+		ahora = time.time()
+		if self._grabador:
+			self._grabador.registrar(delta)
+		
 		# Determinar si el usuario estaba al final del texto antes de actualizar
 		al_final = (self._texto_ctrl.GetInsertionPoint() >= self._texto_ctrl.GetLastPosition() - 1)
 		
@@ -654,10 +1300,35 @@ class VisorConsola(wx.Frame):
 		pos = self._texto_ctrl.GetInsertionPoint()
 		
 		# Actualizar contenido
-		self._texto_ctrl.SetValue(nuevo_texto)
+		if self._modo_historial:
+			self._anadir_delta(delta)
+			self._marcas.completar(len(self.captura), ahora)
+			if self._segmentador is not None:
+				self._segmentador.actualizar(self.captura, len(self.captura) - len(delta.lineas))
+		else:
+			self._contenido = nuevo_texto
+			self._captura = captura
+			self._texto_ctrl.SetValue(nuevo_texto)
+			if mostraba_captura:
+				self._marcas.aplicar_delta(delta, len(captura), ahora)
+			else:
+				self._marcas.reiniciar(delta.inicio, desplazamiento=delta.desplazamiento)
+				self._marcas.completar(len(captura), ahora)
+			if self._segmentador is not None:
+				if mostraba_captura and not delta.reinicio:
+					self._segmentador.actualizar(captura, delta.inicio, delta.desplazamiento)
+				else:
+					self._segmentador.analizar(captura, delta.desplazamiento)
 		
-		# Analizar alertas en el nuevo contenido
-		self._procesar_alertas(nuevo_texto)
+		# Analizar alertas solo en las líneas nuevas
+		primera_linea = delta.inicio + 1
+		if self._modo_historial:
+			primera_linea = self._texto_ctrl.GetNumberOfLines() - len(delta.lineas) + 1
+		self._procesar_alertas(delta, primera_linea)
+		if self._refrescando_automaticamente and self.item_leer_nuevas.IsChecked():
+			self._plugin.anunciador.anunciar_lineas(
+				delta.lineas, clave=("lineas", id(self)), sustituye_pendiente=delta.sustituye_pendiente
+			)
 		
 		if al_final:
 			# Si estábamos al final, ir al nuevo final y hacer scroll
@@ -670,6 +1341,7 @@ class VisorConsola(wx.Frame):
 		
 		self._actualizar_barra_estado()
 		self._barra_estado.SetStatusText(_("Contenido actualizado"), 2)
+		self._programar_siguiente_sondeo(True)
 		
 		# Solo sonido si no es automático silencioso
 		debe_sonar = self._plugin._configuracion.visor.sonidos_seguimiento
@@ -679,36 +1351,302 @@ class VisorConsola(wx.Frame):
 		if debe_sonar:
 			winsound.Beep(1200, 100)
 
+	@property
+	def captura(self) -> Captura:
+		"""Contenido mostrado con su índice de líneas, recalculado solo si cambia."""
+		if self._captura.texto is not self._contenido:
+			self._captura = Captura(self._contenido)
+		return self._captura
+
+	def _anadir_delta(self, delta):
+		"""Añade al final del historial las líneas nuevas de una captura.
+		
+		Args:
+			delta: Líneas nuevas calculadas por el seguidor de capturas.
+		"""
+		if delta.vacio:
+			return
+		nuevas = "\n".join(delta.lineas)
+		if delta.sustituye_pendiente:
+			# La última línea mostrada era provisional: se reemplaza
+			ultima = self._texto_ctrl.GetNumberOfLines() - 1
+			self._texto_ctrl.Remove(self._texto_ctrl.XYToPosition(0, ultima), self._texto_ctrl.GetLastPosition())
+			corte = self._contenido.rfind("\n") + 1
+			self._contenido = self._contenido[:corte] + nuevas
+			self._texto_ctrl.AppendText(nuevas)
+		else:
+			self._contenido += "\n" + nuevas
+			self._texto_ctrl.AppendText("\n" + nuevas)
+
+	def _iniciar_grabacion(self):
+		"""Empieza a grabar en disco las capturas de esta consola."""
+		config = self._plugin._configuracion
+		if self._grabador or not config.grabacion.habilitar_grabacion:
+			return
+		try:
+			self._grabador = GrabadorSesion(
+				config.obtener_directorio_datos("sesiones"),
+				self._describir_consola(),
+				tamano_segmento_kb=config.grabacion.tamano_segmento_kb,
+				max_segmentos=config.grabacion.max_segmentos,
+				max_sesiones=config.grabacion.max_sesiones,
+				indice=self._plugin.indice_historial,
+				tipo_consola=self._tipo_consola
+			)
+			self._grabador.iniciar(self._ultima_captura)
+		except OSError as e:
+			log.error(f"consoleLog: No se pudo iniciar la grabación de la sesión: {e}")
+			self._grabador = None
+
+	def _describir_consola(self) -> str:
+		"""Texto con el que se identifica esta consola en las grabaciones."""
+		nombre = ""
+		try:
+			nombre = self._objeto_consola.name or ""
+		except Exception:
+			pass
+		return nombre or self._tipo_consola
+
+	def _al_cargar_historial(self, evento):
+		"""Permite elegir una sesión grabada y la carga en el visor."""
+		config = self._plugin._configuracion
+		sesiones = grabador_sesion.listar_sesiones(config.obtener_directorio_datos("sesiones"))
+		if not sesiones:
+			ui.message(_("No hay historial grabado. La grabación empieza al activar el seguimiento automático."))
+			return
+		actual = self._grabador.directorio if self._grabador else None
+		opciones = []
+		for sesion in sesiones:
+			lineas = sum(s.get('lineas', 0) for s in sesion.get('segmentos', []))
+			fecha = time.strftime("%d/%m/%Y %H:%M", time.localtime(sesion.get('inicio', 0)))
+			etiqueta = _("{} - {} ({} líneas)").format(sesion.get('descripcion', ""), fecha, lineas)
+			if sesion['directorio'] == actual:
+				etiqueta = _("Sesión actual: {}").format(etiqueta)
+			opciones.append(etiqueta)
+		with wx.SingleChoiceDialog(self, _("Elija la sesión grabada a cargar:"), _("Historial grabado"), opciones) as dlg:
+			if dlg.ShowModal() != wx.ID_OK:
+				return
+			directorio = sesiones[dlg.GetSelection()]['directorio']
+		self._cargar_sesion(directorio)
+
+	def _cargar_sesion(self, directorio, linea_destino=None):
+		"""Carga en segundo plano una sesión grabada.
+		
+		Args:
+			directorio: Directorio de la sesión.
+			linea_destino: Número de línea (en la sesión) en el que situarse al terminar.
+		"""
+		es_actual = self._grabador is not None and directorio == self._grabador.directorio
+		self._seguidor_archivo = None
+		if not es_actual and self.item_seguimiento.IsChecked():
+			# Una sesión antigua no recibe capturas de esta consola
+			self._al_conmutar_seguimiento(None)
+		self._cargando_historial = True
+		self._barra_estado.SetStatusText(_("Cargando historial..."), 2)
+		
+		def _leer():
+			try:
+				texto = grabador_sesion.leer_sesion(directorio)
+			except Exception as e:
+				log.error(f"consoleLog: Error al leer el historial grabado: {e}")
+				texto = None
+			wx.CallAfter(self._mostrar_historial, texto, es_actual, linea_destino)
+		
+		threading.Thread(target=_leer, name="consoleLog_historial", daemon=True).start()
+
+	def _mostrar_historial(self, texto, es_actual, linea_destino=None):
+		"""Muestra el historial cargado y, si es la sesión actual, entra en modo historial."""
+		if not self: return
+		self._cargando_historial = False
+		if texto is None:
+			self._barra_estado.SetStatusText(_("Error al cargar el historial"), 2)
+		else:
+			self._contenido = texto
+			self._modo_historial = es_actual
+			self._texto_ctrl.SetValue(texto)
+			lineas = len(self.captura)
+			if es_actual:
+				# El historial termina con las líneas que ya tenían marca
+				self._marcas.alinear_final(lineas)
+			else:
+				self._marcas.reiniciar(lineas)
+			self._segmentador = None
+			if linea_destino is not None and 0 < linea_destino <= lineas:
+				pos = self._texto_ctrl.XYToPosition(0, linea_destino - 1)
+				self._texto_ctrl.SetInsertionPoint(pos)
+				self._texto_ctrl.ShowPosition(pos)
+			else:
+				self._texto_ctrl.SetInsertionPointEnd()
+				self._texto_ctrl.ShowPosition(self._texto_ctrl.GetLastPosition())
+			self._actualizar_barra_estado()
+			self._barra_estado.SetStatusText(_("Historial cargado: {} líneas").format(lineas), 2)
+			if linea_destino is not None:
+				_ok, _x, y = self._texto_ctrl.PositionToXY(self._texto_ctrl.GetInsertionPoint())
+				ui.message(self._texto_ctrl.GetLineText(y))
+			else:
+				ui.message(_("Historial cargado: {} líneas").format(lineas))
+		if self.item_seguimiento.IsChecked() and not self._timer_seguimiento.IsRunning():
+			self._timer_seguimiento.StartOnce(self._planificador.intervalo_ms)
+
+	def _al_abrir_captura_lanzador(self, evento):
+		"""Permite elegir una salida capturada por el lanzador y la abre en el visor."""
+		capturas = ingesta.listar_capturas(self._plugin._configuracion.obtener_directorio_datos("capturas"))
+		if not capturas:
+			ui.message(_("No hay salidas capturadas. Marque «Guardar la salida para el visor» al abrir una consola con el lanzador."))
+			return
+		opciones = [
+			_("{tipo} - {fecha} ({tamano} KB)").format(
+				tipo=captura['tipo'],
+				fecha=time.strftime("%d/%m/%Y %H:%M", time.localtime(captura['modificacion'])),
+				tamano=max(1, captura['tamano'] // 1024)
+			)
+			for captura in capturas
+		]
+		with wx.SingleChoiceDialog(self, _("Elija la salida capturada a abrir:"), _("Salidas capturadas"), opciones) as dlg:
+			if dlg.ShowModal() != wx.ID_OK:
+				return
+			ruta = capturas[dlg.GetSelection()]['ruta']
+		self._seguidor_archivo = ingesta.SeguidorArchivo(ruta)
+		self._modo_historial = False
+		self._barra_estado.SetStatusText(_("Cargando salida capturada..."), 2)
+		self._leer_archivo_captura(primera=True)
+
+	def _al_abrir_archivo_registro(self, evento):
+		"""Abre en el visor un archivo de registro y lo sigue mientras crece."""
+		comodin = _("Archivos de registro (*.log;*.txt)|*.log;*.txt|Todos los archivos (*.*)|*.*")
+		with wx.FileDialog(self, _("Abrir archivo de registro"), wildcard=comodin, style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as dlg:
+			if dlg.ShowModal() != wx.ID_OK:
+				return
+			ruta = dlg.GetPath()
+		self._seguidor_archivo = ArchivoRegistro(ruta, self._plugin._configuracion.visor.max_lineas_archivo)
+		self._modo_historial = False
+		self._barra_estado.SetStatusText(_("Indexando {}...").format(os.path.basename(ruta)), 2)
+		self._leer_archivo_captura(primera=True)
+
+	def _leer_archivo_captura(self, primera=False):
+		"""Lee en segundo plano lo añadido al archivo de la salida capturada.
+		
+		Args:
+			primera: Si es la lectura con la que se abre el archivo.
+		"""
+		seguidor = self._seguidor_archivo
+		self._cargando_historial = True
+		
+		def _leer():
+			delta, error = None, None
+			try:
+				delta = seguidor.leer()
+			except OSError as e:
+				error = e
+			wx.CallAfter(self._aplicar_archivo_captura, seguidor, delta, error, primera)
+		
+		threading.Thread(target=_leer, name="consoleLog_captura", daemon=True).start()
+
+	def _aplicar_archivo_captura(self, seguidor, delta, error, primera):
+		"""Muestra las líneas leídas del archivo de la salida capturada.
+		
+		Args:
+			seguidor: Seguidor con el que se leyó; si ya no es el actual, se descarta.
+			delta: Líneas nuevas del archivo.
+			error: Error de lectura, o None.
+			primera: Si es la lectura con la que se abre el archivo.
+		"""
+		if not self: return
+		if seguidor is not self._seguidor_archivo:
+			# La carga en curso es la del archivo o sesión que lo sustituyó; el
+			# sondeo se reprograma por si el temporizador se saltó mientras tanto
+			self._programar_siguiente_sondeo(False)
+			return
+		self._cargando_historial = False
+		if error is not None:
+			log.debug(f"consoleLog: No se pudo leer la salida capturada: {error}")
+			self._al_error_refresco(error)
+			return
+		ahora = time.time()
+		if primera or delta.reinicio:
+			# Primera lectura, o el archivo se ha recortado: se muestra entero
+			# (en un archivo de registro, solo sus últimas líneas)
+			self._contenido = "\n".join(delta.lineas)
+			self._texto_ctrl.SetValue(self._contenido)
+			self._marcas.reiniciar(len(self.captura))
+			self._segmentador = None
+			self._texto_ctrl.SetInsertionPointEnd()
+			self._texto_ctrl.ShowPosition(self._texto_ctrl.GetLastPosition())
+			self._actualizar_barra_estado()
+			if len(self.captura) < seguidor.lineas_totales:
+				mensaje = _("Mostrando las últimas {} de {} líneas").format(len(self.captura), seguidor.lineas_totales)
+			else:
+				mensaje = _("{}: {} líneas").format(os.path.basename(seguidor.ruta), len(self.captura))
+			self._barra_estado.SetStatusText(mensaje, 2)
+			if primera:
+				ui.message(mensaje)
+		elif not delta.vacio:
+			al_final = (self._texto_ctrl.GetInsertionPoint() >= self._texto_ctrl.GetLastPosition() - 1)
+			self._anadir_delta(delta)
+			self._marcas.completar(len(self.captura), ahora)
+			if self._segmentador is not None:
+				self._segmentador.actualizar(self.captura, len(self.captura) - len(delta.lineas))
+			self._procesar_alertas(delta, self._texto_ctrl.GetNumberOfLines() - len(delta.lineas) + 1)
+			if self._refrescando_automaticamente and self.item_leer_nuevas.IsChecked():
+				self._plugin.anunciador.anunciar_lineas(
+					delta.lineas, clave=("lineas", id(self)), sustituye_pendiente=delta.sustituye_pendiente
+				)
+			if al_final:
+				self._texto_ctrl.SetInsertionPointEnd()
+				self._texto_ctrl.ShowPosition(self._texto_ctrl.GetLastPosition())
+			self._actualizar_barra_estado()
+			self._barra_estado.SetStatusText(_("Contenido actualizado"), 2)
+		self._programar_siguiente_sondeo(not delta.vacio)
+
 	def _al_error_refresco(self, error):
+		if not self: return
 		self._barra_estado.SetStatusText(_("Error al actualizar"), 2)
+		self._programar_siguiente_sondeo(False)
 		# No mostramos mensaje de error si estamos en modo seguimiento para no molestar
 		if not self.item_seguimiento.IsChecked():
 			wx.MessageBox(_("No se pudo actualizar el contenido: {}").format(error), _("Error"), wx.OK | wx.ICON_ERROR, self)
 
-	def _procesar_alertas(self, texto):
-		"""Analiza el texto en busca de patrones de alerta configurados."""
-		config_alertas = self._plugin._configuracion.alertas
-		if not config_alertas.habilitar_alertas:
+	def _procesar_alertas(self, delta, primera_linea):
+		"""Busca los patrones de alerta en las líneas añadidas desde la captura anterior.
+		
+		Args:
+			delta: Líneas nuevas calculadas por el seguidor de capturas.
+			primera_linea: Número de línea en el visor de la primera línea nueva.
+		"""
+		if not self._plugin._configuracion.alertas.habilitar_alertas:
 			return
-			
-		lineas = texto.splitlines()
-		# Solo procesamos líneas nuevas si es posible, o las últimas para simplificar
-		# Para evitar spam, solo miramos las últimas 5 líneas en cada refresco
-		nuevas_lineas = lineas[-5:]
-		
-		for linea in nuevas_lineas:
-			for item in config_alertas.patrones:
-				patron = item.get("patron", "")
-				if not patron: continue
-				
-				if patron.lower() in linea.lower():
-					# Disparar alerta
-					if item.get("sonido"):
-						winsound.PlaySound("SystemExclamation", winsound.SND_ALIAS | winsound.SND_ASYNC)
-					if item.get("voz"):
-						ui.message(_("Alerta detected: {}").format(linea))
-					return # Una alerta por refresco para no saturar
+		if delta.vacio or not self._motor_alertas.activo:
+			return
+		
+		resultado = self._motor_alertas.procesar(delta.lineas, primera_linea=primera_linea)
+		if not resultado.coincidencias:
+			return
+		
+		self._barra_estado.SetStatusText(
+			_("{} alertas, la primera en la línea {}").format(
+				len(resultado.coincidencias), resultado.coincidencias[0].numero_linea
+			), 2
+		)
+		
+		if any(c.sonido for c in resultado.anunciables):
+			winsound.PlaySound("SystemExclamation", winsound.SND_ALIAS | winsound.SND_ASYNC)
+		
+		mensajes = [
+			_("Alerta en línea {}: {}").format(c.numero_linea, c.linea)
+			for c in resultado.anunciables if c.voz
+		]
+		for patron, cantidad in resultado.silenciadas.items():
+			mensajes.append(_("{} alertas más de {}").format(cantidad, patron))
+		if mensajes:
+			self._plugin.anunciador.anunciar(". ".join(mensajes))
 
+	def _programar_siguiente_sondeo(self, hubo_cambios: bool):
+		"""Programa la siguiente captura del modo seguimiento según la actividad."""
+		if not self.item_seguimiento.IsChecked():
+			return
+		self._planificador.registrar_sondeo(hubo_cambios)
+		self._timer_seguimiento.StartOnce(self._planificador.intervalo_ms)
+	
 	def _al_conmutar_seguimiento(self, evento):
 		"""Activa o desactiva el refresco periódico."""
 		checked = self.item_seguimiento.IsChecked()
@@ -717,20 +1655,41 @@ class VisorConsola(wx.Frame):
 			self.item_seguimiento.Check(checked)
 			
 		if checked:
-			intervalo = self._plugin._configuracion.visor.intervalo_seguimiento
-			self._timer_seguimiento.Start(intervalo * 1000)
-			self._barra_estado.SetStatusText(_("Seguimiento activado ({}s)").format(intervalo), 2)
+			self._iniciar_grabacion()
+			self._planificador.reiniciar()
+			self._timer_seguimiento.StartOnce(self._planificador.intervalo_ms)
+			self._barra_estado.SetStatusText(_("Seguimiento activado"), 2)
 			if self._plugin._configuracion.visor.sonidos_seguimiento:
 				winsound.Beep(1000, 50)
 		else:
 			self._timer_seguimiento.Stop()
-			self._barra_estado.SetStatusText(_("Seguimiento desactivado"), 2)
+			self._barra_estado.SetStatusText(
+				_("Seguimiento desactivado ({} sondeos omitidos)").format(self._planificador.sondeos_omitidos), 2
+			)
 			if self._plugin._configuracion.visor.sonidos_seguimiento:
 				winsound.Beep(500, 50)
 
+	def _al_conmutar_leer_nuevas(self, evento):
+		"""Activa o desactiva la lectura de las líneas nuevas en el modo seguimiento."""
+		activar = self.item_leer_nuevas.IsChecked()
+		config = self._plugin._configuracion
+		config.establecer_valor("anuncios", "leer_lineas_nuevas", activar)
+		config.guardar_configuracion()
+		if activar:
+			ui.message(_("Se leerán las líneas nuevas, agrupadas si llegan muchas seguidas"))
+		else:
+			self._plugin.anunciador.descartar(("lineas", id(self)))
+			ui.message(_("No se leerán las líneas nuevas"))
+
 	def _al_cerrar(self, evento):
 		if self._timer_seguimiento.IsRunning():
 			self._timer_seguimiento.Stop()
+		self._plugin.anunciador.descartar(("lineas", id(self)))
+		if self._tarea_plugin and not self._tarea_plugin.terminada:
+			self._tarea_plugin.cancelar()
+		self._cerrar_progreso_plugin()
+		if self._grabador:
+			self._grabador.detener()
 		self._plugin.dialogo_visor_abierto = False
 		self._objeto_consola = None
 		self.Destroy()
@@ -9,11 +9,14 @@ Módulo del lanzador de consolas.
 Contiene:
 - GestorLanzador: Gestor de consolas disponibles
 - InfoConsola: Información de cada consola
+- PoolConsolas: Consolas ocultas ya iniciadas para abrirlas al instante
 """
 
 from .gestor_lanzador import GestorLanzador, InfoConsola
+from .pool_consolas import PoolConsolas
 
 __all__ = [
 	'GestorLanzador',
-	'InfoConsola'
+	'InfoConsola',
+	'PoolConsolas'
 ]
@@ -7,22 +7,34 @@
 Gestor del lanzador de consolas.
 
 Proporciona funcionalidades para:
-- Detectar consolas disponibles en el sistema
+- Detectar consolas disponibles en el sistema, en segundo plano y con
+  los resultados guardados en caché entre sesiones
 - Obtener el directorio actual del explorador
-- Abrir consolas en directorios específicos
+- Abrir consolas en directorios específicos, opcionalmente tomándolas
+  de un grupo de consolas precalentadas
 """
 
 import os
+import shutil
 import subprocess
 import ctypes
+import hashlib
 import json
 import threading
-from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+import time
+import winreg
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as TiempoAgotado, as_completed
+from typing import Any, Callable, Optional, Dict, List, Tuple
+from dataclasses import asdict, dataclass
+import wx
 from logHandler import log
 import api
+import languageHandler
 from comtypes.client import CreateObject as COMCreate
 
+from . import visual_studio
+from .pool_consolas import PoolConsolas, admite_tipo
+
 import addonHandler
 _ = addonHandler.initTranslation()
 if not callable(_):
@@ -39,223 +51,496 @@ class InfoConsola:
 	descripcion: str = ""
 
 
+# Orden en que se muestran las consolas, independiente del orden en que
+# terminan las sondas
+# Las de Visual Studio ("vs-<versión>-<edición>-<arquitectura>") van en el lugar de 'vs'
+ORDEN_CONSOLAS = ('cmd', 'powershell', 'wt', 'git-bash', 'vs', 'pwsh', 'wsl')
+
+# Nombres legibles de las arquitecturas de los vcvars*.bat
+NOMBRES_ARQUITECTURA = {
+	'32': '32-bit',
+	'64': '64-bit',
+}
+
+# Consolas que pueden guardar su salida en un archivo al abrirse:
+# PowerShell con Start-Transcript y WSL con `script`
+TIPOS_CON_CAPTURA = ('powershell', 'pwsh', 'wsl')
+
+# Cambia cuando cambia el formato del archivo de caché
+VERSION_CACHE_DETECCION = 2
+
+# Clave del registro que WSL modifica al instalar o quitar distribuciones
+CLAVE_REGISTRO_WSL = r"Software\Microsoft\Windows\CurrentVersion\Lxss"
+
+
+def ruta_wsl(ruta: str) -> str:
+	"""Convierte una ruta de Windows en la ruta equivalente dentro de WSL.
+	
+	Args:
+		ruta: Ruta de Windows (C:\\Users\\...).
+	
+	Returns:
+		Ruta bajo /mnt (/mnt/c/Users/...).
+	"""
+	if len(ruta) >= 2 and ruta[1] == ':':
+		return f"/mnt/{ruta[0].lower()}{ruta[2:].replace(os.sep, '/')}"
+	return ruta.replace(os.sep, '/')
+
+
 class GestorLanzador:
 	"""Gestor del lanzador de consolas.
 	
 	Detecta y gestiona las consolas disponibles en el sistema
 	para permitir su apertura desde el explorador de Windows.
+	
+	La detección se hace en segundo plano: cada sonda se ejecuta a la vez
+	que las demás en un grupo de hilos y con su propio límite de tiempo.
+	Mientras tanto, las consultas devuelven lo detectado hasta el momento.
+	
+	Los resultados se guardan en un JSON con las claves que los invalidan
+	(el PATH, la fecha de modificación de los directorios de instalación y,
+	para WSL, la de su clave del registro); en sesiones siguientes solo se
+	vuelven a ejecutar las sondas cuya clave ha cambiado.
 	"""
 	
-	def __init__(self):
-		"""Inicializa el gestor del lanzador."""
+	# Segundos máximos de cada proceso de sonda; al agotarse se mata
+	TIEMPO_MAXIMO_SONDA = 5.0
+	# Segundos máximos de la detección completa; las sondas sin terminar
+	# se dan por no disponibles
+	TIEMPO_MAXIMO_DETECCION = 10.0
+	
+	def __init__(self, ruta_cache: Optional[str] = None, detectar: bool = True):
+		"""Inicializa el gestor del lanzador.
+		
+		Args:
+			ruta_cache: Archivo JSON de la caché de detección; None para no usarla.
+			detectar: Si debe empezar ya la detección en segundo plano.
+		"""
+		# Shell.Application se conserva entre llamadas, junto con sus ventanas por HWND
 		self._shell = None
+		self._ventanas_explorador: Dict[int, Any] = {}
+		self._ruta_cache = ruta_cache
 		self._consolas_cache: Dict[str, InfoConsola] = {}
-		self._detectar_consolas()
+		# Identificadores publicados por cada sonda, para quitar los que ya no detecte
+		self._publicadas: Dict[str, List[str]] = {}
+		self._bloqueo = threading.Lock()
+		self._detectada = threading.Event()
+		self._hilo_deteccion: Optional[threading.Thread] = None
+		# Se pidió volver a detectar mientras había una detección en marcha
+		self._repetir_forzada = False
+		self._oyentes: List[Callable[[List[InfoConsola], bool], None]] = []
+		self._pool: Optional[PoolConsolas] = None
+		if detectar:
+			self.detectar_en_segundo_plano()
 	
-	def _detectar_consolas(self):
-		"""Detecta las consolas disponibles en el sistema."""
-		self._consolas_cache.clear()
+	@property
+	def deteccion_completa(self) -> bool:
+		"""Indica si todas las sondas han terminado (o agotado su tiempo)."""
+		return self._detectada.is_set()
+	
+	def esperar_deteccion(self, tiempo: Optional[float] = None) -> bool:
+		"""Espera a que termine la detección.
 		
-		# CMD siempre disponible
-		self._consolas_cache['cmd'] = InfoConsola(
-			nombre=_("CMD (Símbolo del sistema)"),
-			identificador='cmd',
-			disponible=True,
-			ruta='cmd.exe',
-			descripcion=_("Consola de comandos clásica de Windows")
-		)
+		Args:
+			tiempo: Segundos máximos de espera; None para esperar sin límite.
 		
-		# PowerShell
-		self._detectar_powershell()
+		Returns:
+			True si la detección ha terminado.
+		"""
+		return self._detectada.wait(tiempo)
+	
+	def agregar_oyente(self, oyente: Callable[[List[InfoConsola], bool], None]):
+		"""Registra una función que recibe los resultados a medida que llegan.
 		
-		# Windows Terminal
-		self._detectar_windows_terminal()
+		Se llama en el hilo principal con la lista de consolas disponibles y
+		un indicador de si la detección ha terminado.
 		
-		# Git Bash
-		self._detectar_git_bash()
+		Args:
+			oyente: Función a registrar.
+		"""
+		with self._bloqueo:
+			self._oyentes.append(oyente)
+	
+	def quitar_oyente(self, oyente: Callable[[List[InfoConsola], bool], None]):
+		"""Deja de notificar a una función registrada con `agregar_oyente`.
 		
-		# Visual Studio
-		self._detectar_visual_studio()
+		Args:
+			oyente: Función a quitar.
+		"""
+		with self._bloqueo:
+			if oyente in self._oyentes:
+				self._oyentes.remove(oyente)
+	
+	def detectar_en_segundo_plano(self, forzar: bool = False):
+		"""Empieza una detección de consolas si no hay ninguna en marcha.
 		
-		# PowerShell Core (v7+)
-		self._detectar_powershell_core()
+		Si ya hay una y se pide forzar, se repite sin caché al terminar la actual.
 		
-		# WSL (Windows Subsystem for Linux)
-		self._detectar_wsl()
+		Args:
+			forzar: Si deben ejecutarse todas las sondas aunque la caché siga siendo válida.
+		"""
+		with self._bloqueo:
+			if self._hilo_deteccion is not None:
+				if forzar:
+					self._repetir_forzada = True
+				return
+			self._detectada.clear()
+			# CMD siempre disponible
+			self._consolas_cache['cmd'] = InfoConsola(
+				nombre=_("CMD (Símbolo del sistema)"),
+				identificador='cmd',
+				disponible=True,
+				ruta='cmd.exe',
+				descripcion=_("Consola de comandos clásica de Windows")
+			)
+			self._hilo_deteccion = threading.Thread(
+				target=self._hilo_detectar, args=(forzar,), name="consoleLog_deteccion", daemon=True
+			)
+			self._hilo_deteccion.start()
+	
+	def volver_a_detectar(self):
+		"""Repite la detección completa sin usar la caché."""
+		self.detectar_en_segundo_plano(forzar=True)
+	
+	def _sondas(self) -> Dict[str, Tuple[Callable[[], List[InfoConsola]], List[str]]]:
+		"""Sondas de detección con los directorios de instalación de los que depende cada una.
 		
-		log.debug(f"consoleLog: Consolas detectadas: {list(self._consolas_cache.keys())}")
+		Returns:
+			Diccionario nombre -> (sonda, directorios).
+		"""
+		sistema = os.path.join(os.environ.get("SystemRoot", "C:\\Windows"), "System32")
+		programas = [
+			os.environ[variable] for variable in ("ProgramFiles", "ProgramFiles(x86)")
+			if os.environ.get(variable)
+		]
+		aplicaciones = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "WindowsApps")
+		return {
+			'powershell': (self._detectar_powershell, [os.path.join(sistema, "WindowsPowerShell", "v1.0")]),
+			'wt': (self._detectar_windows_terminal, [aplicaciones]),
+			'git-bash': (self._detectar_git_bash, [os.path.join(p, "Git") for p in programas]),
+			'visual-studio': (
+				self._detectar_visual_studio,
+				[os.path.join(p, "Microsoft Visual Studio") for p in programas] + [visual_studio.directorio_instancias()]
+			),
+			'pwsh': (self._detectar_powershell_core, [os.path.join(p, "PowerShell") for p in programas]),
+			'wsl': (self._detectar_wsl, [sistema]),
+		}
 	
-	def _detectar_powershell(self):
-		"""Detecta si PowerShell está disponible."""
+	@staticmethod
+	def _marca_registro_wsl() -> Optional[int]:
+		"""Fecha de la última modificación de la clave de WSL en el registro, o None si no existe."""
 		try:
-			resultado = subprocess.Popen(
-				['powershell.exe', '-Command', "echo $null"],
+			with winreg.OpenKey(winreg.HKEY_CURRENT_USER, CLAVE_REGISTRO_WSL) as clave:
+				return winreg.QueryInfoKey(clave)[2]
+		except OSError:
+			return None
+	
+	def _clave_invalidacion(self, nombre: str, directorios: List[str], huella_path: str) -> Dict[str, Any]:
+		"""Datos baratos de obtener cuyo cambio obliga a repetir una sonda.
+		
+		Args:
+			nombre: Nombre de la sonda.
+			directorios: Directorios de instalación de los que depende.
+			huella_path: Huella del PATH actual.
+		
+		Returns:
+			Clave serializable en JSON.
+		"""
+		fechas = {}
+		for directorio in directorios:
+			try:
+				fechas[directorio] = os.stat(directorio).st_mtime_ns
+			except OSError:
+				fechas[directorio] = None
+		clave = {"path": huella_path, "directorios": fechas}
+		if nombre == 'wsl':
+			clave["registro"] = self._marca_registro_wsl()
+		return clave
+	
+	def _leer_cache(self) -> Dict[str, Dict[str, Any]]:
+		"""Lee los resultados guardados, o ninguno si no son de esta versión e idioma."""
+		if not self._ruta_cache:
+			return {}
+		try:
+			with open(self._ruta_cache, "r", encoding="utf-8") as archivo:
+				datos = json.load(archivo)
+			# Los nombres se guardan traducidos
+			if datos.get("version") == VERSION_CACHE_DETECCION and datos.get("idioma") == languageHandler.getLanguage():
+				return datos.get("sondas", {})
+		except FileNotFoundError:
+			pass
+		except (OSError, ValueError) as e:
+			log.debug(f"consoleLog: Caché de detección ilegible, se descarta: {e}")
+		return {}
+	
+	def _guardar_cache(self, sondas: Dict[str, Dict[str, Any]]):
+		"""Escribe en disco los resultados de las sondas.
+		
+		Args:
+			sondas: Por nombre de sonda, su clave y las consolas detectadas.
+		"""
+		if not self._ruta_cache:
+			return
+		datos = {"version": VERSION_CACHE_DETECCION, "idioma": languageHandler.getLanguage(), "sondas": sondas}
+		temporal = self._ruta_cache + ".tmp"
+		try:
+			with open(temporal, "w", encoding="utf-8") as archivo:
+				json.dump(datos, archivo, ensure_ascii=False, indent=1)
+			os.replace(temporal, self._ruta_cache)
+		except OSError as e:
+			log.debug(f"consoleLog: No se pudo guardar la caché de detección: {e}")
+	
+	def _publicar(self, nombre: str, consolas: List[InfoConsola]):
+		"""Sustituye los resultados anteriores de una sonda y avisa a los oyentes.
+		
+		Las consolas que la sonda publicó antes y ya no detecta (por ejemplo,
+		una instalación de Visual Studio desinstalada) se quitan.
+		
+		Args:
+			nombre: Nombre de la sonda.
+			consolas: Consolas detectadas por la sonda.
+		"""
+		with self._bloqueo:
+			nuevas = [consola.identificador for consola in consolas]
+			for identificador in self._publicadas.get(nombre, []):
+				if identificador not in nuevas:
+					self._consolas_cache.pop(identificador, None)
+			self._publicadas[nombre] = nuevas
+			for consola in consolas:
+				self._consolas_cache[consola.identificador] = consola
+		self._notificar(False)
+	
+	def _hilo_detectar(self, forzar: bool):
+		"""Cuerpo del hilo de detección: repite la detección mientras se pidan repeticiones forzadas.
+		
+		Args:
+			forzar: Si la primera detección debe ejecutar todas las sondas.
+		"""
+		while True:
+			try:
+				self._detectar_consolas(forzar)
+			except Exception as e:
+				log.error(f"consoleLog: Error en la detección de consolas: {e}")
+				self._detectada.set()
+			with self._bloqueo:
+				if not self._repetir_forzada:
+					# Bajo el bloqueo, para que una petición posterior abra un hilo nuevo
+					self._hilo_deteccion = None
+					return
+				self._repetir_forzada = False
+				self._detectada.clear()
+			forzar = True
+	
+	def _detectar_consolas(self, forzar: bool = False):
+		"""Ejecuta a la vez las sondas cuya caché no es válida y publica cada resultado al llegar.
+		
+		Args:
+			forzar: Si deben ejecutarse todas las sondas sin mirar la caché.
+		"""
+		inicio = time.monotonic()
+		guardadas = {} if forzar else self._leer_cache()
+		huella_path = hashlib.sha1(os.environ.get("PATH", "").encode("utf-8", "surrogatepass")).hexdigest()
+		
+		resultados: Dict[str, Dict[str, Any]] = {}
+		pendientes = {}
+		for nombre, (sonda, directorios) in self._sondas().items():
+			clave = self._clave_invalidacion(nombre, directorios, huella_path)
+			guardada = guardadas.get(nombre)
+			if guardada and guardada.get("clave") == clave:
+				try:
+					self._publicar(nombre, [InfoConsola(**datos) for datos in guardada["consolas"]])
+					resultados[nombre] = guardada
+					continue
+				except (KeyError, TypeError):
+					pass
+			pendientes[nombre] = (sonda, clave)
+		
+		if pendientes:
+			grupo = ThreadPoolExecutor(max_workers=len(pendientes), thread_name_prefix="consoleLog_sonda")
+			futuros = {grupo.submit(sonda): (nombre, clave) for nombre, (sonda, clave) in pendientes.items()}
+			try:
+				for futuro in as_completed(futuros, timeout=self.TIEMPO_MAXIMO_DETECCION):
+					nombre, clave = futuros[futuro]
+					try:
+						consolas = futuro.result()
+					except Exception as e:
+						log.debug(f"consoleLog: Falló la sonda {nombre}: {e}")
+						continue
+					self._publicar(nombre, consolas)
+					resultados[nombre] = {"clave": clave, "consolas": [asdict(c) for c in consolas]}
+			except TiempoAgotado:
+				# Las sondas sin terminar no se guardan: se repetirán la próxima vez
+				log.debug(f"consoleLog: Sondas sin terminar a tiempo: {[n for f, (n, c) in futuros.items() if not f.done()]}")
+			finally:
+				# Las sondas atascadas siguen en sus hilos, pero ya no se esperan
+				grupo.shutdown(wait=False)
+			self._guardar_cache(resultados)
+		
+		self._detectada.set()
+		self._notificar(True)
+		if self._pool is not None:
+			self._pool.rellenar()
+		log.debug(
+			f"consoleLog: Consolas detectadas en {time.monotonic() - inicio:.2f} s "
+			f"({len(pendientes)} sondas ejecutadas): "
+			f"{[c.identificador for c in self.obtener_consolas_disponibles()]}"
+		)
+	
+	def _notificar(self, completa: bool):
+		"""Entrega a los oyentes las consolas disponibles en el hilo principal.
+		
+		Args:
+			completa: Si la detección ha terminado.
+		"""
+		with self._bloqueo:
+			oyentes = list(self._oyentes)
+		if not oyentes:
+			return
+		consolas = self.obtener_consolas_disponibles()
+		for oyente in oyentes:
+			wx.CallAfter(oyente, consolas, completa)
+	
+	def _ejecutar_sonda(self, argumentos: List[str]) -> Optional[Tuple[int, bytes]]:
+		"""Ejecuta un proceso de sonda sin ventana y espera a que termine.
+		
+		Args:
+			argumentos: Programa y argumentos.
+		
+		Returns:
+			Tupla (código de salida, salida estándar), o None si no se pudo ejecutar.
+		
+		Raises:
+			subprocess.TimeoutExpired: Si se mató por superar `TIEMPO_MAXIMO_SONDA`;
+				así la sonda falla y su resultado no se guarda en la caché.
+		"""
+		try:
+			proceso = subprocess.Popen(
+				argumentos,
 				creationflags=subprocess.CREATE_NO_WINDOW,
+				stdin=subprocess.DEVNULL,
 				stdout=subprocess.PIPE,
 				stderr=subprocess.PIPE
 			)
-			resultado.communicate(timeout=5)
-			
-			self._consolas_cache['powershell'] = InfoConsola(
-				nombre=_("PowerShell"),
-				identificador='powershell',
-				disponible=True,
-				ruta='powershell.exe',
-				descripcion=_("Windows PowerShell para automatización y scripts")
-			)
-		except Exception as e:
-			log.debug(f"consoleLog: PowerShell no disponible: {e}")
-			self._consolas_cache['powershell'] = InfoConsola(
+		except OSError as e:
+			log.debug(f"consoleLog: {argumentos[0]} no disponible: {e}")
+			return None
+		try:
+			salida, unused_ = proceso.communicate(timeout=self.TIEMPO_MAXIMO_SONDA)
+		except subprocess.TimeoutExpired:
+			proceso.kill()
+			# Sin leer las tuberías: algún proceso hijo podría mantenerlas abiertas
+			proceso.wait()
+			log.debug(f"consoleLog: Sonda {argumentos[0]} cancelada tras {self.TIEMPO_MAXIMO_SONDA} s")
+			raise
+		return proceso.returncode, salida
+	
+	def _detectar_powershell(self) -> List[InfoConsola]:
+		"""Detecta si PowerShell está disponible."""
+		resultado = self._ejecutar_sonda(['powershell.exe', '-Command', "echo $null"])
+		if resultado is None:
+			return [InfoConsola(
 				nombre=_("PowerShell"),
 				identificador='powershell',
 				disponible=False
-			)
-		
-	def _detectar_powershell_core(self):
+			)]
+		return [InfoConsola(
+			nombre=_("PowerShell"),
+			identificador='powershell',
+			disponible=True,
+			ruta='powershell.exe',
+			descripcion=_("Windows PowerShell para automatización y scripts")
+		)]
+	
+	def _detectar_powershell_core(self) -> List[InfoConsola]:
 		"""Detecta si PowerShell Core (v7+) está disponible."""
-		try:
-			# pwsh suele estar en el PATH
-			self._consolas_cache['pwsh'] = InfoConsola(
-				nombre=_("PowerShell 7 (Core)"),
-				identificador='pwsh',
-				disponible=False,
-				ruta='pwsh.exe',
-				descripcion=_("Versión moderna y multiplataforma de PowerShell")
-			)
-			
-			resultado = subprocess.Popen(
-				['pwsh.exe', '-Command', "echo $null"],
-				creationflags=subprocess.CREATE_NO_WINDOW,
-				stdout=subprocess.PIPE,
-				stderr=subprocess.PIPE
-			)
-			resultado.communicate(timeout=3)
-			if resultado.returncode == 0:
-				self._consolas_cache['pwsh'].disponible = True
-		except:
-			pass
-
-	def _detectar_wsl(self):
+		# pwsh suele estar en el PATH
+		resultado = self._ejecutar_sonda(['pwsh.exe', '-Command', "echo $null"])
+		return [InfoConsola(
+			nombre=_("PowerShell 7 (Core)"),
+			identificador='pwsh',
+			disponible=resultado is not None and resultado[0] == 0,
+			ruta='pwsh.exe',
+			descripcion=_("Versión moderna y multiplataforma de PowerShell")
+		)]
+	
+	def _detectar_wsl(self) -> List[InfoConsola]:
 		"""Detecta si WSL está instalado."""
-		try:
-			self._consolas_cache['wsl'] = InfoConsola(
-				nombre=_("WSL (Linux)"),
-				identificador='wsl',
-				disponible=False,
-				ruta='wsl.exe',
-				descripcion=_("Subsistema de Windows para Linux")
-			)
-			
-			resultado = subprocess.Popen(
-				['wsl.exe', '--status'],
-				creationflags=subprocess.CREATE_NO_WINDOW,
-				stdout=subprocess.PIPE,
-				stderr=subprocess.PIPE
-			)
-			resultado.communicate(timeout=3)
-			if resultado.returncode == 0:
-				self._consolas_cache['wsl'].disponible = True
-		except:
-			pass
+		resultado = self._ejecutar_sonda(['wsl.exe', '--status'])
+		return [InfoConsola(
+			nombre=_("WSL (Linux)"),
+			identificador='wsl',
+			disponible=resultado is not None and resultado[0] == 0,
+			ruta='wsl.exe',
+			descripcion=_("Subsistema de Windows para Linux")
+		)]
 	
-	def _detectar_windows_terminal(self):
+	def _detectar_windows_terminal(self) -> List[InfoConsola]:
 		"""Detecta si Windows Terminal está disponible."""
 		disponible = any(
 			os.access(os.path.join(path, 'wt.exe'), os.X_OK)
 			for path in os.environ.get("PATH", "").split(os.pathsep)
 		)
 		
-		self._consolas_cache['wt'] = InfoConsola(
+		return [InfoConsola(
 			nombre=_("Windows Terminal"),
 			identificador='wt',
 			disponible=disponible,
 			ruta='wt.exe' if disponible else '',
 			descripcion=_("Terminal moderna de Windows con pestañas y temas")
-		)
+		)]
 	
-	def _detectar_git_bash(self):
+	def _detectar_git_bash(self) -> List[InfoConsola]:
 		"""Detecta si Git Bash está disponible."""
 		disponible = False
 		ruta_git = ""
 		
-		try:
-			comando_ps = "Get-Command git | Select-Object -ExpandProperty Source | ConvertTo-Json"
-			resultado = subprocess.Popen(
-				["powershell", "-Command", comando_ps],
-				stdout=subprocess.PIPE,
-				stderr=subprocess.PIPE,
-				creationflags=subprocess.CREATE_NO_WINDOW
-			)
-			salida, unused_ = resultado.communicate(timeout=5)
-			
-			if resultado.returncode == 0 and salida:
-				ruta_git_completa = json.loads(salida.decode('utf-8'))
-				ruta_git = os.path.dirname(os.path.dirname(ruta_git_completa))
-				ruta_git_bash = os.path.join(ruta_git, 'git-bash.exe')
-				disponible = os.path.exists(ruta_git_bash)
-				
-		except Exception as e:
-			log.debug(f"consoleLog: Git Bash no detectado: {e}")
+		# Misma búsqueda en el PATH (con PATHEXT) que Get-Command, sin lanzar PowerShell
+		ruta_git_completa = shutil.which('git')
+		if ruta_git_completa:
+			ruta_git = os.path.dirname(os.path.dirname(ruta_git_completa))
+			disponible = os.path.exists(os.path.join(ruta_git, 'git-bash.exe'))
+		else:
+			log.debug("consoleLog: Git Bash no detectado: git no está en el PATH")
 		
-		self._consolas_cache['git-bash'] = InfoConsola(
+		return [InfoConsola(
 			nombre=_("Git Bash"),
 			identificador='git-bash',
 			disponible=disponible,
 			ruta=ruta_git,
 			descripcion=_("Terminal Bash de Git para Windows")
-		)
+		)]
 	
-	def _detectar_visual_studio(self):
-		"""Detecta las consolas de Visual Studio disponibles."""
-		rutas_vs = [
-			"C:\\Program Files\\Microsoft Visual Studio",
-			"C:\\Program Files (x86)\\Microsoft Visual Studio"
+	def _detectar_visual_studio(self) -> List[InfoConsola]:
+		"""Detecta las consolas de desarrollador de todas las instalaciones de Visual Studio."""
+		raices = [
+			os.path.join(os.environ[variable], "Microsoft Visual Studio")
+			for variable in ("ProgramFiles", "ProgramFiles(x86)")
+			if os.environ.get(variable)
 		]
-		
-		vs_32_encontrado = False
-		vs_64_encontrado = False
-		ruta_vs_32 = ""
-		ruta_vs_64 = ""
-		
-		for ruta in rutas_vs:
-			if os.path.exists(ruta):
-				for root, dirs, files in os.walk(ruta):
-					if 'vcvars32.bat' in files and not vs_32_encontrado:
-						vs_32_encontrado = True
-						ruta_vs_32 = os.path.join(root, 'vcvars32.bat')
-					if 'vcvars64.bat' in files and not vs_64_encontrado:
-						vs_64_encontrado = True
-						ruta_vs_64 = os.path.join(root, 'vcvars64.bat')
-					
-					if vs_32_encontrado and vs_64_encontrado:
-						break
-				
-				if vs_32_encontrado and vs_64_encontrado:
-					break
-		
-		self._consolas_cache['vs-32'] = InfoConsola(
-			nombre=_("Visual Studio Developer (32-bit)"),
-			identificador='vs-32',
-			disponible=vs_32_encontrado,
-			ruta=ruta_vs_32,
-			descripcion=_("Consola de desarrollador de Visual Studio (32 bits)")
-		)
-		
-		self._consolas_cache['vs-64'] = InfoConsola(
-			nombre=_("Visual Studio Developer (64-bit)"),
-			identificador='vs-64',
-			disponible=vs_64_encontrado,
-			ruta=ruta_vs_64,
-			descripcion=_("Consola de desarrollador de Visual Studio (64 bits)")
-		)
+		consolas = []
+		for instalacion in visual_studio.buscar_instalaciones(raices):
+			for arquitectura, script in sorted(instalacion.scripts.items()):
+				nombre_arquitectura = NOMBRES_ARQUITECTURA.get(arquitectura, arquitectura)
+				consolas.append(InfoConsola(
+					nombre=_("Visual Studio {version} {edicion} Developer ({arquitectura})").format(
+						version=instalacion.version, edicion=instalacion.edicion, arquitectura=nombre_arquitectura
+					),
+					identificador=f"vs-{instalacion.version}-{instalacion.edicion}-{arquitectura}".lower().replace(" ", ""),
+					disponible=True,
+					ruta=script,
+					descripcion=_("Consola de desarrollador de Visual Studio ({})").format(nombre_arquitectura)
+				))
+		return consolas
 	
 	def obtener_consolas_disponibles(self) -> List[InfoConsola]:
 		"""Obtiene la lista de consolas disponibles.
 		
+		Si la detección no ha terminado, solo incluye las ya detectadas.
+		
 		Returns:
 			Lista de consolas disponibles.
 		"""
-		return [c for c in self._consolas_cache.values() if c.disponible]
+		return [c for c in self.obtener_todas_consolas() if c.disponible]
 	
 	def obtener_todas_consolas(self) -> List[InfoConsola]:
 		"""Obtiene todas las consolas (disponibles o no).
@@ -263,7 +548,59 @@ class GestorLanzador:
 		Returns:
 			Lista de todas las consolas.
 		"""
-		return list(self._consolas_cache.values())
+		with self._bloqueo:
+			consolas = list(self._consolas_cache.values())
+		orden = {identificador: i for i, identificador in enumerate(ORDEN_CONSOLAS)}
+		
+		def posicion(consola: InfoConsola) -> int:
+			grupo = 'vs' if consola.identificador.startswith('vs-') else consola.identificador
+			return orden.get(grupo, len(orden))
+		
+		return sorted(consolas, key=posicion)
+	
+	def obtener_consolas_precalentables(self) -> List[InfoConsola]:
+		"""Consolas disponibles que pueden mantenerse precalentadas."""
+		return [c for c in self.obtener_consolas_disponibles() if admite_tipo(c.identificador)]
+	
+	def configurar_pool(
+		self,
+		habilitado: bool,
+		tipos: List[str],
+		max_procesos: int,
+		max_memoria_mb: float,
+		ruta_registro: Optional[str] = None
+	):
+		"""Activa, ajusta o detiene el grupo de consolas precalentadas.
+		
+		Args:
+			habilitado: Si deben mantenerse consolas precalentadas.
+			tipos: Tipos a precalentar, por orden de preferencia.
+			max_procesos: Número máximo de consolas ocultas.
+			max_memoria_mb: Memoria máxima del conjunto, en MB.
+			ruta_registro: Archivo donde el grupo anota sus procesos ocultos.
+		"""
+		if not habilitado:
+			self.detener_pool()
+			return
+		if self._pool is None:
+			self._pool = PoolConsolas(self._construir_comando, self._admitido_en_pool, ruta_registro)
+		# Hasta que termine la detección no se sabe qué tipos están instalados;
+		# al terminar se vuelve a rellenar
+		self._pool.configurar(tipos, max_procesos, max_memoria_mb)
+	
+	def detener_pool(self):
+		"""Cierra las consolas precalentadas."""
+		if self._pool is not None:
+			self._pool.detener()
+			self._pool = None
+	
+	def _admitido_en_pool(self, tipo: str) -> bool:
+		"""Indica si un tipo está detectado como disponible y puede precalentarse."""
+		if not self.deteccion_completa:
+			return False
+		with self._bloqueo:
+			info = self._consolas_cache.get(tipo)
+		return info is not None and info.disponible and admite_tipo(tipo)
 	
 	def obtener_directorio_actual(self) -> Optional[str]:
 		"""Obtiene el directorio del elemento seleccionado en el Explorador.
@@ -284,8 +621,6 @@ class GestorLanzador:
 		except Exception as e:
 			log.error(f"consoleLog: Error al obtener directorio: {e}")
 			return None
-		finally:
-			self._shell = None
 	
 	def _es_explorador(self, objeto=None) -> bool:
 		"""Verifica si el objeto es el Explorador de Windows.
@@ -305,68 +640,64 @@ class GestorLanzador:
 	def _obtener_ruta_seleccion(self, objeto) -> Optional[str]:
 		"""Obtiene la ruta del elemento seleccionado.
 		
+		Si el objeto COM ha dejado de ser válido (por ejemplo, porque se
+		reinició el Explorador), se reintenta una vez con uno nuevo.
+		
 		Args:
 			objeto: Objeto del Explorador.
 		
 		Returns:
 			Ruta del elemento seleccionado.
 		"""
-		try:
-			if not self._shell:
-				self._shell = COMCreate("shell.application")
-			
-			for ventana in self._shell.Windows():
-				if ventana.hwnd == objeto.windowHandle:
-					return str(ventana.Document.FocusedItem.path)
-			
-			# Es el escritorio
-			return self._obtener_directorio_desktop()
-			
-		except Exception:
-			# Intentar con PowerShell como fallback
-			return self._obtener_ruta_via_powershell(objeto)
+		inicio = time.perf_counter()
+		hwnd = objeto.windowHandle
+		for intento in range(2):
+			try:
+				ventana = self._buscar_ventana_explorador(hwnd)
+				if ventana is None:
+					# Es el escritorio
+					return self._obtener_directorio_desktop()
+				documento = ventana.Document
+				elemento = documento.FocusedItem
+				# Sin elemento enfocado (carpeta vacía): la carpeta abierta
+				ruta = elemento.Path if elemento is not None else documento.Folder.Self.Path
+				log.debug(f"consoleLog: Ruta del Explorador obtenida en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+				return str(ruta)
+			except Exception as e:
+				log.debug(f"consoleLog: Shell.Application no respondió (intento {intento + 1}): {e}")
+				self.liberar()
+		return None
 	
-	def _obtener_ruta_via_powershell(self, objeto) -> Optional[str]:
-		"""Obtiene la ruta usando PowerShell.
+	def _buscar_ventana_explorador(self, hwnd: int):
+		"""Devuelve la ventana de Shell.Application de un HWND, usando la caché.
 		
 		Args:
-			objeto: Objeto del Explorador.
+			hwnd: Handle de la ventana del Explorador.
 		
 		Returns:
-			Ruta obtenida o None.
+			Objeto de la ventana, o None si el HWND no es una ventana del Explorador.
 		"""
-		try:
-			si = subprocess.STARTUPINFO()
-			si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-			
-			cmd = (
-				"$OutputEncoding = [console]::InputEncoding = [console]::OutputEncoding = "
-				"New-Object System.Text.UTF8Encoding; "
-				"(New-Object -ComObject 'Shell.Application').Windows() | "
-				"ForEach-Object { echo \\\"$($_.HWND):$($_.Document.FocusedItem.Path)\\\" }"
-			)
-			
-			p = subprocess.Popen(
-				f'powershell.exe "{cmd}"',
-				stdin=subprocess.DEVNULL,
-				stdout=subprocess.PIPE,
-				stderr=subprocess.DEVNULL,
-				startupinfo=si,
-				encoding="utf-8",
-				text=True
-			)
-			stdout, unused_ = p.communicate(timeout=5)
-			
-			if p.returncode == 0 and stdout:
-				for linea in stdout.splitlines():
-					hwnd, ruta = linea.split(':', 1)
-					if str(objeto.windowHandle) == hwnd:
-						return ruta
-						
-		except Exception as e:
-			log.debug(f"consoleLog: Error en obtención PS: {e}")
-		
-		return None
+		ventana = self._ventanas_explorador.get(hwnd)
+		# Los HWND se reutilizan: comprobar que sigue siendo la misma ventana
+		if ventana is not None and ventana.hwnd == hwnd:
+			return ventana
+		
+		if self._shell is None:
+			self._shell = COMCreate("shell.application")
+		self._ventanas_explorador = {}
+		for ventana in self._shell.Windows():
+			try:
+				# Con pestañas, varias comparten HWND: la primera, como antes
+				self._ventanas_explorador.setdefault(ventana.hwnd, ventana)
+			except Exception:
+				# Ventanas que se cierran durante la enumeración
+				continue
+		return self._ventanas_explorador.get(hwnd)
+	
+	def liberar(self):
+		"""Suelta el objeto Shell.Application y las ventanas en caché."""
+		self._ventanas_explorador = {}
+		self._shell = None
 	
 	def _obtener_directorio_desktop(self) -> str:
 		"""Obtiene el directorio del escritorio.
@@ -410,26 +741,36 @@ class GestorLanzador:
 		tipo: str,
 		directorio: str,
 		como_admin: bool = False,
-		ruta_script: Optional[str] = None
+		ruta_script: Optional[str] = None,
+		ruta_captura: Optional[str] = None
 	) -> bool:
 		"""Abre una consola en el directorio especificado.
 		
+		Si hay una consola precalentada del tipo pedido (y no se abre como
+		administrador ni con captura), se usa esa en lugar de iniciar otra.
+		
 		Args:
-			tipo: Tipo de consola (cmd, powershell, wt, git-bash, vs).
+			tipo: Tipo de consola (cmd, powershell, wt, git-bash, vs-..., pwsh, wsl).
 			directorio: Directorio donde abrir la consola.
 			como_admin: Si debe abrirse como administrador.
 			ruta_script: Para VS, ruta al script de inicialización.
+			ruta_captura: Archivo donde guardar la salida de la consola; solo
+				para los tipos de `TIPOS_CON_CAPTURA`.
 		
 		Returns:
 			True si se abrió correctamente.
 		"""
 		def _abrir():
+			pool = self._pool
+			if pool is not None and not como_admin and not ruta_captura and pool.tomar(tipo, directorio):
+				return True
+			
 			oldValue = ctypes.c_void_p()
 			ctypes.windll.kernel32.Wow64DisableWow64FsRedirection(ctypes.byref(oldValue))
 			
 			try:
 				ejecutable, parametros = self._construir_comando(
-					tipo, directorio, ruta_script
+					tipo, directorio, ruta_script, ruta_captura
 				)
 				
 				operacion = 'runas' if como_admin else 'open'
@@ -451,7 +792,8 @@ class GestorLanzador:
 		self,
 		tipo: str,
 		directorio: str,
-		ruta_script: Optional[str] = None
+		ruta_script: Optional[str] = None,
+		ruta_captura: Optional[str] = None
 	) -> Tuple[str, str]:
 		"""Construye el comando para abrir la consola.
 		
@@ -459,6 +801,7 @@ class GestorLanzador:
 			tipo: Tipo de consola.
 			directorio: Directorio destino.
 			ruta_script: Script de inicialización (para VS).
+			ruta_captura: Archivo donde guardar la salida (PowerShell y WSL).
 		
 		Returns:
 			Tupla (ejecutable, parámetros).
@@ -469,7 +812,7 @@ class GestorLanzador:
 		elif tipo == 'powershell':
 			return (
 				'powershell.exe',
-				f'-NoExit -Command "Set-Location -LiteralPath \\"{directorio}\\""'
+				f'-NoExit -Command "{self._inicio_powershell(directorio, ruta_captura)}"'
 			)
 		
 		elif tipo == 'wt':
@@ -483,7 +826,7 @@ class GestorLanzador:
 				f'--cd="{directorio}"'
 			)
 		
-		elif tipo in ['vs-32', 'vs-64']:
+		elif tipo.startswith('vs-'):
 			info_vs = self._consolas_cache.get(tipo)
 			script = ruta_script or (info_vs.ruta if info_vs else '')
 			dir_script = os.path.dirname(script)
@@ -495,14 +838,33 @@ class GestorLanzador:
 		elif tipo == 'pwsh':
 			return (
 				'pwsh.exe',
-				f'-NoExit -Command "Set-Location -LiteralPath \\"{directorio}\\""'
+				f'-NoExit -Command "{self._inicio_powershell(directorio, ruta_captura)}"'
 			)
 			
 		elif tipo == 'wsl':
 			# Convertir ruta de Windows a ruta de WSL (ej: C:\ -> /mnt/c/)
 			# Simplificado: wsl se encarga de iniciar en el CWD si se llama correctamente
 			# Pero por seguridad usamos --cd
+			if ruta_captura:
+				# script -f vuelca la salida al archivo a medida que se escribe
+				return ('wsl.exe', f'--cd "{directorio}" -- script -qf "{ruta_wsl(ruta_captura)}"')
 			return ('wsl.exe', f'--cd "{directorio}"')
 		
 		else:
 			raise ValueError(_("Tipo de consola no soportado: {}").format(tipo))
+	
+	@staticmethod
+	def _inicio_powershell(directorio: str, ruta_captura: Optional[str] = None) -> str:
+		"""Comandos con los que empieza una sesión de PowerShell.
+		
+		Args:
+			directorio: Directorio destino.
+			ruta_captura: Archivo de la transcripción de la sesión, si se captura.
+		
+		Returns:
+			Comandos, con las comillas escapadas para ir dentro de -Command "...".
+		"""
+		comandos = f'Set-Location -LiteralPath \\"{directorio}\\"'
+		if ruta_captura:
+			comandos += f'; Start-Transcript -LiteralPath \\"{ruta_captura}\\" -Append | Out-Null'
+		return comandos
@@ -0,0 +1,539 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Consolas Precalentadas
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Grupo de consolas precalentadas para que el lanzador abra al instante.
+
+PowerShell o un entorno de Visual Studio (vcvars) tardan segundos en
+estar listos. `PoolConsolas` mantiene, para cada tipo elegido, una
+consola ya iniciada en una ventana oculta. Al lanzar ese tipo se escribe
+en su entrada el cambio al directorio pedido, se limpia la pantalla y se
+muestra la ventana; después se prepara otra en segundo plano.
+
+Solo se admiten las consolas que se pueden dirigir escribiendo en su
+entrada (cmd, PowerShell y Visual Studio) y solo mientras el anfitrión de
+consola sea el clásico: si Windows entrega las consolas a Windows
+Terminal no hay ventana que ocultar y el tipo se descarta.
+
+El grupo está limitado en número de procesos y en memoria. Los
+identificadores de los procesos ocultos se guardan en disco para
+cerrarlos en el siguiente arranque si NVDA termina sin detener el grupo.
+"""
+
+import ctypes
+import ctypes.wintypes
+import json
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from logHandler import log
+
+from ..lectores.lector_clasico import BLOQUEO_CONSOLA
+
+
+# Constantes de Windows
+SW_HIDE = 0
+SW_SHOW = 5
+STARTF_USESHOWWINDOW = 0x00000001
+KEY_EVENT = 0x0001
+VK_RETURN = 0x0D
+GENERIC_READ = 0x80000000
+GENERIC_WRITE = 0x40000000
+FILE_SHARE_READ = 0x00000001
+FILE_SHARE_WRITE = 0x00000002
+OPEN_EXISTING = 3
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+PROCESS_VM_READ = 0x0010
+
+# Clase de la ventana del anfitrión de consola clásico (conhost)
+CLASE_CONSOLA_CLASICA = "ConsoleWindowClass"
+
+
+class _KEY_EVENT_RECORD(ctypes.Structure):
+	_fields_ = [
+		("bKeyDown", ctypes.wintypes.BOOL),
+		("wRepeatCount", ctypes.wintypes.WORD),
+		("wVirtualKeyCode", ctypes.wintypes.WORD),
+		("wVirtualScanCode", ctypes.wintypes.WORD),
+		("uChar", ctypes.wintypes.WCHAR),
+		("dwControlKeyState", ctypes.wintypes.DWORD),
+	]
+
+
+class _INPUT_RECORD(ctypes.Structure):
+	# Solo se usan eventos de teclado, el mayor miembro de la unión
+	_fields_ = [
+		("EventType", ctypes.wintypes.WORD),
+		("Event", _KEY_EVENT_RECORD),
+	]
+
+
+class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+	_fields_ = [
+		("cb", ctypes.wintypes.DWORD),
+		("PageFaultCount", ctypes.wintypes.DWORD),
+		("PeakWorkingSetSize", ctypes.c_size_t),
+		("WorkingSetSize", ctypes.c_size_t),
+		("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+		("QuotaPagedPoolUsage", ctypes.c_size_t),
+		("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+		("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+		("PagefileUsage", ctypes.c_size_t),
+		("PeakPagefileUsage", ctypes.c_size_t),
+	]
+
+
+def admite_tipo(tipo: str) -> bool:
+	"""Indica si un tipo de consola puede precalentarse.
+	
+	Args:
+		tipo: Identificador de la consola (cmd, powershell, vs-...).
+	"""
+	return tipo in ('cmd', 'powershell', 'pwsh') or tipo.startswith('vs-')
+
+
+def comando_cambio_directorio(tipo: str, directorio: str) -> str:
+	"""Línea que se escribe en una consola precalentada para llevarla a un directorio.
+	
+	Args:
+		tipo: Identificador de la consola.
+		directorio: Directorio destino.
+	
+	Returns:
+		Comando, sin el salto de línea final.
+	"""
+	if tipo in ('powershell', 'pwsh'):
+		ruta = directorio.replace("'", "''")
+		return f"Set-Location -LiteralPath '{ruta}'; Clear-Host"
+	return f'cd /d "{directorio}" & cls'
+
+
+@dataclass
+class ConsolaPrecalentada:
+	"""Una consola oculta lista para usarse."""
+	tipo: str
+	proceso: subprocess.Popen
+	hwnd: int
+	# Instante de creación del proceso (FILETIME), para no confundirlo con
+	# otro que reutilice el mismo identificador
+	creacion: int
+	memoria_mb: float = 0.0
+	
+	@property
+	def pid(self) -> int:
+		"""Identificador del proceso."""
+		return self.proceso.pid
+
+
+class PoolConsolas:
+	"""Consolas ocultas ya iniciadas, una por tipo elegido.
+	
+	Puede llamarse desde cualquier hilo; el relleno se hace en un hilo
+	propio, de un tipo en un tipo.
+	"""
+	
+	# Segundos que se espera a que aparezca la ventana de una consola nueva
+	TIEMPO_MAXIMO_INICIO = 10.0
+	
+	def __init__(
+		self,
+		construir_comando: Callable[[str, str], Tuple[str, str]],
+		admitido: Callable[[str], bool],
+		ruta_registro: Optional[str] = None
+	):
+		"""Inicializa el grupo vacío.
+		
+		Args:
+			construir_comando: Devuelve (ejecutable, parámetros) de un tipo en un directorio.
+			admitido: Indica si un tipo está instalado y puede precalentarse ahora.
+			ruta_registro: Archivo JSON con los procesos ocultos; None para no usarlo.
+		"""
+		self._construir_comando = construir_comando
+		self._admitido = admitido
+		self._ruta_registro = ruta_registro
+		self._instancias: Dict[str, ConsolaPrecalentada] = {}
+		# Tipos que no se pueden ocultar en este sistema (terminal predeterminada)
+		self._descartados: set = set()
+		self._bloqueo = threading.Lock()
+		self._hilo: Optional[threading.Thread] = None
+		self._pendiente = False
+		self._detenido = False
+		self.tipos: List[str] = []
+		self.max_procesos = 0
+		self.max_memoria_mb = 0.0
+		# Se cierran desde el hilo de relleno para no retrasar al llamante
+		self._huerfanos = self._leer_registro()
+	
+	def configurar(self, tipos: List[str], max_procesos: int, max_memoria_mb: float):
+		"""Cambia los tipos precalentados y los límites, y ajusta el grupo.
+		
+		Args:
+			tipos: Tipos a precalentar, por orden de preferencia.
+			max_procesos: Número máximo de consolas ocultas.
+			max_memoria_mb: Memoria máxima del conjunto, en MB.
+		"""
+		self.tipos = [t for t in tipos if admite_tipo(t)]
+		self.max_procesos = max(0, int(max_procesos))
+		self.max_memoria_mb = max(0.0, float(max_memoria_mb))
+		with self._bloqueo:
+			sobrantes = [self._instancias.pop(tipo) for tipo in list(self._instancias) if tipo not in self.tipos]
+			# Por encima del límite se cierran las de menor preferencia
+			exceso = sorted(self._instancias, key=self.tipos.index)[self.max_procesos:]
+			sobrantes += [self._instancias.pop(tipo) for tipo in exceso]
+		for consola in sobrantes:
+			self._cerrar(consola)
+		if sobrantes:
+			self._guardar_registro()
+		self.rellenar()
+	
+	@property
+	def instancias(self) -> List[ConsolaPrecalentada]:
+		"""Consolas ocultas disponibles."""
+		with self._bloqueo:
+			return list(self._instancias.values())
+	
+	def rellenar(self):
+		"""Prepara en segundo plano las consolas que falten."""
+		with self._bloqueo:
+			if self._detenido:
+				return
+			if self._hilo is not None and self._hilo.is_alive():
+				# El hilo en marcha volverá a repasar los tipos al terminar
+				self._pendiente = True
+				return
+			self._pendiente = False
+			self._hilo = threading.Thread(target=self._rellenar, daemon=True, name="consoleLog-pool")
+			self._hilo.start()
+	
+	def tomar(self, tipo: str, directorio: str) -> bool:
+		"""Muestra la consola precalentada de un tipo en un directorio.
+		
+		Args:
+			tipo: Tipo de consola pedido.
+			directorio: Directorio en el que debe quedar.
+		
+		Returns:
+			True si se usó una consola del grupo; False si no había ninguna
+			lista y hay que abrirla de la forma normal.
+		"""
+		with self._bloqueo:
+			consola = self._instancias.pop(tipo, None)
+		if consola is None:
+			return False
+		self._guardar_registro()
+		usada = False
+		try:
+			if consola.proceso.poll() is None and ctypes.windll.user32.IsWindow(consola.hwnd):
+				inicio = time.perf_counter()
+				if self._escribir_entrada(consola.pid, comando_cambio_directorio(tipo, directorio) + "\r"):
+					user32 = ctypes.windll.user32
+					user32.ShowWindow(consola.hwnd, SW_SHOW)
+					user32.SetForegroundWindow(consola.hwnd)
+					usada = True
+					log.debug(f"consoleLog: Consola {tipo} precalentada mostrada en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+		except Exception as e:
+			# Por ejemplo, un carácter del directorio que no cabe en un WCHAR:
+			# la consola se cierra y se abre otra de la forma normal
+			log.warning(f"consoleLog: Error al usar la consola {tipo} precalentada: {e}")
+			usada = False
+		if not usada:
+			log.debug(f"consoleLog: La consola {tipo} precalentada ya no servía")
+			self._cerrar(consola)
+		self.rellenar()
+		return usada
+	
+	def detener(self):
+		"""Cierra todas las consolas ocultas y deja de rellenar el grupo."""
+		with self._bloqueo:
+			self._detenido = True
+			consolas = list(self._instancias.values())
+			self._instancias.clear()
+		for consola in consolas:
+			self._cerrar(consola)
+		self._guardar_registro()
+	
+	def _rellenar(self):
+		"""Hilo de relleno: crea las consolas que falten dentro de los límites."""
+		if self._huerfanos:
+			self._cerrar_huerfanos(self._huerfanos)
+			self._huerfanos = []
+		while True:
+			for tipo in self.tipos:
+				with self._bloqueo:
+					if self._detenido:
+						return
+					if len(self._instancias) >= self.max_procesos:
+						break
+					if tipo in self._instancias or tipo in self._descartados:
+						continue
+				if not self._admitido(tipo):
+					continue
+				if self.memoria_mb() >= self.max_memoria_mb:
+					log.debug(f"consoleLog: Grupo de consolas en el límite de {self.max_memoria_mb:.0f} MB")
+					break
+				consola = self._crear(tipo)
+				if consola is None:
+					continue
+				with self._bloqueo:
+					if self._detenido or tipo in self._instancias:
+						sobra = True
+					else:
+						self._instancias[tipo] = consola
+						sobra = False
+				if sobra:
+					self._cerrar(consola)
+				else:
+					self._guardar_registro()
+			with self._bloqueo:
+				if not self._pendiente or self._detenido:
+					return
+				self._pendiente = False
+	
+	def memoria_mb(self) -> float:
+		"""Memoria en uso (conjunto de trabajo) de las consolas ocultas, en MB."""
+		total = 0.0
+		for consola in self.instancias:
+			consola.memoria_mb = _memoria_proceso_mb(consola.pid)
+			total += consola.memoria_mb
+		return total
+	
+	def _crear(self, tipo: str) -> Optional[ConsolaPrecalentada]:
+		"""Inicia una consola oculta y espera a que tenga ventana.
+		
+		Args:
+			tipo: Tipo de consola.
+		
+		Returns:
+			La consola creada, o None si no se pudo.
+		"""
+		directorio = os.path.expanduser("~")
+		try:
+			ejecutable, parametros = self._construir_comando(tipo, directorio)
+		except ValueError as e:
+			log.debug(f"consoleLog: {e}")
+			return None
+		informacion = subprocess.STARTUPINFO()
+		informacion.dwFlags = STARTF_USESHOWWINDOW
+		informacion.wShowWindow = SW_HIDE
+		inicio = time.perf_counter()
+		try:
+			proceso = subprocess.Popen(
+				f'"{ejecutable}" {parametros}',
+				creationflags=subprocess.CREATE_NEW_CONSOLE,
+				startupinfo=informacion,
+				cwd=directorio
+			)
+		except OSError as e:
+			log.debug(f"consoleLog: No se pudo precalentar {tipo}: {e}")
+			return None
+		
+		hwnd = 0
+		limite = time.monotonic() + self.TIEMPO_MAXIMO_INICIO
+		while not hwnd and proceso.poll() is None and time.monotonic() < limite:
+			time.sleep(0.1)
+			hwnd = _ventana_consola(proceso.pid)
+		if not hwnd:
+			log.debug(f"consoleLog: La consola {tipo} precalentada no llegó a tener ventana")
+			_terminar_proceso(proceso)
+			return None
+		if _clase_ventana(hwnd) != CLASE_CONSOLA_CLASICA:
+			# La consola se ha delegado en otra terminal: no se puede ocultar ni reutilizar
+			log.debug(f"consoleLog: {tipo} no se precalienta: la terminal predeterminada no es la consola clásica")
+			with self._bloqueo:
+				self._descartados.add(tipo)
+			_terminar_proceso(proceso)
+			return None
+		ctypes.windll.user32.ShowWindow(hwnd, SW_HIDE)
+		log.debug(f"consoleLog: Consola {tipo} precalentada en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+		return ConsolaPrecalentada(tipo, proceso, hwnd, _hora_creacion(proceso.pid) or 0)
+	
+	def _cerrar(self, consola: ConsolaPrecalentada):
+		"""Termina el proceso de una consola del grupo."""
+		_terminar_proceso(consola.proceso)
+	
+	def _escribir_entrada(self, pid: int, texto: str) -> bool:
+		"""Escribe texto en el búfer de entrada de la consola de un proceso.
+		
+		Args:
+			pid: Proceso adjunto a la consola.
+			texto: Caracteres a escribir, como si se tecleasen.
+		
+		Returns:
+			True si se escribieron todos.
+		"""
+		kernel32 = ctypes.windll.kernel32
+		user32 = ctypes.windll.user32
+		registros = (_INPUT_RECORD * (len(texto) * 2))()
+		for i, caracter in enumerate(texto):
+			tecla = VK_RETURN if caracter == "\r" else user32.VkKeyScanW(ord(caracter)) & 0xFF
+			for j, pulsada in enumerate((True, False)):
+				registro = registros[i * 2 + j]
+				registro.EventType = KEY_EVENT
+				registro.Event.bKeyDown = pulsada
+				registro.Event.wRepeatCount = 1
+				registro.Event.wVirtualKeyCode = tecla
+				registro.Event.uChar = caracter
+		
+		with BLOQUEO_CONSOLA:
+			kernel32.FreeConsole()
+			if not kernel32.AttachConsole(pid):
+				return False
+			try:
+				kernel32.CreateFileW.restype = ctypes.wintypes.HANDLE
+				entrada = kernel32.CreateFileW(
+					"CONIN$", GENERIC_READ | GENERIC_WRITE, FILE_SHARE_READ | FILE_SHARE_WRITE,
+					None, OPEN_EXISTING, 0, None
+				)
+				if not entrada or entrada == INVALID_HANDLE_VALUE:
+					return False
+				try:
+					escritos = ctypes.wintypes.DWORD()
+					kernel32.WriteConsoleInputW(entrada, registros, len(registros), ctypes.byref(escritos))
+					return escritos.value == len(registros)
+				finally:
+					kernel32.CloseHandle(entrada)
+			finally:
+				kernel32.FreeConsole()
+	
+	def _guardar_registro(self):
+		"""Guarda en disco los procesos ocultos, para cerrarlos si quedan huérfanos."""
+		if not self._ruta_registro:
+			return
+		datos = [{"pid": c.pid, "creacion": c.creacion} for c in self.instancias]
+		temporal = self._ruta_registro + ".tmp"
+		try:
+			with open(temporal, "w", encoding="utf-8") as archivo:
+				json.dump(datos, archivo)
+			os.replace(temporal, self._ruta_registro)
+		except OSError as e:
+			log.debug(f"consoleLog: No se pudo guardar el registro de consolas precalentadas: {e}")
+	
+	def _leer_registro(self) -> List[Tuple[int, int]]:
+		"""Procesos ocultos que dejó guardados una sesión anterior.
+		
+		Returns:
+			Lista de tuplas (pid, instante de creación).
+		"""
+		if not self._ruta_registro:
+			return []
+		try:
+			with open(self._ruta_registro, "r", encoding="utf-8") as archivo:
+				datos = json.load(archivo)
+		except FileNotFoundError:
+			return []
+		except (OSError, ValueError) as e:
+			log.debug(f"consoleLog: Registro de consolas precalentadas ilegible: {e}")
+			return []
+		procesos = []
+		for entrada in datos if isinstance(datos, list) else []:
+			try:
+				procesos.append((int(entrada["pid"]), int(entrada["creacion"])))
+			except (KeyError, TypeError, ValueError):
+				continue
+		return procesos
+	
+	def _cerrar_huerfanos(self, procesos: List[Tuple[int, int]]):
+		"""Cierra las consolas ocultas que dejó una sesión anterior.
+		
+		Args:
+			procesos: Tuplas (pid, instante de creación) leídas del registro.
+		"""
+		for pid, creacion in procesos:
+			# Solo si es el mismo proceso y no otro con el identificador reutilizado
+			if creacion and _hora_creacion(pid) == creacion:
+				log.debug(f"consoleLog: Cerrando consola precalentada huérfana {pid}")
+				_terminar_pid(pid)
+
+
+def _ventana_consola(pid: int) -> int:
+	"""Ventana de la consola a la que está adjunto un proceso, o 0."""
+	kernel32 = ctypes.windll.kernel32
+	with BLOQUEO_CONSOLA:
+		kernel32.FreeConsole()
+		if not kernel32.AttachConsole(pid):
+			return 0
+		try:
+			return kernel32.GetConsoleWindow() or 0
+		finally:
+			kernel32.FreeConsole()
+
+
+def _clase_ventana(hwnd: int) -> str:
+	"""Nombre de la clase de una ventana."""
+	buffer = ctypes.create_unicode_buffer(256)
+	ctypes.windll.user32.GetClassNameW(hwnd, buffer, len(buffer))
+	return buffer.value
+
+
+def _abrir_proceso(pid: int, acceso: int):
+	"""Handle de un proceso, o None si no se puede abrir."""
+	kernel32 = ctypes.windll.kernel32
+	kernel32.OpenProcess.restype = ctypes.wintypes.HANDLE
+	return kernel32.OpenProcess(acceso, False, pid) or None
+
+
+def _hora_creacion(pid: int) -> Optional[int]:
+	"""Instante de creación de un proceso (FILETIME), o None si no existe."""
+	kernel32 = ctypes.windll.kernel32
+	handle = _abrir_proceso(pid, PROCESS_QUERY_LIMITED_INFORMATION)
+	if handle is None:
+		return None
+	try:
+		tiempos = [ctypes.wintypes.FILETIME() for unused_ in range(4)]
+		if not kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in tiempos]):
+			return None
+		return (tiempos[0].dwHighDateTime << 32) | tiempos[0].dwLowDateTime
+	finally:
+		kernel32.CloseHandle(handle)
+
+
+def _memoria_proceso_mb(pid: int) -> float:
+	"""Conjunto de trabajo de un proceso en MB, o 0 si no se puede consultar."""
+	kernel32 = ctypes.windll.kernel32
+	handle = _abrir_proceso(pid, PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ)
+	if handle is None:
+		return 0.0
+	try:
+		contadores = _PROCESS_MEMORY_COUNTERS()
+		contadores.cb = ctypes.sizeof(contadores)
+		if not kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(contadores), contadores.cb):
+			return 0.0
+		return contadores.WorkingSetSize / (1024 * 1024)
+	finally:
+		kernel32.CloseHandle(handle)
+
+
+def _terminar_pid(pid: int) -> bool:
+	"""Termina un proceso y los que haya iniciado (vcvars, etc.).
+	
+	Returns:
+		True si taskkill pudo ejecutarse.
+	"""
+	try:
+		subprocess.run(
+			["taskkill", "/T", "/F", "/PID", str(pid)],
+			creationflags=subprocess.CREATE_NO_WINDOW,
+			stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+			timeout=5
+		)
+		return True
+	except (OSError, subprocess.TimeoutExpired):
+		return False
+
+
+def _terminar_proceso(proceso: subprocess.Popen):
+	"""Termina un proceso de consola iniciado por el grupo."""
+	if proceso.poll() is not None:
+		return
+	if not _terminar_pid(proceso.pid):
+		proceso.kill()
+	try:
+		proceso.wait(timeout=1)
+	except subprocess.TimeoutExpired:
+		pass
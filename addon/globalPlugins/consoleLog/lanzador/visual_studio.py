@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Detección de Visual Studio
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Búsqueda acotada de las instalaciones de Visual Studio.
+
+En lugar de recorrer todo el árbol de Visual Studio buscando los
+`vcvars*.bat`, solo se miran los lugares conocidos:
+
+- Los metadatos del instalador (`_Instances\\*\\state.json` en
+  ProgramData), que indican la ruta, la versión y la edición de cada
+  instalación.
+- `<raíz>\\<año>\\<edición>\\VC\\Auxiliary\\Build`, para instalaciones
+  cuyos metadatos no estén disponibles.
+
+Se devuelven todas las instalaciones y todas las arquitecturas, no solo
+la primera coincidencia.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from logHandler import log
+
+
+# Ruta de los scripts de entorno dentro de una instalación
+SUBDIRECTORIO_SCRIPTS = os.path.join("VC", "Auxiliary", "Build")
+
+
+@dataclass
+class InstalacionVisualStudio:
+	"""Una instalación de Visual Studio con sus scripts de entorno."""
+	ruta: str
+	version: str
+	edicion: str
+	# Arquitectura ("32", "64", "x86_arm64"...) -> ruta del vcvars*.bat
+	scripts: Dict[str, str] = field(default_factory=dict)
+
+
+def directorio_instancias() -> str:
+	"""Directorio donde el instalador de Visual Studio guarda sus instancias."""
+	return os.path.join(
+		os.environ.get("ProgramData", "C:\\ProgramData"),
+		"Microsoft", "VisualStudio", "Packages", "_Instances"
+	)
+
+
+def _listar_directorios(ruta: str) -> List[str]:
+	"""Nombres de los subdirectorios de una ruta, o ninguno si no existe."""
+	try:
+		with os.scandir(ruta) as iterador:
+			return [entrada.name for entrada in iterador if entrada.is_dir()]
+	except OSError:
+		return []
+
+
+def buscar_scripts(ruta_instalacion: str) -> Dict[str, str]:
+	"""Scripts `vcvars*.bat` de una instalación, por arquitectura.
+	
+	Args:
+		ruta_instalacion: Directorio raíz de la instalación.
+	
+	Returns:
+		Diccionario arquitectura -> ruta del script.
+	"""
+	directorio = os.path.join(ruta_instalacion, SUBDIRECTORIO_SCRIPTS)
+	scripts = {}
+	try:
+		with os.scandir(directorio) as iterador:
+			for entrada in iterador:
+				nombre = entrada.name.lower()
+				# vcvarsall.bat necesita la arquitectura como argumento
+				if nombre.startswith("vcvars") and nombre.endswith(".bat") and nombre != "vcvarsall.bat":
+					scripts[nombre[len("vcvars"):-len(".bat")]] = entrada.path
+	except OSError:
+		pass
+	return scripts
+
+
+def _leer_instancia(ruta_estado: str) -> Optional[InstalacionVisualStudio]:
+	"""Lee el state.json de una instancia del instalador.
+	
+	Args:
+		ruta_estado: Ruta del archivo state.json.
+	
+	Returns:
+		Instalación descrita, o None si el archivo no es válido.
+	"""
+	try:
+		with open(ruta_estado, "r", encoding="utf-8-sig") as archivo:
+			estado = json.load(archivo)
+		ruta = estado["installationPath"]
+	except (OSError, ValueError, KeyError, TypeError) as e:
+		log.debug(f"consoleLog: Instancia de Visual Studio ilegible {ruta_estado}: {e}")
+		return None
+	catalogo = estado.get("catalogInfo") or {}
+	producto = (estado.get("product") or {}).get("id", "")
+	return InstalacionVisualStudio(
+		ruta=ruta,
+		version=str(catalogo.get("productLineVersion") or estado.get("installationVersion", "")),
+		# Microsoft.VisualStudio.Product.Community -> Community
+		edicion=producto.rsplit(".", 1)[-1] if producto else os.path.basename(ruta)
+	)
+
+
+def buscar_instalaciones(raices: List[str], instancias: Optional[str] = None) -> List[InstalacionVisualStudio]:
+	"""Busca las instalaciones de Visual Studio que tienen scripts de entorno.
+	
+	Args:
+		raices: Directorios "Microsoft Visual Studio" de Archivos de programa.
+		instancias: Directorio de instancias del instalador; por defecto el de ProgramData.
+	
+	Returns:
+		Instalaciones encontradas, de la versión más reciente a la más antigua.
+	"""
+	if instancias is None:
+		instancias = directorio_instancias()
+	encontradas: Dict[str, InstalacionVisualStudio] = {}
+	
+	for nombre in _listar_directorios(instancias):
+		instalacion = _leer_instancia(os.path.join(instancias, nombre, "state.json"))
+		if instalacion is not None:
+			encontradas.setdefault(os.path.normcase(os.path.normpath(instalacion.ruta)), instalacion)
+	
+	# Instalaciones sin metadatos: solo los niveles <año>\<edición>
+	for raiz in raices:
+		for version in _listar_directorios(raiz):
+			for edicion in _listar_directorios(os.path.join(raiz, version)):
+				ruta = os.path.join(raiz, version, edicion)
+				encontradas.setdefault(
+					os.path.normcase(os.path.normpath(ruta)),
+					InstalacionVisualStudio(ruta=ruta, version=version, edicion=edicion)
+				)
+	
+	instalaciones = []
+	for instalacion in encontradas.values():
+		instalacion.scripts = buscar_scripts(instalacion.ruta)
+		if instalacion.scripts:
+			instalaciones.append(instalacion)
+	instalaciones.sort(key=lambda i: (i.version, i.edicion), reverse=True)
+	return instalaciones
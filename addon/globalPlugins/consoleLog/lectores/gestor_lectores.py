@@ -86,39 +86,103 @@ class GestorLectores:
 			cola_datos: Cola para almacenar resultados.
 		"""
 		try:
-			if tipo_consola == 'terminal':
-				resultado = self._lector_terminal.leer(
-					objeto_ventana,
-					senal_parar=self._senal_parar
-				)
-			else:  # clasica
-				try:
-					resultado = self._lector_clasico.leer(
-						objeto_ventana,
-						senal_parar=self._senal_parar
-					)
-				except Exception as e:
-					# Si falla el método clásico (ej: consola Admin), intentar vía UIA como fallback
-					log.debug(f"consoleLog: Falló el lector clásico, intentando fallback UIA: {e}")
-					try:
-						# Reiniciar señal de parar para el nuevo intento
-						self._senal_parar.clear()
-						resultado = self._lector_terminal.leer(
-							objeto_ventana,
-							senal_parar=self._senal_parar
-						)
-					except Exception:
-						# Si ambos fallan, relanzar el error original o uno más informativo
-						if "adjuntar" in str(e).lower() or "5" in str(e): # Error 5 is Access Denied
-							raise Exception(_("No se puede leer una consola administrada si NVDA no se ejecuta como administrador."))
-						raise e
-			
+			resultado = self._leer(tipo_consola, objeto_ventana, self._senal_parar)
 			cola_datos.put(('exito', resultado))
 			
 		except Exception as e:
 			log.error(f"consoleLog: Error en lectura de consola: {e}")
 			cola_datos.put(('error', str(e)))
 	
+	def _leer(
+		self,
+		tipo_consola: str,
+		objeto_ventana: Any,
+		senal_parar: threading.Event,
+		emitir_beep: bool = True
+	) -> str:
+		"""Lee una consola con el lector adecuado a su tipo.
+		
+		Args:
+			tipo_consola: Tipo de consola.
+			objeto_ventana: Objeto de la ventana.
+			senal_parar: Evento para detener la lectura.
+			emitir_beep: Si se debe emitir un beep durante la lectura.
+		
+		Returns:
+			Texto de la consola.
+		"""
+		if tipo_consola == 'terminal':
+			return self._lector_terminal.leer(
+				objeto_ventana,
+				senal_parar=senal_parar,
+				emitir_beep=emitir_beep
+			)
+		# clasica
+		try:
+			return self._lector_clasico.leer(
+				objeto_ventana,
+				senal_parar=senal_parar,
+				emitir_beep=emitir_beep
+			)
+		except Exception as e:
+			# Si falla el método clásico (ej: consola Admin), intentar vía UIA como fallback
+			log.debug(f"consoleLog: Falló el lector clásico, intentando fallback UIA: {e}")
+			try:
+				# Reiniciar señal de parar para el nuevo intento
+				senal_parar.clear()
+				return self._lector_terminal.leer(
+					objeto_ventana,
+					senal_parar=senal_parar,
+					emitir_beep=emitir_beep
+				)
+			except Exception:
+				# Si ambos fallan, relanzar el error original o uno más informativo
+				if "adjuntar" in str(e).lower() or "5" in str(e): # Error 5 is Access Denied
+					raise Exception(_("No se puede leer una consola administrada si NVDA no se ejecuta como administrador."))
+				raise e
+	
+	def leer_sincrono(self, tipo_consola: str, objeto_ventana: Any) -> str:
+		"""Lee una consola completa en el hilo que llama, sin sonidos.
+		
+		Pensado para hilos en segundo plano; no interfiere con la lectura
+		asíncrona del visor.
+		
+		Args:
+			tipo_consola: Tipo de consola ('clasica' o 'terminal').
+			objeto_ventana: Objeto NVDA de la ventana de consola.
+		
+		Returns:
+			Texto de la consola.
+		"""
+		return self._leer(tipo_consola, objeto_ventana, threading.Event(), emitir_beep=False)
+	
+	def leer_linea_cursor(self, tipo_consola: str, hwnd: int) -> str:
+		"""Lee solo la línea del cursor de una consola (lectura mínima).
+		
+		Args:
+			tipo_consola: Tipo de consola ('clasica' o 'terminal').
+			hwnd: Handle de la ventana de consola.
+		
+		Returns:
+			Texto de la línea del cursor.
+		"""
+		if tipo_consola == 'terminal':
+			return self._lector_terminal.leer_linea_cursor(hwnd)
+		try:
+			return self._lector_clasico.leer_fila_cursor(hwnd)
+		except Exception as e:
+			# Consolas elevadas o de conpty: probar vía UIA
+			log.debug(f"consoleLog: Falló la lectura de la fila del cursor, intentando UIA: {e}")
+			return self._lector_terminal.leer_linea_cursor(hwnd)
+	
+	def olvidar_ventana(self, hwnd: int):
+		"""Libera los recursos recordados para muestrear una ventana.
+		
+		Args:
+			hwnd: Handle de la ventana de consola.
+		"""
+		self._lector_terminal.olvidar_ventana(hwnd)
+	
 	def _verificar_resultado(
 		self,
 		cola_datos: queue.Queue,
@@ -29,6 +29,10 @@ if not callable(_):
 # Constantes de Windows
 STD_OUTPUT_HANDLE = -11
 
+# AttachConsole afecta a todo el proceso de NVDA: solo puede haber una
+# consola adjunta a la vez, así que toda lectura pasa por este bloqueo
+BLOQUEO_CONSOLA = threading.Lock()
+
 
 # Estructuras de datos para la API de Windows
 class COORD(ctypes.Structure):
@@ -118,30 +122,14 @@ class LectorConsolaClasica:
 			if hwnd == 0:
 				raise Exception(_("No se pudo encontrar la ventana de la consola."))
 			
-			# Obtener ID del proceso
-			process_id = ctypes.c_uint32()
-			self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process_id))
-			
-			# Adjuntar a la consola
-			self._kernel32.FreeConsole()
-			if not self._kernel32.AttachConsole(process_id.value):
-				error_code = self._kernel32.GetLastError()
-				if error_code == 5:  # Access Denied
-					raise Exception(_("Acceso denegado: No se puede leer una consola elevada desde una instancia de NVDA no elevada."))
-				raise Exception(_("No se pudo adjuntar a la consola del proceso (Error {}).").format(error_code))
-			
-			try:
-				# Obtener handle del buffer de salida
-				hConsole = self._kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
-				if hConsole == -1:
-					raise Exception(_("No se pudo obtener el manejador de la consola."))
-				
-				# Leer contenido del buffer
-				texto = self._leer_buffer_consola(hConsole)
-				
-			finally:
-				# Siempre liberar la consola
-				self._kernel32.FreeConsole()
+			with BLOQUEO_CONSOLA:
+				hConsole = self._adjuntar(hwnd)
+				try:
+					# Leer contenido del buffer
+					texto = self._leer_buffer_consola(hConsole)
+				finally:
+					# Siempre liberar la consola
+					self._kernel32.FreeConsole()
 			
 			return texto
 			
@@ -150,6 +138,73 @@ class LectorConsolaClasica:
 			if senal_parar:
 				senal_parar.set()
 	
+	def _adjuntar(self, hwnd: int) -> int:
+		"""Adjunta NVDA a la consola de una ventana.
+		
+		Debe llamarse con `BLOQUEO_CONSOLA` adquirido y liberarse con FreeConsole.
+		
+		Args:
+			hwnd: Handle de la ventana de consola.
+		
+		Returns:
+			Handle del buffer de salida de la consola.
+		
+		Raises:
+			Exception: Si no se puede adjuntar a la consola.
+		"""
+		# Obtener ID del proceso
+		process_id = ctypes.c_uint32()
+		self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process_id))
+		
+		# Adjuntar a la consola
+		self._kernel32.FreeConsole()
+		if not self._kernel32.AttachConsole(process_id.value):
+			error_code = self._kernel32.GetLastError()
+			if error_code == 5:  # Access Denied
+				raise Exception(_("Acceso denegado: No se puede leer una consola elevada desde una instancia de NVDA no elevada."))
+			raise Exception(_("No se pudo adjuntar a la consola del proceso (Error {}).").format(error_code))
+		
+		# Obtener handle del buffer de salida
+		hConsole = self._kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
+		if hConsole == -1:
+			self._kernel32.FreeConsole()
+			raise Exception(_("No se pudo obtener el manejador de la consola."))
+		return hConsole
+	
+	def leer_fila_cursor(self, hwnd: int) -> str:
+		"""Lee solo la fila en la que está el cursor de la consola.
+		
+		Es una lectura mínima (una fila del buffer) pensada para muestrear
+		la consola con frecuencia sin leer el buffer completo.
+		
+		Args:
+			hwnd: Handle de la ventana de consola.
+		
+		Returns:
+			Texto de la fila del cursor, sin espacios a la derecha.
+		
+		Raises:
+			Exception: Si no se puede adjuntar a la consola.
+		"""
+		with BLOQUEO_CONSOLA:
+			hConsole = self._adjuntar(hwnd)
+			try:
+				csbi = CONSOLE_SCREEN_BUFFER_INFO()
+				self._kernel32.GetConsoleScreenBufferInfo(hConsole, ctypes.byref(csbi))
+				ancho = csbi.dwSize.X
+				buffer = ctypes.create_unicode_buffer(ancho)
+				leidos = ctypes.c_ulong()
+				self._kernel32.ReadConsoleOutputCharacterW(
+					hConsole,
+					buffer,
+					ancho,
+					COORD(0, csbi.dwCursorPosition.Y),
+					ctypes.byref(leidos)
+				)
+				return buffer[:leidos.value].rstrip()
+			finally:
+				self._kernel32.FreeConsole()
+	
 	def _obtener_hwnd_consola(self, objeto_ventana: Any) -> int:
 		"""Obtiene el handle de la ventana de consola.
 		
@@ -33,6 +33,8 @@ class LectorWindowsTerminal:
 	def __init__(self):
 		"""Inicializa el lector de Windows Terminal."""
 		self._uia_inicializado = False
+		# Patrones de texto de las ventanas vigiladas, por handle
+		self._patrones_ventana = {}
 	
 	def leer(
 		self,
@@ -246,6 +248,76 @@ class LectorWindowsTerminal:
 			patron = None
 			elemento = None
 	
+	def _patron_de_ventana(self, hwnd: int) -> Any:
+		"""Busca el patrón de texto de la pestaña visible de una ventana.
+		
+		Args:
+			hwnd: Handle de la ventana de terminal.
+		
+		Returns:
+			IUIAutomationTextPattern o None si no se encuentra.
+		"""
+		handler = getattr(UIAHandler, "handler", None)
+		if not handler or not handler.clientObject:
+			return None
+		client = handler.clientObject
+		root = client.ElementFromHandle(hwnd)
+		cond_texto = client.CreatePropertyCondition(UIAHandler.UIA_IsTextPatternAvailablePropertyId, True)
+		elementos = root.FindAll(UIAHandler.TreeScope_Descendants, cond_texto)
+		for i in range(elementos.Length if elementos else 0):
+			elemento = elementos.GetElement(i)
+			# Las pestañas inactivas están fuera de pantalla
+			if elemento.CurrentIsOffscreen:
+				continue
+			patron = elemento.GetCurrentPattern(UIAHandler.UIA_TextPatternId)
+			if patron:
+				return patron.QueryInterface(UIAHandler.IUIAutomationTextPattern)
+		return None
+	
+	def leer_linea_cursor(self, hwnd: int) -> str:
+		"""Lee solo la línea del cursor de un terminal, aunque no tenga el foco.
+		
+		El patrón de texto de cada ventana se recuerda entre llamadas para
+		que muestrear con frecuencia no recorra el árbol de UI Automation.
+		
+		Args:
+			hwnd: Handle de la ventana de terminal.
+		
+		Returns:
+			Texto de la línea del cursor.
+		
+		Raises:
+			Exception: Si no se puede acceder al texto del terminal.
+		"""
+		for intento in range(2):
+			patron = self._patrones_ventana.get(hwnd)
+			if patron is None:
+				patron = self._patron_de_ventana(hwnd)
+				if patron is None:
+					raise Exception(_("No se pudo identificar el área de texto activa."))
+				self._patrones_ventana[hwnd] = patron
+			try:
+				rangos = patron.GetSelection()
+				if not rangos or rangos.Length == 0:
+					return ""
+				rango = rangos.GetElement(0)
+				rango.ExpandToEnclosingUnit(UIAHandler.UIA.TextUnit_Line)
+				return (rango.GetText(-1) or "").rstrip()
+			except Exception:
+				# La pestaña cambió o el elemento ya no existe: buscarlo de nuevo
+				self._patrones_ventana.pop(hwnd, None)
+				if intento:
+					raise
+		return ""
+	
+	def olvidar_ventana(self, hwnd: int):
+		"""Libera el patrón recordado de una ventana que ya no se vigila.
+		
+		Args:
+			hwnd: Handle de la ventana de terminal.
+		"""
+		self._patrones_ventana.pop(hwnd, None)
+	
 	def obtener_informacion_terminal(self) -> dict:
 		"""Obtiene información sobre el terminal.
 		
@@ -9,28 +9,84 @@ Módulo nucleo del complemento.
 Contiene:
 - Configuración
 - Gestión de plugins
+- Manifiesto en caché de los plugins para cargarlos bajo demanda
+- Ejecución de plugins en segundo plano
+- Caché de resultados de plugins
+- Captura con índice compacto de líneas
+- Planificación adaptativa del modo seguimiento
+- Líneas nuevas entre capturas y motor de alertas
+- Hora de llegada de cada línea
+- División de las capturas en bloques de comando
+- Aviso de fin de los comandos largos
+- Monitor de alertas de varias consolas en segundo plano
+- Grabación en disco del historial de las sesiones
+- Índice de búsqueda del historial grabado
+- Ingesta incremental de la salida capturada de las consolas
+- Apertura y seguimiento de archivos de registro grandes
+- Tiempos y memoria de las llamadas a los plugins
+- Orden de carga de los plugins según sus dependencias
+- Análisis conjunto de una captura por los plugins de análisis
+
+Los nombres exportados se importan en el primer acceso, de modo que
+importar un submódulo (por ejemplo, `nucleo.configuracion` al arrancar
+NVDA) no arrastra al resto del paquete.
 """
 
-from .configuracion import (
-	Configuracion,
-	ConfiguracionVisor,
-	ConfiguracionLanzador,
-	ConfiguracionPlugins,
-	ConfiguracionGeneral
-)
-from .gestor_plugins import (
-	GestorPlugins,
-	PluginBase,
-	MetadatosPlugin
-)
-
-__all__ = [
-	'Configuracion',
-	'ConfiguracionVisor',
-	'ConfiguracionLanzador',
-	'ConfiguracionPlugins',
-	'ConfiguracionGeneral',
-	'GestorPlugins',
-	'PluginBase',
-	'MetadatosPlugin'
-]
+import importlib
+
+# Nombre exportado -> submódulo que lo define
+_EXPORTACIONES = {
+	'Configuracion': 'configuracion',
+	'ConfiguracionVisor': 'configuracion',
+	'ConfiguracionLanzador': 'configuracion',
+	'ConfiguracionPlugins': 'configuracion',
+	'ConfiguracionGrabacion': 'configuracion',
+	'ConfiguracionAnuncios': 'configuracion',
+	'ConfiguracionGeneral': 'configuracion',
+	'GestorPlugins': 'gestor_plugins',
+	'PluginBase': 'gestor_plugins',
+	'MetadatosPlugin': 'gestor_plugins',
+	'ManifiestoPlugins': 'manifiesto_plugins',
+	'EntradaManifiesto': 'manifiesto_plugins',
+	'EjecutorPlugins': 'ejecutor_plugins',
+	'TareaPlugin': 'ejecutor_plugins',
+	'CacheResultados': 'cache_resultados',
+	'Captura': 'captura',
+	'PlanificadorAdaptativo': 'planificador',
+	'PlanificadorCompartido': 'planificador',
+	'SeguidorCapturas': 'diferencias',
+	'DeltaCaptura': 'diferencias',
+	'MotorAlertas': 'motor_alertas',
+	'CoincidenciaAlerta': 'motor_alertas',
+	'MarcasTiempo': 'marcas_tiempo',
+	'SegmentadorComandos': 'segmentador',
+	'BloqueComando': 'segmentador',
+	'VigilanteComandos': 'vigilante_comandos',
+	'AvisoFinComando': 'vigilante_comandos',
+	'ServicioMonitor': 'servicio_monitor',
+	'ConsolaMonitorizada': 'servicio_monitor',
+	'GrabadorSesion': 'grabador_sesion',
+	'IndiceHistorial': 'indice_historial',
+	'IngestorFlujo': 'ingesta',
+	'SeguidorArchivo': 'ingesta',
+	'ArchivoRegistro': 'archivo_registro',
+	'PerfiladorPlugins': 'perfilador',
+	'PlanCarga': 'dependencias_plugins',
+	'AnalizadorTexto': 'analisis',
+}
+
+__all__ = list(_EXPORTACIONES)
+
+
+def __getattr__(nombre):
+	"""Importa el submódulo de un nombre exportado en su primer acceso."""
+	modulo = _EXPORTACIONES.get(nombre)
+	if modulo is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+	valor = getattr(importlib.import_module(f".{modulo}", __name__), nombre)
+	globals()[nombre] = valor
+	return valor
+
+
+def __dir__():
+	return sorted(set(globals()) | set(__all__))
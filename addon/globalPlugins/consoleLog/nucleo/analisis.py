@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Análisis Conjunto
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Análisis de una captura por varios plugins en una sola pasada.
+
+Los plugins de análisis (filtro de errores, extractor de datos,
+historial de comandos...) ofrecen un `AnalizadorTexto` con
+`PluginBase.crear_analizador`. `analizar` recorre la captura una sola
+vez, en tramos de líneas completas, y entrega cada tramo a todos los
+analizadores mientras está en la caché del procesador, en lugar de que
+cada plugin recorra el texto entero por su cuenta.
+
+Los tramos son posiciones dentro del texto de la captura (no copias), y
+cada analizador busca en ellos con `finditer(texto, inicio, fin)`. Un
+plugin ejecutado solo usa el mismo analizador, así que su resultado es
+el mismo que en el análisis conjunto.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional
+
+from .captura import Captura
+
+
+# Caracteres aproximados de cada tramo (siempre se corta al final de una línea)
+TAMANO_TRAMO = 256 * 1024
+
+
+class AnalizadorTexto(ABC):
+	"""Acumula el resultado de un plugin a medida que recibe los tramos de la captura.
+	
+	Cada instancia sirve para un solo análisis.
+	"""
+	
+	@abstractmethod
+	def procesar(self, texto: str, inicio: int, fin: int, primera_linea: int):
+		"""Analiza un tramo de líneas completas.
+		
+		Args:
+			texto: Texto completo de la captura.
+			inicio: Posición donde empieza el tramo (inicio de una línea).
+			fin: Posición siguiente al último salto de línea del tramo (o el final del texto).
+			primera_linea: Índice (base 0) de la primera línea del tramo.
+		"""
+		pass
+	
+	@abstractmethod
+	def resultado(self) -> Any:
+		"""Resultado del plugin con todo lo recibido."""
+		pass
+
+
+def tramos(captura: Captura, tamano: int = TAMANO_TRAMO):
+	"""Divide una captura en tramos de líneas completas.
+	
+	Args:
+		captura: Contenido a recorrer.
+		tamano: Caracteres aproximados de cada tramo.
+	
+	Yields:
+		Tuplas (inicio, fin, primera_linea) con posiciones en `captura.texto`.
+	"""
+	total = len(captura)
+	linea = 0
+	while linea < total:
+		inicio = captura.inicio_linea(linea)
+		# La línea que contiene la posición límite entra entera en el tramo
+		siguiente = min(total, max(linea + 1, captura.numero_linea(inicio + tamano) + 1))
+		yield inicio, captura.inicio_linea(siguiente), linea
+		linea = siguiente
+
+
+def analizar(
+	captura: Captura,
+	analizadores: List[AnalizadorTexto],
+	senal_parar: Optional[threading.Event] = None
+) -> Optional[List[Any]]:
+	"""Recorre la captura una vez y entrega cada tramo a todos los analizadores.
+	
+	Args:
+		captura: Contenido a analizar.
+		analizadores: Analizadores nuevos, uno por plugin.
+		senal_parar: Si se activa, el análisis se abandona entre dos tramos.
+	
+	Returns:
+		Resultado de cada analizador, en el mismo orden, o None si se canceló.
+	"""
+	texto = captura.texto
+	for inicio, fin, primera_linea in tramos(captura):
+		if senal_parar is not None and senal_parar.is_set():
+			return None
+		for analizador in analizadores:
+			analizador.procesar(texto, inicio, fin, primera_linea)
+	return [analizador.resultado() for analizador in analizadores]
+
+
+def lineas_coincidentes(expresion, texto: str, inicio: int, fin: int) -> List[str]:
+	"""Líneas de un tramo en las que una expresión encuentra algo.
+	
+	Busca en el texto del tramo sin dividirlo en líneas: tras cada
+	coincidencia se salta al final de su línea.
+	
+	Args:
+		expresion: Expresión regular compilada.
+		texto: Texto completo de la captura.
+		inicio: Inicio del tramo.
+		fin: Final del tramo.
+	
+	Returns:
+		Líneas coincidentes, sin el salto final.
+	"""
+	lineas = []
+	posicion = inicio
+	while posicion < fin:
+		coincidencia = expresion.search(texto, posicion, fin)
+		if coincidencia is None:
+			break
+		principio = texto.rfind("\n", inicio, coincidencia.start()) + 1 or inicio
+		final = texto.find("\n", coincidencia.start(), fin)
+		if final == -1:
+			final = fin
+		lineas.append(texto[principio:final])
+		posicion = final + 1
+	return lineas
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Archivo de Registro
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Apertura y seguimiento de archivos de registro de cualquier tamaño.
+
+`ArchivoRegistro` recorre el archivo una sola vez proyectado en memoria
+(`mmap`) y guarda el desplazamiento en bytes de cada línea en un
+`array`, sin decodificar el texto. El visor muestra solo una ventana de
+líneas (las últimas, por defecto), que se lee con ese índice, así que
+abrir un archivo de 1 GB no lo carga entero.
+
+En el seguimiento solo se leen los bytes añadidos tras el último
+desplazamiento. Si el archivo se recorta, se sustituye por otro
+(rotación) o cambia su principio, se vuelve a indexar desde cero.
+
+La proyección se cierra al terminar cada pasada: en Windows, mientras un
+archivo está proyectado, el programa que lo escribe no puede recortarlo
+ni renombrarlo para rotarlo.
+"""
+
+import mmap
+import os
+from array import array
+from itertools import accumulate, islice, repeat
+from operator import add
+from typing import List, Optional, Tuple
+
+from .diferencias import DeltaCaptura
+from .ingesta import limpiar_linea
+
+
+# Bytes que se indexan de cada vez dentro de la proyección
+TAMANO_BLOQUE_INDICE = 16 * 1024 * 1024
+
+# Bytes del principio del archivo que se comparan para detectar que se ha sustituido
+TAMANO_CABECERA = 256
+
+_BOM = b"\xef\xbb\xbf"
+
+
+class ArchivoRegistro:
+	"""Índice de líneas de un archivo de registro, con lectura por el final.
+	
+	Tiene la misma interfaz de lectura que `SeguidorArchivo`: cada llamada
+	a `leer` devuelve un `DeltaCaptura` con lo que hay que mostrar.
+	"""
+	
+	def __init__(self, ruta: str, ventana: int = 50000, codificacion: str = "utf-8"):
+		"""Inicializa el archivo sin leer nada.
+		
+		Args:
+			ruta: Archivo de registro.
+			ventana: Líneas que se muestran al abrirlo (las últimas).
+			codificacion: Codificación del texto.
+		"""
+		self.ruta = ruta
+		self.ventana = max(1, int(ventana))
+		self._codificacion = codificacion
+		# Inicio de cada línea completa y, al final, el de la línea en curso
+		self._inicios = array('I', [0])
+		self._tamano = 0
+		self._identidad: Optional[Tuple[int, int]] = None
+		self._cabecera = b""
+		self._abierto = False
+		# Primera línea (base 0) de la ventana mostrada
+		self.primera_linea = 0
+	
+	@property
+	def lineas(self) -> int:
+		"""Líneas completas (terminadas en salto) indexadas."""
+		return len(self._inicios) - 1
+	
+	@property
+	def lineas_totales(self) -> int:
+		"""Líneas indexadas, incluida la última aunque no tenga salto."""
+		return self.lineas + (1 if self._tamano > self._inicios[-1] else 0)
+	
+	@property
+	def tamano(self) -> int:
+		"""Bytes indexados."""
+		return self._tamano
+	
+	def leer(self) -> DeltaCaptura:
+		"""Indexa el archivo la primera vez y después solo lo añadido.
+		
+		Returns:
+			Al abrir (o si el archivo se ha recortado o rotado, o han llegado
+			más bytes de los que caben en la ventana), las últimas líneas con
+			`reinicio`; en otro caso, las líneas nuevas, con la pendiente al
+			final como en las capturas.
+		
+		Raises:
+			OSError: Si el archivo no se puede leer.
+		"""
+		estado = os.stat(self.ruta)
+		identidad = (estado.st_dev, estado.st_ino)
+		if (not self._abierto or identidad != self._identidad or estado.st_size < self._tamano
+				or not self._misma_cabecera()):
+			self.indexar()
+			return self._delta_ventana()
+		if estado.st_size == self._tamano:
+			return DeltaCaptura(self.lineas)
+		
+		anteriores = self.lineas
+		inicio_pendiente = self._inicios[-1]
+		habia_pendiente = self._tamano > inicio_pendiente
+		self._indexar_desde(self._tamano)
+		if self.lineas - anteriores > self.ventana:
+			# Ha llegado de golpe más de lo que se muestra: se vuelve a la cola
+			return self._delta_ventana()
+		lineas = self._decodificar(self._leer_bytes(inicio_pendiente, self._tamano))
+		return DeltaCaptura(anteriores, lineas, sustituye_pendiente=habia_pendiente)
+	
+	def indexar(self):
+		"""Recorre el archivo entero y reconstruye el índice de líneas.
+		
+		Raises:
+			OSError: Si el archivo no se puede leer.
+		"""
+		self._inicios = array('I', [0])
+		self._tamano = 0
+		estado = os.stat(self.ruta)
+		self._identidad = (estado.st_dev, estado.st_ino)
+		self._indexar_desde(0)
+		self._cabecera = self._leer_bytes(0, min(self._tamano, TAMANO_CABECERA))
+		self._abierto = True
+	
+	def leer_lineas(self, desde: int, hasta: Optional[int] = None) -> List[str]:
+		"""Lee un rango de líneas del archivo usando el índice.
+		
+		Args:
+			desde: Índice (base 0) de la primera línea.
+			hasta: Índice siguiente a la última (por defecto, hasta el final,
+				incluida la línea sin salto).
+		
+		Returns:
+			Líneas del rango, sin escapes ANSI.
+		"""
+		total = self.lineas_totales
+		hasta = total if hasta is None else min(hasta, total)
+		desde = max(0, desde)
+		if desde >= hasta:
+			return []
+		fin = self._inicios[hasta] if hasta <= self.lineas else self._tamano
+		return self._decodificar(self._leer_bytes(self._inicios[desde], fin))[:hasta - desde]
+	
+	def _delta_ventana(self) -> DeltaCaptura:
+		"""Las últimas `ventana` líneas, para mostrarlas en lugar de lo anterior."""
+		self.primera_linea = max(0, self.lineas_totales - self.ventana)
+		return DeltaCaptura(self.primera_linea, self.leer_lineas(self.primera_linea), reinicio=True)
+	
+	def _indexar_desde(self, posicion: int):
+		"""Añade al índice los saltos de línea desde una posición hasta el final.
+		
+		Args:
+			posicion: Byte desde el que se busca (el tamaño indexado hasta ahora).
+		"""
+		with open(self.ruta, "rb") as archivo:
+			tamano = os.fstat(archivo.fileno()).st_size
+			if tamano <= posicion:
+				return
+			if tamano >= 2 ** 32 and self._inicios.typecode == 'I':
+				self._inicios = array('Q', self._inicios)
+			with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+				inicios = self._inicios
+				while posicion < tamano:
+					fin = min(posicion + TAMANO_BLOQUE_INDICE, tamano)
+					partes = mapa[posicion:fin].split(b"\n")
+					# Cada parte salvo la última termina en un salto: su final +1
+					# es el inicio de la línea siguiente
+					inicios.extend(islice(
+						accumulate(map(add, map(len, partes[:-1]), repeat(1)), initial=posicion), 1, None
+					))
+					posicion = fin
+		self._tamano = tamano
+	
+	def _leer_bytes(self, desde: int, hasta: int) -> bytes:
+		"""Lee un rango de bytes del archivo (sin mantenerlo abierto)."""
+		if hasta <= desde:
+			return b""
+		with open(self.ruta, "rb") as archivo:
+			archivo.seek(desde)
+			return archivo.read(hasta - desde)
+	
+	def _misma_cabecera(self) -> bool:
+		"""Comprueba que el principio del archivo no ha cambiado desde que se indexó."""
+		if not self._cabecera:
+			return True
+		try:
+			return self._leer_bytes(0, len(self._cabecera)) == self._cabecera
+		except OSError:
+			return False
+	
+	def _decodificar(self, datos: bytes) -> List[str]:
+		"""Convierte bytes de líneas enteras en texto limpio.
+		
+		Args:
+			datos: Bytes desde el inicio de una línea.
+		
+		Returns:
+			Líneas; si los datos terminan en salto, sin línea vacía final.
+		"""
+		if not datos:
+			return []
+		if datos.startswith(_BOM):
+			datos = datos[len(_BOM):]
+		texto = datos.decode(self._codificacion, errors="replace")
+		if texto.endswith("\n"):
+			texto = texto[:-1]
+		return [limpiar_linea(linea) for linea in texto.split("\n")]
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Caché de Resultados de Plugins
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Caché de resultados de plugins.
+
+Memoriza el resultado de los plugins de análisis indexándolo por
+(nombre del plugin, versión, huella del contenido), de forma que
+repetir un análisis sobre la misma captura sea inmediato.
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+from logHandler import log
+
+
+ClaveCache = Tuple[str, str, str]
+
+
+def calcular_huella(texto: str) -> str:
+	"""Calcula la huella del contenido de una captura.
+	
+	Args:
+		texto: Contenido de la consola.
+	
+	Returns:
+		Huella hexadecimal del contenido.
+	"""
+	return hashlib.blake2b(texto.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def estimar_tamano(valor: Any) -> int:
+	"""Estima la memoria ocupada por un resultado de plugin.
+	
+	Recorre listas, tuplas y diccionarios sumando el tamaño de sus
+	elementos, que es la forma habitual de los resultados de los plugins.
+	
+	Args:
+		valor: Resultado a medir.
+	
+	Returns:
+		Tamaño aproximado en bytes.
+	"""
+	tamano = sys.getsizeof(valor)
+	if isinstance(valor, dict):
+		for clave, elemento in valor.items():
+			tamano += estimar_tamano(clave) + estimar_tamano(elemento)
+	elif isinstance(valor, (list, tuple, set, frozenset)):
+		for elemento in valor:
+			tamano += estimar_tamano(elemento)
+	return tamano
+
+
+class CacheResultados:
+	"""Caché LRU de resultados de plugins limitada en bytes.
+	
+	Es segura para usarse desde varios hilos, ya que los plugins se
+	ejecutan en segundo plano.
+	"""
+	
+	def __init__(self, limite_bytes: int):
+		"""Inicializa la caché.
+		
+		Args:
+			limite_bytes: Tamaño máximo total de los resultados guardados.
+		"""
+		self._limite_bytes = limite_bytes
+		self._entradas: "OrderedDict[ClaveCache, Tuple[Any, int]]" = OrderedDict()
+		self._bytes_usados = 0
+		self._aciertos = 0
+		self._fallos = 0
+		self._bloqueo = threading.Lock()
+	
+	@property
+	def bytes_usados(self) -> int:
+		"""Bytes ocupados actualmente por la caché."""
+		return self._bytes_usados
+	
+	@property
+	def limite_bytes(self) -> int:
+		"""Tamaño máximo de la caché en bytes."""
+		return self._limite_bytes
+	
+	@limite_bytes.setter
+	def limite_bytes(self, valor: int):
+		"""Cambia el tamaño máximo y descarta lo que sobre."""
+		with self._bloqueo:
+			self._limite_bytes = valor
+			self._recortar()
+	
+	def obtener(self, clave: ClaveCache) -> Tuple[bool, Any]:
+		"""Busca un resultado en la caché.
+		
+		Args:
+			clave: Tupla (plugin, versión, huella).
+		
+		Returns:
+			Tupla (encontrado, resultado).
+		"""
+		with self._bloqueo:
+			entrada = self._entradas.get(clave)
+			if entrada is None:
+				self._fallos += 1
+				return False, None
+			self._entradas.move_to_end(clave)
+			self._aciertos += 1
+			return True, entrada[0]
+	
+	def guardar(self, clave: ClaveCache, resultado: Any):
+		"""Guarda un resultado en la caché.
+		
+		Los resultados mayores que el límite completo no se guardan.
+		
+		Args:
+			clave: Tupla (plugin, versión, huella).
+			resultado: Resultado del plugin.
+		"""
+		tamano = estimar_tamano(resultado)
+		with self._bloqueo:
+			if tamano > self._limite_bytes:
+				return
+			anterior = self._entradas.pop(clave, None)
+			if anterior is not None:
+				self._bytes_usados -= anterior[1]
+			self._entradas[clave] = (resultado, tamano)
+			self._bytes_usados += tamano
+			self._recortar()
+	
+	def invalidar_plugin(self, nombre: str):
+		"""Descarta todos los resultados de un plugin.
+		
+		Args:
+			nombre: Nombre del plugin recargado o deshabilitado.
+		"""
+		with self._bloqueo:
+			claves = [clave for clave in self._entradas if clave[0] == nombre]
+			for clave in claves:
+				self._bytes_usados -= self._entradas.pop(clave)[1]
+		if claves:
+			log.debug(f"consoleLog: Caché de {nombre} descartada ({len(claves)} resultados)")
+	
+	def vaciar(self):
+		"""Descarta todos los resultados guardados."""
+		with self._bloqueo:
+			self._entradas.clear()
+			self._bytes_usados = 0
+	
+	def obtener_estadisticas(self) -> dict:
+		"""Obtiene estadísticas de uso de la caché.
+		
+		Returns:
+			Diccionario con entradas, bytes, aciertos y fallos.
+		"""
+		with self._bloqueo:
+			return {
+				'entradas': len(self._entradas),
+				'bytes': self._bytes_usados,
+				'aciertos': self._aciertos,
+				'fallos': self._fallos
+			}
+	
+	def _recortar(self):
+		"""Elimina las entradas menos usadas hasta respetar el límite."""
+		while self._entradas and self._bytes_usados > self._limite_bytes:
+			unused_clave, (unused_resultado, tamano) = self._entradas.popitem(last=False)
+			self._bytes_usados -= tamano
+	
+	def __len__(self) -> int:
+		return len(self._entradas)
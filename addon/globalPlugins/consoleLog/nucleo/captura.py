@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Captura de Consola
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Contenido de una captura con índice compacto de líneas.
+
+Una captura grande se analiza desde varios sitios (seguidor de capturas,
+alertas, plugins) y cada uno la dividía con `splitlines()`, creando
+cientos de miles de cadenas por pasada. `Captura` guarda el texto una
+sola vez junto con los desplazamientos de inicio de cada línea en un
+`array('I')` (4 bytes por línea) y crea las líneas solo cuando se piden.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Union
+
+from .cache_resultados import calcular_huella
+
+
+_SALTO = re.compile("\n")
+
+
+class Captura:
+	"""Texto de una consola con acceso perezoso a sus líneas.
+	
+	Las líneas se separan por "\\n" y, como con `splitlines()`, un salto
+	final no añade una línea vacía. El índice de líneas y la huella se
+	calculan la primera vez que se necesitan y se reutilizan.
+	"""
+	
+	__slots__ = ('texto', '_inicios', '_total', '_huella')
+	
+	def __init__(self, texto: str = ""):
+		"""Inicializa la captura.
+		
+		Args:
+			texto: Contenido completo de la consola.
+		"""
+		self.texto = texto
+		self._inicios: Optional[array] = None
+		self._total = 0
+		self._huella: Optional[str] = None
+	
+	def _indexar(self) -> array:
+		"""Calcula los desplazamientos de inicio de cada línea.
+		
+		Returns:
+			Array con el inicio de cada línea y, al final, la posición
+			siguiente al último carácter (centinela).
+		"""
+		if self._inicios is None:
+			texto = self.texto
+			inicios = array('I', [0])
+			inicios.extend(m.end() for m in _SALTO.finditer(texto))
+			if texto and not texto.endswith("\n"):
+				inicios.append(len(texto) + 1)
+			self._total = len(inicios) - 1
+			self._inicios = inicios
+		return self._inicios
+	
+	def __len__(self) -> int:
+		"""Número de líneas de la captura."""
+		self._indexar()
+		return self._total
+	
+	def __str__(self) -> str:
+		return self.texto
+	
+	def __repr__(self) -> str:
+		return f"Captura({len(self.texto)} caracteres)"
+	
+	def __getitem__(self, indice: Union[int, slice]) -> Union[str, List[str]]:
+		"""Devuelve una línea o una lista de líneas.
+		
+		Args:
+			indice: Índice (base 0, admite negativos) o slice.
+		
+		Returns:
+			Línea sin el salto final, o lista de líneas si es un slice.
+		"""
+		inicios = self._indexar()
+		if isinstance(indice, slice):
+			desde, hasta, paso = indice.indices(self._total)
+			if paso != 1:
+				return [self[i] for i in range(desde, hasta, paso)]
+			return self.lineas(desde, hasta)
+		if indice < 0:
+			indice += self._total
+		if not 0 <= indice < self._total:
+			raise IndexError("línea fuera de la captura")
+		return self.texto[inicios[indice]:inicios[indice + 1] - 1]
+	
+	def __iter__(self) -> Iterator[str]:
+		"""Recorre las líneas sin crear una lista con todas."""
+		inicios = self._indexar()
+		texto = self.texto
+		for i in range(self._total):
+			yield texto[inicios[i]:inicios[i + 1] - 1]
+	
+	def lineas(self, desde: int = 0, hasta: Optional[int] = None) -> List[str]:
+		"""Obtiene un rango de líneas con una sola división del texto.
+		
+		Args:
+			desde: Índice (base 0) de la primera línea.
+			hasta: Índice siguiente a la última línea (por defecto, el final).
+		
+		Returns:
+			Líneas del rango.
+		"""
+		inicios = self._indexar()
+		hasta = self._total if hasta is None else min(hasta, self._total)
+		if desde >= hasta:
+			return []
+		return self.texto[inicios[desde]:inicios[hasta] - 1].split("\n")
+	
+	def inicio_linea(self, indice: int) -> int:
+		"""Posición en el texto donde empieza una línea.
+		
+		Args:
+			indice: Índice (base 0) de la línea; `len(captura)` da el final del texto.
+		
+		Returns:
+			Desplazamiento en caracteres.
+		"""
+		inicios = self._indexar()
+		return min(inicios[indice], len(self.texto))
+	
+	def numero_linea(self, posicion: int) -> int:
+		"""Índice de la línea que contiene una posición del texto.
+		
+		Args:
+			posicion: Desplazamiento en caracteres.
+		
+		Returns:
+			Índice (base 0) de la línea.
+		"""
+		inicios = self._indexar()
+		return max(0, min(bisect_right(inicios, posicion) - 1, self._total - 1))
+	
+	@property
+	def huella(self) -> str:
+		"""Huella del contenido para la caché de resultados."""
+		if self._huella is None:
+			self._huella = calcular_huella(self.texto)
+		return self._huella
+
+
+def como_captura(valor: Union[str, Captura, None]) -> Captura:
+	"""Devuelve una `Captura`, creándola si se recibe texto.
+	
+	Args:
+		valor: Texto, captura existente o None.
+	
+	Returns:
+		Captura del valor.
+	"""
+	if isinstance(valor, Captura):
+		return valor
+	return Captura(valor or "")
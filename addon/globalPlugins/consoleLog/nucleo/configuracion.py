@@ -31,16 +31,28 @@ class ConfiguracionVisor:
 	tamanio_fuente: int = 10
 	sonidos_seguimiento: bool = True
 	categorizar_plugins: bool = True
-	intervalo_seguimiento: int = 2
+	intervalo_seguimiento_minimo: float = 0.5
+	intervalo_seguimiento_maximo: float = 10.0
+	factor_espera_seguimiento: float = 1.5
 	sonidos_al_actualizar: bool = False
+	# Líneas del final de un archivo de registro que se muestran al abrirlo
+	max_lineas_archivo: int = 50000
 
 
 @dataclass
 class ConfiguracionLanzador:
 	"""Configuración del lanzador de consolas."""
 	recordar_ultima_opcion: bool = False
-	ultima_opcion: int = 0
+	# Clave de la última opción abierta (`OpcionConsola.clave`); la lista cambia durante la detección
+	ultima_consola: str = ""
 	mostrar_consolas_no_disponibles: bool = False
+	# Consolas ocultas ya iniciadas para que abrir sea instantáneo
+	pool_habilitado: bool = False
+	pool_tipos: list = field(default_factory=lambda: ['powershell'])
+	pool_max_procesos: int = 2
+	pool_max_memoria_mb: int = 300
+	# Guardar en un archivo la salida de las consolas abiertas (PowerShell y WSL)
+	capturar_salida: bool = False
 
 
 @dataclass
@@ -65,6 +77,11 @@ class ConfiguracionPlugins:
 		'sql_formatter'
 	])
 	auto_cargar_plugins: bool = True
+	limite_cache_resultados_mb: int = 16
+	# Milisegundos que un plugin puede ocupar el hilo de la interfaz sin avisar en el registro
+	presupuesto_hilo_principal_ms: float = 100.0
+	# Medir la memoria de cada llamada con tracemalloc (ralentiza NVDA)
+	medir_memoria_plugins: bool = False
 
 
 @dataclass
@@ -85,6 +102,33 @@ class ConfiguracionAlertas:
 		{"patron": "CRITICAL", "voz": True, "sonido": True},
 		{"patron": "FATAL", "voz": True, "sonido": True}
 	])
+	intervalo_minimo_alerta: float = 5.0  # Segundos entre anuncios del mismo patrón
+	intervalo_vigilancia: float = 1.0  # Segundos entre muestras de las consolas vigiladas
+	duracion_minima_aviso: float = 10.0  # Solo se avisa de comandos que duren al menos esto
+	intervalo_monitor_minimo: float = 1.0  # Segundos entre sondeos de las consolas monitorizadas con actividad
+	intervalo_monitor_maximo: float = 15.0  # Segundos entre sondeos de las consolas monitorizadas en reposo
+	presupuesto_cpu_monitor: float = 0.05  # Fracción de un núcleo que puede ocupar el monitor de consolas
+
+
+@dataclass
+class ConfiguracionGrabacion:
+	"""Configuración de la grabación en disco del historial."""
+	habilitar_grabacion: bool = True
+	tamano_segmento_kb: int = 1024
+	max_segmentos: int = 32
+	max_sesiones: int = 5
+	indexar_historial: bool = True
+	# Archivos de salida de las consolas abiertas con captura que se conservan
+	max_capturas: int = 20
+
+
+@dataclass
+class ConfiguracionAnuncios:
+	"""Configuración de la agrupación de anuncios por voz."""
+	ventana_agrupacion: float = 0.5  # Segundos que se esperan para juntar los mensajes que llegan seguidos
+	intervalo_minimo: float = 1.0  # Segundos mínimos entre dos anuncios
+	leer_lineas_nuevas: bool = False  # Leer las líneas nuevas en el modo seguimiento
+
 
 @dataclass
 class ConfiguracionGeneral:
@@ -94,6 +138,8 @@ class ConfiguracionGeneral:
 	plugins: ConfiguracionPlugins = field(default_factory=ConfiguracionPlugins)
 	google_ai: ConfiguracionGoogleAI = field(default_factory=ConfiguracionGoogleAI)
 	alertas: ConfiguracionAlertas = field(default_factory=ConfiguracionAlertas)
+	grabacion: ConfiguracionGrabacion = field(default_factory=ConfiguracionGrabacion)
+	anuncios: ConfiguracionAnuncios = field(default_factory=ConfiguracionAnuncios)
 
 
 class Configuracion:
@@ -108,6 +154,9 @@ class Configuracion:
 	# Nombre del archivo de configuración
 	NOMBRE_ARCHIVO_CONFIG = "consoleLog_config.json"
 	
+	# Directorio para los datos del complemento (grabaciones, índices...)
+	NOMBRE_DIRECTORIO_DATOS = "consoleLog"
+	
 	def __init__(self):
 		"""Inicializa el gestor de configuración."""
 		self._ruta_config = self._obtener_ruta_configuracion()
@@ -124,6 +173,19 @@ class Configuracion:
 		directorio_config = globalVars.appArgs.configPath
 		return os.path.join(directorio_config, self.NOMBRE_ARCHIVO_CONFIG)
 	
+	def obtener_directorio_datos(self, *partes: str) -> str:
+		"""Obtiene un directorio de datos del complemento, creándolo si no existe.
+		
+		Args:
+			*partes: Subdirectorios dentro del directorio de datos.
+		
+		Returns:
+			Ruta completa del directorio.
+		"""
+		directorio = os.path.join(globalVars.appArgs.configPath, self.NOMBRE_DIRECTORIO_DATOS, *partes)
+		os.makedirs(directorio, exist_ok=True)
+		return directorio
+	
 	def _cargar_configuracion(self):
 		"""Carga la configuración desde el archivo."""
 		try:
@@ -152,16 +214,16 @@ class Configuracion:
 		if 'lanzador' in datos:
 			actualizar_objeto(self._config.lanzador, datos['lanzador'])
 		if 'plugins' in datos:
-			if 'plugins_habilitados' in datos['plugins']:
-				self._config.plugins.plugins_habilitados = datos['plugins']['plugins_habilitados']
-			
-			if 'auto_cargar_plugins' in datos['plugins']:
-				self._config.plugins.auto_cargar_plugins = datos['plugins']['auto_cargar_plugins']
-		
+			actualizar_objeto(self._config.plugins, datos['plugins'])
+
 		if 'google_ai' in datos:
 			actualizar_objeto(self._config.google_ai, datos['google_ai'])
 		if 'alertas' in datos:
 			actualizar_objeto(self._config.alertas, datos['alertas'])
+		if 'grabacion' in datos:
+			actualizar_objeto(self._config.grabacion, datos['grabacion'])
+		if 'anuncios' in datos:
+			actualizar_objeto(self._config.anuncios, datos['anuncios'])
 	
 	def guardar_configuracion(self):
 		"""Guarda la configuración actual en el archivo."""
@@ -171,7 +233,9 @@ class Configuracion:
 				'lanzador': asdict(self._config.lanzador),
 				'plugins': asdict(self._config.plugins),
 				'google_ai': asdict(self._config.google_ai),
-				'alertas': asdict(self._config.alertas)
+				'alertas': asdict(self._config.alertas),
+				'grabacion': asdict(self._config.grabacion),
+				'anuncios': asdict(self._config.anuncios)
 			}
 			
 			with open(self._ruta_config, 'w', encoding='utf-8') as archivo:
@@ -206,6 +270,16 @@ class Configuracion:
 		"""Obtiene la configuración de alertas."""
 		return self._config.alertas
 	
+	@property
+	def grabacion(self) -> ConfiguracionGrabacion:
+		"""Obtiene la configuración de la grabación de sesiones."""
+		return self._config.grabacion
+	
+	@property
+	def anuncios(self) -> ConfiguracionAnuncios:
+		"""Obtiene la configuración de la agrupación de anuncios."""
+		return self._config.anuncios
+	
 	def obtener_valor(self, seccion: str, clave: str, valor_defecto: Any = None) -> Any:
 		"""Obtiene un valor específico de la configuración.
 		
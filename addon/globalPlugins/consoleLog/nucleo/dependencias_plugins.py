@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Dependencias de Plugins
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Orden de carga de los plugins según sus dependencias.
+
+Cada plugin puede declarar en `MetadatosPlugin.dependencias` los módulos
+de otros plugins que necesita inicializados antes que él. Con esas
+declaraciones se construye un grafo y se divide en capas: los plugins de
+una misma capa no dependen entre sí y pueden inicializarse a la vez.
+
+Los plugins que forman un ciclo, o que dependen de un plugin que no está
+disponible o de otro que no se puede cargar, se descartan con el motivo.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+
+@dataclass
+class PlanCarga:
+	"""Orden en el que se inicializan los plugins."""
+	# Cada capa solo depende de las anteriores
+	capas: List[List[str]] = field(default_factory=list)
+	# Plugin -> motivo por el que no se puede cargar
+	descartados: Dict[str, str] = field(default_factory=dict)
+	
+	@property
+	def plugins(self) -> List[str]:
+		"""Plugins que se pueden cargar, en orden de carga."""
+		return [nombre for capa in self.capas for nombre in capa]
+
+
+def buscar_ciclo(dependencias: Dict[str, List[str]], pendientes: List[str]) -> Optional[List[str]]:
+	"""Busca un ciclo entre los plugins que no se han podido ordenar.
+	
+	Args:
+		dependencias: Plugin -> plugins de los que depende.
+		pendientes: Plugins que quedan tras ordenar todos los demás.
+	
+	Returns:
+		Plugins del ciclo, con el primero repetido al final, o None.
+	"""
+	restantes = set(pendientes)
+	for origen in sorted(restantes):
+		camino = [origen]
+		visitados = {origen: 0}
+		actual = origen
+		while True:
+			siguiente = next((d for d in sorted(dependencias.get(actual, ())) if d in restantes), None)
+			if siguiente is None:
+				break
+			if siguiente in visitados:
+				return camino[visitados[siguiente]:] + [siguiente]
+			visitados[siguiente] = len(camino)
+			camino.append(siguiente)
+			actual = siguiente
+	return None
+
+
+def _propagar_descartes(pendientes: Dict[str, Set[str]], plan: PlanCarga):
+	"""Descarta los pendientes que dependen, directa o indirectamente, de un descartado."""
+	cambios = True
+	while cambios:
+		cambios = False
+		for nombre in sorted(pendientes):
+			descartado = next((d for d in sorted(pendientes[nombre]) if d in plan.descartados), None)
+			if descartado is not None:
+				del pendientes[nombre]
+				plan.descartados[nombre] = f"depende de {descartado}, que no se puede cargar"
+				cambios = True
+
+
+def planificar_carga(dependencias: Dict[str, List[str]]) -> PlanCarga:
+	"""Ordena los plugins en capas que se pueden inicializar en paralelo.
+	
+	Args:
+		dependencias: Plugin -> plugins de los que depende. Solo se pueden
+			cargar los plugins que aparecen como claves.
+	
+	Returns:
+		Capas de carga (cada una ordenada por nombre) y plugins descartados.
+	"""
+	plan = PlanCarga()
+	for nombre, requeridos in dependencias.items():
+		faltan = [d for d in requeridos if d not in dependencias]
+		if faltan:
+			plan.descartados[nombre] = "no disponible: " + ", ".join(faltan)
+		elif nombre in requeridos:
+			plan.descartados[nombre] = "depende de sí mismo"
+	
+	# Lo que depende de un plugin descartado tampoco se puede cargar
+	pendientes = {n: set(r) for n, r in dependencias.items() if n not in plan.descartados}
+	_propagar_descartes(pendientes, plan)
+	
+	# Ordenación topológica por capas (algoritmo de Kahn)
+	cargados = set()
+	while pendientes:
+		capa = sorted(n for n, requeridos in pendientes.items() if requeridos <= cargados)
+		if not capa:
+			break
+		plan.capas.append(capa)
+		cargados.update(capa)
+		for nombre in capa:
+			del pendientes[nombre]
+	
+	# Lo que queda forma ciclos o depende de uno
+	while pendientes:
+		ciclo = buscar_ciclo(dependencias, list(pendientes))
+		if ciclo is None:
+			for nombre in pendientes:
+				plan.descartados[nombre] = "dependencia circular"
+			break
+		for nombre in ciclo[:-1]:
+			plan.descartados[nombre] = "dependencia circular: " + " -> ".join(ciclo)
+			pendientes.pop(nombre, None)
+		# Los que dependen del ciclo ya no pueden ordenarse
+		_propagar_descartes(pendientes, plan)
+	return plan
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Diferencias entre Capturas
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Cálculo de las líneas nuevas entre dos capturas de una consola.
+
+El buffer de la consola se desplaza cuando se llena, por lo que la
+captura nueva no siempre empieza igual que la anterior. Se compara
+primero como prefijo y, si no coincide, se busca la cola de la captura
+anterior (el ancla) dentro de la nueva. Ambas comparaciones se hacen
+sobre el texto de las capturas, sin dividirlas en líneas.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+from .captura import Captura, como_captura
+
+
+@dataclass
+class DeltaCaptura:
+	"""Líneas añadidas a una consola desde la captura anterior."""
+	inicio: int
+	lineas: List[str] = field(default_factory=list)
+	desplazamiento: int = 0
+	reinicio: bool = False
+	# La primera línea sustituye a la línea pendiente de la captura anterior
+	sustituye_pendiente: bool = False
+	
+	@property
+	def vacio(self) -> bool:
+		"""Indica si no hay líneas nuevas."""
+		return not self.lineas
+
+
+class SeguidorCapturas:
+	"""Recuerda la última captura de una consola y calcula las líneas nuevas.
+	
+	La última línea de cada captura se considera pendiente (puede ser el
+	prompt en el que aún se escribe), así que se vuelve a entregar si
+	cambia. El resto de líneas se consideran confirmadas y no se repiten.
+	"""
+	
+	# Líneas confirmadas que se buscan como ancla cuando el buffer se ha desplazado
+	LINEAS_ANCLA = 8
+	
+	def __init__(self):
+		"""Inicializa el seguidor sin captura previa."""
+		self._captura: Optional[Captura] = None
+		self._desplazamiento = 0
+	
+	@property
+	def desplazamiento(self) -> int:
+		"""Líneas que han salido por arriba del buffer desde la primera captura."""
+		return self._desplazamiento
+	
+	@property
+	def lineas(self) -> List[str]:
+		"""Líneas de la última captura."""
+		return self._captura.lineas() if self._captura is not None else []
+	
+	@property
+	def captura(self) -> Optional[Captura]:
+		"""Última captura registrada."""
+		return self._captura
+	
+	def reiniciar(self, texto: Union[str, Captura, None] = None):
+		"""Olvida el historial y, opcionalmente, toma un texto como punto de partida.
+		
+		Args:
+			texto: Captura inicial que no debe tratarse como nueva.
+		"""
+		self._captura = como_captura(texto) if texto is not None else None
+		self._desplazamiento = 0
+	
+	def actualizar(self, texto: Union[str, Captura]) -> DeltaCaptura:
+		"""Registra una captura nueva y devuelve las líneas añadidas.
+		
+		Args:
+			texto: Contenido completo de la consola (texto o `Captura`).
+		
+		Returns:
+			Delta con el índice (en la captura nueva) de la primera línea
+			nueva y las líneas desde ese punto.
+		"""
+		captura = como_captura(texto)
+		previa = self._captura
+		self._captura = captura
+		nuevo = captura.texto
+		
+		if previa is None or not previa.texto:
+			return DeltaCaptura(0, _dividir(nuevo, 0), self._desplazamiento, reinicio=True)
+		
+		anterior = previa.texto
+		fin_confirmadas, fin_pendiente = _limites_ultima_linea(anterior)
+		confirmadas = anterior.count("\n", 0, fin_confirmadas)
+		if nuevo.startswith(anterior[:fin_confirmadas]):
+			posicion = fin_confirmadas
+			inicio = confirmadas
+		else:
+			posicion = self._buscar_ancla(anterior, nuevo, fin_confirmadas, confirmadas)
+			if posicion is None:
+				# La consola se limpió o cambió por completo
+				return DeltaCaptura(0, _dividir(nuevo, 0), self._desplazamiento, reinicio=True)
+			# Si el ancla llega a la última línea, la posición queda tras el final
+			inicio = nuevo.count("\n", 0, posicion) + (1 if posicion > len(nuevo) else 0)
+			self._desplazamiento += confirmadas - inicio
+		
+		# La línea pendiente anterior no se repite si no ha cambiado
+		sustituye = True
+		if posicion < len(nuevo):
+			fin_linea = nuevo.find("\n", posicion)
+			if fin_linea == -1:
+				fin_linea = len(nuevo)
+			if nuevo[posicion:fin_linea] == anterior[fin_confirmadas:fin_pendiente]:
+				posicion = fin_linea + 1
+				inicio += 1
+				sustituye = False
+		return DeltaCaptura(inicio, _dividir(nuevo, posicion), self._desplazamiento, sustituye_pendiente=sustituye)
+	
+	def _buscar_ancla(self, anterior: str, nuevo: str, fin_confirmadas: int, confirmadas: int) -> Optional[int]:
+		"""Busca en la captura nueva la cola confirmada de la anterior.
+		
+		Args:
+			anterior: Texto de la captura anterior.
+			nuevo: Texto de la captura nueva.
+			fin_confirmadas: Posición donde acaban las líneas confirmadas anteriores.
+			confirmadas: Número de líneas confirmadas de la captura anterior.
+		
+		Returns:
+			Posición (en el texto nuevo) de la línea siguiente al ancla, o
+			None si no aparece.
+		"""
+		if nuevo and not nuevo.endswith("\n"):
+			# El ancla termina en salto de línea y puede llegar a la última línea
+			nuevo += "\n"
+		limite = min(len(nuevo), fin_confirmadas)
+		# Si el buffer se desplazó más que el ancla, se prueba con colas más cortas
+		tamano = min(self.LINEAS_ANCLA, confirmadas)
+		minimo = min(2, confirmadas)
+		while tamano >= minimo and tamano > 0:
+			inicio_ancla = fin_confirmadas - 1
+			for unused in range(tamano):
+				inicio_ancla = anterior.rfind("\n", 0, inicio_ancla)
+			ancla = anterior[inicio_ancla + 1:fin_confirmadas]
+			# Buscar desde el final: el ancla suele estar cerca de la cola
+			posicion = nuevo.rfind(ancla, 0, limite)
+			while posicion > 0 and nuevo[posicion - 1] != "\n":
+				# Coincidencia a mitad de línea: seguir buscando hacia atrás
+				posicion = nuevo.rfind(ancla, 0, posicion + len(ancla) - 1)
+			if posicion != -1:
+				return posicion + len(ancla)
+			tamano //= 2
+		return None
+
+
+def _limites_ultima_linea(texto: str) -> Tuple[int, int]:
+	"""Localiza la última línea (la pendiente) de un texto.
+	
+	Args:
+		texto: Contenido de una captura.
+	
+	Returns:
+		Posiciones de inicio y fin de la última línea, sin el salto final.
+	"""
+	fin = len(texto) - 1 if texto.endswith("\n") else len(texto)
+	return texto.rfind("\n", 0, fin) + 1, fin
+
+
+def _dividir(texto: str, desde: int) -> List[str]:
+	"""Divide en líneas el texto a partir de una posición.
+	
+	Args:
+		texto: Contenido de una captura.
+		desde: Posición del inicio de la primera línea.
+	
+	Returns:
+		Líneas desde esa posición; un salto final no añade una línea vacía.
+	"""
+	if desde >= len(texto):
+		return []
+	fin = len(texto) - 1 if texto.endswith("\n") else len(texto)
+	return texto[desde:fin].split("\n")
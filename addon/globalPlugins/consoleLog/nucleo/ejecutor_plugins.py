@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Ejecutor de Plugins
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Ejecución de plugins fuera del hilo de la interfaz.
+
+Proporciona:
+- Un grupo de hilos compartido para ejecutar plugins
+- Tareas cancelables con señal de parada
+- Entrega de resultados en el hilo principal mediante wx.CallAfter
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Optional
+import wx
+from logHandler import log
+
+
+class TareaPlugin:
+	"""Representa una ejecución de plugin en curso.
+	
+	Permite consultar su estado y solicitar la cancelación. Los plugins
+	reciben la señal de cancelación en el argumento `senal_parar` y pueden
+	consultarla para abandonar el trabajo antes de tiempo.
+	"""
+	
+	def __init__(self, nombre: str):
+		"""Inicializa la tarea.
+		
+		Args:
+			nombre: Nombre del plugin que se ejecuta.
+		"""
+		self.nombre = nombre
+		self.senal_parar = threading.Event()
+		self._terminada = threading.Event()
+		self._futuro: Optional[Future] = None
+	
+	@property
+	def cancelada(self) -> bool:
+		"""Indica si se solicitó la cancelación de la tarea."""
+		return self.senal_parar.is_set()
+	
+	@property
+	def terminada(self) -> bool:
+		"""Indica si la tarea ha finalizado (con o sin éxito)."""
+		return self._terminada.is_set()
+	
+	def cancelar(self):
+		"""Solicita la cancelación de la tarea.
+		
+		Si la tarea aún no ha empezado se descarta; si ya está en marcha,
+		su resultado se ignorará al terminar.
+		"""
+		self.senal_parar.set()
+		if self._futuro is not None and self._futuro.cancel():
+			# No llegó a empezar: no habrá resultado que esperar
+			self._terminada.set()
+		log.debug(f"consoleLog: Cancelada ejecución del plugin {self.nombre}")
+
+
+class EjecutorPlugins:
+	"""Ejecuta plugins en segundo plano y entrega sus resultados a la interfaz.
+	
+	Los plugins que declaran `REQUIERE_HILO_PRINCIPAL` se ejecutan de forma
+	directa en el hilo que hace la llamada (el hilo de wx), ya que crean
+	diálogos o usan APIs que no admiten otros hilos.
+	"""
+	
+	# Número máximo de plugins ejecutándose a la vez
+	MAX_HILOS = 2
+	
+	def __init__(self):
+		"""Inicializa el ejecutor sin crear aún los hilos."""
+		self._grupo: Optional[ThreadPoolExecutor] = None
+		self._bloqueo = threading.Lock()
+	
+	def _obtener_grupo(self) -> ThreadPoolExecutor:
+		"""Obtiene el grupo de hilos, creándolo en el primer uso.
+		
+		Returns:
+			Grupo de hilos del ejecutor.
+		"""
+		with self._bloqueo:
+			if self._grupo is None:
+				self._grupo = ThreadPoolExecutor(
+					max_workers=self.MAX_HILOS,
+					thread_name_prefix="consoleLog_plugin"
+				)
+			return self._grupo
+	
+	def ejecutar(
+		self,
+		nombre: str,
+		funcion: Callable[..., Any],
+		en_hilo_principal: bool,
+		callback_exito: Callable[[Any], None],
+		callback_error: Callable[[Exception], None],
+		**kwargs
+	) -> TareaPlugin:
+		"""Ejecuta la función de un plugin.
+		
+		Args:
+			nombre: Nombre del plugin (para registro y diagnóstico).
+			funcion: Función a ejecutar (normalmente `plugin.ejecutar`).
+			en_hilo_principal: Si debe ejecutarse en el hilo que llama.
+			callback_exito: Se llama en el hilo principal con el resultado.
+			callback_error: Se llama en el hilo principal si hay una excepción.
+			**kwargs: Argumentos para la función. Se añade `senal_parar`.
+		
+		Returns:
+			Tarea que permite cancelar la ejecución.
+		"""
+		tarea = TareaPlugin(nombre)
+		kwargs['senal_parar'] = tarea.senal_parar
+		
+		if en_hilo_principal:
+			try:
+				resultado = funcion(**kwargs)
+			except Exception as e:
+				log.error(f"consoleLog: Error al ejecutar plugin {nombre}: {e}")
+				tarea._terminada.set()
+				callback_error(e)
+				return tarea
+			tarea._terminada.set()
+			callback_exito(resultado)
+			return tarea
+		
+		def _trabajo():
+			try:
+				resultado = funcion(**kwargs)
+			except Exception as e:
+				log.error(f"consoleLog: Error al ejecutar plugin {nombre}: {e}")
+				tarea._terminada.set()
+				if not tarea.cancelada:
+					wx.CallAfter(callback_error, e)
+				return
+			tarea._terminada.set()
+			if not tarea.cancelada:
+				wx.CallAfter(callback_exito, resultado)
+		
+		tarea._futuro = self._obtener_grupo().submit(_trabajo)
+		return tarea
+	
+	def entregar(
+		self,
+		nombre: str,
+		resultado: Any,
+		callback_exito: Callable[[Any], None]
+	) -> TareaPlugin:
+		"""Entrega de inmediato un resultado ya conocido (por ejemplo, de la caché).
+		
+		Args:
+			nombre: Nombre del plugin.
+			resultado: Resultado a entregar.
+			callback_exito: Función que recibe el resultado.
+		
+		Returns:
+			Tarea ya terminada.
+		"""
+		tarea = TareaPlugin(nombre)
+		tarea._terminada.set()
+		callback_exito(resultado)
+		return tarea
+	
+	def terminar(self):
+		"""Detiene el grupo de hilos sin esperar a las tareas pendientes."""
+		with self._bloqueo:
+			if self._grupo is not None:
+				self._grupo.shutdown(wait=False, cancel_futures=True)
+				self._grupo = None
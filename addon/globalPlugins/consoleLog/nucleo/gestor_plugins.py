@@ -7,23 +7,38 @@
 Sistema de gestión de plugins.
 
 Proporciona:
-- Carga dinámica de plugins
+- Carga dinámica de plugins, bajo demanda a partir del manifiesto
 - Interfaz base para plugins
 - Gestión del ciclo de vida de plugins
+- Tiempos y memoria de cada llamada a los plugins
+- Inicialización en paralelo respetando las dependencias entre plugins
+- Análisis conjunto de una captura por todos los plugins de análisis
 """
 
 import os
+import threading
+import time
 import importlib
 import importlib.util
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Type, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Type, Any
 from dataclasses import dataclass
+import wx
 from logHandler import log
 import addonHandler
 _ = addonHandler.initTranslation()
 if not callable(_):
 	_ = lambda x: x
 
+from .ejecutor_plugins import EjecutorPlugins, TareaPlugin
+from .cache_resultados import CacheResultados, calcular_huella
+from .captura import Captura, como_captura
+from .manifiesto_plugins import ManifiestoPlugins
+from .perfilador import PerfiladorPlugins
+from .dependencias_plugins import PlanCarga, planificar_carga
+from .analisis import AnalizadorTexto, analizar
+
 
 @dataclass
 class MetadatosPlugin:
@@ -50,6 +65,14 @@ class PluginBase(ABC):
 	# Metadatos que deben ser definidos por cada plugin
 	METADATOS: MetadatosPlugin = None
 	
+	# Los plugins que crean ventanas o usan el portapapeles deben ejecutarse
+	# en el hilo principal de wx. El resto se ejecuta en segundo plano.
+	REQUIERE_HILO_PRINCIPAL: bool = False
+	
+	# Los plugins cuyo resultado depende solo del argumento `texto` pueden
+	# memorizarlo: repetir el análisis de la misma captura es inmediato.
+	RESULTADO_CACHEABLE: bool = False
+	
 	def __init__(self):
 		"""Inicializa el plugin base."""
 		self._habilitado = True
@@ -103,6 +126,33 @@ class PluginBase(ABC):
 			Metadatos del plugin o None si no están definidos.
 		"""
 		return self.METADATOS
+	
+	def crear_analizador(self) -> Optional[AnalizadorTexto]:
+		"""Crea el analizador con el que el plugin participa en el análisis conjunto.
+		
+		Los plugins que solo analizan el texto pueden devolver un
+		`AnalizadorTexto` nuevo en cada llamada; su resultado debe ser el
+		mismo que el de `ejecutar` con esa captura.
+		
+		Returns:
+			Analizador, o None si el plugin no participa.
+		"""
+		return None
+	
+	@staticmethod
+	def obtener_captura(kwargs: Dict[str, Any]) -> Captura:
+		"""Obtiene la captura a analizar de los argumentos de `ejecutar`.
+		
+		El visor pasa `captura` (texto con su índice de líneas ya calculado)
+		junto a `texto`; si solo llega `texto`, se crea la captura.
+		
+		Args:
+			kwargs: Argumentos recibidos por `ejecutar`.
+		
+		Returns:
+			Captura del contenido, vacía si no hay texto.
+		"""
+		return como_captura(kwargs.get('captura') or kwargs.get('texto'))
 
 
 class GestorPlugins:
@@ -112,8 +162,20 @@ class GestorPlugins:
 	- Descubrir plugins disponibles
 	- Cargar y descargar plugins
 	- Gestionar el ciclo de vida
+	
+	Los plugins habilitados no se importan al arrancar NVDA: sus
+	metadatos salen del manifiesto y cada uno se importa e inicializa
+	la primera vez que se usa, después de los plugins de los que depende.
+	`precargar_plugins` los inicializa todos en segundo plano, en paralelo
+	dentro de cada capa del grafo de dependencias.
 	"""
 	
+	# Plugins que se inicializan a la vez durante la precarga
+	MAX_HILOS_CARGA = 4
+	
+	# Nombre con el que el perfilador registra el análisis conjunto (como los módulos, sin traducir)
+	NOMBRE_ANALISIS_CONJUNTO = "analizar_todo"
+	
 	def __init__(self, configuracion):
 		"""Inicializa el gestor de plugins.
 		
@@ -123,6 +185,22 @@ class GestorPlugins:
 		self._configuracion = configuracion
 		self._plugins: Dict[str, PluginBase] = {}
 		self._directorio_plugins = self._obtener_directorio_plugins()
+		self._manifiesto: Optional[ManifiestoPlugins] = None
+		# Plugins que fallaron al cargar; no se reintentan hasta volver a habilitarlos
+		self._fallidos = set()
+		self._bloqueo = threading.RLock()
+		# Plugin -> evento que se activa cuando termina de cargarse
+		self._cargando: Dict[str, threading.Event] = {}
+		self._hilo_precarga: Optional[threading.Thread] = None
+		self._parar_precarga = threading.Event()
+		self._ejecutor = EjecutorPlugins()
+		self._cache = CacheResultados(
+			configuracion.plugins.limite_cache_resultados_mb * 1024 * 1024
+		)
+		self._perfilador = PerfiladorPlugins(
+			configuracion.plugins.presupuesto_hilo_principal_ms,
+			configuracion.plugins.medir_memoria_plugins
+		)
 	
 	def _obtener_directorio_plugins(self) -> str:
 		"""Obtiene el directorio donde se encuentran los plugins.
@@ -133,45 +211,42 @@ class GestorPlugins:
 		directorio_actual = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 		return os.path.join(directorio_actual, 'plugins')
 	
+	@property
+	def manifiesto(self) -> ManifiestoPlugins:
+		"""Manifiesto de los plugins disponibles, leído en el primer uso."""
+		if self._manifiesto is None:
+			ruta = os.path.join(self._configuracion.obtener_directorio_datos(), "manifiesto_plugins.json")
+			self._manifiesto = ManifiestoPlugins(self._directorio_plugins, ruta)
+		return self._manifiesto
+	
 	def _descubrir_plugins(self) -> List[str]:
 		"""Descubre los plugins disponibles en el directorio de plugins.
 		
 		Returns:
 			Lista de nombres de archivos de plugins.
 		"""
-		plugins = []
-		
-		if not os.path.exists(self._directorio_plugins):
-			log.warning(f"consoleLog: Directorio de plugins no encontrado: {self._directorio_plugins}")
-			return plugins
-		
-		for archivo in os.listdir(self._directorio_plugins):
-			if archivo.endswith('.py') and not archivo.startswith('_'):
-				nombre_plugin = archivo[:-3]  # Remover .py
-				plugins.append(nombre_plugin)
-		
+		plugins = self.manifiesto.modulos()
 		log.debug(f"consoleLog: Plugins descubiertos: {plugins}")
 		return plugins
 	
 	def cargar_plugins(self):
-		"""Carga todos los plugins habilitados."""
-		plugins_habilitados = self._configuracion.plugins.plugins_habilitados
-		plugins_descubiertos = self._descubrir_plugins()
-		
-		cargados = 0
-		errores = []
-		
-		for nombre_plugin in plugins_descubiertos:
-			if nombre_plugin in plugins_habilitados:
-				if self._cargar_plugin(nombre_plugin):
-					cargados += 1
-				else:
-					errores.append(nombre_plugin)
-		
-		if errores:
-			log.error(f"consoleLog: Complemento cargado con errores. {cargados} plugins cargados, {len(errores)} fallidos: {', '.join(errores)}")
-		else:
-			log.info(f"consoleLog: Complemento cargado exitosamente. {cargados} plugins cargados.")
+		"""Prepara los plugins habilitados sin importarlos.
+		
+		Cada plugin se importa e inicializa la primera vez que se pide con
+		`obtener_plugin`, así que el coste del arranque no depende del
+		número de plugins.
+		"""
+		with self._bloqueo:
+			self._fallidos.clear()
+		log.debug("consoleLog: Plugins preparados para cargarse bajo demanda")
+	
+	def esta_habilitado(self, nombre: str) -> bool:
+		"""Indica si un plugin está habilitado en la configuración.
+		
+		Args:
+			nombre: Nombre del plugin.
+		"""
+		return nombre in self._configuracion.plugins.plugins_habilitados
 	
 	def _cargar_plugin(self, nombre: str) -> bool:
 		"""Carga un plugin específico.
@@ -196,8 +271,11 @@ class GestorPlugins:
 			nombre_modulo = f"{package_base}.plugins.{nombre}"
 			modulo = importlib.import_module(nombre_modulo)
 			
-			# Buscar clase del plugin
-			clase_plugin = self._encontrar_clase_plugin(modulo)
+			# Buscar clase del plugin, primero por el nombre del manifiesto
+			entrada = self.manifiesto.entradas.get(nombre)
+			clase_plugin = getattr(modulo, entrada.clase, None) if entrada else None
+			if clase_plugin is None:
+				clase_plugin = self._encontrar_clase_plugin(modulo)
 			
 			if clase_plugin is None:
 				log.warning(f"consoleLog: No se encontró clase PluginBase en {nombre}")
@@ -206,18 +284,25 @@ class GestorPlugins:
 			# Instanciar plugin
 			plugin = clase_plugin()
 			
+			# Los resultados de una versión anterior ya no son válidos
+			self._cache.invalidar_plugin(nombre)
+			
 			# Inicializar plugin
-			if plugin.inicializar():
+			with self._perfilador.medir(nombre, "inicializar"):
+				inicializado = plugin.inicializar()
+			if inicializado:
 				self._plugins[nombre] = plugin
 				plugin._inicializado = True
 				log.debug(f"consoleLog: Plugin cargado exitosamente: {nombre}")
 				return True
 			else:
 				log.warning(f"consoleLog: Error al inicializar plugin: {nombre}")
+				self._fallidos.add(nombre)
 				return False
 			
 		except Exception as e:
 			log.error(f"consoleLog: Error al cargar plugin {nombre}: {e}")
+			self._fallidos.add(nombre)
 			return False
 	
 	def _encontrar_clase_plugin(self, modulo) -> Optional[Type[PluginBase]]:
@@ -242,9 +327,13 @@ class GestorPlugins:
 	
 	def descargar_plugins(self):
 		"""Descarga todos los plugins cargados."""
+		self._parar_precarga.set()
 		total = len(self._plugins)
 		for nombre, plugin in list(self._plugins.items()):
 			self._descargar_plugin(nombre)
+		self._ejecutor.terminar()
+		self._cache.vaciar()
+		self._perfilador.terminar()
 		log.info(f"consoleLog: {total} plugins descargados correctamente.")
 	
 	def _descargar_plugin(self, nombre: str) -> bool:
@@ -261,6 +350,7 @@ class GestorPlugins:
 				plugin = self._plugins[nombre]
 				plugin.terminar()
 				del self._plugins[nombre]
+				self._cache.invalidar_plugin(nombre)
 				log.debug(f"consoleLog: Plugin descargado: {nombre}")
 				return True
 		except Exception as e:
@@ -268,24 +358,383 @@ class GestorPlugins:
 		return False
 	
 	def obtener_plugin(self, nombre: str) -> Optional[PluginBase]:
-		"""Obtiene una instancia de un plugin.
+		"""Obtiene una instancia de un plugin, cargándolo si es el primer uso.
+		
+		Antes se cargan los plugins de los que depende; si alguno falta,
+		forma un ciclo o no se puede cargar, el plugin tampoco se carga.
 		
 		Args:
 			nombre: Nombre del plugin.
 		
 		Returns:
-			Instancia del plugin o None si no existe.
+			Instancia del plugin o None si no existe, no está habilitado o
+			no se pudo cargar.
 		"""
+		plugin = self._plugins.get(nombre)
+		if plugin is not None or not self.esta_habilitado(nombre) or nombre in self._fallidos:
+			return plugin
+		plan = self._planificar([nombre])
+		self._descartar(plan)
+		if nombre in plan.descartados:
+			return None
+		for dependencia in plan.plugins:
+			if not self._asegurar_cargado(dependencia):
+				if dependencia != nombre:
+					log.warning(f"consoleLog: Plugin {nombre} no cargado: falló su dependencia {dependencia}")
+					with self._bloqueo:
+						self._fallidos.add(nombre)
+				return None
 		return self._plugins.get(nombre)
 	
+	def _asegurar_cargado(self, nombre: str) -> bool:
+		"""Carga un plugin si no lo está, o espera si otro hilo lo está cargando.
+		
+		Args:
+			nombre: Nombre del plugin.
+		
+		Returns:
+			True si el plugin queda cargado.
+		"""
+		with self._bloqueo:
+			if nombre in self._plugins:
+				return True
+			if nombre in self._fallidos:
+				return False
+			evento = self._cargando.get(nombre)
+			propio = evento is None
+			if propio:
+				evento = self._cargando[nombre] = threading.Event()
+		if propio:
+			try:
+				self._cargar_plugin(nombre)
+			finally:
+				with self._bloqueo:
+					del self._cargando[nombre]
+				evento.set()
+		else:
+			evento.wait()
+		return nombre in self._plugins
+	
+	def _dependencias(self, nombre: str) -> List[str]:
+		"""Plugins de los que depende uno, sin importarlo si está en el manifiesto."""
+		entrada = self.manifiesto.entradas.get(nombre)
+		if entrada is not None:
+			return list(entrada.dependencias)
+		# Sin manifiesto solo se conocen una vez importado
+		plugin = self._plugins.get(nombre)
+		meta = plugin.obtener_metadatos() if plugin else None
+		return list(meta.dependencias) if meta else []
+	
+	def _planificar(self, nombres: List[str]) -> PlanCarga:
+		"""Orden de carga de unos plugins y de todo lo que necesitan.
+		
+		Args:
+			nombres: Plugins que se quieren cargar.
+		
+		Returns:
+			Plan con las capas de carga; las dependencias que no están
+			disponibles o habilitadas descartan a quien las pide.
+		"""
+		disponibles = set(self.manifiesto.modulos())
+		grafo: Dict[str, List[str]] = {}
+		pendientes = list(nombres)
+		while pendientes:
+			nombre = pendientes.pop()
+			if nombre in grafo or nombre not in disponibles or not self.esta_habilitado(nombre):
+				continue
+			grafo[nombre] = self._dependencias(nombre)
+			pendientes.extend(grafo[nombre])
+		return planificar_carga(grafo)
+	
+	def _descartar(self, plan: PlanCarga):
+		"""Marca como fallidos los plugins descartados por sus dependencias."""
+		nuevos = {}
+		with self._bloqueo:
+			for nombre, motivo in plan.descartados.items():
+				if nombre not in self._fallidos:
+					self._fallidos.add(nombre)
+					nuevos[nombre] = motivo
+		for nombre, motivo in nuevos.items():
+			log.warning(f"consoleLog: Plugin {nombre} no cargado ({motivo})")
+	
+	def _requiere_hilo_principal(self, nombre: str) -> bool:
+		"""Indica si un plugin debe inicializarse en el hilo de wx."""
+		entrada = self.manifiesto.entradas.get(nombre)
+		# Sin manifiesto no se sabe sin importarlo: se usa el hilo principal por seguridad
+		return entrada.requiere_hilo_principal if entrada is not None else True
+	
+	def precargar_plugins(self, al_terminar: Optional[Callable[[float], None]] = None):
+		"""Inicializa en segundo plano todos los plugins habilitados.
+		
+		Los plugins de cada capa del grafo de dependencias se inicializan a
+		la vez en un grupo de hilos; los que requieren el hilo principal se
+		inicializan en él con wx.CallAfter. Una capa empieza cuando ha
+		terminado la anterior, así que el tiempo total se acerca al del
+		plugin más lento de cada capa en lugar de a la suma de todos.
+		
+		Args:
+			al_terminar: Se llama en el hilo principal con los segundos empleados.
+		"""
+		if self._hilo_precarga is not None and self._hilo_precarga.is_alive():
+			return
+		self._parar_precarga.clear()
+		self._hilo_precarga = threading.Thread(
+			target=self._precargar, args=(al_terminar,), name="consoleLog_precarga_plugins", daemon=True
+		)
+		self._hilo_precarga.start()
+	
+	def _precargar(self, al_terminar: Optional[Callable[[float], None]]):
+		"""Recorre las capas del plan de carga (en el hilo de la precarga)."""
+		inicio = time.perf_counter()
+		plan = self._planificar(self.listar_plugins_habilitados())
+		self._descartar(plan)
+		with ThreadPoolExecutor(max_workers=self.MAX_HILOS_CARGA, thread_name_prefix="consoleLog_carga") as grupo:
+			for capa in plan.capas:
+				if self._parar_precarga.is_set():
+					return
+				# Una dependencia fallida deja fuera a quien la necesita
+				capa = [n for n in capa if all(d in self._plugins for d in self._dependencias(n))]
+				principales = [n for n in capa if self._requiere_hilo_principal(n)]
+				futuros = [grupo.submit(self._asegurar_cargado, n) for n in capa if n not in principales]
+				terminados = [threading.Event() for _n in principales]
+				for nombre, terminado in zip(principales, terminados):
+					wx.CallAfter(self._cargar_en_hilo_principal, nombre, terminado)
+				wait(futuros)
+				for terminado in terminados:
+					while not terminado.wait(0.5):
+						if self._parar_precarga.is_set():
+							return
+		duracion = time.perf_counter() - inicio
+		log.debug(
+			f"consoleLog: {len(self._plugins)} plugins precargados en {duracion * 1000:.0f} ms "
+			f"({len(plan.capas)} capas)"
+		)
+		if al_terminar is not None:
+			wx.CallAfter(al_terminar, duracion)
+	
+	def _cargar_en_hilo_principal(self, nombre: str, terminado: threading.Event):
+		"""Carga un plugin desde la cola de wx y avisa a la precarga."""
+		try:
+			if not self._parar_precarga.is_set():
+				self._asegurar_cargado(nombre)
+		finally:
+			terminado.set()
+	
+	def obtener_metadatos(self, nombre: str) -> Optional[MetadatosPlugin]:
+		"""Obtiene los metadatos de un plugin sin importarlo si es posible.
+		
+		Args:
+			nombre: Nombre del plugin.
+		
+		Returns:
+			Metadatos del plugin o None si no se conocen.
+		"""
+		plugin = self._plugins.get(nombre)
+		if plugin is not None:
+			return plugin.obtener_metadatos()
+		entrada = self.manifiesto.entradas.get(nombre)
+		if entrada is None:
+			# Metadatos no literales: hay que importar el plugin
+			plugin = self.obtener_plugin(nombre)
+			return plugin.obtener_metadatos() if plugin else None
+		textos = {
+			campo: _(getattr(entrada, campo)) if campo in entrada.traducibles else getattr(entrada, campo)
+			for campo in ("nombre", "descripcion", "autor", "categoria")
+		}
+		return MetadatosPlugin(
+			version=entrada.version,
+			dependencias=list(entrada.dependencias),
+			**textos
+		)
+	
+	def ejecutar_plugin(
+		self,
+		nombre: str,
+		callback_exito: Callable[[Any], None],
+		callback_error: Callable[[Exception], None],
+		**kwargs
+	) -> Optional[TareaPlugin]:
+		"""Ejecuta un plugin sin bloquear el hilo de la interfaz.
+		
+		Los plugins que declaran `REQUIERE_HILO_PRINCIPAL` se ejecutan de
+		inmediato en el hilo que llama; el resto en segundo plano, y su
+		resultado se entrega con wx.CallAfter. Si el plugin es cacheable y
+		ya analizó el mismo contenido, el resultado se entrega al instante.
+		
+		Args:
+			nombre: Nombre del plugin.
+			callback_exito: Función que recibe el resultado del plugin.
+			callback_error: Función que recibe la excepción producida.
+			**kwargs: Argumentos para `PluginBase.ejecutar`.
+		
+		Returns:
+			Tarea cancelable o None si el plugin no está cargado.
+		"""
+		plugin = self.obtener_plugin(nombre)
+		if plugin is None:
+			log.warning(f"consoleLog: Plugin no cargado: {nombre}")
+			return None
+		
+		def funcion(**argumentos):
+			with self._perfilador.medir(nombre, "ejecutar"):
+				return plugin.ejecutar(**argumentos)
+		
+		if plugin.RESULTADO_CACHEABLE and ('texto' in kwargs or 'captura' in kwargs):
+			# La captura guarda su huella: no se recalcula en cada plugin
+			captura = kwargs.get('captura')
+			huella = captura.huella if captura is not None else calcular_huella(kwargs['texto'])
+			clave = self._clave_cache(nombre, plugin, huella)
+			encontrado, resultado = self._cache.obtener(clave)
+			if encontrado:
+				log.debug(f"consoleLog: Resultado de {nombre} obtenido de la caché")
+				return self._ejecutor.entregar(nombre, resultado, callback_exito)
+			
+			ejecutar_medido = funcion
+			
+			def funcion(**argumentos):
+				resultado = ejecutar_medido(**argumentos)
+				if not argumentos['senal_parar'].is_set():
+					self._cache.guardar(clave, resultado)
+				return resultado
+		
+		return self._ejecutor.ejecutar(
+			nombre,
+			funcion,
+			plugin.REQUIERE_HILO_PRINCIPAL,
+			callback_exito,
+			callback_error,
+			**kwargs
+		)
+	
+	@staticmethod
+	def _clave_cache(nombre: str, plugin: PluginBase, huella: str) -> tuple:
+		"""Clave de la caché para el resultado de un plugin con un contenido."""
+		meta = plugin.obtener_metadatos()
+		return (nombre, meta.version if meta else "", huella)
+	
+	def _analizadores_disponibles(self) -> List[str]:
+		"""Plugins habilitados que pueden participar en el análisis conjunto.
+		
+		Solo se cargan los que el manifiesto marca como cacheables y sin
+		hilo principal; los que no están en él, solo si ya están cargados.
+		"""
+		nombres = []
+		for nombre in self.listar_plugins_habilitados():
+			entrada = self.manifiesto.entradas.get(nombre)
+			if entrada is None:
+				plugin = self._plugins.get(nombre)
+				if plugin is None or not plugin.RESULTADO_CACHEABLE or plugin.REQUIERE_HILO_PRINCIPAL:
+					continue
+			elif not entrada.resultado_cacheable or entrada.requiere_hilo_principal:
+				continue
+			nombres.append(nombre)
+		return nombres
+	
+	def analizar_todo(
+		self,
+		captura: Captura,
+		senal_parar: Optional[threading.Event] = None
+	) -> Optional[Dict[str, Any]]:
+		"""Analiza una captura con todos los plugins de análisis en una sola pasada.
+		
+		Los resultados que ya están en la caché no se recalculan; los nuevos
+		se guardan en ella, así que después cada plugin por separado
+		responde al instante con esta captura.
+		
+		Args:
+			captura: Contenido a analizar.
+			senal_parar: Si se activa, el análisis se abandona.
+		
+		Returns:
+			Resultado de cada plugin por nombre, en el orden del menú, o None
+			si se canceló.
+		"""
+		resultados: Dict[str, Any] = {}
+		pendientes = []
+		for nombre in self._analizadores_disponibles():
+			plugin = self.obtener_plugin(nombre)
+			if plugin is None:
+				continue
+			clave = self._clave_cache(nombre, plugin, captura.huella)
+			encontrado, resultado = self._cache.obtener(clave)
+			if encontrado:
+				resultados[nombre] = resultado
+				continue
+			analizador = plugin.crear_analizador()
+			if analizador is not None:
+				resultados[nombre] = None
+				pendientes.append((nombre, clave, analizador))
+		
+		if pendientes:
+			with self._perfilador.medir(self.NOMBRE_ANALISIS_CONJUNTO, "ejecutar"):
+				calculados = analizar(captura, [analizador for _n, _c, analizador in pendientes], senal_parar)
+			if calculados is None:
+				return None
+			for (nombre, clave, _a), resultado in zip(pendientes, calculados):
+				resultados[nombre] = resultado
+				self._cache.guardar(clave, resultado)
+		log.debug(
+			f"consoleLog: Análisis conjunto de {len(resultados)} plugins "
+			f"({len(resultados) - len(pendientes)} desde la caché)"
+		)
+		return resultados
+	
+	def ejecutar_analisis_todo(
+		self,
+		captura: Captura,
+		callback_exito: Callable[[Dict[str, Any]], None],
+		callback_error: Callable[[Exception], None]
+	) -> TareaPlugin:
+		"""Ejecuta `analizar_todo` en segundo plano.
+		
+		Args:
+			captura: Contenido a analizar.
+			callback_exito: Recibe en el hilo principal el resultado de cada plugin.
+			callback_error: Recibe en el hilo principal la excepción producida.
+		
+		Returns:
+			Tarea cancelable.
+		"""
+		return self._ejecutor.ejecutar(
+			self.NOMBRE_ANALISIS_CONJUNTO,
+			lambda captura, senal_parar: self.analizar_todo(captura, senal_parar),
+			False,
+			callback_exito,
+			callback_error,
+			captura=captura
+		)
+	
+	@property
+	def cache_resultados(self) -> CacheResultados:
+		"""Caché de resultados compartida por los plugins."""
+		return self._cache
+	
+	@property
+	def perfilador(self) -> PerfiladorPlugins:
+		"""Estadísticas de tiempo y memoria de las llamadas a los plugins."""
+		return self._perfilador
+	
+	def configurar_perfilador(self):
+		"""Aplica al perfilador el presupuesto y la medición de memoria de la configuración."""
+		config = self._configuracion.plugins
+		self._perfilador.configurar(config.presupuesto_hilo_principal_ms, config.medir_memoria_plugins)
+	
 	def listar_plugins_cargados(self) -> List[str]:
-		"""Lista los nombres de los plugins cargados.
+		"""Lista los nombres de los plugins ya importados e inicializados.
 		
 		Returns:
 			Lista de nombres de plugins.
 		"""
 		return list(self._plugins.keys())
 	
+	def listar_plugins_habilitados(self) -> List[str]:
+		"""Lista los plugins disponibles que están habilitados, cargados o no.
+		
+		Returns:
+			Lista de nombres de plugins.
+		"""
+		return [nombre for nombre in self._descubrir_plugins() if self.esta_habilitado(nombre)]
+	
 	def listar_plugins_disponibles(self) -> List[str]:
 		"""Lista los plugins disponibles para cargar.
 		
@@ -307,9 +756,10 @@ class GestorPlugins:
 			self._configuracion.plugins.plugins_habilitados.append(nombre)
 			self._configuracion.guardar_configuracion()
 		
-		if nombre not in self._plugins:
-			return self._cargar_plugin(nombre)
-		return True
+		# Se cargará en su primer uso
+		with self._bloqueo:
+			self._fallidos.discard(nombre)
+		return nombre in self._descubrir_plugins()
 	
 	def deshabilitar_plugin(self, nombre: str) -> bool:
 		"""Deshabilita un plugin.
@@ -324,4 +774,6 @@ class GestorPlugins:
 			self._configuracion.plugins.plugins_habilitados.remove(nombre)
 			self._configuracion.guardar_configuracion()
 		
-		return self._descargar_plugin(nombre)
+		if nombre in self._plugins:
+			return self._descargar_plugin(nombre)
+		return True
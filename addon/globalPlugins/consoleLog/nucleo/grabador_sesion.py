@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Grabador de Sesiones
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Grabación en disco del historial de una consola.
+
+El buffer de la consola tiene un número de filas limitado, así que las
+primeras líneas de una compilación larga se pierden antes de poder
+capturarlas. Mientras el modo seguimiento está activo, el grabador
+añade cada delta de líneas a una serie de segmentos de tamaño acotado
+y mantiene un índice con las líneas de cada uno, de forma que la cola
+del historial puede cargarse leyendo solo los últimos segmentos.
+
+Estructura de una sesión:
+	sesiones/<id>/indice.json
+	sesiones/<id>/00001.log, 00002.log, ...
+"""
+
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+from logHandler import log
+
+from .diferencias import DeltaCaptura
+from .indice_historial import IndiceHistorial
+
+
+NOMBRE_INDICE = "indice.json"
+
+
+def _escribir_json(ruta: str, datos: Dict[str, Any]):
+	"""Escribe un JSON a través de un archivo temporal.
+	
+	Args:
+		ruta: Archivo de destino.
+		datos: Datos a guardar.
+	"""
+	temporal = ruta + ".tmp"
+	with open(temporal, 'w', encoding='utf-8') as archivo:
+		json.dump(datos, archivo, ensure_ascii=False)
+	os.replace(temporal, ruta)
+
+
+def _leer_indice(directorio: str) -> Optional[Dict[str, Any]]:
+	"""Lee el índice de una sesión.
+	
+	Args:
+		directorio: Directorio de la sesión.
+	
+	Returns:
+		Datos del índice o None si no existe o está dañado.
+	"""
+	try:
+		with open(os.path.join(directorio, NOMBRE_INDICE), 'r', encoding='utf-8') as archivo:
+			return json.load(archivo)
+	except (OSError, ValueError):
+		return None
+
+
+def listar_sesiones(directorio_base: str) -> List[Dict[str, Any]]:
+	"""Lista las sesiones grabadas, de la más reciente a la más antigua.
+	
+	Args:
+		directorio_base: Directorio que contiene las sesiones.
+	
+	Returns:
+		Índices de las sesiones, con la clave `directorio` añadida.
+	"""
+	sesiones = []
+	try:
+		nombres = os.listdir(directorio_base)
+	except OSError:
+		return sesiones
+	for nombre in nombres:
+		directorio = os.path.join(directorio_base, nombre)
+		indice = _leer_indice(directorio)
+		if indice is None:
+			continue
+		indice['directorio'] = directorio
+		sesiones.append(indice)
+	sesiones.sort(key=lambda s: s.get('inicio', 0), reverse=True)
+	return sesiones
+
+
+def leer_sesion(directorio: str, max_lineas: Optional[int] = None) -> str:
+	"""Lee el historial grabado de una sesión.
+	
+	Con `max_lineas` solo se abren los últimos segmentos necesarios,
+	usando el recuento de líneas del índice.
+	
+	Args:
+		directorio: Directorio de la sesión.
+		max_lineas: Número máximo de líneas finales a devolver.
+	
+	Returns:
+		Texto del historial, incluida la última línea pendiente.
+	"""
+	indice = _leer_indice(directorio)
+	if indice is None:
+		return ""
+	segmentos = indice.get('segmentos', [])
+	pendiente = indice.get('pendiente')
+	
+	# Elegir los segmentos de la cola que cubren las líneas pedidas
+	seleccion = segmentos
+	if max_lineas is not None:
+		necesarias = max_lineas - (1 if pendiente is not None else 0)
+		acumuladas = 0
+		desde = len(segmentos)
+		while desde > 0 and acumuladas < necesarias:
+			desde -= 1
+			acumuladas += segmentos[desde].get('lineas', 0)
+		seleccion = segmentos[desde:]
+	
+	partes = []
+	for segmento in seleccion:
+		try:
+			with open(os.path.join(directorio, segmento['archivo']), 'r', encoding='utf-8', newline='\n') as archivo:
+				partes.append(archivo.read())
+		except OSError as e:
+			log.warning(f"consoleLog: No se pudo leer el segmento {segmento['archivo']}: {e}")
+	texto = "".join(partes)
+	if pendiente is not None:
+		texto += pendiente
+	elif texto.endswith("\n"):
+		texto = texto[:-1]
+	
+	if max_lineas is not None:
+		lineas = texto.split("\n")
+		if len(lineas) > max_lineas:
+			texto = "\n".join(lineas[-max_lineas:])
+	return texto
+
+
+class GrabadorSesion:
+	"""Graba los deltas de una consola en segmentos rotativos.
+	
+	Solo se escriben las líneas confirmadas; la última línea de cada
+	captura se guarda en el índice como pendiente, ya que puede cambiar
+	en la siguiente captura.
+	"""
+	
+	def __init__(
+		self,
+		directorio_base: str,
+		descripcion: str,
+		tamano_segmento_kb: int = 1024,
+		max_segmentos: int = 50,
+		max_sesiones: int = 10,
+		indice: Optional[IndiceHistorial] = None,
+		tipo_consola: str = ""
+	):
+		"""Inicializa el grabador y crea el directorio de la sesión.
+		
+		Args:
+			directorio_base: Directorio donde se guardan todas las sesiones.
+			descripcion: Texto que identifica la consola grabada.
+			tamano_segmento_kb: Tamaño a partir del cual se abre un segmento nuevo.
+			max_segmentos: Segmentos que se conservan; los más antiguos se borran.
+			max_sesiones: Sesiones que se conservan en el directorio base.
+			indice: Índice de búsqueda en el que registrar las líneas grabadas.
+			tipo_consola: Tipo de consola grabada ('clasica' o 'terminal').
+		"""
+		self._directorio_base = directorio_base
+		self._tamano_segmento = max(16, tamano_segmento_kb) * 1024
+		self._max_segmentos = max(1, max_segmentos)
+		self._max_sesiones = max(1, max_sesiones)
+		self._inicio = time.time()
+		self._id = time.strftime("%Y%m%d_%H%M%S", time.localtime(self._inicio)) + f"_{os.getpid()}_{id(self) & 0xffff:04x}"
+		self._directorio = os.path.join(directorio_base, self._id)
+		self._descripcion = descripcion
+		self._segmentos: List[Dict[str, Any]] = []
+		self._numero_segmento = 0
+		self._archivo = None
+		self._pendiente: Optional[str] = None
+		self._lineas_descartadas = 0
+		self._lineas_escritas = 0
+		self._activo = False
+		self._indice = indice
+		self._tipo_consola = tipo_consola
+	
+	@property
+	def id(self) -> str:
+		"""Identificador de la sesión."""
+		return self._id
+	
+	@property
+	def directorio(self) -> str:
+		"""Directorio de la sesión grabada."""
+		return self._directorio
+	
+	@property
+	def activo(self) -> bool:
+		"""Indica si la grabación está en marcha."""
+		return self._activo
+	
+	@property
+	def total_lineas(self) -> int:
+		"""Líneas grabadas que se conservan en disco."""
+		return sum(s['lineas'] for s in self._segmentos) + (1 if self._pendiente is not None else 0)
+	
+	def iniciar(self, texto_inicial: str):
+		"""Empieza la grabación con el contenido que tiene la consola.
+		
+		Args:
+			texto_inicial: Captura completa en el momento de empezar.
+		"""
+		os.makedirs(self._directorio, exist_ok=True)
+		self._purgar_sesiones()
+		self._activo = True
+		if self._indice:
+			self._indice.registrar_sesion(self._id, self._descripcion, self._tipo_consola, self._inicio)
+		# Como en `Captura`: solo "\n" separa líneas y un salto final no añade una vacía
+		# (`splitlines()` también corta en \r, \x0c... y desplazaría la numeración)
+		if texto_inicial.endswith("\n"):
+			texto_inicial = texto_inicial[:-1]
+		lineas = texto_inicial.split("\n") if texto_inicial else []
+		self._escribir_lineas(lineas[:-1])
+		self._pendiente = lineas[-1] if lineas else None
+		self._guardar_indice()
+		log.debug(f"consoleLog: Grabación de sesión iniciada en {self._directorio}")
+	
+	def registrar(self, delta: DeltaCaptura):
+		"""Añade las líneas nuevas de una captura.
+		
+		Args:
+			delta: Líneas nuevas calculadas por el seguidor de capturas.
+		"""
+		if not self._activo or delta.vacio:
+			return
+		try:
+			if not delta.sustituye_pendiente and self._pendiente is not None:
+				# La línea pendiente anterior ya no cambiará
+				self._escribir_lineas([self._pendiente])
+			self._escribir_lineas(delta.lineas[:-1])
+			self._pendiente = delta.lineas[-1]
+			self._guardar_indice()
+		except OSError as e:
+			log.error(f"consoleLog: Error al grabar la sesión, se detiene la grabación: {e}")
+			self.detener()
+	
+	def detener(self):
+		"""Termina la grabación conservando la línea pendiente."""
+		if not self._activo:
+			return
+		self._activo = False
+		if self._indice and self._pendiente:
+			# La línea pendiente ya es definitiva
+			self._indice.indexar(self._id, self._lineas_escritas + 1, [self._pendiente])
+		try:
+			self._guardar_indice()
+		except OSError as e:
+			log.error(f"consoleLog: Error al cerrar la grabación: {e}")
+		if self._archivo is not None:
+			self._archivo.close()
+			self._archivo = None
+		log.debug(f"consoleLog: Grabación de sesión detenida ({self.total_lineas} líneas)")
+	
+	def _escribir_lineas(self, lineas: List[str]):
+		"""Escribe líneas confirmadas en el segmento actual, rotando si se llena.
+		
+		Args:
+			lineas: Líneas a escribir.
+		"""
+		if not lineas:
+			return
+		if self._indice:
+			self._indice.indexar(self._id, self._lineas_escritas + 1, lineas)
+		self._lineas_escritas += len(lineas)
+		inicio = 0
+		while inicio < len(lineas):
+			if self._archivo is None or self._segmentos[-1]['bytes'] >= self._tamano_segmento:
+				self._abrir_segmento()
+			segmento = self._segmentos[-1]
+			# Llenar el segmento actual hasta su tamaño máximo
+			partes = []
+			tamano = 0
+			libre = self._tamano_segmento - segmento['bytes']
+			while inicio < len(lineas) and tamano < libre:
+				parte = lineas[inicio] + "\n"
+				partes.append(parte)
+				tamano += len(parte.encode('utf-8', 'surrogatepass'))
+				inicio += 1
+			self._archivo.write("".join(partes))
+			segmento['lineas'] += len(partes)
+			segmento['bytes'] += tamano
+		if self._archivo is not None:
+			self._archivo.flush()
+	
+	def _abrir_segmento(self):
+		"""Cierra el segmento actual y abre uno nuevo, borrando los sobrantes."""
+		if self._archivo is not None:
+			self._archivo.close()
+		self._numero_segmento += 1
+		nombre = f"{self._numero_segmento:05d}.log"
+		self._archivo = open(os.path.join(self._directorio, nombre), 'a', encoding='utf-8', newline='\n', errors='surrogatepass')
+		self._segmentos.append({'archivo': nombre, 'lineas': 0, 'bytes': 0})
+		descartadas = self._lineas_descartadas
+		while len(self._segmentos) > self._max_segmentos:
+			antiguo = self._segmentos.pop(0)
+			self._lineas_descartadas += antiguo['lineas']
+			try:
+				os.remove(os.path.join(self._directorio, antiguo['archivo']))
+			except OSError:
+				pass
+		if self._indice and self._lineas_descartadas > descartadas:
+			# Las líneas borradas del disco tampoco deben encontrarse en el historial
+			self._indice.eliminar_lineas(self._id, self._lineas_descartadas)
+	
+	def _guardar_indice(self):
+		"""Actualiza el índice de la sesión."""
+		_escribir_json(os.path.join(self._directorio, NOMBRE_INDICE), {
+			'version': 1,
+			'descripcion': self._descripcion,
+			'inicio': self._inicio,
+			'actualizado': time.time(),
+			'activa': self._activo,
+			'segmentos': self._segmentos,
+			'lineas_descartadas': self._lineas_descartadas,
+			'pendiente': self._pendiente
+		})
+	
+	def _purgar_sesiones(self):
+		"""Borra las sesiones más antiguas que superan el máximo."""
+		sesiones = listar_sesiones(self._directorio_base)
+		borradas = []
+		for sesion in sesiones[self._max_sesiones - 1:]:
+			if sesion['directorio'] == self._directorio:
+				continue
+			shutil.rmtree(sesion['directorio'], ignore_errors=True)
+			borradas.append(os.path.basename(sesion['directorio']))
+		if self._indice:
+			self._indice.eliminar_sesiones(borradas)
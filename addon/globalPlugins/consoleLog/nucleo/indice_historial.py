@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Índice del Historial
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Índice de búsqueda de texto completo sobre las sesiones grabadas.
+
+Usa `sqlite3` con FTS5 (tokenizador trigram, que permite buscar
+subcadenas como en el visor). Si la versión de SQLite no incluye FTS5
+se usa un índice invertido de trigramas en tablas normales.
+
+Las escrituras se hacen en un hilo propio por lotes, de forma que
+grabar una sesión no espera nunca al disco.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Set, Tuple
+from logHandler import log
+
+
+# Líneas que se insertan como máximo en cada transacción
+TAMANO_LOTE = 5000
+
+# Número máximo de resultados por búsqueda
+LIMITE_RESULTADOS = 500
+
+
+@dataclass
+class ResultadoBusqueda:
+	"""Una línea del historial que coincide con la búsqueda."""
+	sesion: str
+	descripcion: str
+	tipo_consola: str
+	marca_tiempo: float
+	numero_linea: int
+	texto: str
+
+
+def _trigramas(texto: str) -> Set[str]:
+	"""Obtiene los trigramas en minúsculas de un texto.
+	
+	Args:
+		texto: Texto a descomponer.
+	
+	Returns:
+		Conjunto de trigramas.
+	"""
+	texto = texto.lower()
+	return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceHistorial:
+	"""Índice persistente de las líneas grabadas de todas las sesiones."""
+	
+	def __init__(self, ruta_bd: str):
+		"""Inicializa el índice y arranca el hilo de escritura.
+		
+		Args:
+			ruta_bd: Ruta del archivo de base de datos.
+		"""
+		self._ruta_bd = ruta_bd
+		self._cola: "queue.Queue[Optional[tuple]]" = queue.Queue()
+		self._modo = self._preparar_esquema()
+		self._hilo = threading.Thread(target=self._escribir, name="consoleLog_indice", daemon=True)
+		self._hilo.start()
+		log.debug(f"consoleLog: Índice del historial en {ruta_bd} (modo {self._modo})")
+	
+	@property
+	def modo(self) -> str:
+		"""Tipo de índice en uso: "fts5" o "trigramas"."""
+		return self._modo
+	
+	def _conectar(self) -> sqlite3.Connection:
+		"""Abre una conexión con la base de datos.
+		
+		Returns:
+			Conexión nueva; cada hilo usa la suya.
+		"""
+		conexion = sqlite3.connect(self._ruta_bd, timeout=10)
+		conexion.execute("PRAGMA journal_mode=WAL")
+		conexion.execute("PRAGMA synchronous=NORMAL")
+		return conexion
+	
+	def _preparar_esquema(self) -> str:
+		"""Crea las tablas si no existen y decide el tipo de índice.
+		
+		Returns:
+			"fts5" o "trigramas".
+		"""
+		conexion = self._conectar()
+		try:
+			conexion.execute(
+				"CREATE TABLE IF NOT EXISTS sesiones ("
+				"id TEXT PRIMARY KEY, descripcion TEXT, tipo_consola TEXT, inicio REAL)"
+			)
+			existente = conexion.execute(
+				"SELECT name FROM sqlite_master WHERE name IN ('lineas_fts', 'lineas')"
+			).fetchone()
+			if existente:
+				return "fts5" if existente[0] == 'lineas_fts' else "trigramas"
+			try:
+				conexion.execute(
+					"CREATE VIRTUAL TABLE lineas_fts USING fts5("
+					"texto, sesion UNINDEXED, numero UNINDEXED, marca UNINDEXED, tokenize='trigram')"
+				)
+				return "fts5"
+			except sqlite3.OperationalError:
+				log.debug("consoleLog: SQLite sin FTS5 trigram, se usa el índice de trigramas propio")
+			conexion.execute(
+				"CREATE TABLE lineas (id INTEGER PRIMARY KEY, sesion TEXT, numero INTEGER, marca REAL, texto TEXT)"
+			)
+			conexion.execute("CREATE TABLE trigramas (trigrama TEXT, linea INTEGER)")
+			conexion.execute("CREATE INDEX idx_trigramas ON trigramas (trigrama)")
+			return "trigramas"
+		finally:
+			conexion.commit()
+			conexion.close()
+	
+	def registrar_sesion(self, sesion: str, descripcion: str, tipo_consola: str, inicio: float):
+		"""Da de alta una sesión grabada.
+		
+		Args:
+			sesion: Identificador de la sesión.
+			descripcion: Texto que identifica la consola.
+			tipo_consola: Tipo de consola ('clasica' o 'terminal').
+			inicio: Instante de inicio de la grabación.
+		"""
+		self._cola.put(("sesion", (sesion, descripcion, tipo_consola, inicio)))
+	
+	def indexar(self, sesion: str, numero_inicial: int, lineas: Sequence[str], marca_tiempo: Optional[float] = None):
+		"""Añade líneas de una sesión al índice (de forma asíncrona).
+		
+		Args:
+			sesion: Identificador de la sesión.
+			numero_inicial: Número (base 1) de la primera línea en la sesión.
+			lineas: Líneas a indexar.
+			marca_tiempo: Instante de captura (por defecto, ahora).
+		"""
+		if not lineas:
+			return
+		marca = marca_tiempo if marca_tiempo is not None else time.time()
+		filas = [(sesion, numero_inicial + i, marca, linea) for i, linea in enumerate(lineas) if linea.strip()]
+		if filas:
+			self._cola.put(("lineas", filas))
+	
+	def eliminar_sesiones(self, sesiones: Sequence[str]):
+		"""Quita del índice las sesiones cuyos archivos se han borrado.
+		
+		Args:
+			sesiones: Identificadores de las sesiones.
+		"""
+		if sesiones:
+			self._cola.put(("eliminar", list(sesiones)))
+	
+	def eliminar_lineas(self, sesion: str, hasta: int):
+		"""Quita del índice las primeras líneas de una sesión (de forma asíncrona).
+		
+		Se usa cuando la rotación borra del disco el segmento más antiguo.
+		
+		Args:
+			sesion: Identificador de la sesión.
+			hasta: Número (base 1) de la última línea a quitar.
+		"""
+		if hasta > 0:
+			self._cola.put(("recortar", (sesion, hasta)))
+	
+	def esperar(self):
+		"""Espera a que se hayan escrito todas las operaciones pendientes.
+		
+		Deja de esperar si el hilo de escritura ha terminado, aunque quede
+		algo en la cola.
+		"""
+		with self._cola.all_tasks_done:
+			while self._cola.unfinished_tasks and self._hilo.is_alive():
+				self._cola.all_tasks_done.wait(0.1)
+	
+	def cerrar(self):
+		"""Termina el hilo de escritura tras vaciar la cola."""
+		self._cola.put(None)
+		self._hilo.join(timeout=5)
+	
+	def _escribir(self):
+		"""Bucle del hilo de escritura: agrupa operaciones en transacciones."""
+		conexion = self._conectar()
+		try:
+			while True:
+				operacion = self._cola.get()
+				lote = [operacion]
+				# Agrupar lo que ya esté en cola en la misma transacción
+				while operacion is not None and len(lote) < TAMANO_LOTE:
+					try:
+						operacion = self._cola.get_nowait()
+					except queue.Empty:
+						break
+					lote.append(operacion)
+				try:
+					with conexion:
+						for elemento in lote:
+							if elemento is not None:
+								self._aplicar(conexion, *elemento)
+				except Exception as e:
+					# Cualquier error se descarta con su lote: si el hilo terminase, nadie vaciaría la cola
+					log.error(f"consoleLog: Error al actualizar el índice del historial: {e}")
+				for unused in lote:
+					self._cola.task_done()
+				if None in lote:
+					return
+		finally:
+			conexion.close()
+	
+	def _aplicar(self, conexion: sqlite3.Connection, tipo: str, datos):
+		"""Ejecuta una operación de escritura.
+		
+		Args:
+			conexion: Conexión del hilo de escritura.
+			tipo: "sesion", "lineas", "eliminar" o "recortar".
+			datos: Datos de la operación.
+		"""
+		if tipo == "sesion":
+			conexion.execute("INSERT OR REPLACE INTO sesiones VALUES (?, ?, ?, ?)", datos)
+		elif tipo == "lineas":
+			if self._modo == "fts5":
+				conexion.executemany(
+					"INSERT INTO lineas_fts (sesion, numero, marca, texto) VALUES (?, ?, ?, ?)", datos
+				)
+				return
+			for fila in datos:
+				cursor = conexion.execute(
+					"INSERT INTO lineas (sesion, numero, marca, texto) VALUES (?, ?, ?, ?)", fila
+				)
+				conexion.executemany(
+					"INSERT INTO trigramas VALUES (?, ?)",
+					[(trigrama, cursor.lastrowid) for trigrama in _trigramas(fila[3])]
+				)
+		elif tipo == "eliminar":
+			for sesion in datos:
+				conexion.execute("DELETE FROM sesiones WHERE id = ?", (sesion,))
+				if self._modo == "fts5":
+					conexion.execute("DELETE FROM lineas_fts WHERE sesion = ?", (sesion,))
+				else:
+					conexion.execute(
+						"DELETE FROM trigramas WHERE linea IN (SELECT id FROM lineas WHERE sesion = ?)", (sesion,)
+					)
+					conexion.execute("DELETE FROM lineas WHERE sesion = ?", (sesion,))
+		elif tipo == "recortar":
+			if self._modo == "fts5":
+				conexion.execute("DELETE FROM lineas_fts WHERE sesion = ? AND numero <= ?", datos)
+			else:
+				conexion.execute(
+					"DELETE FROM trigramas WHERE linea IN (SELECT id FROM lineas WHERE sesion = ? AND numero <= ?)", datos
+				)
+				conexion.execute("DELETE FROM lineas WHERE sesion = ? AND numero <= ?", datos)
+	
+	def buscar(self, consulta: str, limite: int = LIMITE_RESULTADOS) -> List[ResultadoBusqueda]:
+		"""Busca un texto (sin distinguir mayúsculas) en todo el historial.
+		
+		Args:
+			consulta: Texto a buscar.
+			limite: Número máximo de resultados.
+		
+		Returns:
+			Resultados, de los más recientes a los más antiguos.
+		"""
+		consulta = consulta.strip()
+		if not consulta:
+			return []
+		conexion = self._conectar()
+		try:
+			filas = self._consultar(conexion, consulta, limite)
+			descripciones = {
+				fila[0]: (fila[1], fila[2])
+				for fila in conexion.execute("SELECT id, descripcion, tipo_consola FROM sesiones")
+			}
+		finally:
+			conexion.close()
+		resultados = []
+		for sesion, numero, marca, texto in filas:
+			descripcion, tipo = descripciones.get(sesion, ("", ""))
+			resultados.append(ResultadoBusqueda(sesion, descripcion, tipo, marca, numero, texto))
+		return resultados
+	
+	def _consultar(self, conexion: sqlite3.Connection, consulta: str, limite: int) -> List[Tuple]:
+		"""Ejecuta la consulta adecuada al tipo de índice.
+		
+		Args:
+			conexion: Conexión de lectura.
+			consulta: Texto a buscar.
+			limite: Número máximo de resultados.
+		
+		Returns:
+			Filas (sesion, numero, marca, texto).
+		"""
+		patron = "%" + consulta.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+		if self._modo == "fts5":
+			if len(consulta) >= 3:
+				# Frase literal: el tokenizador trigram busca la subcadena
+				frase = '"' + consulta.replace('"', '""') + '"'
+				return conexion.execute(
+					"SELECT sesion, numero, marca, texto FROM lineas_fts WHERE lineas_fts MATCH ? "
+					"ORDER BY rowid DESC LIMIT ?", (frase, limite)
+				).fetchall()
+			return conexion.execute(
+				"SELECT sesion, numero, marca, texto FROM lineas_fts WHERE texto LIKE ? ESCAPE '\\' "
+				"ORDER BY rowid DESC LIMIT ?", (patron, limite)
+			).fetchall()
+		
+		trigramas = _trigramas(consulta)
+		if not trigramas:
+			return conexion.execute(
+				"SELECT sesion, numero, marca, texto FROM lineas WHERE texto LIKE ? ESCAPE '\\' "
+				"ORDER BY id DESC LIMIT ?", (patron, limite)
+			).fetchall()
+		marcadores = ",".join("?" * len(trigramas))
+		# Candidatas: líneas con todos los trigramas; LIKE confirma el orden
+		return conexion.execute(
+			"SELECT sesion, numero, marca, texto FROM lineas WHERE id IN ("
+			f"SELECT linea FROM trigramas WHERE trigrama IN ({marcadores}) "
+			"GROUP BY linea HAVING COUNT(DISTINCT trigrama) = ?"
+			") AND texto LIKE ? ESCAPE '\\' ORDER BY id DESC LIMIT ?",
+			(*trigramas, len(trigramas), patron, limite)
+		).fetchall()
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Ingesta de Salida
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Ingesta incremental de la salida de una consola.
+
+Las consolas abiertas desde el lanzador con la captura activada escriben
+su salida en un archivo del complemento (transcripción de PowerShell o
+`script` en WSL). Leer ese archivo por el final es mucho más barato que
+volver a capturar la pantalla de la consola, y no está limitado por su
+búfer de desplazamiento.
+
+`IngestorFlujo` convierte bloques de bytes en líneas: decodifica de forma
+incremental (un carácter puede llegar partido entre dos bloques), quita
+las secuencias de escape ANSI y respeta los retornos de carro con los
+que se redibujan las barras de progreso. Funciona igual con un archivo
+que con la tubería de un `subprocess`. `SeguidorArchivo` lee solo lo
+añadido a un archivo desde la lectura anterior y lo entrega como
+`DeltaCaptura`, igual que las capturas del modo seguimiento.
+"""
+
+import codecs
+import os
+import re
+import time
+from typing import BinaryIO, Callable, Dict, List, Optional, Any
+
+from .diferencias import DeltaCaptura
+
+
+# Secuencias de escape: CSI (colores, cursor), OSC (título de la ventana)
+# y las de dos caracteres
+_ANSI = re.compile(
+	r"\x1b\[[0-?]*[ -/]*[@-~]"
+	r"|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)"
+	r"|\x1b[@-Z\\-_]"
+)
+
+# Una secuencia de escape sin terminar al final de un bloque no pasa de aquí
+_LONGITUD_MAXIMA_ESCAPE = 256
+
+# Caracteres de control que no se muestran (se conservan \t, \n y \r)
+_CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1a\x1c-\x1f\x7f]")
+
+EXTENSION_CAPTURA = ".log"
+
+
+def quitar_ansi(texto: str) -> str:
+	"""Quita de un texto las secuencias de escape ANSI completas.
+	
+	Args:
+		texto: Texto con posibles secuencias de escape.
+	
+	Returns:
+		Texto sin ellas.
+	"""
+	return _ANSI.sub("", texto)
+
+
+def limpiar_linea(linea: str, quitar_escapes: bool = True, final: bool = True) -> str:
+	"""Quita escapes y controles y aplica los retornos de carro de una línea.
+	
+	Args:
+		linea: Línea sin el salto final.
+		quitar_escapes: Si deben quitarse las secuencias de escape ANSI.
+		final: Si la línea está completa; si no, una secuencia de escape
+			a medio llegar al final no se muestra.
+	
+	Returns:
+		Texto de la línea tal como se vería en pantalla.
+	"""
+	if quitar_escapes and "\x1b" in linea:
+		linea = _ANSI.sub("", linea)
+		if not final:
+			corte = linea.rfind("\x1b")
+			if corte != -1 and len(linea) - corte <= _LONGITUD_MAXIMA_ESCAPE:
+				linea = linea[:corte]
+		linea = linea.replace("\x1b", "")
+	if linea.endswith("\r"):
+		linea = linea.rstrip("\r")
+	if "\r" in linea:
+		# Lo que se escribe tras un retorno de carro tapa el principio de la línea
+		partes = linea.split("\r")
+		linea = partes[0]
+		for parte in partes[1:]:
+			linea = parte + linea[len(parte):]
+	return _CONTROL.sub("", linea)
+
+
+class IngestorFlujo:
+	"""Convierte bloques de bytes de una salida en líneas de texto.
+	
+	Las líneas completas se entregan una sola vez; la última línea, sin
+	salto todavía (normalmente el prompt), queda en `pendiente`.
+	"""
+	
+	# Bytes que se leen de cada vez en `consumir`
+	TAMANO_BLOQUE = 64 * 1024
+	
+	def __init__(self, codificacion: str = "utf-8-sig", quitar_escapes: bool = True):
+		"""Inicializa el ingestor.
+		
+		Args:
+			codificacion: Codificación de la salida; con "utf-8-sig" se descarta la marca BOM inicial.
+			quitar_escapes: Si deben quitarse las secuencias de escape ANSI.
+		"""
+		self._decodificador = codecs.getincrementaldecoder(codificacion)(errors="replace")
+		self._quitar_escapes = quitar_escapes
+		# Texto decodificado después del último salto de línea
+		self._resto = ""
+		self.lineas_totales = 0
+		self.bytes_totales = 0
+	
+	@property
+	def pendiente(self) -> str:
+		"""Línea en curso, sin salto todavía, tal como se vería en pantalla."""
+		return limpiar_linea(self._resto, self._quitar_escapes, final=False)
+	
+	def alimentar(self, datos: bytes) -> List[str]:
+		"""Añade un bloque de bytes.
+		
+		Args:
+			datos: Bytes leídos de la salida.
+		
+		Returns:
+			Líneas que el bloque ha completado.
+		"""
+		self.bytes_totales += len(datos)
+		return self._separar(self._decodificador.decode(datos))
+	
+	def terminar(self) -> List[str]:
+		"""Entrega lo que queda al terminar la salida.
+		
+		Returns:
+			Líneas restantes, incluida la última aunque no acabe en salto.
+		"""
+		lineas = self._separar(self._decodificador.decode(b"", final=True))
+		if self._resto:
+			lineas.append(limpiar_linea(self._resto, self._quitar_escapes))
+			self._resto = ""
+			self.lineas_totales += 1
+		return lineas
+	
+	def consumir(
+		self,
+		flujo: BinaryIO,
+		al_recibir: Callable[[List[str]], None],
+		copia: Optional[BinaryIO] = None
+	) -> int:
+		"""Lee un flujo hasta el final y entrega las líneas a medida que se completan.
+		
+		Se bloquea mientras el flujo no tenga datos, así que con una tubería
+		debe llamarse desde un hilo propio.
+		
+		Args:
+			flujo: Flujo binario (tubería de un proceso, archivo...).
+			al_recibir: Recibe cada grupo de líneas nuevas.
+			copia: Archivo binario donde se copian los bytes leídos tal cual.
+		
+		Returns:
+			Número total de líneas entregadas.
+		"""
+		leer = getattr(flujo, "read1", flujo.read)
+		while True:
+			datos = leer(self.TAMANO_BLOQUE)
+			if not datos:
+				break
+			if copia is not None:
+				copia.write(datos)
+				copia.flush()
+			lineas = self.alimentar(datos)
+			if lineas:
+				al_recibir(lineas)
+		lineas = self.terminar()
+		if lineas:
+			al_recibir(lineas)
+		return self.lineas_totales
+	
+	def _separar(self, texto: str) -> List[str]:
+		"""Une el texto decodificado con el resto y separa las líneas completas."""
+		if not texto:
+			return []
+		self._resto += texto
+		if "\n" not in self._resto:
+			return []
+		completas, self._resto = self._resto.rsplit("\n", 1)
+		lineas = [limpiar_linea(linea, self._quitar_escapes) for linea in completas.split("\n")]
+		self.lineas_totales += len(lineas)
+		return lineas
+
+
+class SeguidorArchivo:
+	"""Lee por el final un archivo de salida que otro proceso va ampliando.
+	
+	La línea sin terminar se entrega como última línea de cada delta y se
+	sustituye en el siguiente, como la línea pendiente de las capturas.
+	"""
+	
+	def __init__(self, ruta: str, codificacion: str = "utf-8-sig"):
+		"""Inicializa el seguidor sin leer nada.
+		
+		Args:
+			ruta: Archivo a seguir.
+			codificacion: Codificación del archivo.
+		"""
+		self.ruta = ruta
+		self._codificacion = codificacion
+		self._ingestor = IngestorFlujo(codificacion)
+		self._posicion = 0
+		# Líneas completas entregadas
+		self.lineas = 0
+		# Si la última línea entregada era la pendiente
+		self._pendiente_entregada = False
+	
+	@property
+	def posicion(self) -> int:
+		"""Bytes del archivo leídos hasta ahora."""
+		return self._posicion
+	
+	@property
+	def lineas_totales(self) -> int:
+		"""Líneas del archivo entregadas, incluida la pendiente."""
+		return self.lineas + (1 if self._pendiente_entregada else 0)
+	
+	def leer(self) -> DeltaCaptura:
+		"""Lee lo añadido al archivo desde la lectura anterior.
+		
+		Returns:
+			Líneas nuevas; con `reinicio` si el archivo se ha vaciado o
+			recortado y se ha vuelto a leer desde el principio.
+		
+		Raises:
+			OSError: Si el archivo no se puede abrir.
+		"""
+		reinicio = False
+		with open(self.ruta, "rb") as archivo:
+			tamano = os.fstat(archivo.fileno()).st_size
+			if tamano < self._posicion:
+				# Recortado (o sustituido por uno más pequeño): se empieza de nuevo
+				self._ingestor = IngestorFlujo(self._codificacion)
+				self._posicion = 0
+				self.lineas = 0
+				self._pendiente_entregada = False
+				reinicio = True
+			archivo.seek(self._posicion)
+			datos = archivo.read(tamano - self._posicion)
+		self._posicion += len(datos)
+		
+		inicio = self.lineas
+		if not datos and not reinicio:
+			return DeltaCaptura(inicio)
+		completas = self._ingestor.alimentar(datos)
+		pendiente = self._ingestor.pendiente
+		lineas = completas + ([pendiente] if pendiente else [])
+		if not lineas and self._pendiente_entregada:
+			# La línea pendiente se ha borrado con retornos de carro
+			lineas = [""]
+		delta = DeltaCaptura(
+			inicio, lineas, reinicio=reinicio, sustituye_pendiente=self._pendiente_entregada and not reinicio
+		)
+		self.lineas += len(completas)
+		self._pendiente_entregada = bool(pendiente)
+		return delta
+
+
+def nueva_ruta_captura(directorio: str, tipo: str) -> str:
+	"""Ruta para el archivo de captura de una consola que se va a abrir.
+	
+	Args:
+		directorio: Directorio de las capturas.
+		tipo: Tipo de consola (powershell, wsl...).
+	
+	Returns:
+		Ruta de un archivo que todavía no existe.
+	"""
+	base = os.path.join(directorio, f"{time.strftime('%Y%m%d-%H%M%S')}-{tipo}")
+	ruta = base + EXTENSION_CAPTURA
+	numero = 1
+	while os.path.exists(ruta):
+		numero += 1
+		ruta = f"{base}-{numero}{EXTENSION_CAPTURA}"
+	return ruta
+
+
+def listar_capturas(directorio: str) -> List[Dict[str, Any]]:
+	"""Lista los archivos de captura, del más reciente al más antiguo.
+	
+	Args:
+		directorio: Directorio de las capturas.
+	
+	Returns:
+		Diccionarios con `ruta`, `tipo`, `modificacion` y `tamano`.
+	"""
+	capturas = []
+	try:
+		with os.scandir(directorio) as iterador:
+			for entrada in iterador:
+				if not entrada.name.endswith(EXTENSION_CAPTURA) or not entrada.is_file():
+					continue
+				estado = entrada.stat()
+				partes = entrada.name[:-len(EXTENSION_CAPTURA)].split("-", 2)
+				capturas.append({
+					"ruta": entrada.path,
+					"tipo": partes[2] if len(partes) > 2 else "",
+					"modificacion": estado.st_mtime,
+					"tamano": estado.st_size
+				})
+	except OSError:
+		return []
+	capturas.sort(key=lambda c: c["modificacion"], reverse=True)
+	return capturas
+
+
+def limpiar_capturas(directorio: str, max_capturas: int) -> int:
+	"""Borra las capturas más antiguas por encima del máximo.
+	
+	Args:
+		directorio: Directorio de las capturas.
+		max_capturas: Número de capturas que se conservan.
+	
+	Returns:
+		Número de archivos borrados.
+	"""
+	borradas = 0
+	for captura in listar_capturas(directorio)[max(0, max_capturas):]:
+		try:
+			os.remove(captura["ruta"])
+			borradas += 1
+		except OSError:
+			# La consola aún lo tiene abierto
+			pass
+	return borradas
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Manifiesto de Plugins
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Índice en caché de los plugins disponibles.
+
+Para construir el menú de plugins no hace falta importarlos: sus
+metadatos se leen del código fuente con `ast` (sin ejecutarlo) y se
+guardan en un JSON junto a la fecha de modificación y el tamaño de cada
+archivo. En los arranques siguientes solo se vuelven a analizar los
+archivos que han cambiado.
+"""
+
+import ast
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from logHandler import log
+
+
+# Cambia cuando cambia el formato del archivo de caché
+VERSION_MANIFIESTO = 1
+
+
+@dataclass
+class EntradaManifiesto:
+	"""Datos de un plugin obtenidos sin importarlo."""
+	modulo: str
+	clase: str
+	nombre: str
+	version: str
+	descripcion: str
+	autor: str
+	categoria: str = "general"
+	dependencias: List[str] = field(default_factory=list)
+	requiere_hilo_principal: bool = False
+	resultado_cacheable: bool = False
+	# Campos escritos como _("...") que se traducen al mostrarlos
+	traducibles: List[str] = field(default_factory=list)
+	mtime_ns: int = 0
+	tamano: int = 0
+
+
+# Orden de los argumentos posicionales de MetadatosPlugin
+_CAMPOS_METADATOS = ("nombre", "version", "descripcion", "autor", "categoria", "dependencias")
+
+
+def _valor_literal(nodo: ast.AST) -> Tuple[Any, bool]:
+	"""Evalúa un nodo literal, aceptando también cadenas marcadas con _().
+	
+	Args:
+		nodo: Nodo del árbol sintáctico.
+	
+	Returns:
+		Tupla (valor, traducible).
+	
+	Raises:
+		ValueError: Si el valor no es literal.
+	"""
+	if (isinstance(nodo, ast.Call) and isinstance(nodo.func, ast.Name) and nodo.func.id == "_"
+			and len(nodo.args) == 1 and not nodo.keywords):
+		return ast.literal_eval(nodo.args[0]), True
+	return ast.literal_eval(nodo), False
+
+
+def _es_plugin(clase: ast.ClassDef) -> bool:
+	"""Indica si una clase hereda directamente de PluginBase."""
+	for base in clase.bases:
+		if isinstance(base, ast.Name) and base.id == "PluginBase":
+			return True
+		if isinstance(base, ast.Attribute) and base.attr == "PluginBase":
+			return True
+	return False
+
+
+def analizar_plugin(ruta: str) -> Optional[EntradaManifiesto]:
+	"""Lee los metadatos de un plugin a partir de su código fuente.
+	
+	Args:
+		ruta: Ruta del archivo .py del plugin.
+	
+	Returns:
+		Entrada del manifiesto, o None si el archivo no declara un plugin
+		con metadatos literales (entonces hay que importarlo para conocerlos).
+	"""
+	with open(ruta, "rb") as archivo:
+		arbol = ast.parse(archivo.read(), ruta)
+	
+	for nodo in arbol.body:
+		if not isinstance(nodo, ast.ClassDef) or not _es_plugin(nodo):
+			continue
+		datos: Dict[str, Any] = {}
+		traducibles: List[str] = []
+		indicadores = {"REQUIERE_HILO_PRINCIPAL": False, "RESULTADO_CACHEABLE": False}
+		for sentencia in nodo.body:
+			if not isinstance(sentencia, ast.Assign) or len(sentencia.targets) != 1:
+				continue
+			destino = sentencia.targets[0]
+			if not isinstance(destino, ast.Name):
+				continue
+			if destino.id in indicadores:
+				try:
+					indicadores[destino.id] = bool(ast.literal_eval(sentencia.value))
+				except ValueError:
+					return None
+			elif destino.id == "METADATOS" and isinstance(sentencia.value, ast.Call):
+				llamada = sentencia.value
+				argumentos = list(zip(_CAMPOS_METADATOS, llamada.args))
+				argumentos += [(k.arg, k.value) for k in llamada.keywords]
+				try:
+					for campo, valor in argumentos:
+						datos[campo], traducible = _valor_literal(valor)
+						if traducible:
+							traducibles.append(campo)
+				except ValueError:
+					return None
+		if not {"nombre", "version", "descripcion", "autor"} <= datos.keys():
+			return None
+		return EntradaManifiesto(
+			modulo=os.path.splitext(os.path.basename(ruta))[0],
+			clase=nodo.name,
+			nombre=datos["nombre"],
+			version=datos["version"],
+			descripcion=datos["descripcion"],
+			autor=datos["autor"],
+			categoria=datos.get("categoria") or "general",
+			dependencias=list(datos.get("dependencias") or []),
+			requiere_hilo_principal=indicadores["REQUIERE_HILO_PRINCIPAL"],
+			resultado_cacheable=indicadores["RESULTADO_CACHEABLE"],
+			traducibles=traducibles
+		)
+	return None
+
+
+class ManifiestoPlugins:
+	"""Índice de los plugins de un directorio, guardado en un archivo JSON."""
+	
+	def __init__(self, directorio: str, ruta_cache: str):
+		"""Inicializa el manifiesto sin leer nada todavía.
+		
+		Args:
+			directorio: Directorio de los plugins.
+			ruta_cache: Archivo JSON donde se guarda el índice.
+		"""
+		self._directorio = directorio
+		self._ruta_cache = ruta_cache
+		self._entradas: Optional[Dict[str, EntradaManifiesto]] = None
+		# Plugins cuyos metadatos no se pudieron leer sin importarlos
+		self._sin_manifiesto: List[str] = []
+		# Firma (mtime_ns, tamano) de esos plugins, para no volver a analizarlos si no cambian
+		self._firmas_sin_manifiesto: Dict[str, Dict[str, int]] = {}
+	
+	@property
+	def entradas(self) -> Dict[str, EntradaManifiesto]:
+		"""Entradas por nombre de módulo, cargadas en el primer acceso."""
+		if self._entradas is None:
+			self.actualizar()
+		return self._entradas
+	
+	@property
+	def sin_manifiesto(self) -> List[str]:
+		"""Módulos de plugin que hay que importar para conocer sus metadatos."""
+		if self._entradas is None:
+			self.actualizar()
+		return self._sin_manifiesto
+	
+	def modulos(self) -> List[str]:
+		"""Todos los módulos de plugin del directorio, con o sin entrada."""
+		return sorted(list(self.entradas) + self.sin_manifiesto)
+	
+	def _leer_cache(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, int]]]:
+		"""Lee el índice guardado, o uno vacío si no existe o es de otra versión.
+		
+		Returns:
+			Entradas guardadas y firmas de los plugins sin manifiesto, por módulo.
+		"""
+		try:
+			with open(self._ruta_cache, "r", encoding="utf-8") as archivo:
+				datos = json.load(archivo)
+			if datos.get("version") == VERSION_MANIFIESTO:
+				return datos.get("plugins", {}), datos.get("sin_manifiesto", {})
+		except FileNotFoundError:
+			pass
+		except (OSError, ValueError) as e:
+			log.debug(f"consoleLog: Manifiesto de plugins ilegible, se regenera: {e}")
+		return {}, {}
+	
+	def _guardar_cache(self):
+		"""Escribe el índice en disco."""
+		datos = {
+			"version": VERSION_MANIFIESTO,
+			"plugins": {modulo: asdict(entrada) for modulo, entrada in self._entradas.items()},
+			"sin_manifiesto": self._firmas_sin_manifiesto
+		}
+		temporal = self._ruta_cache + ".tmp"
+		try:
+			with open(temporal, "w", encoding="utf-8") as archivo:
+				json.dump(datos, archivo, ensure_ascii=False, indent=1)
+			os.replace(temporal, self._ruta_cache)
+		except OSError as e:
+			log.debug(f"consoleLog: No se pudo guardar el manifiesto de plugins: {e}")
+	
+	def actualizar(self):
+		"""Compara el índice guardado con los archivos y analiza solo los cambiados."""
+		guardadas, firmas_guardadas = self._leer_cache()
+		entradas: Dict[str, EntradaManifiesto] = {}
+		firmas: Dict[str, Dict[str, int]] = {}
+		cambios = False
+		
+		try:
+			with os.scandir(self._directorio) as iterador:
+				archivos = [a for a in iterador if a.name.endswith(".py") and not a.name.startswith("_")]
+		except OSError as e:
+			log.warning(f"consoleLog: Directorio de plugins no encontrado: {self._directorio}: {e}")
+			archivos = []
+		
+		for archivo in archivos:
+			modulo = archivo.name[:-3]
+			estado = archivo.stat()
+			firma = {"mtime_ns": estado.st_mtime_ns, "tamano": estado.st_size}
+			if firmas_guardadas.get(modulo) == firma:
+				# Ya se sabe que hay que importarlo para leer sus metadatos
+				firmas[modulo] = firma
+				continue
+			guardada = guardadas.get(modulo)
+			if guardada and guardada.get("mtime_ns") == estado.st_mtime_ns and guardada.get("tamano") == estado.st_size:
+				try:
+					entradas[modulo] = EntradaManifiesto(**guardada)
+					continue
+				except TypeError:
+					pass
+			cambios = True
+			try:
+				entrada = analizar_plugin(archivo.path)
+			except (OSError, SyntaxError, ValueError) as e:
+				log.debug(f"consoleLog: No se pudo analizar el plugin {modulo}: {e}")
+				entrada = None
+			if entrada is None:
+				firmas[modulo] = firma
+				continue
+			entrada.mtime_ns = estado.st_mtime_ns
+			entrada.tamano = estado.st_size
+			entradas[modulo] = entrada
+		
+		if set(guardadas) - set(entradas) or set(firmas_guardadas) - set(firmas):
+			cambios = True
+		self._entradas = entradas
+		self._firmas_sin_manifiesto = firmas
+		self._sin_manifiesto = sorted(firmas)
+		if cambios:
+			self._guardar_cache()
+		log.debug(f"consoleLog: Manifiesto de plugins: {len(entradas)} plugins ({'regenerado' if cambios else 'desde caché'})")
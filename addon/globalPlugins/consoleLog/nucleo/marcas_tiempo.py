@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Marcas de Tiempo por Línea
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Hora de llegada de cada línea de una consola.
+
+Las consolas no imprimen la hora, pero el modo seguimiento captura de
+forma periódica: cada línea nueva se marca con el instante en que se vio
+por primera vez. Las marcas se guardan en un `array('d')` paralelo a las
+líneas del visor (8 bytes por línea). Las líneas que ya estaban al abrir
+el visor o que se cargan del historial no tienen marca (NaN).
+"""
+
+import heapq
+import math
+from array import array
+from typing import List, Optional, Tuple
+
+import addonHandler
+_ = addonHandler.initTranslation()
+if not callable(_):
+	_ = lambda x: x
+
+from .diferencias import DeltaCaptura
+
+
+SIN_MARCA = float("nan")
+
+
+def formatear_duracion(segundos: float) -> str:
+	"""Expresa una duración en horas, minutos y segundos.
+	
+	Args:
+		segundos: Duración en segundos.
+	
+	Returns:
+		Texto legible, por ejemplo "2 min 5 s".
+	"""
+	segundos = abs(segundos)
+	if segundos < 10:
+		return _("{:.1f} s").format(segundos)
+	total = int(round(segundos))
+	horas, resto = divmod(total, 3600)
+	minutos, segundos = divmod(resto, 60)
+	if horas:
+		return _("{} h {} min {} s").format(horas, minutos, segundos)
+	if minutos:
+		return _("{} min {} s").format(minutos, segundos)
+	return _("{} s").format(segundos)
+
+
+class MarcasTiempo:
+	"""Instante de llegada de cada línea mostrada en el visor.
+	
+	Una línea pendiente que se completa en capturas posteriores conserva
+	la marca de cuando apareció.
+	"""
+	
+	def __init__(self):
+		"""Inicializa el registro sin líneas."""
+		self._marcas = array('d')
+		self._desplazamiento = 0
+	
+	def __len__(self) -> int:
+		return len(self._marcas)
+	
+	def reiniciar(self, total_lineas: int, marca: float = SIN_MARCA, desplazamiento: int = 0):
+		"""Sustituye todas las marcas.
+		
+		Args:
+			total_lineas: Número de líneas mostradas.
+			marca: Instante asignado a todas ellas (por defecto, desconocido).
+			desplazamiento: Desplazamiento del seguidor de capturas en este momento.
+		"""
+		self._marcas = array('d', [marca]) * total_lineas
+		self._desplazamiento = desplazamiento
+	
+	def aplicar_delta(self, delta: DeltaCaptura, total_lineas: int, marca: float):
+		"""Actualiza las marcas cuando el visor muestra la captura completa.
+		
+		Args:
+			delta: Líneas nuevas calculadas por el seguidor de capturas.
+			total_lineas: Líneas de la captura nueva.
+			marca: Instante de la captura.
+		"""
+		if delta.reinicio:
+			self.reiniciar(total_lineas, marca, delta.desplazamiento)
+			return
+		# Las líneas que salieron por arriba del buffer
+		salidas = delta.desplazamiento - self._desplazamiento
+		self._desplazamiento = delta.desplazamiento
+		if salidas > 0:
+			del self._marcas[:salidas]
+		conservadas = delta.inicio + (1 if delta.sustituye_pendiente else 0)
+		del self._marcas[conservadas:]
+		self.completar(total_lineas, marca)
+	
+	def completar(self, total_lineas: int, marca: float):
+		"""Ajusta el número de marcas cuando solo se añaden líneas al final.
+		
+		Args:
+			total_lineas: Líneas mostradas tras el cambio.
+			marca: Instante de las líneas añadidas.
+		"""
+		faltan = total_lineas - len(self._marcas)
+		if faltan > 0:
+			self._marcas.extend(array('d', [marca]) * faltan)
+		elif faltan < 0:
+			del self._marcas[total_lineas:]
+	
+	def alinear_final(self, total_lineas: int):
+		"""Conserva las marcas actuales para las últimas líneas de un texto mayor.
+		
+		Se usa al cargar el historial de la sesión actual, que termina con
+		las líneas que ya se estaban mostrando.
+		
+		Args:
+			total_lineas: Líneas del nuevo texto.
+		"""
+		conservadas = self._marcas[-total_lineas:] if total_lineas else array('d')
+		self._marcas = array('d', [SIN_MARCA]) * (total_lineas - len(conservadas)) + conservadas
+	
+	def marca(self, indice: int) -> Optional[float]:
+		"""Instante en que apareció una línea.
+		
+		Args:
+			indice: Índice (base 0) de la línea.
+		
+		Returns:
+			Marca de tiempo o None si se desconoce.
+		"""
+		if not 0 <= indice < len(self._marcas):
+			return None
+		valor = self._marcas[indice]
+		return None if math.isnan(valor) else valor
+	
+	def pausas_mayores(self, cantidad: int = 10) -> List[Tuple[float, int]]:
+		"""Busca las esperas más largas entre líneas consecutivas.
+		
+		Args:
+			cantidad: Número máximo de pausas a devolver.
+		
+		Returns:
+			Tuplas (segundos, índice de la línea que llegó tras la pausa),
+			de la más larga a la más corta.
+		"""
+		marcas = self._marcas
+		pausas = (
+			(marcas[i] - marcas[i - 1], i)
+			for i in range(1, len(marcas))
+			# Las líneas de una misma captura comparten marca; NaN nunca es mayor
+			if marcas[i] > marcas[i - 1]
+		)
+		return heapq.nlargest(cantidad, pausas)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Motor de Alertas
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Detección de patrones de alerta en las líneas nuevas de una consola.
+
+Todos los patrones se compilan en una única expresión regular que
+localiza las líneas con alguna coincidencia, de forma que cada bloque de
+líneas se recorre una sola vez sea cual sea el número de patrones. Solo
+en esas líneas se comprueba después cada patrón por separado, para que
+los patrones que se solapan ("ERROR" dentro de "FATAL ERROR") informen
+todos de la línea.
+"""
+
+import re
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class CoincidenciaAlerta:
+	"""Una aparición de un patrón de alerta."""
+	numero_linea: int
+	linea: str
+	patron: str
+	voz: bool = True
+	sonido: bool = True
+
+
+@dataclass
+class ResultadoAlertas:
+	"""Resultado de analizar un bloque de líneas."""
+	coincidencias: List[CoincidenciaAlerta] = field(default_factory=list)
+	anunciables: List[CoincidenciaAlerta] = field(default_factory=list)
+	silenciadas: Dict[str, int] = field(default_factory=dict)
+
+
+class MotorAlertas:
+	"""Busca los patrones de alerta configurados y limita su frecuencia.
+	
+	Cada patrón se anuncia como mucho una vez por intervalo; el resto de
+	apariciones se cuentan como silenciadas para poder resumirlas.
+	"""
+	
+	def __init__(self, patrones: List[Dict[str, Any]], intervalo_minimo: float = 0.0):
+		"""Inicializa el motor.
+		
+		Args:
+			patrones: Patrones de `ConfiguracionAlertas.patrones`.
+			intervalo_minimo: Segundos mínimos entre anuncios del mismo patrón.
+		"""
+		self._expresion: Optional[re.Pattern] = None
+		self._patrones: List[Dict[str, Any]] = []
+		self._expresiones: List[re.Pattern] = []
+		self._ultimo_anuncio: Dict[str, float] = {}
+		self.configurar(patrones, intervalo_minimo)
+	
+	def configurar(self, patrones: List[Dict[str, Any]], intervalo_minimo: float = 0.0):
+		"""Compila los patrones, juntos y por separado.
+		
+		Args:
+			patrones: Lista de diccionarios con `patron`, `voz` y `sonido`.
+			intervalo_minimo: Segundos mínimos entre anuncios del mismo patrón.
+		"""
+		self.intervalo_minimo = max(0.0, float(intervalo_minimo))
+		self._patrones = [p for p in patrones if p.get("patron")]
+		self._ultimo_anuncio = {}
+		self._expresiones = [re.compile(re.escape(p["patron"]), re.IGNORECASE) for p in self._patrones]
+		if not self._patrones:
+			self._expresion = None
+			return
+		# Solo indica qué líneas tienen alguna coincidencia
+		self._expresion = re.compile("|".join(e.pattern for e in self._expresiones), re.IGNORECASE)
+	
+	@property
+	def activo(self) -> bool:
+		"""Indica si hay algún patrón que buscar."""
+		return self._expresion is not None
+	
+	def buscar(self, lineas: List[str], primera_linea: int = 1) -> List[CoincidenciaAlerta]:
+		"""Busca todas las apariciones de los patrones en un bloque de líneas.
+		
+		Cada patrón se informa como mucho una vez por línea, aunque se
+		solape con otro.
+		
+		Args:
+			lineas: Líneas a analizar.
+			primera_linea: Número de línea (base 1) de la primera del bloque.
+		
+		Returns:
+			Coincidencias en orden de aparición.
+		"""
+		if self._expresion is None or not lineas:
+			return []
+		bloque = "\n".join(lineas)
+		inicios = None
+		coincidencias = []
+		resultado = self._expresion.search(bloque)
+		while resultado is not None:
+			if inicios is None:
+				# Desplazamientos de cada línea, solo si hay alguna coincidencia
+				inicios = []
+				posicion = 0
+				for linea in lineas:
+					inicios.append(posicion)
+					posicion += len(linea) + 1
+			indice_linea = bisect_right(inicios, resultado.start()) - 1
+			linea = lineas[indice_linea]
+			# Cada patrón por separado, ordenados por su posición en la línea
+			encontrados = []
+			for indice_patron, expresion in enumerate(self._expresiones):
+				aparicion = expresion.search(linea)
+				if aparicion is not None:
+					encontrados.append((aparicion.start(), indice_patron))
+			for _posicion, indice_patron in sorted(encontrados):
+				item = self._patrones[indice_patron]
+				coincidencias.append(CoincidenciaAlerta(
+					numero_linea=primera_linea + indice_linea,
+					linea=linea,
+					patron=item["patron"],
+					voz=item.get("voz", True),
+					sonido=item.get("sonido", True)
+				))
+			# La línea ya está analizada: se sigue por la siguiente
+			resultado = self._expresion.search(bloque, inicios[indice_linea] + len(linea) + 1)
+		return coincidencias
+	
+	def procesar(self, lineas: List[str], primera_linea: int = 1, ahora: Optional[float] = None) -> ResultadoAlertas:
+		"""Busca los patrones y decide qué apariciones anunciar.
+		
+		Args:
+			lineas: Líneas nuevas a analizar.
+			primera_linea: Número de línea (base 1) de la primera del bloque.
+			ahora: Instante actual (por defecto, `time.monotonic()`).
+		
+		Returns:
+			Coincidencias totales, las que deben anunciarse y el número de
+			silenciadas por patrón.
+		"""
+		resultado = ResultadoAlertas(coincidencias=self.buscar(lineas, primera_linea))
+		if not resultado.coincidencias:
+			return resultado
+		if ahora is None:
+			ahora = time.monotonic()
+		for coincidencia in resultado.coincidencias:
+			ultimo = self._ultimo_anuncio.get(coincidencia.patron)
+			if ultimo is not None and ahora - ultimo < self.intervalo_minimo:
+				resultado.silenciadas[coincidencia.patron] = resultado.silenciadas.get(coincidencia.patron, 0) + 1
+				continue
+			self._ultimo_anuncio[coincidencia.patron] = ahora
+			resultado.anunciables.append(coincidencia)
+		return resultado
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Perfilador de Plugins
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Tiempos y memoria de las llamadas a los plugins.
+
+`PerfiladorPlugins` cronometra cada `inicializar` y `ejecutar` y guarda
+las últimas duraciones de cada plugin para calcular la media y el
+percentil 95. Si se activa la medición de memoria, usa `tracemalloc`
+para anotar el pico de memoria reservada durante la llamada; como
+`tracemalloc` ralentiza todo el proceso, está desactivada por defecto.
+
+Las llamadas hechas en el hilo de la interfaz que superan el presupuesto
+se avisan en el registro de NVDA: mientras duran, NVDA no responde.
+"""
+
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+from logHandler import log
+
+import addonHandler
+_ = addonHandler.initTranslation()
+if not callable(_):
+	_ = lambda x: x
+
+
+@dataclass
+class EstadisticasPlugin:
+	"""Duraciones recientes de una fase (inicializar o ejecutar) de un plugin."""
+	nombre: str
+	fase: str
+	# Últimas duraciones en milisegundos
+	muestras: Deque[float] = field(default_factory=deque)
+	ejecuciones: int = 0
+	maximo_ms: float = 0.0
+	# Mayor pico de memoria medido, en bytes (None si no se ha medido)
+	memoria_pico: Optional[int] = None
+	# Llamadas en el hilo de la interfaz por encima del presupuesto
+	excesos: int = 0
+	
+	@property
+	def media_ms(self) -> float:
+		"""Duración media de las muestras guardadas."""
+		return sum(self.muestras) / len(self.muestras) if self.muestras else 0.0
+	
+	@property
+	def p95_ms(self) -> float:
+		"""Percentil 95 de las muestras guardadas (por rango más cercano)."""
+		if not self.muestras:
+			return 0.0
+		ordenadas = sorted(self.muestras)
+		return ordenadas[max(0, -(-len(ordenadas) * 95 // 100) - 1)]
+
+
+class PerfiladorPlugins:
+	"""Estadísticas de duración y memoria de las llamadas a los plugins."""
+	
+	# Duraciones que se guardan de cada plugin y fase
+	MUESTRAS = 100
+	
+	def __init__(self, presupuesto_ms: float = 100.0, medir_memoria: bool = False):
+		"""Inicializa el perfilador sin estadísticas.
+		
+		Args:
+			presupuesto_ms: Milisegundos que un plugin puede ocupar el hilo de la interfaz.
+			medir_memoria: Si debe medirse la memoria con `tracemalloc`.
+		"""
+		self.presupuesto_ms = presupuesto_ms
+		self._estadisticas: Dict[Tuple[str, str], EstadisticasPlugin] = {}
+		self._bloqueo = threading.Lock()
+		self._medir_memoria = False
+		# Si `tracemalloc` lo arrancó el perfilador (y debe pararlo él)
+		self._tracemalloc_propio = False
+		self._mediciones_memoria = 0
+		self.configurar(presupuesto_ms, medir_memoria)
+	
+	@property
+	def mide_memoria(self) -> bool:
+		"""Indica si se está midiendo la memoria de los plugins."""
+		return self._medir_memoria
+	
+	def configurar(self, presupuesto_ms: float, medir_memoria: bool):
+		"""Cambia el presupuesto y activa o desactiva la medición de memoria.
+		
+		Args:
+			presupuesto_ms: Milisegundos que un plugin puede ocupar el hilo de la interfaz.
+			medir_memoria: Si debe medirse la memoria con `tracemalloc`.
+		"""
+		self.presupuesto_ms = presupuesto_ms
+		with self._bloqueo:
+			if medir_memoria and not self._medir_memoria:
+				if not tracemalloc.is_tracing():
+					tracemalloc.start()
+					self._tracemalloc_propio = True
+			elif not medir_memoria and self._medir_memoria:
+				self._parar_tracemalloc()
+			self._medir_memoria = medir_memoria
+	
+	def terminar(self):
+		"""Deja de medir la memoria si el perfilador arrancó `tracemalloc`."""
+		with self._bloqueo:
+			self._parar_tracemalloc()
+			self._medir_memoria = False
+	
+	def _parar_tracemalloc(self):
+		"""Para `tracemalloc` si lo arrancó el perfilador."""
+		if self._tracemalloc_propio and tracemalloc.is_tracing():
+			tracemalloc.stop()
+		self._tracemalloc_propio = False
+	
+	@contextmanager
+	def medir(self, nombre: str, fase: str):
+		"""Cronometra una llamada a un plugin.
+		
+		Con varios plugins midiéndose a la vez en segundo plano, el pico de
+		memoria de cada uno incluye lo reservado por los demás.
+		
+		Args:
+			nombre: Nombre del plugin.
+			fase: "inicializar" o "ejecutar".
+		"""
+		en_interfaz = threading.current_thread() is threading.main_thread()
+		medir_memoria = self._medir_memoria and tracemalloc.is_tracing()
+		base = 0
+		if medir_memoria:
+			with self._bloqueo:
+				self._mediciones_memoria += 1
+				if self._mediciones_memoria == 1:
+					tracemalloc.reset_peak()
+			base = tracemalloc.get_traced_memory()[0]
+		inicio = time.perf_counter()
+		try:
+			yield
+		finally:
+			duracion = (time.perf_counter() - inicio) * 1000
+			pico = None
+			if medir_memoria:
+				pico = max(0, tracemalloc.get_traced_memory()[1] - base) if tracemalloc.is_tracing() else None
+				with self._bloqueo:
+					self._mediciones_memoria -= 1
+			self._registrar(nombre, fase, duracion, pico, en_interfaz)
+	
+	def _registrar(self, nombre: str, fase: str, duracion: float, pico: Optional[int], en_interfaz: bool):
+		"""Añade una duración a las estadísticas y avisa si supera el presupuesto."""
+		excede = en_interfaz and duracion > self.presupuesto_ms
+		with self._bloqueo:
+			estadisticas = self._estadisticas.get((nombre, fase))
+			if estadisticas is None:
+				estadisticas = EstadisticasPlugin(nombre, fase, deque(maxlen=self.MUESTRAS))
+				self._estadisticas[(nombre, fase)] = estadisticas
+			estadisticas.muestras.append(duracion)
+			estadisticas.ejecuciones += 1
+			estadisticas.maximo_ms = max(estadisticas.maximo_ms, duracion)
+			if pico is not None:
+				estadisticas.memoria_pico = max(estadisticas.memoria_pico or 0, pico)
+			if excede:
+				estadisticas.excesos += 1
+		if excede:
+			log.warning(
+				f"consoleLog: El plugin {nombre} ocupó el hilo de la interfaz {duracion:.0f} ms en {fase} "
+				f"(presupuesto: {self.presupuesto_ms:.0f} ms)"
+			)
+	
+	def estadisticas(self) -> List[EstadisticasPlugin]:
+		"""Estadísticas de cada plugin y fase, de mayor a menor percentil 95.
+		
+		Returns:
+			Copias de las estadísticas, que no cambian con las llamadas posteriores.
+		"""
+		with self._bloqueo:
+			copias = [
+				EstadisticasPlugin(
+					e.nombre, e.fase, deque(e.muestras), e.ejecuciones, e.maximo_ms, e.memoria_pico, e.excesos
+				)
+				for e in self._estadisticas.values()
+			]
+		copias.sort(key=lambda e: e.p95_ms, reverse=True)
+		return copias
+	
+	def reiniciar(self):
+		"""Borra las estadísticas acumuladas."""
+		with self._bloqueo:
+			self._estadisticas.clear()
+	
+	def informe(self) -> str:
+		"""Texto con las estadísticas, de los plugins más lentos a los más rápidos."""
+		lineas = [_("Rendimiento de los plugins (presupuesto en el hilo de la interfaz: {:.0f} ms)").format(self.presupuesto_ms)]
+		for e in self.estadisticas():
+			memoria = _(", memoria pico {:.1f} KB").format(e.memoria_pico / 1024) if e.memoria_pico is not None else ""
+			lineas.append(
+				_("  {nombre} ({fase}): {ejecuciones} llamadas, media {media:.1f} ms, p95 {p95:.1f} ms, máximo {maximo:.1f} ms{memoria}").format(
+					nombre=e.nombre, fase=e.fase, ejecuciones=e.ejecuciones, media=e.media_ms,
+					p95=e.p95_ms, maximo=e.maximo_ms, memoria=memoria
+				)
+			)
+		return "\n".join(lineas)
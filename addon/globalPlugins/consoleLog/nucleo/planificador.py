@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Planificador de Sondeos
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Planificación adaptativa de sondeos.
+
+Calcula el intervalo entre capturas del modo seguimiento: se aleja
+exponencialmente mientras la consola no cambia y vuelve al mínimo
+en cuanto aparece salida nueva. Los servicios en segundo plano que
+sondean varias consolas comparten un único hilo con un montículo de
+tareas ordenado por su próximo instante de ejecución.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from logHandler import log
+
+
+class PlanificadorAdaptativo:
+	"""Calcula el intervalo del siguiente sondeo de una consola.
+	
+	Lleva además la cuenta de los sondeos ahorrados respecto a sondear
+	siempre con el intervalo mínimo.
+	"""
+	
+	def __init__(self, minimo: float, maximo: float, factor: float):
+		"""Inicializa el planificador.
+		
+		Args:
+			minimo: Intervalo mínimo en segundos (con salida nueva).
+			maximo: Intervalo máximo en segundos (consola en reposo).
+			factor: Multiplicador del intervalo tras cada sondeo sin cambios.
+		"""
+		self.configurar(minimo, maximo, factor)
+		self._intervalo = self._minimo
+		self._sondeos = 0
+		self._omitidos = 0.0
+	
+	def configurar(self, minimo: float, maximo: float, factor: float):
+		"""Cambia los límites del planificador.
+		
+		Args:
+			minimo: Intervalo mínimo en segundos.
+			maximo: Intervalo máximo en segundos.
+			factor: Multiplicador de espera (se fuerza a 1 como mínimo).
+		"""
+		self._minimo = max(0.1, float(minimo))
+		self._maximo = max(self._minimo, float(maximo))
+		self._factor = max(1.0, float(factor))
+		if hasattr(self, '_intervalo'):
+			self._intervalo = min(max(self._intervalo, self._minimo), self._maximo)
+	
+	@property
+	def intervalo(self) -> float:
+		"""Intervalo en segundos hasta el próximo sondeo."""
+		return self._intervalo
+	
+	@property
+	def intervalo_ms(self) -> int:
+		"""Intervalo en milisegundos, listo para un wx.Timer."""
+		return int(self._intervalo * 1000)
+	
+	@property
+	def sondeos_realizados(self) -> int:
+		"""Número de sondeos registrados."""
+		return self._sondeos
+	
+	@property
+	def sondeos_omitidos(self) -> int:
+		"""Sondeos evitados respecto a sondear siempre al intervalo mínimo."""
+		return int(self._omitidos)
+	
+	def reiniciar(self):
+		"""Vuelve al intervalo mínimo y pone a cero los contadores."""
+		self._intervalo = self._minimo
+		self._sondeos = 0
+		self._omitidos = 0.0
+	
+	def registrar_sondeo(self, hubo_cambios: bool) -> float:
+		"""Registra el resultado de un sondeo y calcula el siguiente intervalo.
+		
+		Args:
+			hubo_cambios: Si la captura trajo contenido nuevo.
+		
+		Returns:
+			Intervalo en segundos hasta el próximo sondeo.
+		"""
+		self._sondeos += 1
+		# Con el intervalo mínimo se habrían hecho intervalo/mínimo sondeos
+		self._omitidos += max(0.0, self._intervalo / self._minimo - 1.0)
+		
+		if hubo_cambios:
+			self._intervalo = self._minimo
+		else:
+			self._intervalo = min(self._maximo, self._intervalo * self._factor)
+		return self._intervalo
+
+
+class PlanificadorCompartido:
+	"""Ejecuta en un único hilo las tareas periódicas de varias consolas.
+	
+	Cada tarea es una función sin argumentos que devuelve los segundos
+	hasta su siguiente ejecución, o None para terminar. El hilo duerme
+	hasta el instante de la tarea más próxima y termina solo cuando no
+	queda ninguna programada.
+	"""
+	
+	def __init__(self, nombre: str = "consoleLog_planificador"):
+		"""Inicializa el planificador sin tareas.
+		
+		Args:
+			nombre: Nombre del hilo de ejecución.
+		"""
+		self._nombre = nombre
+		# Entradas (instante, generación, clave); la generación desempata y
+		# permite descartar las entradas de tareas canceladas o reprogramadas
+		self._monticulo: List[Tuple[float, int, Any]] = []
+		self._tareas: Dict[Any, Tuple[int, Callable[[], Optional[float]]]] = {}
+		self._generaciones = itertools.count()
+		self._condicion = threading.Condition()
+		self._hilo: Optional[threading.Thread] = None
+		self._parado = False
+	
+	def __len__(self) -> int:
+		"""Número de tareas programadas."""
+		return len(self._tareas)
+	
+	def programar(self, clave: Any, funcion: Callable[[], Optional[float]], retraso: float = 0.0):
+		"""Programa una tarea, sustituyendo a la que tuviera la misma clave.
+		
+		Args:
+			clave: Identificador de la tarea.
+			funcion: Tarea a ejecutar; devuelve el retraso de la siguiente ejecución o None.
+			retraso: Segundos hasta la primera ejecución.
+		"""
+		with self._condicion:
+			self._parado = False
+			generacion = next(self._generaciones)
+			self._tareas[clave] = (generacion, funcion)
+			heapq.heappush(self._monticulo, (time.monotonic() + retraso, generacion, clave))
+			if self._hilo is None or not self._hilo.is_alive():
+				self._hilo = threading.Thread(target=self._bucle, name=self._nombre, daemon=True)
+				self._hilo.start()
+			self._condicion.notify()
+	
+	def cancelar(self, clave: Any):
+		"""Cancela una tarea; si se está ejecutando, no se vuelve a programar.
+		
+		Args:
+			clave: Identificador de la tarea.
+		"""
+		with self._condicion:
+			self._tareas.pop(clave, None)
+			self._condicion.notify()
+	
+	def programada(self, clave: Any) -> bool:
+		"""Indica si hay una tarea con esa clave.
+		
+		Args:
+			clave: Identificador de la tarea.
+		"""
+		return clave in self._tareas
+	
+	def detener(self):
+		"""Cancela todas las tareas y espera a que termine el hilo."""
+		with self._condicion:
+			self._parado = True
+			self._tareas.clear()
+			self._monticulo.clear()
+			self._condicion.notify()
+			hilo = self._hilo
+		if hilo is not None and hilo is not threading.current_thread():
+			hilo.join(timeout=2)
+	
+	def _siguiente(self) -> Optional[Tuple[int, Any, Callable[[], Optional[float]]]]:
+		"""Espera a que venza la próxima tarea.
+		
+		Returns:
+			Generación, clave y función de la tarea, o None si hay que terminar.
+		"""
+		with self._condicion:
+			while not self._parado:
+				if not self._tareas:
+					self._monticulo.clear()
+					self._hilo = None
+					return None
+				instante, generacion, clave = self._monticulo[0]
+				tarea = self._tareas.get(clave)
+				if tarea is None or tarea[0] != generacion:
+					# Entrada de una tarea cancelada o reprogramada
+					heapq.heappop(self._monticulo)
+					continue
+				espera = instante - time.monotonic()
+				if espera > 0:
+					self._condicion.wait(espera)
+					continue
+				heapq.heappop(self._monticulo)
+				return generacion, clave, tarea[1]
+			return None
+	
+	def _bucle(self):
+		"""Bucle del hilo: ejecuta las tareas vencidas y las vuelve a programar."""
+		while True:
+			siguiente = self._siguiente()
+			if siguiente is None:
+				return
+			generacion, clave, funcion = siguiente
+			try:
+				retraso = funcion()
+			except Exception as e:
+				log.error(f"consoleLog: Error en la tarea programada {clave}: {e}")
+				retraso = None
+			with self._condicion:
+				tarea = self._tareas.get(clave)
+				if tarea is None or tarea[0] != generacion:
+					# Cancelada o reprogramada mientras se ejecutaba
+					continue
+				if retraso is None:
+					del self._tareas[clave]
+				else:
+					heapq.heappush(self._monticulo, (time.monotonic() + max(0.0, retraso), generacion, clave))
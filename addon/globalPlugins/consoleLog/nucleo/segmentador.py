@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Segmentador de Comandos
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+División de una captura en bloques de comando.
+
+Un bloque va desde una línea de prompt (con el comando escrito) hasta la
+línea anterior al siguiente prompt; lo que queda entre medias es la
+salida del comando. Todos los patrones de prompt se compilan en una
+única expresión regular que recorre el texto de una sola pasada, y las
+líneas de prompt se guardan ordenadas en un `array` para localizar el
+bloque de cualquier línea con búsqueda binaria.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .captura import Captura
+
+
+# Patrones de prompt comunes; `comando` es lo escrito tras el prompt
+PATRONES_PROMPT = [
+	r'PS [A-Za-z]:\\[^>\n]*>(?P<comando>.*)',  # PowerShell: PS C:\Users>comando
+	r'[A-Za-z]:\\[^>\n]*>(?P<comando>.*)',  # CMD: C:\Users\User>comando
+	r'[\w.-]+@[\w.-]+:[^$#\n]*[$#] (?P<comando>.*)',  # Bash: usuario@equipo:~$ comando
+	r'\$ (?P<comando>.*)',  # Bash: $ comando
+	r'>>> (?P<comando>.*)',  # Python REPL: >>> comando
+	r'> (?P<comando>.*)',  # Prompt genérico: > comando
+]
+
+
+@dataclass
+class BloqueComando:
+	"""Un comando y el rango de líneas de su salida."""
+	linea_prompt: int
+	comando: str
+	# Rango [inicio_salida, fin_salida) de índices de línea de la captura
+	inicio_salida: int
+	fin_salida: int
+	
+	@property
+	def lineas_salida(self) -> int:
+		"""Número de líneas de salida."""
+		return self.fin_salida - self.inicio_salida
+
+
+class SegmentadorComandos:
+	"""Índice de las líneas de prompt de una captura.
+	
+	Las líneas se guardan con numeración absoluta (contando las que ya
+	salieron por arriba del buffer), así que el desplazamiento de la
+	consola no obliga a reescribir el índice.
+	"""
+	
+	def __init__(self, patrones: Optional[List[str]] = None):
+		"""Inicializa el segmentador.
+		
+		Args:
+			patrones: Expresiones de prompt con un grupo `comando`
+				(por defecto, `PATRONES_PROMPT`).
+		"""
+		alternativas = [
+			patron.replace("(?P<comando>", f"(?P<c{i}>")
+			for i, patron in enumerate(patrones or PATRONES_PROMPT)
+		]
+		self._expresion = re.compile(
+			r"^[ \t]*(?:" + "|".join(alternativas) + r")$", re.MULTILINE
+		)
+		self._lineas = array('q')
+		self._comandos: List[str] = []
+		self._desplazamiento = 0
+		self._total_lineas = 0
+	
+	def __len__(self) -> int:
+		"""Número de líneas de prompt indexadas."""
+		return len(self._lineas)
+	
+	def es_prompt(self, linea: str) -> Optional[str]:
+		"""Comprueba si una línea suelta es un prompt.
+		
+		Args:
+			linea: Texto de la línea.
+		
+		Returns:
+			Comando escrito tras el prompt (vacío si no hay ninguno), o
+			None si la línea no es un prompt.
+		"""
+		resultado = self._expresion.match(linea)
+		if resultado is None:
+			return None
+		return resultado.group(resultado.lastgroup).strip()
+	
+	def comandos_en(self, texto: str, inicio: int = 0, fin: Optional[int] = None) -> List[str]:
+		"""Comandos escritos en un tramo de texto, sin añadirlos al índice.
+		
+		Args:
+			texto: Texto donde buscar.
+			inicio: Posición de inicio (el principio de una línea).
+			fin: Posición final (tras un salto de línea o el final del texto).
+		
+		Returns:
+			Comandos no vacíos, en orden de aparición.
+		"""
+		fin = len(texto) if fin is None else fin
+		comandos = []
+		for resultado in self._expresion.finditer(texto, inicio, fin):
+			comando = resultado.group(resultado.lastgroup).strip()
+			if comando:
+				comandos.append(comando)
+		return comandos
+	
+	def analizar(self, captura: Captura, desplazamiento: int = 0):
+		"""Indexa una captura completa.
+		
+		Args:
+			captura: Contenido a dividir.
+			desplazamiento: Líneas que ya salieron del buffer (del seguidor de capturas).
+		"""
+		self._lineas = array('q')
+		self._comandos = []
+		self._desplazamiento = desplazamiento
+		self._escanear(captura, 0)
+	
+	def actualizar(self, captura: Captura, primera_linea: int, desplazamiento: int = 0):
+		"""Actualiza el índice volviendo a analizar solo desde una línea.
+		
+		Args:
+			captura: Contenido nuevo.
+			primera_linea: Primera línea (base 0) que puede haber cambiado.
+			desplazamiento: Líneas que ya salieron del buffer (del seguidor de capturas).
+		"""
+		self._desplazamiento = desplazamiento
+		# Prompts que salieron por arriba y los que hay que volver a analizar
+		salidos = bisect_left(self._lineas, desplazamiento)
+		desde = bisect_left(self._lineas, desplazamiento + primera_linea)
+		del self._lineas[desde:]
+		del self._comandos[desde:]
+		if salidos:
+			del self._lineas[:salidos]
+			del self._comandos[:salidos]
+		self._escanear(captura, primera_linea)
+	
+	def _escanear(self, captura: Captura, primera_linea: int):
+		"""Busca prompts desde una línea hasta el final.
+		
+		Args:
+			captura: Contenido a analizar.
+			primera_linea: Índice (base 0) de la línea donde empezar.
+		"""
+		texto = captura.texto
+		self._total_lineas = len(captura)
+		if primera_linea >= self._total_lineas:
+			return
+		posicion = captura.inicio_linea(primera_linea)
+		linea = primera_linea
+		for resultado in self._expresion.finditer(texto, posicion):
+			# Contar saltos desde la coincidencia anterior, sin dividir el texto
+			linea += texto.count("\n", posicion, resultado.start())
+			posicion = resultado.start()
+			self._lineas.append(self._desplazamiento + linea)
+			self._comandos.append(resultado.group(resultado.lastgroup).strip())
+	
+	def _bloque(self, k: int) -> BloqueComando:
+		"""Construye el bloque del prompt k-ésimo.
+		
+		Args:
+			k: Posición del prompt en el índice.
+		
+		Returns:
+			Bloque con índices de línea relativos a la captura actual.
+		"""
+		linea = self._lineas[k] - self._desplazamiento
+		if k + 1 < len(self._lineas):
+			fin = self._lineas[k + 1] - self._desplazamiento
+		else:
+			fin = self._total_lineas
+		return BloqueComando(linea, self._comandos[k], linea + 1, fin)
+	
+	def bloques(self) -> List[BloqueComando]:
+		"""Todos los bloques con comando, en orden."""
+		return [self._bloque(k) for k in range(len(self._lineas)) if self._comandos[k]]
+	
+	def comandos(self) -> List[str]:
+		"""Comandos escritos, en orden de aparición."""
+		return [comando for comando in self._comandos if comando]
+	
+	def bloque_de_linea(self, linea: int) -> Optional[BloqueComando]:
+		"""Bloque al que pertenece una línea.
+		
+		Args:
+			linea: Índice (base 0) de la línea.
+		
+		Returns:
+			Bloque cuyo prompt es el último en o antes de la línea, o None.
+		"""
+		k = bisect_right(self._lineas, self._desplazamiento + linea) - 1
+		if k < 0:
+			return None
+		return self._bloque(k)
+	
+	def siguiente(self, linea: int) -> Optional[BloqueComando]:
+		"""Primer comando posterior a una línea.
+		
+		Args:
+			linea: Índice (base 0) de la línea actual.
+		
+		Returns:
+			Bloque encontrado o None.
+		"""
+		k = bisect_right(self._lineas, self._desplazamiento + linea)
+		while k < len(self._lineas):
+			if self._comandos[k]:
+				return self._bloque(k)
+			k += 1
+		return None
+	
+	def anterior(self, linea: int) -> Optional[BloqueComando]:
+		"""Último comando anterior a una línea.
+		
+		Args:
+			linea: Índice (base 0) de la línea actual.
+		
+		Returns:
+			Bloque encontrado o None.
+		"""
+		k = bisect_left(self._lineas, self._desplazamiento + linea) - 1
+		while k >= 0:
+			if self._comandos[k]:
+				return self._bloque(k)
+			k -= 1
+		return None
+	
+	def ultimo(self) -> Optional[BloqueComando]:
+		"""Último comando de la captura (el que se ejecutó más recientemente)."""
+		return self.anterior(self._total_lineas)
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Servicio de Monitorización de Consolas
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Alertas en varias consolas a la vez, sin el visor abierto.
+
+Cada consola registrada tiene su propio seguidor de capturas, su
+planificador adaptativo y su motor de alertas, pero todas se sondean
+desde el hilo del `PlanificadorCompartido`. El tiempo de CPU de los
+sondeos se descuenta de un crédito que se recarga a razón del presupuesto
+configurado; si se agota, los sondeos se aplazan hasta recuperarlo, de
+modo que el servicio nunca compite con la voz de NVDA.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import wx
+from logHandler import log
+
+from .captura import Captura
+from .diferencias import SeguidorCapturas
+from .motor_alertas import MotorAlertas, ResultadoAlertas
+from .planificador import PlanificadorAdaptativo, PlanificadorCompartido
+
+
+@dataclass
+class ConsolaMonitorizada:
+	"""Estado de una consola registrada en el monitor."""
+	hwnd: int
+	objeto: Any
+	tipo_consola: str
+	descripcion: str
+	planificador: PlanificadorAdaptativo
+	motor_alertas: MotorAlertas
+	seguidor: SeguidorCapturas = field(default_factory=SeguidorCapturas)
+	# El primer sondeo solo fija el contenido de partida
+	iniciada: bool = False
+	fallos: int = 0
+	alertas: int = 0
+	tiempo_cpu: float = 0.0
+
+
+class ServicioMonitor:
+	"""Sondea las consolas registradas y busca alertas en sus líneas nuevas.
+	
+	Los callbacks se llaman en el hilo principal mediante wx.CallAfter.
+	"""
+	
+	# Sondeos fallidos seguidos tras los que se retira la consola (ventana cerrada)
+	MAX_FALLOS = 5
+	# Crédito de CPU máximo que se acumula en reposo, en segundos
+	RAFAGA_CPU = 0.25
+	
+	def __init__(
+		self,
+		gestor_lectores,
+		planificador: PlanificadorCompartido,
+		callback_alertas: Callable[[ConsolaMonitorizada, ResultadoAlertas], None],
+		callback_retirada: Optional[Callable[[ConsolaMonitorizada], None]] = None
+	):
+		"""Inicializa el servicio sin consolas.
+		
+		Args:
+			gestor_lectores: `GestorLectores` con el que leer las consolas.
+			planificador: Hilo compartido en el que se ejecutan los sondeos.
+			callback_alertas: Recibe las alertas de cada sondeo que las tenga.
+			callback_retirada: Recibe las consolas retiradas porque dejaron de responder.
+		"""
+		self._gestor_lectores = gestor_lectores
+		self._planificador = planificador
+		self._callback_alertas = callback_alertas
+		self._callback_retirada = callback_retirada
+		self._consolas: Dict[int, ConsolaMonitorizada] = {}
+		self._bloqueo = threading.Lock()
+		
+		self._intervalos = (1.0, 10.0, 1.5)
+		self._patrones: List[Dict[str, Any]] = []
+		self._intervalo_minimo_alerta = 0.0
+		self.presupuesto_cpu = 0.05
+		
+		self._credito_cpu = self.RAFAGA_CPU
+		self._ultima_recarga = time.monotonic()
+		self._inicio = self._ultima_recarga
+		self._cpu_total = 0.0
+		self.sondeos = 0
+		self.sondeos_aplazados = 0
+	
+	def configurar(
+		self,
+		minimo: float,
+		maximo: float,
+		factor: float,
+		patrones: List[Dict[str, Any]],
+		intervalo_minimo_alerta: float,
+		presupuesto_cpu: float
+	):
+		"""Aplica la configuración a todas las consolas registradas.
+		
+		Args:
+			minimo: Intervalo mínimo de sondeo en segundos.
+			maximo: Intervalo máximo de sondeo en segundos.
+			factor: Multiplicador del intervalo tras cada sondeo sin cambios.
+			patrones: Patrones de alerta (vacío para no buscar ninguno).
+			intervalo_minimo_alerta: Segundos mínimos entre avisos del mismo patrón.
+			presupuesto_cpu: Fracción de un núcleo que pueden ocupar los sondeos.
+		"""
+		self._intervalos = (minimo, maximo, factor)
+		self._patrones = patrones
+		self._intervalo_minimo_alerta = intervalo_minimo_alerta
+		self.presupuesto_cpu = min(1.0, max(0.005, float(presupuesto_cpu)))
+		for consola in self.consolas:
+			consola.planificador.configurar(*self._intervalos)
+			consola.motor_alertas.configurar(patrones, intervalo_minimo_alerta)
+	
+	@property
+	def consolas(self) -> List[ConsolaMonitorizada]:
+		"""Consolas registradas."""
+		with self._bloqueo:
+			return list(self._consolas.values())
+	
+	@property
+	def uso_cpu(self) -> float:
+		"""Fracción media de un núcleo usada por los sondeos desde el inicio."""
+		transcurrido = time.monotonic() - self._inicio
+		return self._cpu_total / transcurrido if transcurrido > 0 else 0.0
+	
+	def esta_registrada(self, hwnd: int) -> bool:
+		"""Indica si una ventana está registrada.
+		
+		Args:
+			hwnd: Handle de la ventana de consola.
+		"""
+		return hwnd in self._consolas
+	
+	def registrar(self, objeto: Any, tipo_consola: str, descripcion: str = ""):
+		"""Añade una consola al monitor.
+		
+		El contenido que ya tiene la consola no genera alertas; solo las
+		líneas que aparezcan a partir de ahora.
+		
+		Args:
+			objeto: Objeto NVDA de la ventana de consola.
+			tipo_consola: Tipo de consola ('clasica' o 'terminal').
+			descripcion: Texto con el que se nombra la consola en los avisos.
+		"""
+		hwnd = objeto.windowHandle
+		consola = ConsolaMonitorizada(
+			hwnd, objeto, tipo_consola, descripcion,
+			planificador=PlanificadorAdaptativo(*self._intervalos),
+			motor_alertas=MotorAlertas(self._patrones, self._intervalo_minimo_alerta)
+		)
+		with self._bloqueo:
+			self._consolas[hwnd] = consola
+		self._planificador.programar(self._clave(hwnd), lambda: self._sondear(consola))
+		log.debug(f"consoleLog: Consola {descripcion} ({hwnd}) añadida al monitor")
+	
+	def retirar(self, hwnd: int):
+		"""Quita una consola del monitor.
+		
+		Args:
+			hwnd: Handle de la ventana de consola.
+		"""
+		with self._bloqueo:
+			self._consolas.pop(hwnd, None)
+		self._planificador.cancelar(self._clave(hwnd))
+	
+	def detener(self):
+		"""Quita todas las consolas del monitor."""
+		for consola in self.consolas:
+			self.retirar(consola.hwnd)
+	
+	@staticmethod
+	def _clave(hwnd: int) -> tuple:
+		"""Clave de la tarea de sondeo de una ventana en el planificador compartido."""
+		return ("monitor", hwnd)
+	
+	def _recargar_credito(self, ahora: float):
+		"""Recarga el crédito de CPU según el tiempo transcurrido.
+		
+		Args:
+			ahora: Instante actual.
+		"""
+		recarga = (ahora - self._ultima_recarga) * self.presupuesto_cpu
+		self._credito_cpu = min(self.RAFAGA_CPU, self._credito_cpu + recarga)
+		self._ultima_recarga = ahora
+	
+	def _sondear(self, consola: ConsolaMonitorizada) -> Optional[float]:
+		"""Captura una consola y procesa sus líneas nuevas (hilo del planificador).
+		
+		Args:
+			consola: Consola a sondear.
+		
+		Returns:
+			Segundos hasta el siguiente sondeo, o None si se retiró la consola.
+		"""
+		if not self.esta_registrada(consola.hwnd):
+			return None
+		self._recargar_credito(time.monotonic())
+		if self._credito_cpu < 0:
+			# Presupuesto agotado: esperar a recuperar el crédito
+			self.sondeos_aplazados += 1
+			return -self._credito_cpu / self.presupuesto_cpu
+		
+		inicio_cpu = time.thread_time()
+		try:
+			texto = self._gestor_lectores.leer_sincrono(consola.tipo_consola, consola.objeto)
+		except Exception as e:
+			texto = None
+			log.debug(f"consoleLog: Falló el sondeo de {consola.descripcion}: {e}")
+		
+		try:
+			if texto is None:
+				return self._registrar_fallo(consola)
+			consola.fallos = 0
+			self.sondeos += 1
+			
+			captura = Captura(texto)
+			if not consola.iniciada:
+				consola.iniciada = True
+				consola.seguidor.reiniciar(captura)
+				return consola.planificador.intervalo
+			delta = consola.seguidor.actualizar(captura)
+			consola.planificador.registrar_sondeo(not delta.vacio)
+			if not delta.vacio and consola.motor_alertas.activo:
+				resultado = consola.motor_alertas.procesar(delta.lineas, primera_linea=delta.inicio + 1)
+				if resultado.anunciables or resultado.silenciadas:
+					consola.alertas += len(resultado.coincidencias)
+					wx.CallAfter(self._callback_alertas, consola, resultado)
+			return consola.planificador.intervalo
+		finally:
+			gasto = time.thread_time() - inicio_cpu
+			self._credito_cpu -= gasto
+			self._cpu_total += gasto
+			consola.tiempo_cpu += gasto
+	
+	def _registrar_fallo(self, consola: ConsolaMonitorizada) -> Optional[float]:
+		"""Cuenta un sondeo fallido y retira la consola si falla demasiadas veces.
+		
+		Args:
+			consola: Consola cuyo sondeo ha fallado.
+		
+		Returns:
+			Segundos hasta el siguiente intento, o None si se retiró la consola.
+		"""
+		consola.fallos += 1
+		if consola.fallos < self.MAX_FALLOS:
+			return consola.planificador.registrar_sondeo(False)
+		with self._bloqueo:
+			self._consolas.pop(consola.hwnd, None)
+		log.debug(f"consoleLog: Consola {consola.descripcion} retirada del monitor tras {consola.fallos} fallos")
+		if self._callback_retirada:
+			wx.CallAfter(self._callback_retirada, consola)
+		return None
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Vigilante de Comandos
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Aviso de fin de los comandos largos, sin el visor abierto.
+
+El hilo del `PlanificadorCompartido` muestrea cada consola vigilada
+leyendo solo la línea del cursor. Mientras esa línea es un prompt la consola está libre;
+cuando deja de serlo hay un comando en marcha, y cuando vuelve a aparecer
+un prompt el comando ha terminado. Solo entonces se lee la consola
+completa para analizar la salida del comando con los patrones de alerta.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import wx
+from logHandler import log
+
+from .captura import Captura
+from .motor_alertas import CoincidenciaAlerta, MotorAlertas
+from .planificador import PlanificadorCompartido
+from .segmentador import SegmentadorComandos
+
+
+@dataclass
+class ConsolaVigilada:
+	"""Estado de una consola vigilada."""
+	hwnd: int
+	objeto: Any
+	tipo_consola: str
+	descripcion: str
+	ejecutando: bool = False
+	inicio: float = 0.0
+	# Último comando visto en el prompt antes de ejecutarse
+	comando: str = ""
+	fallos: int = 0
+
+
+@dataclass
+class AvisoFinComando:
+	"""Un comando vigilado que ha terminado."""
+	consola: ConsolaVigilada
+	comando: str
+	duracion: float
+	lineas_salida: int = 0
+	alertas: List[CoincidenciaAlerta] = field(default_factory=list)
+
+
+class VigilanteComandos:
+	"""Muestrea varias consolas y avisa cuando termina un comando largo.
+	
+	Los callbacks se llaman en el hilo principal mediante wx.CallAfter.
+	"""
+	
+	# Muestras fallidas seguidas tras las que se deja de vigilar (ventana cerrada)
+	MAX_FALLOS = 5
+	
+	def __init__(
+		self,
+		gestor_lectores,
+		planificador: PlanificadorCompartido,
+		callback_aviso: Callable[[AvisoFinComando], None],
+		callback_fin_vigilancia: Optional[Callable[[ConsolaVigilada], None]] = None,
+		intervalo: float = 1.0,
+		duracion_minima: float = 10.0,
+		patrones_alerta: Optional[List[Dict[str, Any]]] = None
+	):
+		"""Inicializa el vigilante sin consolas.
+		
+		Args:
+			gestor_lectores: `GestorLectores` con el que muestrear y leer las consolas.
+			planificador: Hilo compartido en el que se ejecutan las muestras.
+			callback_aviso: Recibe cada comando terminado.
+			callback_fin_vigilancia: Recibe las consolas que dejan de vigilarse por error.
+			intervalo: Segundos entre muestras.
+			duracion_minima: Duración mínima de un comando para avisar.
+			patrones_alerta: Patrones de `ConfiguracionAlertas.patrones`.
+		"""
+		self._gestor_lectores = gestor_lectores
+		self._planificador = planificador
+		self._callback_aviso = callback_aviso
+		self._callback_fin_vigilancia = callback_fin_vigilancia
+		self._segmentador = SegmentadorComandos()
+		self._motor_alertas = MotorAlertas([])
+		self._consolas: Dict[int, ConsolaVigilada] = {}
+		self._bloqueo = threading.Lock()
+		self.configurar(intervalo, duracion_minima, patrones_alerta or [])
+	
+	def configurar(self, intervalo: float, duracion_minima: float, patrones_alerta: List[Dict[str, Any]]):
+		"""Actualiza los parámetros de vigilancia.
+		
+		Args:
+			intervalo: Segundos entre muestras.
+			duracion_minima: Duración mínima de un comando para avisar.
+			patrones_alerta: Patrones de alerta que se buscan en la salida.
+		"""
+		self.intervalo = max(0.2, float(intervalo))
+		self.duracion_minima = max(0.0, float(duracion_minima))
+		self._motor_alertas.configurar(patrones_alerta)
+	
+	@property
+	def consolas(self) -> List[ConsolaVigilada]:
+		"""Consolas vigiladas."""
+		with self._bloqueo:
+			return list(self._consolas.values())
+	
+	def esta_vigilada(self, hwnd: int) -> bool:
+		"""Indica si una ventana está vigilada.
+		
+		Args:
+			hwnd: Handle de la ventana de consola.
+		"""
+		return hwnd in self._consolas
+	
+	def vigilar(self, objeto: Any, tipo_consola: str, descripcion: str = ""):
+		"""Empieza a vigilar una consola.
+		
+		Args:
+			objeto: Objeto NVDA de la ventana de consola.
+			tipo_consola: Tipo de consola ('clasica' o 'terminal').
+			descripcion: Texto con el que se nombra la consola en los avisos.
+		"""
+		hwnd = objeto.windowHandle
+		consola = ConsolaVigilada(hwnd, objeto, tipo_consola, descripcion)
+		with self._bloqueo:
+			self._consolas[hwnd] = consola
+		self._planificador.programar(self._clave(hwnd), lambda: self._muestrear(consola), self.intervalo)
+		log.debug(f"consoleLog: Vigilando la consola {descripcion} ({hwnd})")
+	
+	def dejar_de_vigilar(self, hwnd: int):
+		"""Deja de vigilar una consola.
+		
+		Args:
+			hwnd: Handle de la ventana de consola.
+		"""
+		with self._bloqueo:
+			self._consolas.pop(hwnd, None)
+		self._planificador.cancelar(self._clave(hwnd))
+		self._gestor_lectores.olvidar_ventana(hwnd)
+	
+	def detener(self):
+		"""Deja de vigilar todas las consolas."""
+		for consola in self.consolas:
+			self.dejar_de_vigilar(consola.hwnd)
+	
+	@staticmethod
+	def _clave(hwnd: int) -> tuple:
+		"""Clave de la tarea de muestreo de una ventana en el planificador compartido."""
+		return ("vigilante", hwnd)
+	
+	def _muestrear(self, consola: ConsolaVigilada) -> Optional[float]:
+		"""Lee la línea del cursor de una consola y actualiza su estado.
+		
+		Args:
+			consola: Consola a muestrear.
+		
+		Returns:
+			Segundos hasta la siguiente muestra, o None si se dejó de vigilar.
+		"""
+		if not self.esta_vigilada(consola.hwnd):
+			return None
+		ahora = time.monotonic()
+		try:
+			linea = self._gestor_lectores.leer_linea_cursor(consola.tipo_consola, consola.hwnd)
+		except Exception as e:
+			consola.fallos += 1
+			log.debug(f"consoleLog: Falló la muestra de {consola.descripcion}: {e}")
+			if consola.fallos >= self.MAX_FALLOS:
+				self.dejar_de_vigilar(consola.hwnd)
+				if self._callback_fin_vigilancia:
+					wx.CallAfter(self._callback_fin_vigilancia, consola)
+				return None
+			return self.intervalo
+		consola.fallos = 0
+		
+		comando = self._segmentador.es_prompt(linea)
+		if comando is None:
+			if not consola.ejecutando:
+				consola.ejecutando = True
+				consola.inicio = ahora
+			return self.intervalo
+		if consola.ejecutando:
+			consola.ejecutando = False
+			duracion = ahora - consola.inicio
+			if duracion >= self.duracion_minima:
+				self._avisar(consola, duracion)
+		consola.comando = comando
+		return self.intervalo
+	
+	def _avisar(self, consola: ConsolaVigilada, duracion: float):
+		"""Analiza la salida del comando terminado y entrega el aviso.
+		
+		Args:
+			consola: Consola en la que terminó el comando.
+			duracion: Segundos que estuvo en marcha.
+		"""
+		aviso = AvisoFinComando(consola, consola.comando, duracion)
+		try:
+			captura = Captura(self._gestor_lectores.leer_sincrono(consola.tipo_consola, consola.objeto))
+			segmentador = SegmentadorComandos()
+			segmentador.analizar(captura)
+			bloque = segmentador.ultimo()
+			if bloque is not None:
+				aviso.comando = bloque.comando
+				aviso.lineas_salida = bloque.lineas_salida
+				if self._motor_alertas.activo:
+					aviso.alertas = self._motor_alertas.buscar(
+						captura.lineas(bloque.inicio_salida, bloque.fin_salida), bloque.inicio_salida + 1
+					)
+		except Exception as e:
+			# Se avisa igualmente, sin el análisis de la salida
+			log.debug(f"consoleLog: No se pudo leer la salida de {consola.descripcion}: {e}")
+		wx.CallAfter(self._callback_aviso, aviso)
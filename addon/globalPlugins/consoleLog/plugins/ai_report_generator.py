@@ -20,6 +20,9 @@ class PluginAIReport(PluginBase):
 		categoria="ia"
 	)
 
+	# Muestra un diálogo de progreso y el informe final
+	REQUIERE_HILO_PRINCIPAL = True
+
 	def inicializar(self):
 		return True
 
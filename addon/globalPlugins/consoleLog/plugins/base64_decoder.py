@@ -13,6 +13,35 @@ if not callable(_):
 	_ = lambda x: x
 
 from ..nucleo.gestor_plugins import PluginBase, MetadatosPlugin
+from ..nucleo.analisis import AnalizadorTexto, analizar
+
+# Patrón para Base64 (mínimo 8 caracteres para evitar falsos positivos)
+PATRON_BASE64 = re.compile(r'\b(?:[A-Za-z0-9+/]{4}){2,}(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?\b')
+
+
+class AnalizadorBase64(AnalizadorTexto):
+	"""Decodifica las cadenas Base64 distintas de los tramos."""
+	
+	def __init__(self):
+		self._vistos = set()
+		self._resultados: List[str] = []
+	
+	def procesar(self, texto: str, inicio: int, fin: int, primera_linea: int):
+		for coincidencia in PATRON_BASE64.finditer(texto, inicio, fin):
+			match = coincidencia.group()
+			if match in self._vistos or len(match) < 8: continue
+			self._vistos.add(match)
+			try:
+				decoded = base64.b64decode(match).decode('utf-8', errors='ignore')
+				# Si el resultado es legible (sin caracteres de control raros)
+				if any(c.isalnum() for c in decoded):
+					self._resultados.append(f"{match} -> {decoded}")
+			except Exception:
+				continue
+	
+	def resultado(self) -> List[str]:
+		return self._resultados
+
 
 class PluginBase64Decoder(PluginBase):
 	"""Plugin para detectar y decodificar cadenas en Base64."""
@@ -25,32 +54,18 @@ class PluginBase64Decoder(PluginBase):
 		categoria="desarrollo"
 	)
 	
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
 	def inicializar(self) -> bool:
 		self._inicializado = True
 		return True
 	
 	def ejecutar(self, **kwargs) -> List[str]:
-		texto = kwargs.get('texto', '')
-		if not texto: return []
-		
-		# Patrón para Base64 (mínimo 8 caracteres para evitar falsos positivos)
-		patron = re.compile(r'\b(?:[A-Za-z0-9+/]{4}){2,}(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?\b')
-		matches = patron.findall(texto)
-		
-		resultados = []
-		vistos = set()
-		for match in matches:
-			if match in vistos or len(match) < 8: continue
-			vistos.add(match)
-			try:
-				decoded = base64.b64decode(match).decode('utf-8', errors='ignore')
-				# Si el resultado es legible (sin caracteres de control raros)
-				if any(c.isalnum() for c in decoded):
-					resultados.append(f"{match} -> {decoded}")
-			except Exception:
-				continue
-				
-		return resultados
+		return analizar(self.obtener_captura(kwargs), [self.crear_analizador()])[0]
+	
+	def crear_analizador(self) -> AnalizadorBase64:
+		return AnalizadorBase64()
 
 	def terminar(self):
 		pass
@@ -25,6 +25,9 @@ class PluginCalculadoraExpress(PluginBase):
 		categoria="utilidades"
 	)
 	
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
 	def inicializar(self) -> bool:
 		self._inicializado = True
 		return True
@@ -40,6 +40,9 @@ class PluginClicDerecho(PluginBase):
 		categoria="acciones"
 	)
 	
+	# Simula eventos de ratón sobre la ventana de la consola
+	REQUIERE_HILO_PRINCIPAL = True
+	
 	def __init__(self):
 		"""Inicializa el plugin de clic derecho."""
 		super().__init__()
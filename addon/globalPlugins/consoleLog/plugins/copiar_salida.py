@@ -38,6 +38,9 @@ class PluginCopiarSalida(PluginBase):
 		categoria="portapapeles"
 	)
 	
+	# El portapapeles solo debe usarse desde el hilo principal
+	REQUIERE_HILO_PRINCIPAL = True
+	
 	def __init__(self):
 		"""Inicializa el plugin de copiar salida."""
 		super().__init__()
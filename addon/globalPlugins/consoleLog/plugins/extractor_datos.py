@@ -17,6 +17,25 @@ if not callable(_):
 	_ = lambda x: x
 
 from ..nucleo.gestor_plugins import PluginBase, MetadatosPlugin
+from ..nucleo.analisis import AnalizadorTexto, analizar
+
+
+class AnalizadorExtractor(AnalizadorTexto):
+	"""Reúne las URLs, rutas e IPs distintas de los tramos, en orden de aparición."""
+	
+	def __init__(self, patrones: Dict[str, Any]):
+		self._patrones = patrones
+		# Un diccionario por categoría conserva el orden y descarta duplicados
+		self._encontrados: Dict[str, Dict[str, None]] = {categoria: {} for categoria in patrones}
+	
+	def procesar(self, texto: str, inicio: int, fin: int, primera_linea: int):
+		for categoria, patron in self._patrones.items():
+			encontrados = self._encontrados[categoria]
+			for coincidencia in patron.finditer(texto, inicio, fin):
+				encontrados.setdefault(coincidencia.group(), None)
+	
+	def resultado(self) -> Dict[str, List[str]]:
+		return {categoria: list(encontrados) for categoria, encontrados in self._encontrados.items()}
 
 
 class PluginExtractorDatos(PluginBase):
@@ -36,10 +55,13 @@ class PluginExtractorDatos(PluginBase):
 		categoria="analisis"
 	)
 	
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
 	# Patrones de búsqueda
 	PATRONES = {
 		'urls': r'https?://[^\s<>"]+|www\.[^\s<>"]+',
-		'rutas': r'(?:[a-zA-Z]:\\(?:[^\\\/:*?"<>|\r\n]+\\)*[^\\\/:*?"<>|\r\n]*)|(?:/(?:[^/ ]+/)+[^/ ]*)',
+		'rutas': r'(?:[a-zA-Z]:\\(?:[^\\\/:*?"<>|\r\n]+\\)*[^\\\/:*?"<>|\r\n]*)|(?:/(?:[^/ \r\n]+/)+[^/ \r\n]*)',
 		'ips': r'\b(?:\d{1,3}\.){3}\d{1,3}\b'
 	}
 	
@@ -63,30 +85,20 @@ class PluginExtractorDatos(PluginBase):
 		
 		Args:
 			texto: Contenido de la consola a analizar.
+			captura: Contenido con su índice de líneas (opcional).
 		
 		Returns:
 			Diccionario con listas de datos encontrados por categoría.
 		"""
-		texto = kwargs.get('texto', '')
-		
-		if not texto:
-			return {'urls': [], 'rutas': [], 'ips': []}
-		
-		resultados = {}
-		for categoria, patron in self._patrones_compilados.items():
-			encontrados = patron.findall(texto)
-			# Eliminar duplicados manteniendo orden
-			vistos = set()
-			unicos = []
-			for item in encontrados:
-				if item not in vistos:
-					vistos.add(item)
-					unicos.append(item)
-			resultados[categoria] = unicos
+		resultados = analizar(self.obtener_captura(kwargs), [self.crear_analizador()])[0]
 		
 		log.debug(f"consoleLog: Extracción completada. URLs: {len(resultados['urls'])}, Rutas: {len(resultados['rutas'])}, IPs: {len(resultados['ips'])}")
 		return resultados
 	
+	def crear_analizador(self) -> AnalizadorExtractor:
+		"""Analizador de este plugin para el análisis conjunto."""
+		return AnalizadorExtractor(self._patrones_compilados)
+	
 	def terminar(self):
 		"""Libera recursos del plugin."""
 		log.debug("consoleLog: Plugin ExtractorDatos terminado")
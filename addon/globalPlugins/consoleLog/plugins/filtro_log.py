@@ -17,6 +17,21 @@ if not callable(_):
 	_ = lambda x: x
 
 from ..nucleo.gestor_plugins import PluginBase, MetadatosPlugin
+from ..nucleo.analisis import AnalizadorTexto, analizar, lineas_coincidentes
+
+
+class AnalizadorFiltroLog(AnalizadorTexto):
+	"""Reúne las líneas con errores o advertencias de cada tramo."""
+	
+	def __init__(self, patron):
+		self._patron = patron
+		self._lineas: List[str] = []
+	
+	def procesar(self, texto: str, inicio: int, fin: int, primera_linea: int):
+		self._lineas.extend(linea.strip() for linea in lineas_coincidentes(self._patron, texto, inicio, fin))
+	
+	def resultado(self) -> List[str]:
+		return self._lineas
 
 
 class PluginFiltroLog(PluginBase):
@@ -36,6 +51,9 @@ class PluginFiltroLog(PluginBase):
 		categoria="analisis"
 	)
 	
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
 	# Palabras clave para filtrado
 	KEYWORDS_ERROR = [r'error', r'fault', r'fail', r'exception', r'critical', r'fatal']
 	KEYWORDS_WARNING = [r'warning', r'warn', r'alert']
@@ -43,8 +61,8 @@ class PluginFiltroLog(PluginBase):
 	def __init__(self):
 		"""Inicializa el plugin de filtro."""
 		super().__init__()
-		self._patron_error = re.compile('|'.join(self.KEYWORDS_ERROR), re.IGNORECASE)
-		self._patron_warning = re.compile('|'.join(self.KEYWORDS_WARNING), re.IGNORECASE)
+		# Una sola expresión para errores y advertencias: cada línea se busca una vez
+		self._patron = re.compile('|'.join(self.KEYWORDS_ERROR + self.KEYWORDS_WARNING), re.IGNORECASE)
 	
 	def inicializar(self) -> bool:
 		"""Inicializa el plugin.
@@ -61,21 +79,16 @@ class PluginFiltroLog(PluginBase):
 		
 		Args:
 			texto: Contenido de la consola a filtrar.
+			captura: Contenido con su índice de líneas (opcional).
 		
 		Returns:
 			Lista de líneas que coinciden con los criterios de importancia.
 		"""
-		texto = kwargs.get('texto', '')
-		
-		if not texto:
-			return []
-		
-		lineas_interesantes = []
-		for linea in texto.splitlines():
-			if self._patron_error.search(linea) or self._patron_warning.search(linea):
-				lineas_interesantes.append(linea.strip())
-		
-		return lineas_interesantes
+		return analizar(self.obtener_captura(kwargs), [self.crear_analizador()])[0]
+	
+	def crear_analizador(self) -> AnalizadorFiltroLog:
+		"""Analizador de este plugin para el análisis conjunto."""
+		return AnalizadorFiltroLog(self._patron)
 	
 	def terminar(self):
 		"""Libera recursos del plugin."""
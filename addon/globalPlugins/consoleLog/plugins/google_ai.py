@@ -48,6 +48,9 @@ class PluginGoogleAI(PluginBase):
 		categoria="ia"
 	)
 	
+	# Abre su propia ventana de chat
+	REQUIERE_HILO_PRINCIPAL = True
+	
 	def inicializar(self) -> bool:
 		self._dialogo = None
 		self._inicializado = True
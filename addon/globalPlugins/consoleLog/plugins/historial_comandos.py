@@ -10,7 +10,6 @@ Este plugin permite identificar y extraer los comandos ejecutados
 del contenido de la consola.
 """
 
-import re
 from typing import Any, List
 from logHandler import log
 
@@ -20,6 +19,22 @@ if not callable(_):
 	_ = lambda x: x
 
 from ..nucleo.gestor_plugins import PluginBase, MetadatosPlugin
+from ..nucleo.segmentador import PATRONES_PROMPT, SegmentadorComandos
+from ..nucleo.analisis import AnalizadorTexto, analizar
+
+
+class AnalizadorHistorial(AnalizadorTexto):
+	"""Reúne los comandos escritos tras cada prompt de los tramos."""
+	
+	def __init__(self, segmentador: SegmentadorComandos):
+		self._segmentador = segmentador
+		self._comandos: List[str] = []
+	
+	def procesar(self, texto: str, inicio: int, fin: int, primera_linea: int):
+		self._comandos.extend(self._segmentador.comandos_en(texto, inicio, fin))
+	
+	def resultado(self) -> List[str]:
+		return self._comandos
 
 
 class PluginHistorialComandos(PluginBase):
@@ -31,25 +46,22 @@ class PluginHistorialComandos(PluginBase):
 	
 	METADATOS = MetadatosPlugin(
 		nombre=_("Historial de Comandos"),
-		version="2.0.0",
+		version="2.1.0",
 		descripcion=_("Extrae y lista los comandos ejecutados en la consola"),
 		autor="Héctor J. Benítez Corredera",
 		categoria="analisis"
 	)
 	
-	# Patrones de prompts comunes
-	PATRONES_PROMPT = [
-		r'^[A-Za-z]:\\[^>]*>(.+)$',  # CMD: C:\Users\User>comando
-		r'^PS [A-Za-z]:\\[^>]*>(.+)$',  # PowerShell: PS C:\Users>comando
-		r'^\$ (.+)$',  # Bash: $ comando
-		r'^> (.+)$',  # Prompt genérico: > comando
-		r'^>>> (.+)$',  # Python REPL: >>> comando
-	]
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
+	# Patrones de prompts comunes (ver `nucleo.segmentador`)
+	PATRONES_PROMPT = PATRONES_PROMPT
 	
 	def __init__(self):
 		"""Inicializa el plugin de historial."""
 		super().__init__()
-		self._patrones_compilados = [re.compile(p) for p in self.PATRONES_PROMPT]
+		self._segmentador = None
 	
 	def inicializar(self) -> bool:
 		"""Inicializa el plugin.
@@ -66,34 +78,29 @@ class PluginHistorialComandos(PluginBase):
 		
 		Args:
 			texto: Contenido de la consola a analizar.
+			captura: Contenido con su índice de líneas (opcional).
 		
 		Returns:
 			Lista de comandos encontrados.
 		"""
-		texto = kwargs.get('texto', '')
+		captura = self.obtener_captura(kwargs)
 		
-		if not texto:
+		if not captura:
 			log.debug("consoleLog: No hay texto para analizar")
 			return []
 		
-		comandos = []
-		
-		for linea in texto.splitlines():
-			linea = linea.strip()
-			if not linea:
-				continue
-			
-			for patron in self._patrones_compilados:
-				match = patron.match(linea)
-				if match:
-					comando = match.group(1).strip()
-					if comando:
-						comandos.append(comando)
-					break
+		comandos = analizar(captura, [self.crear_analizador()])[0]
 		
 		log.debug(f"consoleLog: Encontrados {len(comandos)} comandos")
 		return comandos
 	
+	def crear_analizador(self) -> AnalizadorHistorial:
+		"""Analizador de este plugin para el análisis conjunto."""
+		# Una sola expresión con todos los patrones de prompt
+		if self._segmentador is None:
+			self._segmentador = SegmentadorComandos(self.PATRONES_PROMPT)
+		return AnalizadorHistorial(self._segmentador)
+	
 	def obtener_ultimo_comando(self, texto: str) -> str:
 		"""Obtiene el último comando ejecutado.
 		
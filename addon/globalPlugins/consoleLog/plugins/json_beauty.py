@@ -26,6 +26,9 @@ class PluginJSONBeauty(PluginBase):
 		categoria="desarrollo"
 	)
 	
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
 	def inicializar(self) -> bool:
 		self._inicializado = True
 		return True
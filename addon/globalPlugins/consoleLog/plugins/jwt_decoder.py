@@ -20,6 +20,9 @@ class PluginJWTDecoder(PluginBase):
 		categoria="edición"
 	)
 
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+
 	def inicializar(self):
 		return True
 
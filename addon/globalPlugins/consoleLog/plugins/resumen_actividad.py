@@ -12,6 +12,50 @@ if not callable(_):
 	_ = lambda x: x
 
 from ..nucleo.gestor_plugins import PluginBase, MetadatosPlugin
+from ..nucleo.analisis import AnalizadorTexto, analizar
+
+# Palabras como las separa `str.split()`, contadas sin copiar el tramo
+PATRON_PALABRA = re.compile(r'\S+')
+
+
+class AnalizadorResumen(AnalizadorTexto):
+	"""Cuenta líneas, palabras y menciones de cada herramienta en los tramos."""
+	
+	def __init__(self, patrones: Dict[str, Any]):
+		self._patrones = patrones
+		self._menciones = dict.fromkeys(patrones, 0)
+		self._lineas = 0
+		self._palabras = 0
+	
+	def procesar(self, texto: str, inicio: int, fin: int, primera_linea: int):
+		termina_en_salto = fin > inicio and texto[fin - 1] == "\n"
+		self._lineas = primera_linea + texto.count("\n", inicio, fin) + (0 if termina_en_salto else 1)
+		self._palabras += sum(1 for _palabra in PATRON_PALABRA.finditer(texto, inicio, fin))
+		for nombre, patron in self._patrones.items():
+			self._menciones[nombre] += len(patron.findall(texto, inicio, fin))
+	
+	def resultado(self) -> List[str]:
+		if not self._lineas:
+			return []
+		resumen = []
+		resumen.append(_("Estadísticas Generales:"))
+		resumen.append(_("- Total de líneas: {}").format(self._lineas))
+		resumen.append(_("- Total de palabras: {}").format(self._palabras))
+		
+		resumen.append("")
+		resumen.append(_("Herramientas Detectadas:"))
+		
+		encontrado = False
+		for nombre, menciones in self._menciones.items():
+			if menciones:
+				encontrado = True
+				resumen.append(f"- {nombre}: {menciones} menciones")
+				
+		if not encontrado:
+			resumen.append(_("- No se detectaron herramientas específicas."))
+			
+		return resumen
+
 
 class PluginResumenActividad(PluginBase):
 	"""Plugin para analizar y resumir las herramientas detectadas en la consola."""
@@ -24,6 +68,9 @@ class PluginResumenActividad(PluginBase):
 		categoria="analisis"
 	)
 	
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
 	HERRAMIENTAS = {
 		'Git': r'\bgit\s+\w+',
 		'Docker': r'\bdocker\s+\w+',
@@ -34,34 +81,21 @@ class PluginResumenActividad(PluginBase):
 		'Cloud': r'\baws\s+|\baz\s+|\bgcloud\s+'
 	}
 	
+	def __init__(self):
+		super().__init__()
+		# Se compilan una vez y no en cada análisis
+		self._patrones = {nombre: re.compile(patron, re.IGNORECASE) for nombre, patron in self.HERRAMIENTAS.items()}
+	
 	def inicializar(self) -> bool:
 		self._inicializado = True
 		return True
 	
 	def ejecutar(self, **kwargs) -> List[str]:
-		texto = kwargs.get('texto', '')
-		if not texto: return []
-		
-		resumen = []
-		lineas = texto.splitlines()
-		resumen.append(_("Estadísticas Generales:"))
-		resumen.append(_("- Total de líneas: {}").format(len(lineas)))
-		resumen.append(_("- Total de palabras: {}").format(len(texto.split())))
-		
-		resumen.append("")
-		resumen.append(_("Herramientas Detectadas:"))
-		
-		encontrado = False
-		for nombre, patron in self.HERRAMIENTAS.items():
-			matches = re.findall(patron, texto, re.IGNORECASE)
-			if matches:
-				encontrado = True
-				resumen.append(f"- {nombre}: {len(matches)} menciones")
-				
-		if not encontrado:
-			resumen.append(_("- No se detectaron herramientas específicas."))
-			
-		return resumen
+		return analizar(self.obtener_captura(kwargs), [self.crear_analizador()])[0]
+	
+	def crear_analizador(self) -> AnalizadorResumen:
+		"""Analizador de este plugin para el análisis conjunto."""
+		return AnalizadorResumen(self._patrones)
 
 	def terminar(self):
 		pass
@@ -5,11 +5,40 @@
 import re
 import os
 from ..nucleo.gestor_plugins import PluginBase, MetadatosPlugin
+from ..nucleo.analisis import AnalizadorTexto, analizar
 import addonHandler
 _ = addonHandler.initTranslation()
 if not callable(_):
 	_ = lambda x: x
 
+# Patrón para Python: File "path", line X, in function
+PATRON_PYTHON = re.compile(r'File "(.+?)", line (\d+)')
+
+
+class AnalizadorStackTrace(AnalizadorTexto):
+	"""Reúne los archivos y líneas de las trazas de Python de los tramos."""
+
+	def __init__(self):
+		self._vistos = set()
+		self._resultados = []
+
+	def procesar(self, texto, inicio, fin, primera_linea):
+		for coincidencia in PATRON_PYTHON.finditer(texto, inicio, fin):
+			path, linea = coincidencia.groups()
+			# Formato amigable para el diálogo de selección
+			nombre_fich = os.path.basename(path)
+			item = f"{nombre_fich}:{linea} -> {path}"
+			# Eliminar duplicados manteniendo el orden
+			if item not in self._vistos:
+				self._resultados.append(item)
+				self._vistos.add(item)
+
+	def resultado(self):
+		if not self._resultados:
+			return [_("No se han encontrado trazas de error (Stack Traces) de Python en el texto.")]
+		return self._resultados
+
+
 class PluginStackTrace(PluginBase):
 	METADATOS = MetadatosPlugin(
 		nombre=_("Analizador de StackTrace"),
@@ -19,31 +48,17 @@ class PluginStackTrace(PluginBase):
 		categoria="desarrollo"
 	)
 
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+
 	def inicializar(self):
 		return True
 
 	def ejecutar(self, **kwargs):
-		texto = kwargs.get('texto', '')
-		# Patrón para Python: File "path", line X, in function
-		patron_python = r'File "(.+?)", line (\d+)'
-		
-		coincidencias = re.findall(patron_python, texto)
-		
-		if not coincidencias:
-			return [_("No se han encontrado trazas de error (Stack Traces) de Python en el texto.")]
-		
-		# Eliminar duplicados manteniendo el orden
-		vistos = set()
-		resultados = []
-		for path, linea in coincidencias:
-			# Formato amigable para el diálogo de selección
-			nombre_fich = os.path.basename(path)
-			item = f"{nombre_fich}:{linea} -> {path}"
-			if item not in vistos:
-				resultados.append(item)
-				vistos.add(item)
-		
-		return resultados
+		return analizar(self.obtener_captura(kwargs), [self.crear_analizador()])[0]
+
+	def crear_analizador(self):
+		return AnalizadorStackTrace()
 
 	def terminar(self):
 		pass
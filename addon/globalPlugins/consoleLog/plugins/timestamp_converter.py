@@ -13,6 +13,40 @@ if not callable(_):
 	_ = lambda x: x
 
 from ..nucleo.gestor_plugins import PluginBase, MetadatosPlugin
+from ..nucleo.analisis import AnalizadorTexto, analizar
+
+# Buscar números de 10 dígitos (segundos) o 13 dígitos (milisegundos)
+# Filtramos para años razonables (aprox entre 2000 y 2100)
+PATRON_TIMESTAMP = re.compile(r'\b(1[0-9]{9}|[45][0-9]{12})\b')
+
+
+class AnalizadorTimestamps(AnalizadorTexto):
+	"""Convierte las marcas de tiempo distintas de los tramos."""
+	
+	def __init__(self):
+		self._vistos = set()
+		self._resultados: List[str] = []
+	
+	def procesar(self, texto: str, inicio: int, fin: int, primera_linea: int):
+		for coincidencia in PATRON_TIMESTAMP.finditer(texto, inicio, fin):
+			match = coincidencia.group(1)
+			if match in self._vistos: continue
+			self._vistos.add(match)
+			try:
+				ts = int(match)
+				# Si tiene 13 dígitos, son milisegundos
+				if ts > 10000000000:
+					ts = ts / 1000.0
+				
+				fecha = datetime.fromtimestamp(ts)
+				fecha_str = fecha.strftime('%d/%m/%Y %H:%M:%S')
+				self._resultados.append(f"{match} -> {fecha_str}")
+			except Exception:
+				continue
+	
+	def resultado(self) -> List[str]:
+		return self._resultados
+
 
 class PluginTimestampConverter(PluginBase):
 	"""Plugin para detectar y convertir Unix Timestamps a fechas legibles."""
@@ -25,37 +59,18 @@ class PluginTimestampConverter(PluginBase):
 		categoria="analisis"
 	)
 	
+	# El resultado depende solo del texto analizado
+	RESULTADO_CACHEABLE = True
+	
 	def inicializar(self) -> bool:
 		self._inicializado = True
 		return True
 	
 	def ejecutar(self, **kwargs) -> List[str]:
-		texto = kwargs.get('texto', '')
-		if not texto: return []
-		
-		# Buscar números de 10 dígitos (segundos) o 13 dígitos (milisegundos)
-		# Filtramos para años razonables (aprox entre 2000 y 2100)
-		patron = re.compile(r'\b(1[0-9]{9}|[45][0-9]{12})\b')
-		matches = patron.findall(texto)
-		
-		resultados = []
-		vistos = set()
-		for match in matches:
-			if match in vistos: continue
-			vistos.add(match)
-			try:
-				ts = int(match)
-				# Si tiene 13 dígitos, son milisegundos
-				if ts > 10000000000:
-					ts = ts / 1000.0
-				
-				fecha = datetime.fromtimestamp(ts)
-				fecha_str = fecha.strftime('%d/%m/%Y %H:%M:%S')
-				resultados.append(f"{match} -> {fecha_str}")
-			except Exception:
-				continue
-				
-		return resultados
+		return analizar(self.obtener_captura(kwargs), [self.crear_analizador()])[0]
+	
+	def crear_analizador(self) -> AnalizadorTimestamps:
+		return AnalizadorTimestamps()
 	
 	def terminar(self):
 		pass
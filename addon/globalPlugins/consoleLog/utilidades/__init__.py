@@ -8,10 +8,37 @@ Módulo de utilidades del complemento.
 
 Contiene:
 - Mensajes: Gestión de mensajes y anuncios
+- AnunciadorAgrupado: Anuncios agrupados y con frecuencia limitada
+- TareaExportacion: Guardado de capturas en segundo plano (submódulo `exportador`)
+- PerfilArranque: Medición de lo que el complemento añade al arranque de NVDA
+
+Los nombres exportados se importan en el primer acceso, de modo que
+importar un submódulo (por ejemplo, `utilidades.perfil_arranque` antes
+de empezar a medir el arranque) no arrastra al resto del paquete.
 """
 
-from .mensajes import Mensajes
+import importlib
+
+# Nombre exportado -> submódulo que lo define
+_EXPORTACIONES = {
+	'Mensajes': 'mensajes',
+	'AnunciadorAgrupado': 'anunciador',
+	'TareaExportacion': 'exportador',
+	'PerfilArranque': 'perfil_arranque',
+}
+
+__all__ = list(_EXPORTACIONES)
+
+
+def __getattr__(nombre):
+	"""Importa el submódulo de un nombre exportado en su primer acceso."""
+	modulo = _EXPORTACIONES.get(nombre)
+	if modulo is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+	valor = getattr(importlib.import_module(f".{modulo}", __name__), nombre)
+	globals()[nombre] = valor
+	return valor
+
 
-__all__ = [
-	'Mensajes'
-]
+def __dir__():
+	return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Anunciador Agrupado
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Anuncios agrupados y con frecuencia limitada.
+
+Una compilación puede imprimir cientos de líneas por segundo; si cada
+una se enviara a `ui.message`, la voz quedaría atascada leyendo salida
+antigua. `AnunciadorAgrupado` retiene los mensajes durante una ventana
+corta, sustituye los pendientes que comparten clave por el más reciente,
+resume las ráfagas de líneas ("37 líneas nuevas, la última: ...") y
+nunca habla más de una vez por intervalo.
+"""
+
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+import wx
+import speech
+
+import addonHandler
+_ = addonHandler.initTranslation()
+if not callable(_):
+	_ = lambda x: x
+
+from .mensajes import Mensajes
+
+
+@dataclass
+class _Pendiente:
+	"""Mensaje en espera de ser anunciado."""
+	texto: str
+	prioridad: Optional[Any] = None
+	# Ráfagas de líneas: cuántas se han agrupado
+	lineas: int = 0
+
+
+class AnunciadorAgrupado:
+	"""Cola de anuncios sobre `Mensajes` que agrupa y limita la frecuencia.
+	
+	Puede llamarse desde cualquier hilo; los anuncios se hacen siempre en
+	el hilo principal.
+	"""
+	
+	# Mensajes distintos que se leen en un mismo anuncio; el resto se resume
+	MAX_MENSAJES = 3
+	# Caracteres de la última línea que se leen en el resumen de una ráfaga
+	LONGITUD_MAXIMA_LINEA = 200
+	
+	def __init__(self, mensajes: Mensajes, ventana: float = 0.5, intervalo_minimo: float = 1.0):
+		"""Inicializa el anunciador.
+		
+		Args:
+			mensajes: Gestor de mensajes con el que se habla.
+			ventana: Segundos que se esperan para agrupar los mensajes que llegan juntos.
+			intervalo_minimo: Segundos mínimos entre dos anuncios.
+		"""
+		self._mensajes = mensajes
+		self._pendientes: Dict[Hashable, _Pendiente] = {}
+		self._sin_clave = itertools.count()
+		self._temporizador: Optional[wx.CallLater] = None
+		self._primera_llegada = 0.0
+		self._ultimo_anuncio = float("-inf")
+		self.descartados = 0
+		self.configurar(ventana, intervalo_minimo)
+	
+	def configurar(self, ventana: float, intervalo_minimo: float):
+		"""Cambia la ventana de agrupación y el intervalo mínimo.
+		
+		Args:
+			ventana: Segundos de agrupación.
+			intervalo_minimo: Segundos mínimos entre anuncios.
+		"""
+		self.ventana = max(0.0, float(ventana))
+		self.intervalo_minimo = max(0.0, float(intervalo_minimo))
+	
+	@property
+	def pendientes(self) -> int:
+		"""Número de mensajes en espera."""
+		return len(self._pendientes)
+	
+	def anunciar(self, texto: str, clave: Optional[Hashable] = None, prioridad: Optional[Any] = None):
+		"""Pone un mensaje en la cola.
+		
+		Args:
+			texto: Texto a anunciar.
+			clave: Mensajes con la misma clave se sustituyen: solo se lee el último.
+			prioridad: Prioridad de voz; con `speech.Spri.NOW` no se espera a la ventana.
+		"""
+		if not texto:
+			return
+		if not wx.IsMainThread():
+			wx.CallAfter(self.anunciar, texto, clave, prioridad)
+			return
+		if clave is None:
+			clave = ("sin_clave", next(self._sin_clave))
+		elif clave in self._pendientes:
+			# El anterior aún no se ha leído y ya no está al día
+			del self._pendientes[clave]
+			self.descartados += 1
+		self._poner(clave, _Pendiente(texto, prioridad), urgente=prioridad == speech.Spri.NOW)
+	
+	def anunciar_lineas(self, lineas: List[str], clave: Hashable = "lineas", sustituye_pendiente: bool = False):
+		"""Pone en la cola líneas nuevas, agrupándolas con las ya pendientes.
+		
+		Args:
+			lineas: Líneas a anunciar; las vacías se ignoran.
+			clave: Las líneas con la misma clave se resumen juntas.
+			sustituye_pendiente: Si la primera línea reemplaza a la última de la captura
+				anterior (`DeltaCaptura.sustituye_pendiente`); no se cuenta como nueva.
+		"""
+		if not wx.IsMainThread():
+			wx.CallAfter(self.anunciar_lineas, lineas, clave, sustituye_pendiente)
+			return
+		nuevas = lineas[1:] if sustituye_pendiente else lineas
+		lineas = [linea for linea in lineas if linea.strip()]
+		if not lineas:
+			return
+		pendiente = self._pendientes.get(clave)
+		if pendiente is None:
+			pendiente = _Pendiente("")
+		pendiente.lineas += sum(1 for linea in nuevas if linea.strip())
+		pendiente.texto = lineas[-1].strip()[:self.LONGITUD_MAXIMA_LINEA]
+		self._poner(clave, pendiente)
+	
+	def vaciar(self):
+		"""Anuncia ya los mensajes pendientes, sin esperar a la ventana."""
+		self._detener_temporizador()
+		self._anunciar_pendientes()
+	
+	def descartar(self, clave: Optional[Hashable] = None):
+		"""Descarta mensajes pendientes sin anunciarlos.
+		
+		Args:
+			clave: Clave a descartar; si es None, se descartan todos.
+		"""
+		if clave is None:
+			self._pendientes.clear()
+			self._detener_temporizador()
+		else:
+			self._pendientes.pop(clave, None)
+	
+	def _poner(self, clave: Hashable, pendiente: _Pendiente, urgente: bool = False):
+		"""Guarda un mensaje y programa el próximo anuncio.
+		
+		Args:
+			clave: Clave del mensaje.
+			pendiente: Mensaje a guardar.
+			urgente: Si debe anunciarse sin esperar a la ventana.
+		"""
+		ahora = time.monotonic()
+		if not self._pendientes:
+			self._primera_llegada = ahora
+		self._pendientes[clave] = pendiente
+		
+		vencimiento = self._ultimo_anuncio + self.intervalo_minimo
+		if not urgente:
+			vencimiento = max(vencimiento, self._primera_llegada + self.ventana)
+		espera = vencimiento - ahora
+		if espera <= 0:
+			self.vaciar()
+			return
+		if self._temporizador is not None and self._temporizador.IsRunning():
+			if not urgente:
+				return
+			self._temporizador.Stop()
+		self._temporizador = wx.CallLater(max(1, int(espera * 1000)), self._anunciar_pendientes)
+	
+	def _detener_temporizador(self):
+		"""Cancela el anuncio programado."""
+		if self._temporizador is not None and self._temporizador.IsRunning():
+			self._temporizador.Stop()
+		self._temporizador = None
+	
+	def _componer(self, pendiente: _Pendiente) -> str:
+		"""Texto que se lee de un mensaje pendiente.
+		
+		Args:
+			pendiente: Mensaje o ráfaga de líneas.
+		"""
+		if pendiente.lineas > 1:
+			return _("{cantidad} líneas nuevas, la última: {linea}").format(
+				cantidad=pendiente.lineas, linea=pendiente.texto
+			)
+		return pendiente.texto
+	
+	def _anunciar_pendientes(self):
+		"""Lee en un único anuncio los mensajes pendientes."""
+		self._temporizador = None
+		if not self._pendientes:
+			return
+		# Los urgentes primero, para que nunca queden dentro del resumen
+		pendientes = sorted(self._pendientes.values(), key=lambda p: p.prioridad != speech.Spri.NOW)
+		self._pendientes.clear()
+		
+		textos = [self._componer(p) for p in pendientes[:self.MAX_MENSAJES]]
+		resto = len(pendientes) - self.MAX_MENSAJES
+		if resto > 0:
+			textos.append(_("{} mensajes más").format(resto))
+		prioridad = speech.Spri.NOW if any(p.prioridad == speech.Spri.NOW for p in pendientes) else None
+		
+		self._ultimo_anuncio = time.monotonic()
+		self._mensajes.anunciar(". ".join(textos), prioridad=prioridad)
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Exportador de Contenido
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Guardado de capturas en segundo plano.
+
+Proporciona:
+- Generadores que recorren el contenido por bloques o por líneas sin copiarlo
+- Escritura en un hilo aparte con compresión gzip o xz opcional
+- Escritura a un archivo temporal que solo sustituye al destino al terminar
+"""
+
+import gzip
+import lzma
+import os
+import tempfile
+import threading
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+import wx
+from logHandler import log
+
+
+# Caracteres que se escriben en cada bloque
+TAMANO_BLOQUE = 256 * 1024
+
+# Compresiones admitidas y su extensión
+COMPRESIONES = {
+	"": ".txt",
+	"gzip": ".txt.gz",
+	"xz": ".txt.xz"
+}
+
+# Cada fragmento es (texto a escribir, caracteres del origen recorridos)
+Fragmento = Tuple[str, int]
+
+
+def iterar_bloques(texto: str, tamano: int = TAMANO_BLOQUE) -> Iterator[Fragmento]:
+	"""Recorre el texto completo en bloques de tamaño fijo.
+	
+	Args:
+		texto: Contenido a guardar.
+		tamano: Caracteres por bloque.
+	
+	Yields:
+		Tuplas (bloque, caracteres recorridos).
+	"""
+	for inicio in range(0, len(texto), tamano):
+		fin = min(inicio + tamano, len(texto))
+		yield texto[inicio:fin], fin
+
+
+def iterar_lineas(
+	texto: str,
+	primera: int = 0,
+	ultima: Optional[int] = None,
+	filtro: Optional[Callable[[str], bool]] = None
+) -> Iterator[Fragmento]:
+	"""Recorre un rango de líneas del texto, opcionalmente filtradas.
+	
+	Las líneas se localizan con `str.find`, sin dividir el texto completo.
+	
+	Args:
+		texto: Contenido a guardar.
+		primera: Índice (base 0) de la primera línea a incluir.
+		ultima: Índice (base 0) de la última línea a incluir, o None hasta el final.
+		filtro: Función que decide si una línea se incluye.
+	
+	Yields:
+		Tuplas (línea con salto final, caracteres recorridos).
+	"""
+	posicion = 0
+	indice = 0
+	longitud = len(texto)
+	while posicion < longitud:
+		fin = texto.find("\n", posicion)
+		if fin == -1:
+			fin = longitud
+		if indice >= primera:
+			if ultima is not None and indice > ultima:
+				break
+			linea = texto[posicion:fin]
+			if filtro is None or filtro(linea):
+				yield linea + "\n", fin
+		posicion = fin + 1
+		indice += 1
+
+
+class TareaExportacion:
+	"""Guardado en curso, que puede cancelarse."""
+	
+	def __init__(self, ruta: str):
+		"""Inicializa la tarea.
+		
+		Args:
+			ruta: Archivo de destino.
+		"""
+		self.ruta = ruta
+		self.senal_parar = threading.Event()
+		self._hilo: Optional[threading.Thread] = None
+	
+	@property
+	def en_curso(self) -> bool:
+		"""Indica si el guardado sigue en marcha."""
+		return self._hilo is not None and self._hilo.is_alive()
+	
+	def cancelar(self):
+		"""Solicita la cancelación; el destino no se modifica."""
+		self.senal_parar.set()
+
+
+def compresion_por_ruta(ruta: str) -> str:
+	"""Deduce la compresión a partir de la extensión del archivo.
+	
+	Args:
+		ruta: Ruta del archivo de destino.
+	
+	Returns:
+		"gzip", "xz" o cadena vacía si no se comprime.
+	"""
+	ruta = ruta.lower()
+	if ruta.endswith(".gz"):
+		return "gzip"
+	if ruta.endswith(".xz"):
+		return "xz"
+	return ""
+
+
+def exportar(
+	ruta: str,
+	fragmentos: Iterable[Fragmento],
+	total: int,
+	compresion: str = "",
+	callback_progreso: Optional[Callable[[int], None]] = None,
+	callback_exito: Optional[Callable[[str], None]] = None,
+	callback_error: Optional[Callable[[Exception], None]] = None
+) -> TareaExportacion:
+	"""Guarda los fragmentos en un archivo desde un hilo en segundo plano.
+	
+	Los callbacks se llaman en el hilo principal mediante wx.CallAfter.
+	Los saltos de línea se escriben con `os.linesep`, como en modo texto.
+	
+	Args:
+		ruta: Archivo de destino.
+		fragmentos: Generador de tuplas (texto, caracteres recorridos).
+		total: Caracteres totales del origen, para calcular el porcentaje.
+		compresion: "gzip", "xz" o cadena vacía.
+		callback_progreso: Recibe el porcentaje completado.
+		callback_exito: Recibe la ruta guardada.
+		callback_error: Recibe la excepción producida.
+	
+	Returns:
+		Tarea que permite cancelar el guardado.
+	"""
+	tarea = TareaExportacion(ruta)
+	
+	def _trabajo():
+		temporal = None
+		try:
+			directorio = os.path.dirname(os.path.abspath(ruta))
+			descriptor, temporal = tempfile.mkstemp(prefix=".consoleLog_", suffix=".tmp", dir=directorio)
+			with os.fdopen(descriptor, "wb") as crudo:
+				if compresion == "gzip":
+					destino = gzip.GzipFile(fileobj=crudo, mode="wb")
+				elif compresion == "xz":
+					destino = lzma.LZMAFile(crudo, "wb")
+				else:
+					destino = crudo
+				ultimo_porcentaje = -1
+				for texto, recorrido in fragmentos:
+					if tarea.senal_parar.is_set():
+						break
+					if os.linesep != "\n":
+						# Los mismos saltos que el guardado en modo texto (CRLF en Windows)
+						texto = texto.replace("\n", os.linesep)
+					destino.write(texto.encode("utf-8", "surrogatepass"))
+					porcentaje = int(recorrido * 100 / total) if total else 100
+					if callback_progreso and porcentaje != ultimo_porcentaje:
+						ultimo_porcentaje = porcentaje
+						wx.CallAfter(callback_progreso, porcentaje)
+				if destino is not crudo:
+					destino.close()
+				crudo.flush()
+				os.fsync(crudo.fileno())
+			if tarea.senal_parar.is_set():
+				os.remove(temporal)
+				log.debug(f"consoleLog: Guardado de {ruta} cancelado")
+				return
+			os.replace(temporal, ruta)
+		except Exception as e:
+			log.error(f"consoleLog: Error al guardar {ruta}: {e}")
+			if temporal:
+				try:
+					os.remove(temporal)
+				except OSError:
+					pass
+			if callback_error:
+				wx.CallAfter(callback_error, e)
+			return
+		if callback_exito:
+			wx.CallAfter(callback_exito, ruta)
+	
+	tarea._hilo = threading.Thread(target=_trabajo, name="consoleLog_exportar", daemon=True)
+	tarea._hilo.start()
+	return tarea
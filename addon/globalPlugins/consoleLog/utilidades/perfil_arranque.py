@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# consoleLog - Perfil de Arranque
+# Copyright (C) 2024-2026 Héctor J. Benítez Corredera <xebolax@gmail.com>
+# Este archivo está cubierto por la Licencia Pública General de GNU.
+
+"""
+Medición de lo que el complemento añade al arranque de NVDA.
+
+`PerfilArranque` instala durante el arranque un buscador en
+`sys.meta_path` que cronometra la ejecución de cada módulo del paquete
+(tiempo propio, sin contar los módulos que importa), registra los pasos
+de inicialización y compara el total con un presupuesto. Los componentes
+que se crean más tarde, en su primer uso, se anotan aparte porque no
+retrasan el arranque.
+"""
+
+import importlib.abc
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from logHandler import log
+
+import addonHandler
+_ = addonHandler.initTranslation()
+if not callable(_):
+	_ = lambda x: x
+
+
+class _CargadorMedido(importlib.abc.Loader):
+	"""Envuelve el cargador real de un módulo para cronometrar su ejecución."""
+	
+	def __init__(self, cargador, perfil: "PerfilArranque"):
+		self._cargador = cargador
+		self._perfil = perfil
+	
+	def create_module(self, spec):
+		return self._cargador.create_module(spec)
+	
+	def exec_module(self, modulo):
+		pila = self._perfil._pila
+		pila.append(0.0)
+		inicio = time.perf_counter()
+		try:
+			self._cargador.exec_module(modulo)
+		finally:
+			total = time.perf_counter() - inicio
+			hijos = pila.pop()
+			if pila:
+				pila[-1] += total
+			self._perfil._registrar_modulo(modulo.__name__, total - hijos)
+	
+	def __getattr__(self, nombre):
+		# get_source, get_filename, is_package... del cargador real
+		return getattr(self._cargador, nombre)
+
+
+class _MedidorImportaciones(importlib.abc.MetaPathFinder):
+	"""Buscador que solo intercepta los módulos del paquete medido."""
+	
+	def __init__(self, perfil: "PerfilArranque"):
+		self._perfil = perfil
+		self._hilo = threading.get_ident()
+	
+	def find_spec(self, fullname, path, target=None):
+		if not fullname.startswith(self._perfil.paquete + ".") or threading.get_ident() != self._hilo:
+			return None
+		for buscador in sys.meta_path:
+			if buscador is self or not hasattr(buscador, "find_spec"):
+				continue
+			spec = buscador.find_spec(fullname, path, target)
+			if spec is not None:
+				if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+					spec.loader = _CargadorMedido(spec.loader, self._perfil)
+				return spec
+		return None
+
+
+class PerfilArranque:
+	"""Tiempos de importación e inicialización del complemento."""
+	
+	# Milisegundos que el complemento puede añadir al arranque de NVDA
+	PRESUPUESTO_MS = 50.0
+	
+	def __init__(self, paquete: str, presupuesto_ms: Optional[float] = None):
+		"""Inicializa el perfil sin medir nada todavía.
+		
+		Args:
+			paquete: Nombre del paquete cuyos módulos se cronometran.
+			presupuesto_ms: Presupuesto de arranque; por defecto `PRESUPUESTO_MS`.
+		"""
+		self.paquete = paquete
+		self.presupuesto_ms = self.PRESUPUESTO_MS if presupuesto_ms is None else presupuesto_ms
+		self.pasos: List[Tuple[str, float]] = []
+		self.modulos: Dict[str, float] = {}
+		self.diferidos: List[Tuple[str, float]] = []
+		self._pila: List[float] = []
+		self._medidor: Optional[_MedidorImportaciones] = None
+		self._inicio_paso = 0.0
+		self.terminado = False
+	
+	@property
+	def total_ms(self) -> float:
+		"""Milisegundos añadidos al arranque por los pasos registrados."""
+		return sum(ms for _paso, ms in self.pasos)
+	
+	def iniciar(self):
+		"""Empieza a cronometrar las importaciones del paquete."""
+		self._medidor = _MedidorImportaciones(self)
+		sys.meta_path.insert(0, self._medidor)
+		self._inicio_paso = time.perf_counter()
+	
+	def registrar_paso(self, paso: str, inicio: Optional[float] = None):
+		"""Anota un paso del arranque que termina ahora.
+		
+		Args:
+			paso: Nombre del paso.
+			inicio: Instante `time.perf_counter()` en que empezó; por defecto,
+				el final del paso anterior o el inicio del perfil.
+		"""
+		ahora = time.perf_counter()
+		desde = self._inicio_paso if inicio is None else inicio
+		self.pasos.append((paso, (ahora - desde) * 1000))
+		self._inicio_paso = ahora
+	
+	def detener(self):
+		"""Deja de cronometrar las importaciones sin dar el arranque por medido.
+		
+		Se llama también si el complemento no llega a arrancar (modo seguro
+		o un error), para que el buscador no quede en `sys.meta_path`.
+		"""
+		if self._medidor is not None:
+			try:
+				sys.meta_path.remove(self._medidor)
+			except ValueError:
+				pass
+			self._medidor = None
+	
+	def terminar(self):
+		"""Deja de cronometrar las importaciones y comprueba el presupuesto."""
+		self.detener()
+		self.terminado = True
+		if self.total_ms > self.presupuesto_ms:
+			log.warning(
+				f"consoleLog: El arranque tardó {self.total_ms:.1f} ms, "
+				f"por encima del presupuesto de {self.presupuesto_ms:.0f} ms\n{self.informe()}"
+			)
+		else:
+			log.debug(f"consoleLog: Arranque en {self.total_ms:.1f} ms")
+	
+	@contextmanager
+	def medir(self, paso: str):
+		"""Cronometra un bloque; tras el arranque se anota como primer uso.
+		
+		Args:
+			paso: Nombre del paso o del componente creado.
+		"""
+		inicio = time.perf_counter()
+		try:
+			yield
+		finally:
+			if self.terminado:
+				self.diferidos.append((paso, (time.perf_counter() - inicio) * 1000))
+			else:
+				self.registrar_paso(paso, inicio)
+	
+	def _registrar_modulo(self, nombre: str, segundos: float):
+		"""Acumula el tiempo propio de ejecución de un módulo del paquete."""
+		nombre = nombre[len(self.paquete) + 1:]
+		self.modulos[nombre] = self.modulos.get(nombre, 0.0) + segundos * 1000
+	
+	def informe(self) -> str:
+		"""Texto con los tiempos medidos, de mayor a menor dentro de cada sección."""
+		lineas = [
+			_("Arranque de consoleLog: {total:.1f} ms (presupuesto: {presupuesto:.0f} ms)").format(
+				total=self.total_ms, presupuesto=self.presupuesto_ms
+			),
+			"",
+			_("Pasos:")
+		]
+		lineas += [f"  {paso}: {ms:.1f} ms" for paso, ms in self.pasos]
+		if self.modulos:
+			lineas += ["", _("Módulos importados al arrancar (tiempo propio):")]
+			lineas += [
+				f"  {nombre}: {ms:.1f} ms"
+				for nombre, ms in sorted(self.modulos.items(), key=lambda m: m[1], reverse=True)
+			]
+		if self.diferidos:
+			lineas += ["", _("Creados en su primer uso (no cuentan en el arranque):")]
+			lineas += [f"  {paso}: {ms:.1f} ms" for paso, ms in self.diferidos]
+		return "\n".join(lineas)